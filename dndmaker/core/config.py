@@ -105,4 +105,22 @@ class Config:
         """Définit la langue préférée"""
         self._config['language'] = language
         self._save_config()
+    
+    def get_generation_pool(self) -> dict:
+        """Récupère les paramètres de la réserve de pré-génération
 
+        Returns:
+            {'size': personnages gardés d'avance par jeu de paramètres,
+             'presets': [{'type': 'PNJ', 'level': 1, 'stats_method': 'standard'}, ...]}
+            (clés absentes : valeurs par défaut)
+        """
+        settings = self._config.get('generation_pool', {})
+        return settings if isinstance(settings, dict) else {}
+    
+    def set_generation_pool(self, size: int, presets: Optional[list] = None) -> None:
+        """Définit les paramètres de la réserve de pré-génération"""
+        settings = {'size': size}
+        if presets is not None:
+            settings['presets'] = presets
+        self._config['generation_pool'] = settings
+        self._save_config()
@@ -6,7 +6,7 @@ import json
 from pathlib import Path
 from typing import List, Dict, Optional
 from ..models.bank import DataBank, BankEntry, BankType
-from ..core.utils import generate_id
+from ..core.utils import generate_id, normalize_key
 
 
 class DataLoader:
@@ -103,6 +103,11 @@ class DataLoader:
             pass
         return []
     
+    @staticmethod
+    def _existing_keys(bank: DataBank) -> set:
+        """Clés canoniques des entrées déjà présentes dans une banque"""
+        return {normalize_key(entry.value) for entry in bank.entries}
+    
     @staticmethod
     def initialize_banks(bank_service) -> None:
         """Initialise les banques avec les données par défaut si elles sont vides"""
@@ -146,12 +151,13 @@ class DataLoader:
         
         # Créatures depuis le fichier JSON
         creatures_bank = bank_service.get_or_create_bank(BankType.CREATURES)
-        # Vérifier quelles créatures sont déjà présentes
-        existing_creature_names = {entry.value for entry in creatures_bank.entries}
+        # Vérifier quelles créatures sont déjà présentes (à la normalisation près) ; les
+        # homonymes du fichier lui-même (variantes d'armures...) sont tous conservés
+        existing_creature_names = DataLoader._existing_keys(creatures_bank)
         creatures = DataLoader.load_creatures()
         for creature in creatures:
             creature_name = creature.get('name', '')
-            if creature_name and creature_name not in existing_creature_names:
+            if creature_name and normalize_key(creature_name) not in existing_creature_names:
                 metadata = {
                     'level': creature.get('level', 1),
                     'type': creature.get('type', ''),
@@ -167,56 +173,56 @@ class DataLoader:
         
         # Professions depuis le fichier JSON
         professions_bank = bank_service.get_or_create_bank(BankType.PROFESSIONS)
-        existing_profession_names = {entry.value for entry in professions_bank.entries}
+        existing_profession_names = DataLoader._existing_keys(professions_bank)
         professions = DataLoader.load_professions()
         for profession in professions:
             profession_name = profession.get('name', '')
-            if profession_name and profession_name not in existing_profession_names:
+            if profession_name and normalize_key(profession_name) not in existing_profession_names:
                 bank_service.add_entry_to_bank(professions_bank.id, profession_name, profession)
         
         # Armures depuis le fichier JSON
         armors_bank = bank_service.get_or_create_bank(BankType.ARMORS)
-        existing_armor_names = {entry.value for entry in armors_bank.entries}
+        existing_armor_names = DataLoader._existing_keys(armors_bank)
         armors = DataLoader.load_armors()
         for armor in armors:
             armor_name = armor.get('name', '')
-            if armor_name and armor_name not in existing_armor_names:
+            if armor_name and normalize_key(armor_name) not in existing_armor_names:
                 bank_service.add_entry_to_bank(armors_bank.id, armor_name, armor)
         
         # Outils depuis le fichier JSON
         tools_bank = bank_service.get_or_create_bank(BankType.TOOLS)
-        existing_tool_names = {entry.value for entry in tools_bank.entries}
+        existing_tool_names = DataLoader._existing_keys(tools_bank)
         tools = DataLoader.load_tools()
         for tool in tools:
             tool_name = tool.get('name', '')
-            if tool_name and tool_name not in existing_tool_names:
+            if tool_name and normalize_key(tool_name) not in existing_tool_names:
                 bank_service.add_entry_to_bank(tools_bank.id, tool_name, tool)
         
         # Babioles depuis le fichier JSON
         trinkets_bank = bank_service.get_or_create_bank(BankType.TRINKETS)
-        existing_trinket_names = {entry.value for entry in trinkets_bank.entries}
+        existing_trinket_names = DataLoader._existing_keys(trinkets_bank)
         trinkets = DataLoader.load_trinkets()
         for trinket in trinkets:
             trinket_name = trinket.get('name', '')
-            if trinket_name and trinket_name not in existing_trinket_names:
+            if trinket_name and normalize_key(trinket_name) not in existing_trinket_names:
                 bank_service.add_entry_to_bank(trinkets_bank.id, trinket_name, trinket)
         
         # Armes depuis le fichier JSON
         weapons_bank = bank_service.get_or_create_bank(BankType.WEAPONS)
-        existing_weapon_names = {entry.value for entry in weapons_bank.entries}
+        existing_weapon_names = DataLoader._existing_keys(weapons_bank)
         weapons = DataLoader.load_weapons()
         for weapon in weapons:
             weapon_name = weapon.get('name', '')
-            if weapon_name and weapon_name not in existing_weapon_names:
+            if weapon_name and normalize_key(weapon_name) not in existing_weapon_names:
                 bank_service.add_entry_to_bank(weapons_bank.id, weapon_name, weapon)
         
         # Lieux depuis le fichier JSON
         locations_bank = bank_service.get_or_create_bank(BankType.LOCATIONS)
-        existing_location_names = {entry.value for entry in locations_bank.entries}
+        existing_location_names = DataLoader._existing_keys(locations_bank)
         locations = DataLoader.load_locations()
         for location in locations:
             location_name = location.get('name', '')
-            if location_name and location_name not in existing_location_names:
+            if location_name and normalize_key(location_name) not in existing_location_names:
                 metadata = {
                     'type': location.get('type', ''),
                     'description': location.get('description', ''),
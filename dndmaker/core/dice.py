@@ -0,0 +1,405 @@
+"""
+Expressions de dés
+Compilation d'expressions ("2d6+3", "4d6kh3", "1d8 + 1d6 - 1") en évaluateurs
+réutilisables : tirage unitaire, tirage en masse et distribution exacte (approchée par
+une loi normale quand le calcul exact serait trop coûteux, ex: "200d100").
+"""
+
+import random
+import re
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from fractions import Fraction
+from math import ceil, comb, sqrt
+from statistics import NormalDist
+from typing import Dict, List, Optional, Tuple
+
+from .numeric import np
+
+# Garde-fous contre les expressions absurdes ("1000000d6")
+MAX_DICE = 1000
+MAX_FACES = 1000
+
+# Coût estimé (opérations élémentaires) au-delà duquel la distribution exacte n'est pas
+# calculée : moyenne et percentiles passent par une loi normale, les tirages sont directs
+EXACT_COST_LIMIT = 200_000
+
+# Nombre de tirages à partir duquel roll_many construit la table exacte
+TABLE_MIN_ROLLS = 64
+
+# Tirages servant à estimer la variance d'un terme à dés conservés sans table exacte
+_SAMPLING_BUDGET = 50_000
+
+_TERM_PATTERN = re.compile(
+    r"(?P<sign>[+-])"
+    r"(?:(?P<count>\d*)d(?P<faces>\d+|%)(?:(?P<op>kh|kl|dh|dl|k|d)(?P<n>\d+))?"
+    r"|(?P<constant>\d+))"
+)
+
+
+@dataclass(frozen=True)
+class DiceTerm:
+    """Groupe de dés identiques : NdM, éventuellement en ne gardant que certains dés"""
+    count: int
+    faces: int
+    keep: Optional[int] = None  # Nombre de dés conservés (None : tous)
+    highest: bool = True  # Conserver les meilleurs (sinon les plus faibles)
+    sign: int = 1
+
+    def __str__(self) -> str:
+        text = f"{self.count}d{self.faces}"
+        if self.keep is not None:
+            text += f"{'kh' if self.highest else 'kl'}{self.keep}"
+        return text
+
+    def roll(self, rng: random.Random) -> int:
+        """Lance les dés du terme"""
+        rolls = [rng.randint(1, self.faces) for _ in range(self.count)]
+        if self.keep is not None:
+            rolls.sort(reverse=self.highest)
+            rolls = rolls[:self.keep]
+        return self.sign * sum(rolls)
+
+    @property
+    def keeps_all(self) -> bool:
+        return self.keep is None or self.keep >= self.count
+
+    @property
+    def support(self) -> int:
+        """Nombre de totaux possibles"""
+        kept = self.count if self.keeps_all else self.keep
+        return kept * (self.faces - 1) + 1
+
+    def exact_cost(self) -> int:
+        """Estimation du nombre d'opérations du calcul de counts()"""
+        if self.keeps_all:
+            return self.count * self.support
+        return self.faces * (self.count + 1) ** 2 * (self.keep + 1) * self.support
+
+    def counts(self) -> Dict[int, int]:
+        """Nombre de combinaisons menant à chaque total (sur faces ** count au total)"""
+        if self.keeps_all:
+            counts = _uniform_counts(self.count, self.faces)
+        else:
+            counts = _keep_counts(self.count, self.faces, self.keep, self.highest)
+        return {self.sign * total: n for total, n in counts.items()}
+
+    def moments(self) -> Tuple[float, float]:
+        """Espérance et variance du terme (estimées par tirages pour un grand terme à dés conservés)"""
+        if self.keeps_all:
+            return self.sign * self.count * (self.faces + 1) / 2, self.count * (self.faces ** 2 - 1) / 12
+        if self.exact_cost() <= EXACT_COST_LIMIT:
+            counts = self.counts()
+            total = self.faces ** self.count
+            mean = sum(value * n for value, n in counts.items()) / total
+            return mean, sum((value - mean) ** 2 * n for value, n in counts.items()) / total
+        # Tirages reproductibles, en nombre borné par le budget
+        rng = random.Random(0)
+        samples = [self.roll(rng) for _ in range(max(100, _SAMPLING_BUDGET // self.count))]
+        mean = sum(samples) / len(samples)
+        return mean, sum((value - mean) ** 2 for value in samples) / (len(samples) - 1)
+
+
+def _uniform_counts(count: int, faces: int) -> Dict[int, int]:
+    """Distribution de la somme de `count` dés à `faces` faces
+
+    Chaque dé ajouté est une somme glissante de `faces` valeurs (sommes préfixes) :
+    O(count × support) au lieu de O(count × support × faces).
+    """
+    counts = [1]  # counts[i] : combinaisons menant au total i + nombre de dés lancés
+    for _ in range(count):
+        prefix = [0]
+        for n in counts:
+            prefix.append(prefix[-1] + n)
+        size = len(counts)
+        counts = [
+            prefix[min(i + 1, size)] - prefix[max(0, i + 1 - faces)]
+            for i in range(size + faces - 1)
+        ]
+    return {count + i: n for i, n in enumerate(counts)}
+
+
+def _convolve(left: Dict[int, int], right: Dict[int, int]) -> Dict[int, int]:
+    """Produit de convolution de deux distributions (somme de variables indépendantes)"""
+    result: Dict[int, int] = {}
+    for a, n in left.items():
+        for b, m in right.items():
+            result[a + b] = result.get(a + b, 0) + n * m
+    return result
+
+
+def _keep_counts(count: int, faces: int, keep: int, highest: bool) -> Dict[int, int]:
+    """Distribution de la somme des `keep` meilleurs (ou pires) dés parmi `count`
+
+    Programmation dynamique sur les faces, de la meilleure à la pire : pour chaque
+    face on choisit combien de dés la montrent (C(restants, c) façons) et l'on
+    conserve ceux qui entrent encore dans les `keep` premiers.
+    """
+    order = range(faces, 0, -1) if highest else range(1, faces + 1)
+    # (dés restants, dés encore à conserver, somme) -> nombre de combinaisons
+    states: Dict[Tuple[int, int, int], int] = {(count, keep, 0): 1}
+    result: Dict[int, int] = {}
+    for position, face in enumerate(order):
+        remaining_faces = faces - position
+        next_states: Dict[Tuple[int, int, int], int] = {}
+        for (dice, to_keep, total), ways in states.items():
+            if to_keep == 0:
+                # Les dés restants ne comptent plus : toutes leurs valeurs se valent
+                result[total] = result.get(total, 0) + ways * remaining_faces ** dice
+                continue
+            # Sur la dernière face, tous les dés restants la montrent
+            choices = [dice] if remaining_faces == 1 else range(dice + 1)
+            for shown in choices:
+                kept = min(shown, to_keep)
+                key = (dice - shown, to_keep - kept, total + kept * face)
+                next_states[key] = next_states.get(key, 0) + ways * comb(dice, shown)
+        states = next_states
+    for (_, _, total), ways in states.items():
+        result[total] = result.get(total, 0) + ways
+    return result
+
+
+class DiceExpression:
+    """Expression de dés compilée
+
+    La distribution exacte est calculée à la première demande puis conservée ;
+    les tirages en masse s'en servent (inversion de la fonction de répartition).
+    Si son coût dépasse EXACT_COST_LIMIT (is_exact est faux), elle n'est jamais
+    calculée : moyenne et percentiles sont approchés par une loi normale et les
+    dés sont lancés directement.
+    """
+
+    def __init__(self, text: str, terms: Tuple[DiceTerm, ...], modifier: int = 0):
+        self.text = text
+        self.terms = terms
+        self.modifier = modifier
+        self._values: Optional[List[int]] = None
+        self._cumulative: Optional[List[int]] = None
+        self._moments: Optional[Tuple[float, float]] = None
+
+    def __repr__(self) -> str:
+        return f"DiceExpression({self.text!r})"
+
+    def __str__(self) -> str:
+        parts = [("-" if t.sign < 0 else "+") + str(t) for t in self.terms]
+        if self.modifier:
+            parts.append(f"{self.modifier:+d}")
+        return "".join(parts).lstrip("+") or "0"
+
+    @property
+    def minimum(self) -> int:
+        return self.modifier + sum(
+            t.sign * (t.keep if t.keep is not None and t.keep < t.count else t.count) * (1 if t.sign > 0 else t.faces)
+            for t in self.terms
+        )
+
+    @property
+    def maximum(self) -> int:
+        return self.modifier + sum(
+            t.sign * (t.keep if t.keep is not None and t.keep < t.count else t.count) * (t.faces if t.sign > 0 else 1)
+            for t in self.terms
+        )
+
+    @property
+    def is_exact(self) -> bool:
+        """Vrai si la distribution exacte est assez peu coûteuse pour être calculée"""
+        cost = 0
+        support = 1
+        for term in self.terms:
+            # Calcul du terme, puis convolution avec les termes précédents
+            support_cost = support * term.support
+            cost += term.exact_cost() + support_cost
+            support += term.support - 1
+            if cost > EXACT_COST_LIMIT:
+                return False
+        return True
+
+    @property
+    def total_outcomes(self) -> int:
+        """Nombre total de combinaisons équiprobables"""
+        total = 1
+        for term in self.terms:
+            total *= term.faces ** term.count
+        return total
+
+    def roll(self, rng: Optional[random.Random] = None) -> int:
+        """Lance les dés une fois"""
+        rng = rng or random
+        return self.modifier + sum(term.roll(rng) for term in self.terms)
+
+    def roll_many(self, count: int, rng: Optional[random.Random] = None) -> List[int]:
+        """Lance les dés `count` fois
+
+        À partir de TABLE_MIN_ROLLS tirages (ou si elle existe déjà), la table exacte
+        est inversée : un seul tirage aléatoire par résultat. Sinon les dés sont lancés.
+        """
+        rng = rng or random
+        if self._values is None and (count < TABLE_MIN_ROLLS or not self.is_exact):
+            return [self.roll(rng) for _ in range(count)]
+        values, cumulative = self._tables()
+        total = cumulative[-1]
+        if np is not None and total < 2 ** 63:
+            generator = np.random.default_rng(rng.getrandbits(63))
+            draws = generator.integers(0, total, size=count, dtype=np.int64)
+            indexes = np.searchsorted(np.asarray(cumulative, dtype=np.int64), draws, side='right')
+            return np.asarray(values)[indexes].tolist()
+        return [values[bisect_right(cumulative, rng.randrange(total))] for _ in range(count)]
+
+    def counts(self) -> Dict[int, int]:
+        """Nombre exact de combinaisons menant à chaque total (sur total_outcomes)
+
+        Raises:
+            ValueError: Si la distribution exacte est trop coûteuse (voir is_exact)
+        """
+        values, cumulative = self._tables()
+        return {value: cumul - previous for value, cumul, previous in zip(values, cumulative, [0] + cumulative)}
+    
+    def distribution(self) -> Dict[int, float]:
+        """Probabilité exacte de chaque total (ValueError si is_exact est faux)"""
+        total = self.total_outcomes
+        return {value: n / total for value, n in self.counts().items()}
+    
+    def mean(self) -> float:
+        """Espérance (calculée terme à terme quand aucun dé n'est écarté)"""
+        if all(t.keeps_all for t in self.terms) or not self.is_exact:
+            return self._normal_moments()[0]
+        return sum(value * p for value, p in self.distribution().items())
+
+    def percentile(self, p: float) -> int:
+        """Plus petit total dont la probabilité cumulée atteint p % (0-100)
+
+        Approché par une loi normale si la distribution exacte est trop coûteuse.
+        """
+        if not 0 <= p <= 100:
+            raise ValueError(f"Percentile hors de [0, 100]: {p}")
+        if not self.is_exact:
+            if p in (0, 100):
+                return self.minimum if p == 0 else self.maximum
+            mean, variance = self._normal_moments()
+            value = round(NormalDist(mean, sqrt(variance) or 1e-9).inv_cdf(p / 100))
+            return min(self.maximum, max(self.minimum, value))
+        values, cumulative = self._tables()
+        # Calcul exact même avec de très grands nombres de combinaisons
+        target = max(1, ceil(Fraction(p) * cumulative[-1] / 100))
+        return values[bisect_left(cumulative, target)]
+
+    def summary(self) -> str:
+        """Résumé lisible, ex: "2d6+3 : 5 à 15, moyenne 10 (médiane 10)" """
+        approximate = "" if self.is_exact else "≈"
+        return (
+            f"{self} : {self.minimum} à {self.maximum}, "
+            f"moyenne {approximate}{self.mean():.3g} (médiane {approximate}{self.percentile(50)})"
+        )
+
+    def _normal_moments(self) -> Tuple[float, float]:
+        """Espérance et variance de l'expression (termes indépendants)"""
+        if self._moments is None:
+            moments = [term.moments() for term in self.terms]
+            self._moments = (
+                self.modifier + sum(mean for mean, _ in moments),
+                sum(variance for _, variance in moments)
+            )
+        return self._moments
+
+    def _tables(self) -> Tuple[List[int], List[int]]:
+        """Totaux possibles triés et nombre cumulé de combinaisons"""
+        if self._values is None:
+            if not self.is_exact:
+                raise ValueError(f"Distribution exacte trop coûteuse à calculer: {self.text!r}")
+            counts = {self.modifier: 1}
+            for term in self.terms:
+                counts = _convolve(counts, term.counts())
+            self._values = sorted(counts)
+            self._cumulative = []
+            running = 0
+            for value in self._values:
+                running += counts[value]
+                self._cumulative.append(running)
+        return self._values, self._cumulative
+
+
+@lru_cache(maxsize=512)
+def compile_dice(text: str) -> DiceExpression:
+    """Compile une expression de dés (résultat mis en cache)
+
+    Syntaxe : termes NdM (N vaut 1 par défaut, d% pour d100) ou constantes,
+    séparés par + ou -. Un terme peut conserver (kh/k, kl) ou écarter (dl/d, dh)
+    une partie des dés : 4d6kh3, 4d6d1, 2d20kl1.
+
+    Raises:
+        ValueError: Si l'expression est invalide
+    """
+    compact = re.sub(r"\s+", "", str(text)).lower()
+    if not compact:
+        raise ValueError("Expression de dés vide")
+    if compact[0] not in "+-":
+        compact = "+" + compact
+
+    terms: List[DiceTerm] = []
+    modifier = 0
+    position = 0
+    while position < len(compact):
+        match = _TERM_PATTERN.match(compact, position)
+        if not match:
+            raise ValueError(f"Expression de dés invalide: {text!r}")
+        position = match.end()
+        sign = -1 if match.group('sign') == '-' else 1
+
+        if match.group('constant') is not None:
+            modifier += sign * int(match.group('constant'))
+            continue
+
+        count = int(match.group('count') or 1)
+        faces = 100 if match.group('faces') == '%' else int(match.group('faces'))
+        if not 1 <= count <= MAX_DICE or not 1 <= faces <= MAX_FACES:
+            raise ValueError(f"Nombre de dés ou de faces hors limites: {text!r}")
+
+        keep, highest = None, True
+        op = match.group('op')
+        if op:
+            n = int(match.group('n'))
+            if n > count:
+                raise ValueError(f"Impossible de conserver ou d'écarter {n} dés sur {count}: {text!r}")
+            if op in ('kh', 'k'):
+                keep = n
+            elif op == 'kl':
+                keep, highest = n, False
+            elif op in ('dl', 'd'):
+                keep = count - n
+            else:  # dh
+                keep, highest = count - n, False
+        terms.append(DiceTerm(count=count, faces=faces, keep=keep, highest=highest, sign=sign))
+
+    return DiceExpression(str(text).strip(), tuple(terms), modifier)
+
+
+def is_dice_expression(text: str) -> bool:
+    """Indique si un texte est une expression de dés valide"""
+    try:
+        compile_dice(text)
+    except ValueError:
+        return False
+    return True
+
+
+def roll_dice(text: str, rng: Optional[random.Random] = None) -> int:
+    """Lance une expression de dés (compilée une seule fois grâce au cache)"""
+    return compile_dice(text).roll(rng)
+
+
+def describe_dice(text: str) -> str:
+    """Description d'une expression pour une infobulle ("" si le texte n'est pas une expression de dés)"""
+    try:
+        expression = compile_dice(text)
+    except ValueError:
+        return ""
+    if not expression.terms:
+        return ""
+    description = (
+        f"{expression.summary()}\n"
+        f"90 % des jets entre {expression.percentile(5)} et {expression.percentile(95)}"
+    )
+    if not expression.is_exact:
+        description += "\n(valeurs approchées)"
+    return description
@@ -0,0 +1,11 @@
+"""
+Accès optionnel à NumPy pour les calculs en masse
+Sans NumPy, les appelants utilisent une implémentation Python pure
+"""
+
+try:
+    import numpy as np
+except ImportError:  # NumPy est optionnel (extra "fast")
+    np = None
+
+HAS_NUMPY = np is not None
@@ -0,0 +1,35 @@
+"""
+Flux aléatoires reproductibles pour les générateurs
+Chaque tâche dérive son propre flux d'une graine racine, de façon déterministe :
+le résultat ne dépend ni de l'ordre d'exécution ni du nombre de cœurs utilisés.
+"""
+
+import hashlib
+import random
+
+# Les graines tiennent sur 63 bits (entier signé 64 bits, sûr en JSON)
+SEED_BITS = 63
+
+
+def new_seed() -> int:
+    """Tire une nouvelle graine racine (non reproductible)"""
+    return random.SystemRandom().getrandbits(SEED_BITS)
+
+
+def derive_seed(seed: int, *path) -> int:
+    """Dérive la graine d'un flux enfant depuis une graine et un chemin (ex: indice de tâche)
+
+    Exemple: derive_seed(42, "npc", 3) donne toujours la même graine
+    """
+    digest = hashlib.blake2b(repr((seed,) + path).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') >> (64 - SEED_BITS)
+
+
+def make_rng(seed: int = None) -> random.Random:
+    """Crée un générateur aléatoire (graine aléatoire si None)"""
+    return random.Random(new_seed() if seed is None else seed)
+
+
+def child_rng(seed: int, *path) -> random.Random:
+    """Crée le générateur du flux enfant identifié par `path`"""
+    return random.Random(derive_seed(seed, *path))
@@ -0,0 +1,142 @@
+"""
+Échantillonnage aléatoire pondéré
+Méthode d'alias de Walker (variante de Vose) : construction en O(n), tirage en O(1)
+"""
+
+import heapq
+import random
+from typing import Any, List, Optional, Sequence
+
+
+class AliasSampler:
+    """Échantillonneur pondéré avec tirage en temps constant"""
+
+    def __init__(self, items: Sequence[Any], weights: Optional[Sequence[float]] = None):
+        """Construit les tables d'alias
+
+        Args:
+            items: Éléments à tirer
+            weights: Poids relatifs (1.0 par défaut). Les éléments de poids nul
+                ou négatif sont ignorés.
+        """
+        if weights is None:
+            weights = [1.0] * len(items)
+        if len(weights) != len(items):
+            raise ValueError("Le nombre de poids ne correspond pas au nombre d'éléments")
+
+        self.items: List[Any] = []
+        self.weights: List[float] = []
+        for item, weight in zip(items, weights):
+            weight = float(weight)
+            if weight > 0:
+                self.items.append(item)
+                self.weights.append(weight)
+
+        self.total_weight = sum(self.weights)
+        self._prob: List[float] = []
+        self._alias: List[int] = []
+        self._build()
+
+    def _build(self) -> None:
+        """Construit les tables de probabilités et d'alias (algorithme de Vose)"""
+        n = len(self.weights)
+        if n == 0:
+            return
+
+        scaled = [w * n / self.total_weight for w in self.weights]
+        self._prob = [0.0] * n
+        self._alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            self._prob[s] = scaled[s]
+            self._alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            if scaled[l] < 1.0:
+                small.append(l)
+            else:
+                large.append(l)
+
+        # Les restes (erreurs d'arrondi) ont une probabilité de 1
+        for i in large + small:
+            self._prob[i] = 1.0
+            self._alias[i] = i
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def draw_index(self, rng: Optional[random.Random] = None) -> int:
+        """Tire l'indice d'un élément en O(1)"""
+        if not self.items:
+            raise ValueError("Aucun élément à tirer")
+        rng = rng or random
+        u = rng.random() * len(self._prob)
+        i = int(u)
+        return i if (u - i) < self._prob[i] else self._alias[i]
+
+    def draw(self, rng: Optional[random.Random] = None) -> Any:
+        """Tire un élément selon les poids"""
+        return self.items[self.draw_index(rng)]
+
+    def draw_many(
+        self,
+        count: int,
+        replace: bool = True,
+        rng: Optional[random.Random] = None
+    ) -> List[Any]:
+        """Tire plusieurs éléments
+
+        Args:
+            count: Nombre d'éléments souhaités
+            replace: Tirage avec remise (True) ou sans remise (False)
+            rng: Générateur aléatoire (module random par défaut)
+
+        Sans remise, le résultat est tronqué au nombre d'éléments disponibles.
+        """
+        rng = rng or random
+        if count <= 0 or not self.items:
+            return []
+
+        if replace:
+            items = self.items
+            prob = self._prob
+            alias = self._alias
+            n = len(prob)
+            result = []
+            for _ in range(count):
+                u = rng.random() * n
+                i = int(u)
+                result.append(items[i] if (u - i) < prob[i] else items[alias[i]])
+            return result
+
+        n = len(self.items)
+        if count >= n:
+            return self._weighted_order(n, rng)
+
+        # Peu d'éléments demandés : tirages d'alias avec rejet des doublons,
+        # puis repli sur l'ordre pondéré si les poids sont trop déséquilibrés
+        if count <= n // 2:
+            seen = set()
+            result = []
+            attempts = 4 * count + 32
+            while len(result) < count and attempts > 0:
+                index = self.draw_index(rng)
+                attempts -= 1
+                if index not in seen:
+                    seen.add(index)
+                    result.append(self.items[index])
+            if len(result) == count:
+                return result
+
+        return self._weighted_order(count, rng)
+
+    def _weighted_order(self, count: int, rng) -> List[Any]:
+        """Tirage pondéré sans remise (Efraimidis-Spirakis) en O(n log k)"""
+        keyed = (
+            (rng.random() ** (1.0 / weight), index)
+            for index, weight in enumerate(self.weights)
+        )
+        return [self.items[index] for _, index in heapq.nlargest(count, keyed)]
@@ -2,6 +2,7 @@
 Utilitaires pour le core
 """
 
+import unicodedata
 import uuid
 from typing import Any
 
@@ -20,3 +21,13 @@ def calculate_modifier(value: int) -> int:
     """Calcule le modificateur d'une caractéristique"""
     return (value - 10) // 2
 
+
+
+def normalize_key(text: str) -> str:
+    """Calcule la clé canonique d'un texte (casse, accents et espaces ignorés)
+    
+    Exemple: "  Épée   longue " -> "epee longue"
+    """
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    stripped = ''.join(c for c in decomposed if not unicodedata.combining(c))
+    return ' '.join(stripped.split())
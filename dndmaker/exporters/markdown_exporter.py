@@ -8,6 +8,7 @@ from typing import List
 from ..models.character import Character
 from ..models.scene import Scene
 from ..models.session import Session
+from ..services.scene_graph import SceneGraph
 
 
 class MarkdownExporter:
@@ -57,9 +58,9 @@ class MarkdownExporter:
                 f.write(f"- **Base:** {character.defense.base}\n")
                 f.write(f"- **Armure:** {character.defense.armor}\n")
                 f.write(f"- **Bouclier:** {character.defense.shield}\n")
-                f.write(f"- **DEX:** {character.defense.dexterity}\n")
+                f.write(f"- **DEX:** {character.derived.modifier('dexterity')}\n")
                 f.write(f"- **Divers:** {character.defense.misc}\n")
-                f.write(f"- **Total:** {character.defense.calculate_total()}\n\n")
+                f.write(f"- **Total:** {character.derived.defense_total}\n\n")
                 
                 # Armes
                 if character.weapons:
@@ -104,6 +105,39 @@ class MarkdownExporter:
             print(f"Erreur lors de l'export Markdown: {e}")
             return False
     
+    @staticmethod
+    def export_story_arc(scenes: List[Scene], graph: SceneGraph, output_path: Path) -> bool:
+        """Exporte l'arc narratif : les scènes dans l'ordre de leurs références, avec leurs liens"""
+        try:
+            titles = {scene.id: scene.title for scene in scenes}
+            by_id = {scene.id: scene for scene in scenes}
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("# Arc narratif\n\n")
+                for scene_id in graph.topological_order():
+                    scene = by_id.get(scene_id)
+                    if scene is None:
+                        continue
+                    f.write(f"## {scene.title}\n\n")
+                    if scene.description:
+                        f.write(f"{scene.description}\n\n")
+                    parents = [titles[i] for i in graph.parents(scene_id) if i in titles]
+                    children = [titles[i] for i in graph.children(scene_id) if i in titles]
+                    if parents:
+                        f.write(f"- **Suite de:** {', '.join(parents)}\n")
+                    if children:
+                        f.write(f"- **Mène à:** {', '.join(children)}\n")
+                    if parents or children:
+                        f.write("\n")
+                cycles = graph.cycles()
+                if cycles:
+                    f.write("## Boucles\n\n")
+                    for cycle in cycles:
+                        f.write(f"- {', '.join(titles.get(i, i) for i in cycle)}\n")
+            return True
+        except Exception as e:
+            print(f"Erreur lors de l'export Markdown: {e}")
+            return False
+    
     @staticmethod
     def export_session(session: Session, output_path: Path) -> bool:
         """Exporte une session en Markdown"""
@@ -237,9 +237,9 @@ class PDFExporter:
             c.drawString(x_pos + 30*mm, y_pos, str(character.defense.base))
             c.drawString(x_pos + 45*mm, y_pos, str(character.defense.armor))
             c.drawString(x_pos + 70*mm, y_pos, str(character.defense.shield))
-            c.drawString(x_pos + 95*mm, y_pos, str(character.defense.dexterity))
+            c.drawString(x_pos + 95*mm, y_pos, str(character.derived.modifier('dexterity')))
             c.drawString(x_pos + 110*mm, y_pos, str(character.defense.misc))
-            c.drawString(x_pos + 130*mm, y_pos, str(character.defense.calculate_total()))
+            c.drawString(x_pos + 130*mm, y_pos, str(character.derived.defense_total))
             
             # Armes
             y_pos -= 20*mm
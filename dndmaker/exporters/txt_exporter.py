@@ -8,6 +8,7 @@ from typing import List
 from ..models.character import Character
 from ..models.scene import Scene
 from ..models.session import Session
+from ..services.scene_graph import SceneGraph
 
 
 class TXTExporter:
@@ -61,9 +62,9 @@ class TXTExporter:
                 f.write(f"Base: {character.defense.base}\n")
                 f.write(f"Armure: {character.defense.armor}\n")
                 f.write(f"Bouclier: {character.defense.shield}\n")
-                f.write(f"DEX: {character.defense.dexterity}\n")
+                f.write(f"DEX: {character.derived.modifier('dexterity')}\n")
                 f.write(f"Divers: {character.defense.misc}\n")
-                f.write(f"Total: {character.defense.calculate_total()}\n\n")
+                f.write(f"Total: {character.derived.defense_total}\n\n")
                 
                 # Armes
                 if character.weapons:
@@ -111,6 +112,32 @@ class TXTExporter:
             print(f"Erreur lors de l'export TXT: {e}")
             return False
     
+    @staticmethod
+    def export_story_arc(scenes: List[Scene], graph: SceneGraph, output_path: Path) -> bool:
+        """Exporte l'arc narratif : les scènes dans l'ordre de leurs références, avec leurs liens"""
+        try:
+            titles = {scene.id: scene.title for scene in scenes}
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("=" * 60 + "\n")
+                f.write("ARC NARRATIF\n")
+                f.write("=" * 60 + "\n\n")
+                for number, scene_id in enumerate(graph.topological_order(), 1):
+                    if scene_id not in titles:
+                        continue
+                    f.write(f"{number}. {titles[scene_id]}\n")
+                    children = [titles[i] for i in graph.children(scene_id) if i in titles]
+                    if children:
+                        f.write(f"   → {', '.join(children)}\n")
+                cycles = graph.cycles()
+                if cycles:
+                    f.write("\nBoucles:\n")
+                    for cycle in cycles:
+                        f.write(f"• {', '.join(titles.get(i, i) for i in cycle)}\n")
+            return True
+        except Exception as e:
+            print(f"Erreur lors de l'export TXT: {e}")
+            return False
+    
     @staticmethod
     def export_session(session: Session, output_path: Path) -> bool:
         """Exporte une session en TXT"""
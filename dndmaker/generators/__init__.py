@@ -5,5 +5,11 @@ Générateurs de PNJ et créatures
 from .npc_generator import NPCGenerator
 from .creature_generator import CreatureGenerator
 from .stats_generator import StatsGenerator
+from .bulk_generator import BulkGenerator
+from .encounter_builder import EncounterBuilder, BestiaryIndex
+from .name_generator import NameGenerator
+from .treasure_generator import TreasureGenerator
+from .settlement_generator import SettlementGenerator
+from .generation_pool import GenerationPool
 
-__all__ = ['NPCGenerator', 'CreatureGenerator', 'StatsGenerator']
+__all__ = ['NPCGenerator', 'CreatureGenerator', 'StatsGenerator', 'BulkGenerator', 'EncounterBuilder', 'BestiaryIndex', 'NameGenerator', 'TreasureGenerator', 'SettlementGenerator', 'GenerationPool']
@@ -0,0 +1,349 @@
+"""
+Génération en masse de rencontres et de villages
+Les packs sont générés en parallèle dans un ProcessPoolExecutor puis fusionnés
+dans les services du projet par lots, dans l'ordre des packs.
+"""
+
+import math
+import multiprocessing
+import random
+import signal
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ..core.rng import derive_seed, new_seed
+
+ENCOUNTER = "encounter"
+SETTLEMENT = "settlement"
+
+# En dessous de ce nombre de personnages, le démarrage des workers coûte plus qu'il ne rapporte
+PARALLEL_THRESHOLD = 5000
+
+
+@dataclass
+class PackTask:
+    """Unité de travail envoyée à un worker (un pack = une rencontre ou un village)"""
+    kind: str
+    index: int  # Position du pack dans le job (détermine sa graine)
+    seed: int  # Graine du pack
+    level: int
+    size: int  # Nombre de créatures ou d'habitants
+
+
+@dataclass
+class GeneratedPack:
+    """Résultat compact d'un pack : personnages déjà sérialisés"""
+    kind: str
+    index: int
+    level: int
+    characters: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class BulkGenerationReport:
+    """Rapport d'une génération en masse"""
+    packs: int = 0
+    characters: int = 0
+    cancelled: bool = False
+    scene_ids: List[str] = field(default_factory=list)
+    location_ids: List[str] = field(default_factory=list)
+
+    def summary(self) -> str:
+        """Résumé lisible du rapport"""
+        status = " (annulée)" if self.cancelled else ""
+        return f"{self.packs} pack(s), {self.characters} personnage(s) générés{status}"
+
+
+# Générateurs créés une fois par processus worker (voir _init_worker)
+_worker_generators: Dict[str, object] = {}
+
+
+def _init_worker(banks_data: List[dict]) -> None:
+    """Initialise un worker avec une copie des banques du projet"""
+    # L'annulation (Ctrl+C) est gérée par le processus parent
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_generators.update(_make_generators(banks_data))
+
+
+def _make_generators(banks_data: List[dict]) -> Dict[str, object]:
+    """Crée des générateurs sur une copie des banques (leurs caches servent d'un pack à l'autre)
+
+    La copie isole les caches (échantillonneurs, index) de ceux du projet, qui ne sont
+    ainsi jamais remplis hors du thread principal.
+    """
+    from ..services.bank_service import BankService
+    from .creature_generator import CreatureGenerator
+    from .npc_generator import NPCGenerator
+    bank_service = BankService(None)
+    bank_service.load_banks(banks_data)
+    # Les graines sont passées explicitement à chaque tirage : celle des générateurs est sans effet
+    return {ENCOUNTER: CreatureGenerator(bank_service), SETTLEMENT: NPCGenerator(bank_service)}
+
+
+def _run_chunk(tasks: List[PackTask], generators: Optional[Dict[str, object]] = None) -> List[GeneratedPack]:
+    """Génère une série de packs (dans un worker : avec les générateurs de _init_worker)"""
+    from ..persistence.serializer import serialize_model
+
+    generators = generators if generators is not None else _worker_generators
+    results = []
+    for task in tasks:
+        generator = generators[task.kind]
+        if task.kind == ENCOUNTER:
+            characters = [
+                generator.generate_creature(level=task.level, seed=derive_seed(task.seed, i))
+                for i in range(task.size)
+            ]
+        else:
+            characters = generator.generate_npcs(task.size, level=task.level, seed=task.seed)
+        results.append(GeneratedPack(
+            kind=task.kind,
+            index=task.index,
+            level=task.level,
+            characters=[serialize_model(c) for c in characters]
+        ))
+    return results
+
+
+class BulkGenerator:
+    """Génère de grands volumes de rencontres et de villages sur plusieurs processus
+
+    Chaque pack a sa propre graine dérivée de celle du job : le résultat est
+    identique quel que soit le nombre de workers.
+    """
+
+    def __init__(self, project_service, workers: Optional[int] = None, batch_size: int = 50):
+        """
+        Args:
+            project_service: Service de campagne (banques source et services cibles)
+            workers: Nombre de processus (None pour le nombre de cœurs, 1 pour tout faire sur place)
+            batch_size: Nombre de packs fusionnés à la fois dans les services
+        """
+        self.project_service = project_service
+        self.workers = workers or multiprocessing.cpu_count()
+        self.batch_size = max(1, batch_size)
+
+    @staticmethod
+    def plan_encounters(
+        count: int,
+        min_level: int = 1,
+        max_level: int = 1,
+        min_size: int = 1,
+        max_size: int = 6,
+        seed: Optional[int] = None
+    ) -> List[PackTask]:
+        """Planifie `count` rencontres réparties uniformément entre deux niveaux"""
+        seed = seed if seed is not None else new_seed()
+        rng = random.Random(seed)
+        levels = max_level - min_level + 1
+        return [
+            PackTask(
+                kind=ENCOUNTER,
+                index=i,
+                seed=derive_seed(seed, ENCOUNTER, i),
+                level=min_level + (i * levels) // count,
+                size=rng.randint(min_size, max_size)
+            )
+            for i in range(count)
+        ]
+
+    @staticmethod
+    def plan_settlements(
+        count: int,
+        min_population: int = 20,
+        max_population: int = 60,
+        level: int = 1,
+        seed: Optional[int] = None
+    ) -> List[PackTask]:
+        """Planifie `count` villages dont la population est tirée entre deux bornes"""
+        seed = seed if seed is not None else new_seed()
+        rng = random.Random(seed)
+        return [
+            PackTask(
+                kind=SETTLEMENT,
+                index=i,
+                seed=derive_seed(seed, SETTLEMENT, i),
+                level=level,
+                size=rng.randint(min_population, max_population)
+            )
+            for i in range(count)
+        ]
+
+    def run(
+        self,
+        tasks: List[PackTask],
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        region_name: Optional[str] = None
+    ) -> BulkGenerationReport:
+        """Exécute les packs et fusionne les résultats dans les services
+
+        Args:
+            tasks: Packs planifiés (plan_encounters / plan_settlements)
+            progress: Appelé avec (packs terminés, total) au fil de l'eau
+            is_cancelled: Interrogé entre deux lots ; si True, les packs restants
+                sont abandonnés et les packs déjà fusionnés sont conservés
+            region_name: Nom du lieu parent créé pour regrouper les villages
+
+        Les rencontres deviennent des scènes et les villages des lieux dont le
+        bestiaire contient les habitants. Rien n'est sauvegardé : l'appelant
+        sauvegarde la campagne une fois le rapport obtenu. La fusion a lieu dans le
+        thread appelant (voir generate et merger pour générer dans un autre thread).
+        """
+        merger = self.merger(region_name)
+        for packs in self.generate(tasks, progress, is_cancelled):
+            merger.add(packs)
+        return merger.finish(len(tasks))
+
+    def merger(self, region_name: Optional[str] = None) -> '_PackMerger':
+        """Fusion des packs dans les services, à utiliser depuis le thread de l'interface
+        
+        Les services du projet ne sont pas protégés contre les accès concurrents : une
+        interface qui génère dans un thread de travail (generate) fusionne les packs
+        reçus dans son propre thread, puis appelle finish.
+        """
+        return _PackMerger(self.project_service, BulkGenerationReport(), self.batch_size, region_name)
+
+    def generate(
+        self,
+        tasks: List[PackTask],
+        progress: Optional[Callable[[int, int], None]] = None,
+        is_cancelled: Optional[Callable[[], bool]] = None
+    ) -> Iterator[List[GeneratedPack]]:
+        """Génère les packs par lots, sans toucher aux services du projet
+
+        Les lots sont produits au fil de l'eau, pas forcément dans l'ordre des packs.
+        Les banques du projet ne sont que lues. Voir run pour les arguments.
+        """
+        total = len(tasks)
+        done = 0
+
+        if self.workers <= 1 or total <= 1 or sum(t.size for t in tasks) < PARALLEL_THRESHOLD:
+            # Sur place : générateurs propres à ce job, sur une copie des banques
+            generators = _make_generators(self.project_service.bank_service.serialize_banks())
+            for start in range(0, total, self.batch_size):
+                if is_cancelled and is_cancelled():
+                    return
+                packs = _run_chunk(tasks[start:start + self.batch_size], generators)
+                done += len(packs)
+                yield packs
+                if progress:
+                    progress(done, total)
+            return
+
+        # Lots assez petits pour un suivi fluide, assez gros pour amortir les échanges
+        chunk_size = max(1, min(self.batch_size, math.ceil(total / (self.workers * 4))))
+        chunks = [tasks[i:i + chunk_size] for i in range(0, total, chunk_size)]
+        # "spawn" évite de dupliquer l'état de l'interface graphique dans les workers
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.project_service.bank_service.serialize_banks(),)
+        )
+        pending = set()
+        try:
+            pending = {executor.submit(_run_chunk, chunk) for chunk in chunks}
+            while pending:
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    packs = future.result()
+                    done += len(packs)
+                    yield packs
+                if finished and progress:
+                    progress(done, total)
+                if is_cancelled and is_cancelled():
+                    break
+        finally:
+            # Python 3.8 : pas de shutdown(cancel_futures=True), les lots en attente sont annulés un à un
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+
+
+class _PackMerger:
+    """Fusionne les packs dans les services par lots, dans l'ordre de leur index"""
+
+    def __init__(self, project_service, report: BulkGenerationReport, batch_size: int, region_name: Optional[str]):
+        self.project_service = project_service
+        self.report = report
+        self.batch_size = batch_size
+        self.region_name = region_name
+        self._region_id: Optional[str] = None
+        self._waiting: Dict[int, GeneratedPack] = {}
+        self._ready: List[GeneratedPack] = []
+        self._next_index = 0
+        self.received = 0  # Packs reçus
+
+    def finish(self, total: int) -> BulkGenerationReport:
+        """Fusionne les derniers packs et retourne le rapport (annulé si des packs manquent)"""
+        self.report.cancelled = self.received < total
+        self.flush(complete=not self.report.cancelled)
+        return self.report
+
+    def add(self, packs: List[GeneratedPack]) -> None:
+        """Reçoit des packs (dans n'importe quel ordre)"""
+        self.received += len(packs)
+        for pack in packs:
+            self._waiting[pack.index] = pack
+        while self._next_index in self._waiting:
+            self._ready.append(self._waiting.pop(self._next_index))
+            self._next_index += 1
+        if len(self._ready) >= self.batch_size:
+            self._merge(self._ready)
+            self._ready = []
+
+    def flush(self, complete: bool = True) -> None:
+        """Fusionne les packs restants
+
+        Args:
+            complete: Si False (annulation), les packs reçus hors ordre sont aussi fusionnés
+        """
+        if not complete:
+            self._ready.extend(self._waiting[i] for i in sorted(self._waiting))
+            self._waiting = {}
+        if self._ready:
+            self._merge(self._ready)
+            self._ready = []
+
+    def _merge(self, packs: List[GeneratedPack]) -> None:
+        """Insère un lot de packs : personnages en une fois, puis scènes et lieux"""
+        characters = self.project_service.character_service.import_characters(
+            data for pack in packs for data in pack.characters
+        )
+
+        offset = 0
+        for pack in packs:
+            pack_characters = characters[offset:offset + len(pack.characters)]
+            offset += len(pack.characters)
+            ids = [c.id for c in pack_characters]
+            number = pack.index + 1
+            if pack.kind == ENCOUNTER:
+                scene = self.project_service.scene_service.create_scene(
+                    f"Rencontre {number} (niveau {pack.level})",
+                    ", ".join(c.name for c in pack_characters)
+                )
+                scene.npcs = ids
+                self.project_service.scene_service.update_scene(scene)
+                self.report.scene_ids.append(scene.id)
+            else:
+                location = self.project_service.location_service.create_location(
+                    f"Village {number}",
+                    description=f"{len(pack_characters)} habitant(s)",
+                    location_type="Village",
+                    parent_location=self._get_region_id(),
+                    bestiary=ids
+                )
+                self.report.location_ids.append(location.id)
+            self.report.packs += 1
+        self.report.characters += len(characters)
+
+    def _get_region_id(self) -> Optional[str]:
+        """Crée (une seule fois) le lieu parent des villages"""
+        if self.region_name and self._region_id is None:
+            region = self.project_service.location_service.create_location(
+                self.region_name, location_type="Région"
+            )
+            self._region_id = region.id
+            self.report.location_ids.append(region.id)
+        return self._region_id
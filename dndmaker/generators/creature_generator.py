@@ -4,49 +4,112 @@ Génération semi-automatique de créatures
 """
 
 import random
-from typing import Optional
+from typing import List, Optional
 from ..models.character import (
     Character, CharacterType, CharacterProfile, Characteristics,
     CombatStats, DefenseStats
 )
 from ..models.bank import BankType
 from ..core.utils import generate_id
+from ..core.rng import SEED_BITS, make_rng, new_seed
+from ..core.dice import compile_dice
+from .creature_scaling import scale_bestiary, scale_template
 from .stats_generator import StatsGenerator
 
 
 class CreatureGenerator:
-    """Générateur de créatures"""
+    """Générateur de créatures
     
-    def __init__(self, bank_service):
-        """Initialise le générateur avec le service de banques"""
+    Comme pour NPCGenerator, chaque créature est tirée de son propre flux aléatoire
+    dont la graine est enregistrée sur le personnage.
+    """
+    
+    def __init__(self, bank_service, seed: Optional[int] = None):
+        """Initialise le générateur avec le service de banques
+        
+        Args:
+            bank_service: Service de banques
+            seed: Graine racine (None pour une graine aléatoire)
+        """
         self.bank_service = bank_service
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = make_rng(self.seed)
+        # Templates du bestiaire, chargés une seule fois par générateur
+        self._templates: Optional[list] = None
+        self._index = None
     
-    def generate_name(self) -> str:
+    def generate_name(self, rng: Optional[random.Random] = None) -> str:
         """Génère un nom de créature aléatoire"""
-        names_bank = self.bank_service.get_bank_by_type(BankType.NAMES)
-        
-        if names_bank and names_bank.entries:
-            # Filtrer les noms de créatures si possible
-            creature_names = [
-                e for e in names_bank.entries
-                if e.metadata.get('type', '').upper() == 'CREATURE'
-            ]
-            if creature_names:
-                return random.choice(creature_names).value
-            # Sinon, prendre un nom aléatoire
-            return random.choice(names_bank.entries).value
+        rng = rng or self.rng
+        # Filtrer les noms de créatures si possible, sinon prendre un nom aléatoire
+        sampler = (
+            self.bank_service.get_sampler(BankType.NAMES, {'type': 'CREATURE'})
+            or self.bank_service.get_sampler(BankType.NAMES)
+        )
+        if sampler:
+            return sampler.draw(rng).value
         
         # Par défaut, générer un nom générique
-        return f"Créature_{random.randint(1000, 9999)}"
+        return f"Créature_{rng.randint(1000, 9999)}"
     
     def generate_creature_from_template(
         self,
         template_name: Optional[str] = None,
-        level: Optional[int] = None
+        level: Optional[int] = None,
+        seed: Optional[int] = None
     ) -> Optional[Character]:
-        """Génère une créature depuis un template du bestiaire"""
-        from ..core.data_loader import DataLoader
-        creatures = DataLoader.load_creatures()
+        """Génère une créature depuis un template du bestiaire
+        
+        Args:
+            template_name: Nom du template (None pour un template aléatoire adapté au niveau)
+            level: Niveau de la créature (None pour celui du template)
+            seed: Graine de la créature (None pour en tirer une)
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(SEED_BITS)
+        character = self._from_template(template_name, level, random.Random(seed))
+        if character:
+            character.seed = seed
+        return character
+    
+    def generate_creature_from_data(
+        self,
+        template: dict,
+        level: Optional[int] = None,
+        seed: Optional[int] = None
+    ) -> Character:
+        """Génère une créature depuis un template déjà chargé (ex: entrée de BestiaryIndex)
+        
+        Args:
+            template: Données du template (nom, type, stats, ac, hp...)
+            level: Niveau de la créature (None pour celui du template)
+            seed: Graine de la créature (None pour en tirer une)
+        """
+        if seed is None:
+            seed = self.rng.getrandbits(SEED_BITS)
+        character = self._build_from_template(template, level, random.Random(seed))
+        character.seed = seed
+        return character
+    
+    @property
+    def index(self):
+        """Index du bestiaire (creatures.json), construit une seule fois par générateur"""
+        if self._index is None:
+            from ..core.data_loader import DataLoader
+            from .encounter_builder import BestiaryIndex
+            self._templates = DataLoader.load_creatures()
+            self._index = BestiaryIndex.from_templates(self._templates)
+        return self._index
+    
+    def _from_template(
+        self,
+        template_name: Optional[str],
+        level: Optional[int],
+        rng: random.Random
+    ) -> Optional[Character]:
+        """Construit une créature depuis un template avec le flux aléatoire fourni"""
+        index = self.index
+        creatures = self._templates
         
         if not creatures:
             return None
@@ -55,21 +118,25 @@ class CreatureGenerator:
         if template_name:
             template = next((c for c in creatures if c['name'].lower() == template_name.lower()), None)
         else:
-            # Sinon, choisir un template aléatoire adapté au niveau
-            if level:
-                suitable_creatures = [c for c in creatures if c.get('level', 1) <= level + 1]
-                if suitable_creatures:
-                    template = random.choice(suitable_creatures)
-                else:
-                    template = random.choice(creatures)
+            # Sinon, choisir un template aléatoire adapté au niveau (recherche par intervalle dans l'index)
+            suitable_creatures = index.by_level(max_level=level + 1) if level else None
+            if suitable_creatures:
+                template = rng.choice(suitable_creatures).template
             else:
-                template = random.choice(creatures)
+                template = rng.choice(creatures)
         
         if not template:
             return None
         
-        # Utiliser le niveau du template ou celui fourni
+        return self._build_from_template(template, level, rng)
+    
+    def _build_from_template(self, template: dict, level: Optional[int], rng: random.Random) -> Character:
+        """Construit une créature depuis les données d'un template"""
+        # Adapter le template au niveau demandé (PV, défense, attaque, caractéristiques)
+        if level and level != template.get('level', 1):
+            template = scale_template(template, level)
         creature_level = level if level else template.get('level', 1)
+        attack = template.get('attack', creature_level)
         
         # Créer la créature depuis le template
         name = template['name']
@@ -94,9 +161,9 @@ class CreatureGenerator:
         
         # Calculer les stats de combat
         combat = CombatStats()
-        combat.melee_attack = f"{stats.strength.modifier} + {creature_level}"
-        combat.ranged_attack = f"{stats.dexterity.modifier} + {creature_level}"
-        combat.magic_attack = str(creature_level)
+        combat.melee_attack = f"{stats.strength.modifier} + {attack}"
+        combat.ranged_attack = f"{stats.dexterity.modifier} + {attack}"
+        combat.magic_attack = str(attack)
         # Utiliser l'initiative du template si disponible, sinon calculer depuis DEX
         if 'initiative' in template:
             combat.initiative = str(template['initiative'])
@@ -108,11 +175,16 @@ class CreatureGenerator:
             hp_value = template['hp']
             if isinstance(hp_value, int):
                 combat.life_points = hp_value
-                combat.current_life_points = hp_value
             else:
-                # Si c'est une chaîne (ex: "2d6"), garder la valeur par défaut
-                combat.life_points = creature_level * 5
-                combat.current_life_points = creature_level * 5
+                # Chaîne : nombre fixe ou expression de dés (ex: "2d6"), lancée avec le flux de la créature
+                try:
+                    expression = compile_dice(hp_value)
+                    combat.life_points = max(1, expression.roll(rng))
+                    if expression.terms:
+                        combat.life_dice = str(expression)
+                except ValueError:
+                    combat.life_points = creature_level * 5
+            combat.current_life_points = combat.life_points
         
         # Calculer la défense
         defense = DefenseStats()
@@ -132,12 +204,27 @@ class CreatureGenerator:
         
         return character
     
+    def generate_bestiary(self, level: int, seed: Optional[int] = None) -> List[Character]:
+        """Génère une variante de chaque créature du bestiaire au niveau donné
+        
+        Args:
+            level: Niveau cible
+            seed: Graine du lot (None pour en tirer une) ; chaque créature reçoit sa propre graine
+        """
+        self.index  # Charge les templates
+        rng = make_rng(seed) if seed is not None else self.rng
+        return [
+            self.generate_creature_from_data(template, seed=rng.getrandbits(SEED_BITS))
+            for template in scale_bestiary(self._templates or [], [level])
+        ]
+    
     def generate_creature(
         self,
         level: int = 1,
         name: Optional[str] = None,
         stats_method: str = "standard",
-        use_template: bool = True
+        use_template: bool = True,
+        seed: Optional[int] = None
     ) -> Character:
         """Génère une créature complète
         
@@ -146,23 +233,30 @@ class CreatureGenerator:
             name: Nom spécifique (None pour généré)
             stats_method: Méthode de génération de stats ("standard" ou "heroic")
             use_template: Utiliser un template du bestiaire si disponible
+            seed: Graine de la créature (None pour en tirer une) ; la même graine avec
+                les mêmes paramètres régénère la même créature
         """
+        if seed is None:
+            seed = self.rng.getrandbits(SEED_BITS)
+        rng = random.Random(seed)
+        
         # Essayer d'abord avec un template si demandé
         if use_template:
-            template_creature = self.generate_creature_from_template(name, level)
+            template_creature = self._from_template(name, level, rng)
             if template_creature:
                 # Si un nom spécifique est fourni, l'utiliser
                 if name:
                     template_creature.name = name
+                template_creature.seed = seed
                 return template_creature
         
         # Sinon, génération standard
         # Générer ou utiliser le nom fourni
         if name is None:
-            name = self.generate_name()
+            name = self.generate_name(rng)
         
         # Générer les stats
-        stats = StatsGenerator.generate_stats_by_level(level, stats_method)
+        stats = StatsGenerator.generate_stats_by_level(level, stats_method, rng)
         
         # Créer le profil (créatures n'ont généralement pas de race/classe au sens classique)
         profile = CharacterProfile(
@@ -189,7 +283,8 @@ class CreatureGenerator:
             profile=profile,
             characteristics=stats,
             combat=combat,
-            defense=defense
+            defense=defense,
+            seed=seed
         )
         
         return character
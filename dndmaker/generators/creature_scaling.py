@@ -0,0 +1,166 @@
+"""
+Mise à l'échelle des créatures
+Adapte un template du bestiaire à un autre niveau (PV, défense, attaque,
+caractéristiques et NC) à partir de tables précalculées par archétype et par taille.
+"""
+
+from array import array
+from dataclasses import dataclass
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..core.dice import DiceExpression, compile_dice
+from ..core.utils import normalize_key
+from .encounter_builder import parse_challenge
+
+MAX_LEVEL = 20
+
+
+@dataclass(frozen=True)
+class ArchetypeScaling:
+    """Progression par niveau d'un archétype"""
+    hp_per_level: float
+    defense_per_level: float
+    attack_per_level: float
+    challenge_per_level: float
+    stat_step: int  # Un point de caractéristique tous les `stat_step` niveaux
+    primary_stats: Tuple[str, ...]  # Caractéristiques qui progressent
+
+
+@dataclass(frozen=True)
+class SizeScaling:
+    """Correction de la progression selon la taille"""
+    hp_factor: float
+    defense_per_level: float
+
+
+ARCHETYPES = {
+    "inférieur": ArchetypeScaling(6, 0.25, 0.75, 0.5, 4, ("constitution",)),
+    "standard": ArchetypeScaling(12, 0.5, 1.0, 1.0, 3, ("strength", "constitution")),
+    "rapide": ArchetypeScaling(9, 0.75, 1.0, 1.0, 3, ("dexterity",)),
+    "puissant": ArchetypeScaling(16, 0.5, 1.25, 1.25, 2, ("strength", "constitution")),
+}
+
+SIZES = {
+    "minuscule": SizeScaling(0.25, 0.5),
+    "très petite": SizeScaling(0.5, 0.25),
+    "petit": SizeScaling(0.75, 0.25),
+    "moyen": SizeScaling(1.0, 0.0),
+    "grand": SizeScaling(1.25, 0.0),
+    "très grand": SizeScaling(1.5, -0.25),
+    "énorme": SizeScaling(2.0, -0.25),
+    "colossal": SizeScaling(2.5, -0.5),
+}
+
+DEFAULT_ARCHETYPE = "standard"
+DEFAULT_SIZE = "moyen"
+
+
+class ScalingTable:
+    """Valeurs cumulées par niveau (0 à MAX_LEVEL) pour un couple archétype/taille
+
+    Passer du niveau a au niveau b ajoute `table[b] - table[a]` à chaque valeur.
+    """
+
+    def __init__(self, archetype: ArchetypeScaling, size: SizeScaling):
+        self.primary_stats = archetype.primary_stats
+        levels = range(MAX_LEVEL + 1)
+        self.hp = array('i', (round(level * archetype.hp_per_level * size.hp_factor) for level in levels))
+        self.defense = array('i', (
+            round(level * (archetype.defense_per_level + size.defense_per_level)) for level in levels
+        ))
+        self.attack = array('i', (round(level * archetype.attack_per_level) for level in levels))
+        self.stats = array('i', (level // archetype.stat_step for level in levels))
+        self.challenge = array('d', (level * archetype.challenge_per_level for level in levels))
+
+
+def _normalized(table: Dict) -> Dict[str, object]:
+    return {normalize_key(key): value for key, value in table.items()}
+
+
+# Tables précalculées pour tous les couples archétype/taille
+_ARCHETYPES = _normalized(ARCHETYPES)
+_SIZES = _normalized(SIZES)
+_TABLES: Dict[Tuple[str, str], ScalingTable] = {
+    (archetype, size): ScalingTable(_ARCHETYPES[archetype], _SIZES[size])
+    for archetype in _ARCHETYPES
+    for size in _SIZES
+}
+
+
+def scaling_table(archetype: Optional[str], size: Optional[str]) -> ScalingTable:
+    """Table d'un archétype et d'une taille (valeurs par défaut si inconnus)"""
+    archetype_key = normalize_key(archetype or "")
+    size_key = normalize_key(size or "")
+    return _TABLES[(
+        archetype_key if archetype_key in _ARCHETYPES else normalize_key(DEFAULT_ARCHETYPE),
+        size_key if size_key in _SIZES else normalize_key(DEFAULT_SIZE),
+    )]
+
+
+def format_challenge(value: float) -> str:
+    """Formate un NC comme dans le bestiaire ("1/2", "3")"""
+    if value <= 0:
+        return "0"
+    if value >= 1:
+        return str(round(value))
+    fraction = Fraction(value).limit_denominator(8)
+    return f"{fraction.numerator}/{fraction.denominator}"
+
+
+def scale_template(template: dict, level: int) -> dict:
+    """Adapte un template du bestiaire à un niveau
+
+    Le template d'origine n'est pas modifié. Les PV, la défense, les caractéristiques
+    principales de l'archétype et le NC évoluent selon l'écart de niveau ; l'attaque
+    (clé 'attack') est celle du niveau cible.
+    """
+    level = max(0, min(MAX_LEVEL, level))
+    base_level = max(0, min(MAX_LEVEL, int(template.get('level', 1) or 0)))
+    table = scaling_table(template.get('archetype'), template.get('size'))
+    scaled = dict(template)
+    scaled['level'] = level
+    scaled['base_level'] = template.get('base_level', base_level)
+    scaled['attack'] = table.attack[level]
+    if level == base_level:
+        return scaled
+
+    hp_delta = table.hp[level] - table.hp[base_level]
+    hp = template.get('hp')
+    if isinstance(hp, int):
+        scaled['hp'] = max(1, hp + hp_delta)
+    elif hp:
+        # PV en dés : l'écart s'ajoute au modificateur ("2d6+1" -> "2d6+11")
+        try:
+            expression = compile_dice(hp)
+        except ValueError:
+            expression = None
+        if expression is not None and expression.terms:
+            modifier = expression.modifier + hp_delta
+            dice = str(DiceExpression(expression.text, expression.terms))
+            scaled['hp'] = f"{dice}{modifier:+d}" if modifier else dice
+        elif expression is not None:
+            scaled['hp'] = max(1, expression.modifier + hp_delta)
+
+    scaled['ac'] = max(1, template.get('ac', 10) + table.defense[level] - table.defense[base_level])
+
+    stat_delta = table.stats[level] - table.stats[base_level]
+    if stat_delta:
+        stats = dict(template.get('stats', {}))
+        for name in table.primary_stats:
+            stats[name] = max(1, stats.get(name, 10) + stat_delta)
+        scaled['stats'] = stats
+
+    challenge = parse_challenge(template.get('challenge', base_level))
+    scaled['challenge'] = format_challenge(challenge + table.challenge[level] - table.challenge[base_level])
+    return scaled
+
+
+def scale_bestiary(templates: Iterable[dict], levels: Iterable[int]) -> List[dict]:
+    """Adapte tout un bestiaire à un ou plusieurs niveaux en une passe
+
+    Returns:
+        Une variante par template et par niveau (templates d'abord, niveaux ensuite)
+    """
+    levels = list(levels)
+    return [scale_template(template, level) for template in templates for level in levels]
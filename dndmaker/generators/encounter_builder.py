@@ -0,0 +1,338 @@
+"""
+Constructeur de rencontres
+Index du bestiaire par niveau, NC (niveau de challenge) et archétype, et
+solveur de budget (sac à dos) pour composer des rencontres équilibrées.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..models.bank import BankType
+from ..models.character import Character, CharacterType
+from ..core.utils import normalize_key
+from ..core.rng import make_rng
+
+# Budget relatif à la somme des niveaux du groupe, par difficulté
+DIFFICULTY_MULTIPLIERS = {
+    "facile": 0.5,
+    "moyenne": 1.0,
+    "difficile": 1.5,
+    "mortelle": 2.0,
+}
+
+# Les coûts sont exprimés en quarts de NC pour que le solveur travaille sur des entiers
+COST_UNIT = 4
+
+
+def parse_challenge(value) -> float:
+    """Convertit un NC ("1/2", "3", 0.25...) en nombre"""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    text = str(value or '').strip()
+    try:
+        if '/' in text:
+            numerator, denominator = text.split('/', 1)
+            return float(numerator) / float(denominator)
+        return float(text)
+    except (ValueError, ZeroDivisionError):
+        return 0.0
+
+
+@dataclass
+class BestiaryCreature:
+    """Créature indexée (template du bestiaire)"""
+    name: str
+    level: int
+    challenge: float
+    archetype: str
+    template: dict = field(default_factory=dict, repr=False)
+
+    @property
+    def cost(self) -> int:
+        """Coût dans le budget (en quarts de NC, au moins 1)"""
+        return max(1, round(self.challenge * COST_UNIT))
+
+    @classmethod
+    def from_template(cls, template: dict) -> 'BestiaryCreature':
+        """Crée une entrée depuis un template (creatures.json ou métadonnées de banque)"""
+        return cls(
+            name=template.get('name', ''),
+            level=int(template.get('level', 1) or 0),
+            challenge=parse_challenge(template.get('challenge', 0)),
+            archetype=template.get('archetype', 'standard') or 'standard',
+            template=template
+        )
+
+
+class BestiaryIndex:
+    """Index du bestiaire en seaux triés (recherche par intervalle avec bisect)"""
+
+    def __init__(self, creatures: Iterable[BestiaryCreature]):
+        self.creatures = sorted(creatures, key=lambda c: (c.level, c.cost, c.name))
+        self._levels = [c.level for c in self.creatures]
+        # Même contenu trié par coût, pour les recherches par NC
+        self._by_cost = sorted(self.creatures, key=lambda c: (c.cost, c.level, c.name))
+        self._costs = [c.cost for c in self._by_cost]
+        self._by_archetype: Dict[str, List[BestiaryCreature]] = {}
+        for creature in self.creatures:
+            self._by_archetype.setdefault(creature.archetype.lower(), []).append(creature)
+
+    def __len__(self) -> int:
+        return len(self.creatures)
+
+    @classmethod
+    def from_templates(cls, templates: Iterable[dict]) -> 'BestiaryIndex':
+        """Indexe une liste de templates"""
+        return cls(BestiaryCreature.from_template(t) for t in templates if t.get('name'))
+
+    @classmethod
+    def from_sources(cls, bank_service) -> 'BestiaryIndex':
+        """Indexe la banque CREATURES et creatures.json (la banque est prioritaire)"""
+        from ..core.data_loader import DataLoader
+
+        templates: Dict[str, dict] = {}
+        bank = bank_service.get_bank_by_type(BankType.CREATURES) if bank_service else None
+        for entry in (bank.entries if bank else []):
+            templates.setdefault(normalize_key(entry.value), {**entry.metadata, 'name': entry.value})
+        for template in DataLoader.load_creatures():
+            if template.get('name'):
+                templates.setdefault(normalize_key(template['name']), template)
+        return cls.from_templates(templates.values())
+
+    def by_level(self, min_level: Optional[int] = None, max_level: Optional[int] = None) -> List[BestiaryCreature]:
+        """Créatures dont le niveau est dans [min_level, max_level]"""
+        start = 0 if min_level is None else bisect_left(self._levels, min_level)
+        end = len(self._levels) if max_level is None else bisect_right(self._levels, max_level)
+        return self.creatures[start:end]
+
+    def by_challenge(self, min_challenge: Optional[float] = None, max_challenge: Optional[float] = None) -> List[BestiaryCreature]:
+        """Créatures dont le NC est dans [min_challenge, max_challenge]"""
+        start = 0 if min_challenge is None else bisect_left(self._costs, max(1, round(min_challenge * COST_UNIT)))
+        end = len(self._costs) if max_challenge is None else bisect_right(self._costs, round(max_challenge * COST_UNIT))
+        return self._by_cost[start:end]
+
+    def by_archetype(self, archetype: str) -> List[BestiaryCreature]:
+        """Créatures d'un archétype (triées par niveau)"""
+        return list(self._by_archetype.get(archetype.lower(), []))
+
+    def query(
+        self,
+        min_level: Optional[int] = None,
+        max_level: Optional[int] = None,
+        max_cost: Optional[int] = None,
+        archetypes: Optional[Sequence[str]] = None
+    ) -> List[BestiaryCreature]:
+        """Combine les critères : intervalle de niveaux, coût maximal et archétypes"""
+        candidates = self.by_level(min_level, max_level)
+        if max_cost is not None:
+            candidates = [c for c in candidates if c.cost <= max_cost]
+        if archetypes:
+            wanted = {a.lower() for a in archetypes}
+            candidates = [c for c in candidates if c.archetype.lower() in wanted]
+        return candidates
+
+
+@lru_cache(maxsize=1024)
+def solve_budget(costs: Tuple[int, ...], budget: int, max_creatures: int) -> Tuple[int, ...]:
+    """Compose le mélange le plus proche du budget sans le dépasser (sac à dos non borné)
+
+    Args:
+        costs: Coûts distincts disponibles (en quarts de NC)
+        budget: Budget à atteindre
+        max_creatures: Nombre maximum de créatures
+
+    Returns:
+        Nombre de créatures retenues pour chaque coût (dans l'ordre de `costs`).
+        À somme égale, le mélange avec le moins de créatures est retenu.
+    """
+    # fewest[b] = nombre minimal de créatures pour un total exact b (None si inatteignable)
+    fewest: List[Optional[int]] = [None] * (budget + 1)
+    last_choice = [-1] * (budget + 1)
+    fewest[0] = 0
+    for total in range(1, budget + 1):
+        for i, cost in enumerate(costs):
+            if cost > total:
+                continue
+            previous = fewest[total - cost]
+            if previous is None or previous + 1 > max_creatures:
+                continue
+            if fewest[total] is None or previous + 1 < fewest[total]:
+                fewest[total] = previous + 1
+                last_choice[total] = i
+
+    best = max(b for b in range(budget + 1) if fewest[b] is not None)
+    counts = [0] * len(costs)
+    while best > 0:
+        i = last_choice[best]
+        counts[i] += 1
+        best -= costs[i]
+    return tuple(counts)
+
+
+@dataclass
+class Encounter:
+    """Rencontre proposée : créatures retenues et budget visé"""
+    creatures: List[BestiaryCreature]
+    budget: int
+
+    @property
+    def total_cost(self) -> int:
+        return sum(c.cost for c in self.creatures)
+
+    @property
+    def challenge(self) -> float:
+        """NC total de la rencontre"""
+        return self.total_cost / COST_UNIT
+
+    def describe(self) -> str:
+        """Description courte, ex: "3 × Gobelin, 1 × Ogre (NC 4.75 / 5)" """
+        counts: Dict[str, int] = {}
+        for creature in self.creatures:
+            counts[creature.name] = counts.get(creature.name, 0) + 1
+        parts = ", ".join(f"{n} × {name}" for name, n in counts.items())
+        return f"{parts} (NC {self.challenge:g} / {self.budget / COST_UNIT:g})"
+
+
+class EncounterBuilder:
+    """Compose des rencontres adaptées au groupe de PJ du projet"""
+
+    def __init__(self, project_service, seed: Optional[int] = None):
+        self.project_service = project_service
+        self.rng = make_rng(seed)
+        self._index: Optional[BestiaryIndex] = None
+        self._index_source = None  # Échantillonneur CREATURES à partir duquel l'index a été construit
+
+    @property
+    def index(self) -> BestiaryIndex:
+        """Index du bestiaire, reconstruit après toute mutation de la banque CREATURES
+
+        Comme TreasureGenerator.pool : l'échantillonneur de la banque n'est remplacé
+        qu'après une mutation (ajout, renommage, métadonnées...), son identité suffit.
+        """
+        bank_service = self.project_service.bank_service
+        source = bank_service.get_sampler(BankType.CREATURES)
+        if self._index is None or source is not self._index_source:
+            self._index = BestiaryIndex.from_sources(bank_service)
+            self._index_source = source
+        return self._index
+
+    def party_levels(self, pj_ids: Optional[Sequence[str]] = None) -> List[int]:
+        """Niveaux des PJ du groupe (tous les PJ du projet par défaut)"""
+        character_service = self.project_service.character_service
+        if pj_ids:
+            party = [character_service.get_character(pj_id) for pj_id in pj_ids]
+            party = [c for c in party if c is not None]
+        else:
+            party = character_service.get_characters_by_type(CharacterType.PJ)
+        return [max(1, c.profile.level) for c in party]
+
+    @staticmethod
+    def budget_for(party_levels: Sequence[int], difficulty: str = "moyenne") -> int:
+        """Budget en quarts de NC : somme des niveaux du groupe pondérée par la difficulté"""
+        if difficulty not in DIFFICULTY_MULTIPLIERS:
+            raise ValueError(f"Difficulté inconnue: {difficulty} (attendu: {', '.join(DIFFICULTY_MULTIPLIERS)})")
+        return max(1, round(sum(party_levels) * DIFFICULTY_MULTIPLIERS[difficulty] * COST_UNIT))
+
+    def suggest(
+        self,
+        difficulty: str = "moyenne",
+        party_levels: Optional[Sequence[int]] = None,
+        count: int = 3,
+        max_creatures: int = 8,
+        archetypes: Optional[Sequence[str]] = None,
+        level_margin: int = 1,
+        max_kinds: int = 3
+    ) -> List[Encounter]:
+        """Propose jusqu'à `count` rencontres distinctes proches du budget
+
+        Args:
+            difficulty: Difficulté ("facile", "moyenne", "difficile", "mortelle")
+            party_levels: Niveaux du groupe (PJ du projet par défaut, sinon un PJ de niveau 1)
+            count: Nombre de propositions
+            max_creatures: Nombre maximum de créatures par rencontre
+            archetypes: Archétypes autorisés (tous par défaut)
+            level_margin: Écart de niveau toléré au-dessus du PJ le plus fort
+            max_kinds: Nombre maximum d'espèces différentes par rencontre
+        """
+        levels = list(party_levels) if party_levels else (self.party_levels() or [1])
+        budget = self.budget_for(levels, difficulty)
+        candidates = self.index.query(max_level=max(levels) + level_margin, max_cost=budget, archetypes=archetypes)
+        if not candidates:
+            return []
+
+        by_cost: Dict[int, List[BestiaryCreature]] = {}
+        for creature in candidates:
+            by_cost.setdefault(creature.cost, []).append(creature)
+        available_costs = sorted(by_cost)
+
+        encounters: List[Encounter] = []
+        seen = set()
+        # Chaque essai retient quelques coûts au hasard : le solveur (mis en cache) fait le reste
+        for _ in range(count * 4):
+            if len(encounters) >= count:
+                break
+            costs = tuple(sorted(self.rng.sample(available_costs, min(max_kinds, len(available_costs)))))
+            counts = solve_budget(costs, budget, max_creatures)
+            creatures = []
+            for cost, n in zip(costs, counts):
+                if n:
+                    creature = self.rng.choice(by_cost[cost])
+                    creatures.extend([creature] * n)
+            key = tuple(sorted(c.name for c in creatures))
+            if creatures and key not in seen:
+                seen.add(key)
+                encounters.append(Encounter(creatures=creatures, budget=budget))
+
+        # Les propositions les plus proches du budget d'abord
+        encounters.sort(key=lambda e: (budget - e.total_cost, len(e.creatures)))
+        return encounters
+
+    def create_creatures(
+        self,
+        encounter: Encounter,
+        level: Optional[int] = None,
+        shared: bool = False
+    ) -> List[Character]:
+        """Génère les créatures d'une rencontre et les ajoute au projet en une fois
+
+        Args:
+            shared: Une seule créature générée par template, les suivantes étant des
+                instances qui la partagent (copie à l'écriture, voir Character.instantiate)
+        """
+        from .creature_generator import CreatureGenerator
+        from ..core.utils import generate_id
+
+        generator = CreatureGenerator(self.project_service.bank_service, seed=self.rng.getrandbits(63))
+        characters = []
+        prototypes: Dict[str, Character] = {}
+        counts: Dict[str, int] = {}
+        for creature in encounter.creatures:
+            prototype = prototypes.get(creature.name) if shared else None
+            if prototype is not None:
+                counts[creature.name] += 1
+                characters.append(prototype.instantiate(generate_id(), f"{prototype.name} {counts[creature.name]}"))
+                continue
+            character = generator.generate_creature_from_data(creature.template, level=level)
+            prototypes[creature.name] = character
+            counts[creature.name] = 1
+            characters.append(character)
+        self.project_service.character_service.add_characters(characters)
+        return characters
+
+    def add_to_scene(
+        self,
+        scene,
+        encounter: Encounter,
+        level: Optional[int] = None,
+        shared: bool = False
+    ) -> List[Character]:
+        """Génère les créatures d'une rencontre et les ajoute aux PNJ d'une scène
+
+        La campagne n'est pas sauvegardée : l'appelant sauvegarde une fois.
+        """
+        characters = self.create_creatures(encounter, level, shared)
+        scene.npcs.extend(c.id for c in characters)
+        self.project_service.scene_service.update_scene(scene)
+        return characters
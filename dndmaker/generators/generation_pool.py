@@ -0,0 +1,186 @@
+"""
+Réserve de personnages pré-générés
+Un thread de travail garde quelques PNJ et créatures d'avance par jeu de paramètres
+(type, niveau, méthode de stats) : l'action « Générer » en remet un instantanément.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..models.character import Character, CharacterType
+from ..core.logger import get_logger
+
+logger = get_logger()
+
+DEFAULT_POOL_SIZE = 3
+
+# Jeux de paramètres entretenus par défaut : PNJ et créatures de niveau 1 à 5
+DEFAULT_PRESETS = [
+    {'type': character_type, 'level': level, 'stats_method': 'standard'}
+    for character_type in (CharacterType.PNJ.value, CharacterType.CREATURE.value)
+    for level in range(1, 6)
+]
+
+PoolKey = Tuple[str, int, str]
+
+
+def pool_key(character_type: CharacterType, level: int, stats_method: str = "standard") -> PoolKey:
+    """Clé d'un jeu de paramètres"""
+    return (character_type.value, level, stats_method)
+
+
+class GenerationPool:
+    """Réserve de personnages générés à l'avance sur un thread de travail
+
+    Le thread travaille sur une copie des banques : la réserve est vidée et la copie
+    renouvelée dès que les banques du projet changent (nombre d'entrées, banques
+    ajoutées ou retirées, changement de projet). Les jeux de paramètres demandés
+    via take() sont ajoutés à ceux entretenus.
+    """
+
+    def __init__(self, bank_service, size: int = DEFAULT_POOL_SIZE, presets: Optional[Iterable[dict]] = None):
+        """
+        Args:
+            bank_service: Service de banques du projet (lu uniquement depuis le thread appelant)
+            size: Nombre de personnages gardés d'avance par jeu de paramètres
+            presets: Jeux de paramètres entretenus ({'type', 'level', 'stats_method'})
+        """
+        self.bank_service = bank_service
+        self.size = max(0, size)
+        self._keys: List[PoolKey] = []
+        for preset in DEFAULT_PRESETS if presets is None else presets:
+            self._track(pool_key(
+                CharacterType(preset.get('type', CharacterType.PNJ.value)),
+                int(preset.get('level', 1)),
+                preset.get('stats_method', 'standard')
+            ))
+        self._queues: Dict[PoolKey, Deque[Character]] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self._signature: Optional[tuple] = None
+        self._banks_data: Optional[List[dict]] = None
+        self._generation = 0  # Incrémenté à chaque changement de banques
+
+    def start(self) -> None:
+        """Démarre le thread de remplissage (sans effet s'il tourne déjà)"""
+        self._sync_banks()
+        if self.size and (self._thread is None or not self._thread.is_alive()):
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="generation-pool", daemon=True)
+            self._thread.start()
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Arrête le thread de remplissage"""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def take(
+        self,
+        character_type: CharacterType,
+        level: int,
+        stats_method: str = "standard"
+    ) -> Optional[Character]:
+        """Remet un personnage pré-généré et relance le remplissage
+
+        Returns:
+            Le personnage, ou None si la réserve de ce jeu de paramètres est vide
+            (l'appelant génère alors lui-même)
+        """
+        key = pool_key(character_type, level, stats_method)
+        self._sync_banks()
+        with self._lock:
+            self._track(key)
+            queue = self._queues.get(key)
+            character = queue.popleft() if queue else None
+        self._wake.set()
+        return character
+
+    def available(self, character_type: CharacterType, level: int, stats_method: str = "standard") -> int:
+        """Nombre de personnages prêts pour un jeu de paramètres"""
+        with self._lock:
+            return len(self._queues.get(pool_key(character_type, level, stats_method), ()))
+
+    def wait_until_full(self, timeout: float = 10.0) -> bool:
+        """Attend que toutes les réserves soient pleines (tests, préchargement)"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._lock:
+                if all(len(self._queues.get(key, ())) >= self.size for key in self._keys):
+                    return True
+            time.sleep(0.01)
+        return False
+
+    def _track(self, key: PoolKey) -> None:
+        if key not in self._keys:
+            self._keys.append(key)
+
+    def _sync_banks(self) -> None:
+        """Renouvelle la copie des banques du thread si celles du projet ont changé"""
+        signature = tuple((bank.id, len(bank.entries)) for bank in self.bank_service.get_all_banks())
+        if signature == self._signature:
+            return
+        banks_data = self.bank_service.serialize_banks()
+        with self._lock:
+            self._signature = signature
+            self._banks_data = banks_data
+            self._generation += 1
+            self._queues.clear()
+
+    def _run(self) -> None:
+        """Boucle du thread : complète les réserves, puis attend une demande"""
+        generators = None
+        generation = None
+        while not self._stopping:
+            with self._lock:
+                renew = generation != self._generation
+                generation, banks_data = self._generation, self._banks_data
+                missing = [key for key in self._keys if len(self._queues.get(key, ())) < self.size]
+            if renew:
+                generators = self._create_generators(banks_data)
+            if not missing:
+                self._wake.wait()
+                self._wake.clear()
+                continue
+            for key in missing:
+                if self._stopping:
+                    return
+                try:
+                    character = self._generate(generators, key)
+                except Exception as e:
+                    logger.error(f"Pré-génération impossible pour {key}: {e}")
+                    with self._lock:
+                        self._keys.remove(key)
+                    continue
+                with self._lock:
+                    # Les banques ont pu changer pendant la génération : personnage périmé
+                    if generation == self._generation and character is not None:
+                        self._queues.setdefault(key, deque()).append(character)
+
+    @staticmethod
+    def _create_generators(banks_data: Optional[List[dict]]) -> Dict[str, object]:
+        """Générateurs du thread, sur une copie des banques"""
+        from ..services.bank_service import BankService
+        from .creature_generator import CreatureGenerator
+        from .npc_generator import NPCGenerator
+        bank_service = BankService(None)
+        bank_service.load_banks(banks_data or [])
+        return {
+            CharacterType.PNJ.value: NPCGenerator(bank_service),
+            CharacterType.CREATURE.value: CreatureGenerator(bank_service),
+        }
+
+    @staticmethod
+    def _generate(generators: Dict[str, object], key: PoolKey) -> Optional[Character]:
+        character_type, level, stats_method = key
+        generator = generators[character_type]
+        if character_type == CharacterType.PNJ.value:
+            return generator.generate_npc(level=level, stats_method=stats_method)
+        return generator.generate_creature(level=level, stats_method=stats_method)
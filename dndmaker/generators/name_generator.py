@@ -0,0 +1,255 @@
+"""
+Générateur de noms
+Modèle de Markov sur les caractères (n-grammes), entraîné sur la banque de noms
+par origine raciale et par genre, pour inventer des noms plausibles et inédits.
+"""
+
+import hashlib
+import json
+import random
+from array import array
+from bisect import bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ..models.bank import BankType
+from ..core.logger import get_logger
+from ..core.utils import normalize_key
+
+logger = get_logger()
+
+# Marqueurs de début et de fin de nom (absents des noms réels)
+START = "\x02"
+END = "\x03"
+
+# Version du format des tables en cache (à incrémenter si le format change)
+CACHE_FORMAT = 1
+
+# En dessous de ce nombre de noms, le modèle d'une origine est complété par toute la banque
+MIN_TRAINING_NAMES = 5
+
+
+def default_cache_dir() -> Optional[Path]:
+    """Répertoire du cache des modèles (~/.dndmaker/cache/names), None si indisponible"""
+    try:
+        return Path.home() / ".dndmaker" / "cache" / "names"
+    except (OSError, RuntimeError):
+        return None
+
+
+class NameModel:
+    """Modèle n-gramme compilé en tableaux compacts
+
+    Chaque contexte (les `order` caractères précédents) correspond à une ligne ;
+    les caractères suivants possibles de toutes les lignes sont concaténés dans
+    `symbols`, avec leurs effectifs cumulés (par ligne) dans `cumulative`.
+    """
+
+    def __init__(self, order: int, contexts: Dict[str, int], offsets: array, symbols: str, cumulative: array):
+        self.order = order
+        self.contexts = contexts
+        self.offsets = offsets
+        self.symbols = symbols
+        self.cumulative = cumulative
+
+    @classmethod
+    def train(cls, names: Iterable[str], order: int = 3) -> 'NameModel':
+        """Compile les transitions observées dans une liste de noms"""
+        transitions: Dict[str, Dict[str, int]] = {}
+        for name in names:
+            padded = START * order + name.strip() + END
+            for i in range(order, len(padded)):
+                following = transitions.setdefault(padded[i - order:i], {})
+                following[padded[i]] = following.get(padded[i], 0) + 1
+
+        contexts: Dict[str, int] = {}
+        offsets = array('I', [0])
+        symbols: List[str] = []
+        cumulative = array('I')
+        for row, context in enumerate(sorted(transitions)):
+            contexts[context] = row
+            running = 0
+            for symbol, count in sorted(transitions[context].items()):
+                running += count
+                symbols.append(symbol)
+                cumulative.append(running)
+            offsets.append(len(symbols))
+        return cls(order, contexts, offsets, "".join(symbols), cumulative)
+
+    def __len__(self) -> int:
+        return len(self.contexts)
+
+    def generate(self, rng: random.Random, max_length: int = 14) -> Optional[str]:
+        """Génère un nom (None si la longueur maximale est dépassée)"""
+        context = START * self.order
+        letters = []
+        while len(letters) <= max_length:
+            row = self.contexts.get(context)
+            if row is None:
+                return None
+            start, end = self.offsets[row], self.offsets[row + 1]
+            index = bisect_right(self.cumulative, rng.randrange(self.cumulative[end - 1]), start, end)
+            symbol = self.symbols[index]
+            if symbol == END:
+                return "".join(letters)
+            letters.append(symbol)
+            context = context[1:] + symbol
+        return None
+
+    def to_dict(self) -> dict:
+        """Sérialise les tables (cache disque)"""
+        return {
+            'format': CACHE_FORMAT,
+            'order': self.order,
+            'contexts': sorted(self.contexts, key=self.contexts.get),
+            'offsets': self.offsets.tolist(),
+            'symbols': self.symbols,
+            'cumulative': self.cumulative.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'NameModel':
+        """Recharge des tables sérialisées
+
+        Raises:
+            ValueError: Si le format n'est pas reconnu
+        """
+        if data.get('format') != CACHE_FORMAT:
+            raise ValueError("Format de cache de noms inconnu")
+        return cls(
+            data['order'],
+            {context: row for row, context in enumerate(data['contexts'])},
+            array('I', data['offsets']),
+            data['symbols'],
+            array('I', data['cumulative'])
+        )
+
+
+class NameGenerator:
+    """Invente des noms inédits à partir de la banque de noms
+
+    Un modèle est entraîné par couple (origine raciale, genre) ; il est gardé en
+    mémoire tant que la banque ne change pas et ses tables sont mises en cache sur
+    disque, indexées par une empreinte des noms d'entraînement.
+    """
+
+    def __init__(self, bank_service, cache_dir: Optional[Path] = None, order: int = 3):
+        """
+        Args:
+            bank_service: Service de banques (source des noms)
+            cache_dir: Répertoire du cache disque (None pour ne pas utiliser de cache disque)
+            order: Longueur du contexte (les petits corpus utilisent un contexte plus court)
+        """
+        self.bank_service = bank_service
+        self.cache_dir = cache_dir
+        self.order = order
+        self._models: Dict[Tuple[str, str], Tuple[object, NameModel, Set[str]]] = {}
+        self._used: Set[str] = set()
+
+    def reserve(self, names: Iterable[str]) -> None:
+        """Déclare des noms déjà pris (ex: personnages du projet), qui ne seront pas générés"""
+        self._used.update(normalize_key(name) for name in names)
+
+    def generate(
+        self,
+        racial_origin: Optional[str] = None,
+        gender: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+        min_length: int = 3,
+        max_attempts: int = 50
+    ) -> Optional[str]:
+        """Invente un nom inédit (absent de la banque, des noms réservés et des noms déjà générés)
+
+        Returns:
+            Le nom, ou None si la banque est vide ou si aucun nom inédit n'a été trouvé
+        """
+        rng = rng or random
+        found = self._get_model(racial_origin, gender)
+        if found is None:
+            return None
+        model, known = found
+        for _ in range(max_attempts):
+            name = model.generate(rng)
+            if not name or len(name) < min_length:
+                continue
+            key = normalize_key(name)
+            if key in known or key in self._used:
+                continue
+            self._used.add(key)
+            return name
+        return None
+
+    def generate_many(
+        self,
+        count: int,
+        racial_origin: Optional[str] = None,
+        gender: Optional[str] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[str]:
+        """Invente jusqu'à `count` noms inédits et distincts
+
+        S'arrête plus tôt si le modèle ne produit plus de nom inédit (petite banque).
+        """
+        names = []
+        misses = 0
+        while len(names) < count and misses < 3:
+            name = self.generate(racial_origin, gender, rng)
+            if name is None:
+                misses += 1
+                continue
+            misses = 0
+            names.append(name)
+        return names
+
+    def _get_model(self, racial_origin: Optional[str], gender: Optional[str]) -> Optional[Tuple[NameModel, Set[str]]]:
+        """Modèle d'une origine et d'un genre (complété par des filtres plus larges si trop peu de noms)"""
+        key = (normalize_key(racial_origin or ""), (gender or "").upper())
+        candidates = []
+        if racial_origin and gender:
+            candidates.append({'racial_origin': racial_origin, 'gender': gender})
+        if racial_origin:
+            candidates.append({'racial_origin': racial_origin})
+        if gender:
+            candidates.append({'gender': gender})
+        candidates.append(None)
+
+        sampler = None
+        for where in candidates:
+            sampler = self.bank_service.get_sampler(BankType.NAMES, where)
+            if sampler and len(sampler) >= MIN_TRAINING_NAMES:
+                break
+        if not sampler:
+            return None
+
+        # L'échantillonneur est reconstruit à chaque mutation de la banque : même objet, même modèle
+        cached = self._models.get(key)
+        if cached and cached[0] is sampler:
+            return cached[1], cached[2]
+
+        names = sorted({entry.value.strip() for entry in sampler.items if entry.value.strip()})
+        order = self.order if len(names) >= 50 else min(self.order, 2)
+        model = self._load_or_train(names, order)
+        known = {normalize_key(name) for name in names}
+        self._models[key] = (sampler, model, known)
+        return model, known
+
+    def _load_or_train(self, names: List[str], order: int) -> NameModel:
+        """Charge les tables depuis le cache disque ou les compile (puis les met en cache)"""
+        digest = hashlib.sha256("\n".join([str(order)] + names).encode('utf-8')).hexdigest()[:32]
+        path = self.cache_dir / f"names-{digest}.json" if self.cache_dir else None
+        if path and path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return NameModel.from_dict(json.load(f))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Cache de noms illisible ({path}): {e}")
+
+        model = NameModel.train(names, order)
+        if path:
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(model.to_dict(), f, ensure_ascii=False)
+            except OSError as e:
+                logger.warning(f"Impossible d'écrire le cache de noms ({path}): {e}")
+        return model
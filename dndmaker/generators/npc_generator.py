@@ -4,60 +4,98 @@ Génération semi-automatique de PNJ avec cohérence classe/race
 """
 
 import random
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Mapping
 from ..models.character import (
     Character, CharacterType, CharacterProfile, Characteristics,
     CombatStats, DefenseStats, CharacterCapabilities, PathCapability
 )
 from ..models.bank import BankType
 from ..core.utils import generate_id
-from .stats_generator import StatsGenerator
+from ..core.rng import SEED_BITS, derive_seed, make_rng, new_seed
+from .stats_generator import CHARACTERISTIC_NAMES, Constraint, StatsGenerator
+from .name_generator import NameGenerator, default_cache_dir
+
+# Objets de base dont chaque PNJ reçoit 1 à 2 exemplaires
+BASIC_ITEMS = ["Bourse", "Torche", "Rations (1 jour)", "Sac à dos"]
+
+GENDERS = ["M", "F", None]
 
 
 class NPCGenerator:
-    """Générateur de PNJ"""
+    """Générateur de PNJ
     
-    def __init__(self, bank_service):
-        """Initialise le générateur avec le service de banques"""
+    Chaque PNJ est tiré de son propre flux aléatoire, dérivé de façon déterministe
+    de la graine du générateur : une même graine donne les mêmes PNJ, quel que soit
+    le découpage du travail. La graine de chaque PNJ est enregistrée sur le personnage.
+    """
+    
+    def __init__(self, bank_service, seed: Optional[int] = None, invent_names: bool = False):
+        """Initialise le générateur avec le service de banques
+        
+        Args:
+            bank_service: Service de banques
+            seed: Graine racine (None pour une graine aléatoire)
+            invent_names: Inventer des noms inédits (modèle de Markov entraîné sur la
+                banque de noms) plutôt que réutiliser ceux de la banque. Les noms déjà
+                générés sont écartés : le nom d'un PNJ dépend alors aussi des PNJ
+                générés avant lui par ce générateur. Le nom est tiré dans son propre
+                flux, le reste du PNJ ne dépend donc toujours que de sa graine.
+        """
         self.bank_service = bank_service
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = make_rng(self.seed)
+        self.invent_names = invent_names
+        # Équipements disponibles, chargés une seule fois par générateur
+        self._equipment_pools: Optional[Dict] = None
+        self._name_generator: Optional[NameGenerator] = None
     
-    def generate_name(self, gender: Optional[str] = None) -> str:
-        """Génère un nom aléatoire depuis les banques"""
-        names_bank = self.bank_service.get_bank_by_type(BankType.NAMES)
-        
-        if names_bank and names_bank.entries:
-            # Filtrer par genre si spécifié
-            if gender:
-                filtered_entries = [
-                    e for e in names_bank.entries
-                    if e.metadata.get('gender', '').upper() == gender.upper()
-                ]
-                if filtered_entries:
-                    return random.choice(filtered_entries).value
-            
-            # Sinon, prendre un nom aléatoire
-            return random.choice(names_bank.entries).value
+    @property
+    def name_generator(self) -> NameGenerator:
+        """Générateur de noms inédits (modèles mis en cache sur disque)"""
+        if self._name_generator is None:
+            self._name_generator = NameGenerator(self.bank_service, default_cache_dir())
+        return self._name_generator
+    
+    def generate_name(
+        self,
+        gender: Optional[str] = None,
+        rng: Optional[random.Random] = None,
+        race: Optional[str] = None
+    ) -> str:
+        """Génère un nom aléatoire (pondéré) depuis les banques, de la même origine
+        raciale si possible, ou un nom inventé si invent_names est actif"""
+        rng = rng or self.rng
+        if self.invent_names:
+            name = self.name_generator.generate(race, gender, rng)
+            if name:
+                return name
+        # Filtrer par origine raciale et par genre si possible, sinon prendre un nom aléatoire
+        filters = []
+        if race and gender:
+            filters.append({'racial_origin': race, 'gender': gender})
+        if race:
+            filters.append({'racial_origin': race})
+        if gender:
+            filters.append({'gender': gender})
+        filters.append(None)
+        sampler = None
+        for where in filters:
+            sampler = self.bank_service.get_sampler(BankType.NAMES, where)
+            if sampler:
+                break
+        if sampler:
+            return sampler.draw(rng).value
         
         # Par défaut, générer un nom générique
-        return f"PNJ_{random.randint(1000, 9999)}"
+        return f"PNJ_{rng.randint(1000, 9999)}"
     
-    def generate_race(self) -> str:
+    def generate_race(self, rng: Optional[random.Random] = None) -> str:
         """Génère une race aléatoire depuis les banques"""
-        races_bank = self.bank_service.get_bank_by_type(BankType.RACES)
-        
-        if races_bank and races_bank.entries:
-            return random.choice(races_bank.entries).value
-        
-        return "Humain"  # Par défaut
+        return self._draw_value(BankType.RACES, rng) or "Humain"  # Par défaut
     
-    def generate_class(self) -> str:
+    def generate_class(self, rng: Optional[random.Random] = None) -> str:
         """Génère une classe aléatoire depuis les banques"""
-        classes_bank = self.bank_service.get_bank_by_type(BankType.CLASSES)
-        
-        if classes_bank and classes_bank.entries:
-            return random.choice(classes_bank.entries).value
-        
-        return "Guerrier"  # Par défaut
+        return self._draw_value(BankType.CLASSES, rng) or "Guerrier"  # Par défaut
     
     def generate_profession(self) -> Optional[str]:
         """Génère un métier aléatoire depuis les banques ou données initiales"""
@@ -65,34 +103,45 @@ class NPCGenerator:
         # L'utilisateur pourra sélectionner un métier dans l'éditeur
         return None
     
-    def generate_paths_for_class(self, class_name: str, level: int = 1) -> list[PathCapability]:
+    def _draw_value(self, bank_type: BankType, rng: Optional[random.Random] = None) -> Optional[str]:
+        """Tire une valeur pondérée d'une banque"""
+        sampler = self.bank_service.get_sampler(bank_type)
+        return sampler.draw(rng or self.rng).value if sampler else None
+    
+    def generate_paths_for_class(
+        self,
+        class_name: str,
+        level: int = 1,
+        rng: Optional[random.Random] = None
+    ) -> list[PathCapability]:
         """Génère des voies cohérentes pour une classe donnée"""
+        return self._pick_paths(self._compatible_paths(class_name), level, rng or self.rng)
+    
+    def _compatible_paths(self, class_name: str) -> list:
+        """Récupère les entrées de voies compatibles avec une classe"""
         paths_bank = self.bank_service.get_bank_by_type(BankType.PATHS)
+        if not paths_bank or not paths_bank.entries:
+            return []
         
-        paths = []
-        if paths_bank and paths_bank.entries:
-            # Filtrer les voies compatibles avec la classe
-            compatible_paths = [
-                e for e in paths_bank.entries
-                if class_name.lower() in e.metadata.get('classes', '').lower()
-                or e.metadata.get('classes', '') == ''
-            ]
-            
-            if not compatible_paths:
-                compatible_paths = paths_bank.entries
-            
-            # Sélectionner jusqu'à 3 voies
-            selected = random.sample(
-                compatible_paths,
-                min(3, len(compatible_paths))
+        # Filtrer les voies compatibles avec la classe
+        compatible_paths = [
+            e for e in paths_bank.entries
+            if class_name.lower() in e.metadata.get('classes', '').lower()
+            or e.metadata.get('classes', '') == ''
+        ]
+        return compatible_paths or paths_bank.entries
+    
+    @staticmethod
+    def _pick_paths(compatible_paths: list, level: int, rng: random.Random) -> list[PathCapability]:
+        """Sélectionne jusqu'à 3 voies et complète avec des voies vides"""
+        selected = rng.sample(compatible_paths, min(3, len(compatible_paths)))
+        paths = [
+            PathCapability(
+                name=entry.value,
+                rank=min(level, 3)  # Limiter au rang 3 pour les voies
             )
-            
-            for entry in selected:
-                path = PathCapability(
-                    name=entry.value,
-                    level=min(level, 3)  # Limiter au niveau 3 pour les voies
-                )
-                paths.append(path)
+            for entry in selected
+        ]
         
         # Compléter avec des voies vides si nécessaire
         while len(paths) < 3:
@@ -107,7 +156,9 @@ class NPCGenerator:
         class_name: Optional[str] = None,
         gender: Optional[str] = None,
         name: Optional[str] = None,
-        stats_method: str = "standard"
+        stats_method: str = "standard",
+        seed: Optional[int] = None,
+        constraints: Optional[Mapping[str, Constraint]] = None
     ) -> Character:
         """Génère un PNJ complet
         
@@ -118,30 +169,115 @@ class NPCGenerator:
             gender: Genre (None pour aléatoire)
             name: Nom spécifique (None pour généré)
             stats_method: Méthode de génération de stats ("standard" ou "heroic")
+            seed: Graine du PNJ (None pour en tirer une) ; la même graine avec les mêmes
+                paramètres et les mêmes banques régénère le même PNJ
+            constraints: Contraintes sur les caractéristiques, ex: {'INT': 16} pour un mage
+                (voir StatsGenerator.roll_characteristics_batch)
         """
-        # Générer ou utiliser les valeurs fournies
-        if name is None:
-            name = self.generate_name(gender)
-        
-        if race is None:
-            race = self.generate_race()
-        
-        if class_name is None:
-            class_name = self.generate_class()
+        if seed is None:
+            seed = self.rng.getrandbits(SEED_BITS)
+        return self._generate_batch([seed], level, race, class_name, gender, stats_method, constraints, name)[0]
+    
+    def generate_npcs(
+        self,
+        count: int,
+        level: int = 1,
+        race: Optional[str] = None,
+        class_name: Optional[str] = None,
+        gender: Optional[str] = None,
+        stats_method: str = "standard",
+        seed: Optional[int] = None,
+        start: int = 0,
+        constraints: Optional[Mapping[str, Constraint]] = None
+    ) -> List[Character]:
+        """Génère plusieurs PNJ en une seule passe
         
-        if gender is None:
-            gender = random.choice(["M", "F", None])
+        Les caractéristiques sont tirées en une passe et les banques ne sont interrogées
+        qu'une fois par valeur de contrainte. Les PNJ ne sont pas ajoutés au projet :
+        utiliser CharacterService.add_characters pour les insérer en une fois.
         
-        # Générer les stats
-        stats = StatsGenerator.generate_stats_by_level(level, stats_method)
+        Args:
+            count: Nombre de PNJ à générer
+            level, race, class_name, gender, stats_method: Contraintes communes
+                (voir generate_npc, None pour aléatoire)
+            seed: Graine du lot (None pour en tirer une)
+            start: Indice du premier PNJ ; le PNJ d'indice i ne dépend que de (seed, i),
+                un lot réparti en plusieurs tâches donne donc les mêmes PNJ
+            constraints: Contraintes sur les caractéristiques (voir generate_npc) ; elles sont
+                respectées par construction, sans tirage rejeté
+        """
+        if count <= 0:
+            return []
+        if seed is None:
+            seed = self.rng.getrandbits(SEED_BITS)
+        seeds = [derive_seed(seed, "npc", i) for i in range(start, start + count)]
+        return self._generate_batch(seeds, level, race, class_name, gender, stats_method, constraints)
+    
+    def _generate_batch(
+        self,
+        seeds: List[int],
+        level: int,
+        race: Optional[str],
+        class_name: Optional[str],
+        gender: Optional[str],
+        stats_method: str,
+        constraints: Optional[Mapping[str, Constraint]] = None,
+        name: Optional[str] = None
+    ) -> List[Character]:
+        """Génère un PNJ par graine, chacun depuis son propre flux aléatoire
         
-        # Générer les voies
-        paths = self.generate_paths_for_class(class_name, level)
+        Les caractéristiques du lot sont tirées en une passe à la fin (roll_stat_values_each),
+        chaque PNJ dans son flux : le résultat ne dépend pas du découpage en lots.
+        """
+        drafts = []
+        rngs = []
+        compatible_paths: Dict[str, list] = {}
+        for seed in seeds:
+            rng = random.Random(seed)
+            rngs.append(rng)
+            # Ordre de tirage fixe : il garantit la reproductibilité d'un PNJ depuis sa graine
+            npc_gender = gender if gender is not None else rng.choice(GENDERS)
+            npc_race = race if race is not None else self.generate_race(rng)
+            # Un nom inventé peut être rejeté (déjà pris) : flux séparé pour ne pas décaler la suite
+            name_rng = random.Random(derive_seed(seed, "name")) if self.invent_names else rng
+            npc_name = name if name is not None else self.generate_name(npc_gender, name_rng, npc_race)
+            npc_class = class_name if class_name is not None else self.generate_class(rng)
+            
+            if npc_class not in compatible_paths:
+                compatible_paths[npc_class] = self._compatible_paths(npc_class)
+            paths = self._pick_paths(compatible_paths[npc_class], level, rng)
+            equipment = self._generate_random_equipment(npc_class, level, rng)
+            drafts.append((seed, npc_name, npc_race, npc_gender, npc_class, paths, equipment))
         
+        values = StatsGenerator.roll_stat_values_each(rngs, stats_method, constraints)
+        num_stats = len(CHARACTERISTIC_NAMES)
+        return [
+            self._build_npc(
+                npc_name, npc_race, npc_gender, level,
+                StatsGenerator.characteristics_from_values(values[i * num_stats:(i + 1) * num_stats]),
+                paths, equipment, seed, npc_class
+            )
+            for i, (seed, npc_name, npc_race, npc_gender, npc_class, paths, equipment) in enumerate(drafts)
+        ]
+    
+    def _build_npc(
+        self,
+        name: str,
+        race: str,
+        gender: Optional[str],
+        level: int,
+        stats: Characteristics,
+        paths: list[PathCapability],
+        equipment: list[str],
+        seed: Optional[int] = None,
+        character_class: Optional[str] = None
+    ) -> Character:
+        """Assemble un PNJ à partir de ses éléments déjà tirés"""
         # Créer le profil
         profile = CharacterProfile(
             level=level,
             race=race,
+            character_class=character_class or None,
             gender=gender
         )
         
@@ -163,11 +299,8 @@ class NPCGenerator:
         defense = DefenseStats()
         defense.dexterity = stats.dexterity.modifier
         
-        # Générer des équipements aléatoires
-        equipment = self._generate_random_equipment(class_name, level)
-        
         # Créer le personnage
-        character = Character(
+        return Character(
             id=generate_id(),
             name=name,
             type=CharacterType.PNJ,
@@ -176,69 +309,77 @@ class NPCGenerator:
             combat=combat,
             defense=defense,
             capabilities=capabilities,
-            equipment=equipment
+            equipment=equipment,
+            seed=seed
         )
-        
-        return character
     
-    def _generate_random_equipment(self, class_name: str, level: int) -> list[str]:
-        """Génère des équipements aléatoires pour un PNJ"""
-        from ..core.data_loader import DataLoader
+    def _get_equipment_pools(self) -> Dict:
+        """Précalcule les équipements disponibles par catégorie (chargés une seule fois)"""
+        if self._equipment_pools is not None:
+            return self._equipment_pools
         
-        equipment = []
+        from ..core.data_loader import DataLoader
         
-        # Charger les équipements disponibles
         weapons = DataLoader.load_weapons()
         armors = DataLoader.load_armors()
-        tools = DataLoader.load_tools()
         trinkets = DataLoader.load_trinkets()
         
+        trinket_names = {t.get('name', '').lower(): t['name'] for t in trinkets if t.get('name')}
+        self._equipment_pools = {
+            # Objets de base présents dans les babioles
+            'basic': {item: trinket_names.get(item.lower()) for item in BASIC_ITEMS} if trinkets else {},
+            'weapons': {
+                'melee': [w['name'] for w in weapons if w.get('category') == 'corps_à_corps'],
+                'light': [w['name'] for w in weapons if 'légère' in w.get('properties', []) or w.get('category') == 'distance'],
+                'simple': [w['name'] for w in weapons if w.get('type') == 'courante'],
+                'any': [w['name'] for w in weapons]
+            },
+            'armors': {
+                'low': [a['name'] for a in armors if a.get('type') in ['légère', 'moyenne']],
+                'high': [a['name'] for a in armors if a.get('type') in ['moyenne', 'lourde']]
+            }
+        }
+        return self._equipment_pools
+    
+    def _generate_random_equipment(
+        self,
+        class_name: str,
+        level: int,
+        rng: Optional[random.Random] = None
+    ) -> list[str]:
+        """Génère des équipements aléatoires pour un PNJ"""
+        rng = rng or self.rng
+        pools = self._get_equipment_pools()
+        equipment = []
+        
         # Équipement de base (toujours présent - 1 à 2 items aléatoires)
-        if trinkets:
-            # Ajouter quelques babioles de base
-            basic_items = ["Bourse", "Torche", "Rations (1 jour)", "Sac à dos"]
-            # Sélectionner 1 à 2 items aléatoires
-            selected_basic = random.sample(basic_items, min(random.randint(1, 2), len(basic_items)))
+        if pools['basic']:
+            selected_basic = rng.sample(BASIC_ITEMS, min(rng.randint(1, 2), len(BASIC_ITEMS)))
             for item_name in selected_basic:
                 # Chercher dans les babioles
-                item = next((t for t in trinkets if t.get('name', '').lower() == item_name.lower()), None)
+                item = pools['basic'][item_name]
                 if item:
-                    equipment.append(item['name'])
-        
-        # Arme selon la classe
-        if weapons:
-            # Filtrer les armes selon la classe (simplifié)
-            suitable_weapons = []
-            if class_name.lower() in ["guerrier", "paladin", "barbare"]:
-                # Armes de mêlée
-                suitable_weapons = [w for w in weapons if w.get('category') == 'corps_à_corps']
-            elif class_name.lower() in ["rôdeur", "roublard"]:
-                # Armes légères et à distance
-                suitable_weapons = [w for w in weapons if 'légère' in w.get('properties', []) or w.get('category') == 'distance']
-            elif class_name.lower() in ["mage", "prêtre", "barde"]:
-                # Armes simples
-                suitable_weapons = [w for w in weapons if w.get('type') == 'courante']
-            else:
-                suitable_weapons = weapons
-            
-            if suitable_weapons:
-                weapon = random.choice(suitable_weapons)
-                equipment.append(weapon['name'])
-        
-        # Armure selon le niveau
-        if armors:
-            # Plus le niveau est élevé, meilleure est l'armure
-            if level >= 5:
-                suitable_armors = [a for a in armors if a.get('type') in ['moyenne', 'lourde']]
-            else:
-                suitable_armors = [a for a in armors if a.get('type') in ['légère', 'moyenne']]
-            
-            if suitable_armors:
-                armor = random.choice(suitable_armors)
-                equipment.append(armor['name'])
+                    equipment.append(item)
+        
+        # Arme selon la classe (simplifié)
+        lowered = class_name.lower()
+        if lowered in ["guerrier", "paladin", "barbare"]:
+            suitable_weapons = pools['weapons']['melee']  # Armes de mêlée
+        elif lowered in ["rôdeur", "roublard"]:
+            suitable_weapons = pools['weapons']['light']  # Armes légères et à distance
+        elif lowered in ["mage", "prêtre", "barde"]:
+            suitable_weapons = pools['weapons']['simple']  # Armes simples
+        else:
+            suitable_weapons = pools['weapons']['any']
+        if suitable_weapons:
+            equipment.append(rng.choice(suitable_weapons))
+        
+        # Armure selon le niveau : plus le niveau est élevé, meilleure est l'armure
+        suitable_armors = pools['armors']['high' if level >= 5 else 'low']
+        if suitable_armors:
+            equipment.append(rng.choice(suitable_armors))
         
         # Outils selon le métier (si présent)
         # Les outils seront ajoutés via le métier dans le profil
         
         return equipment
-
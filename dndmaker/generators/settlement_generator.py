@@ -0,0 +1,168 @@
+"""
+Générateur de peuplement
+Peuple un lieu en une seule opération : foyers cohérents (race et nom de famille
+communs), métiers et factions tirés des banques, insertion en un seul lot.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from ..models.bank import BankType
+from ..models.character import Character
+from ..models.location import Location
+from ..core.rng import SEED_BITS, derive_seed, make_rng, new_seed
+from .npc_generator import NPCGenerator
+
+# Part des habitants appartenant à la race dominante du lieu
+DOMINANT_SHARE = 0.7
+
+# Taille d'un foyer (tirée uniformément) et part des foyers affiliés à une faction
+HOUSEHOLD_SIZES = (1, 2, 2, 3, 3, 4, 5)
+FACTION_SHARE = 0.4
+
+
+@dataclass
+class SettlementReport:
+    """Résultat d'un peuplement"""
+    location_id: str
+    seed: int
+    characters: List[Character] = field(default_factory=list)
+    households: int = 0
+    factions: List[str] = field(default_factory=list)  # Noms des factions présentes
+
+    def summary(self) -> str:
+        """Résumé lisible du peuplement"""
+        text = f"{len(self.characters)} habitant(s) en {self.households} foyer(s)"
+        if self.factions:
+            text += f", factions : {', '.join(self.factions)}"
+        return text
+
+
+class SettlementGenerator:
+    """Peuple un lieu de PNJ
+
+    Les habitants sont regroupés en foyers qui partagent une race et un nom de
+    famille ; chaque foyer peut appartenir à l'une des factions du lieu et chaque
+    habitant reçoit un métier (et ses outils). Comme pour NPCGenerator, le résultat
+    ne dépend que de la graine et des banques ; seuls les noms inventés peuvent varier,
+    un nom déjà pris dans le projet étant remplacé. Ils sont tirés dans leurs propres
+    flux, si bien qu'un rejet ne décale aucun autre tirage.
+    """
+
+    def __init__(self, project_service, seed: Optional[int] = None, invent_names: bool = True):
+        """
+        Args:
+            project_service: Service de campagne (banques source et services cibles)
+            seed: Graine racine (None pour une graine aléatoire)
+            invent_names: Inventer les noms de famille et les prénoms (par race) plutôt
+                que les reprendre de la banque de noms
+        """
+        self.project_service = project_service
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = make_rng(self.seed)
+        self.npc_generator = NPCGenerator(project_service.bank_service, invent_names=invent_names)
+        if invent_names:
+            self.npc_generator.name_generator.reserve(
+                c.name for c in project_service.character_service.get_all_characters()
+            )
+
+    def populate(
+        self,
+        location: Location,
+        population: int,
+        level: int = 1,
+        race: Optional[str] = None,
+        faction_count: int = 2,
+        seed: Optional[int] = None
+    ) -> SettlementReport:
+        """Génère la population d'un lieu et l'insère dans le projet
+
+        Les habitants sont ajoutés en un seul lot et le bestiaire du lieu est mis à
+        jour en une seule écriture. Rien n'est sauvegardé : l'appelant sauvegarde.
+
+        Args:
+            location: Lieu à peupler
+            population: Nombre d'habitants
+            level: Niveau des habitants
+            race: Race dominante (None pour la tirer de la banque)
+            faction_count: Nombre maximal de factions présentes
+            seed: Graine du peuplement (None pour en tirer une)
+        """
+        seed = seed if seed is not None else self.rng.getrandbits(SEED_BITS)
+        report = SettlementReport(location_id=location.id, seed=seed)
+        characters = self.generate(population, level, race, faction_count, seed, report)
+
+        self.project_service.character_service.add_characters(characters)
+        location.bestiary = location.bestiary + [c.id for c in characters]
+        self.project_service.location_service.update_location(location)
+        report.characters = characters
+        return report
+
+    def generate(
+        self,
+        population: int,
+        level: int = 1,
+        race: Optional[str] = None,
+        faction_count: int = 2,
+        seed: Optional[int] = None,
+        report: Optional[SettlementReport] = None
+    ) -> List[Character]:
+        """Génère des habitants sans les ajouter au projet (voir populate)"""
+        if population <= 0:
+            return []
+        seed = seed if seed is not None else self.rng.getrandbits(SEED_BITS)
+        rng = random.Random(seed)
+        bank_service = self.project_service.bank_service
+
+        dominant = race or self.npc_generator.generate_race(rng)
+        factions_sampler = bank_service.get_sampler(BankType.FACTIONS)
+        factions = factions_sampler.draw_many(faction_count, replace=False, rng=rng) if factions_sampler else []
+        professions = bank_service.get_sampler(BankType.PROFESSIONS)
+
+        characters: List[Character] = []
+        households = 0
+        while len(characters) < population:
+            household_rng = random.Random(derive_seed(seed, "household", households))
+            household_race = (
+                dominant if household_rng.random() < DOMINANT_SHARE
+                else self.npc_generator.generate_race(household_rng)
+            )
+            faction = (
+                household_rng.choice(factions)
+                if factions and household_rng.random() < FACTION_SHARE else None
+            )
+            size = min(household_rng.choice(HOUSEHOLD_SIZES), population - len(characters))
+            family_name = self._family_name(
+                household_race, random.Random(derive_seed(seed, "family", households))
+            )
+            for member in range(size):
+                npc_seed = derive_seed(seed, "resident", households, member)
+                npc = self.npc_generator.generate_npc(level=level, race=household_race, seed=npc_seed)
+                if family_name:
+                    npc.name = f"{npc.name} {family_name}"
+                if faction:
+                    npc.faction = faction.id
+                if professions:
+                    profession = professions.draw(household_rng)
+                    npc.profile.profession = profession.value
+                    npc.equipment.extend(profession.metadata.get('tools', []))
+                characters.append(npc)
+            households += 1
+
+        if report is not None:
+            report.households = households
+            report.factions = [f.value for f in factions if any(c.faction == f.id for c in characters)]
+        return characters
+
+    def _family_name(self, race: str, rng: random.Random) -> Optional[str]:
+        """Nom de famille d'un foyer, cohérent avec sa race (None si la banque de noms est vide)"""
+        if self.npc_generator.invent_names:
+            name = self.npc_generator.name_generator.generate(race, None, rng)
+            if name:
+                return name
+        sampler = (
+            self.project_service.bank_service.get_sampler(BankType.NAMES, {'racial_origin': race})
+            or self.project_service.bank_service.get_sampler(BankType.NAMES)
+        )
+        return sampler.draw(rng).value if sampler else None
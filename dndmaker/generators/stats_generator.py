@@ -4,8 +4,159 @@ Selon les règles Chroniques Oubliées
 """
 
 import random
-from typing import Dict, Optional
-from ..models.character import CharacteristicValue, Characteristics
+from array import array
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from ..models.character import CHARACTERISTIC_NAMES, Characteristics
+from ..core.dice import compile_dice
+
+# Abréviations de la fiche Chroniques Oubliées
+CHARACTERISTIC_ABBREVIATIONS = {
+    'FOR': 'strength', 'DEX': 'dexterity', 'CON': 'constitution',
+    'INT': 'intelligence', 'SAG': 'wisdom', 'CHA': 'charisma'
+}
+
+# Expression de dés de chaque méthode (on garde toujours les 3 meilleurs)
+STAT_DICE = {"standard": "4d6kh3", "heroic": "5d6kh3"}
+
+# Contrainte sur une caractéristique : minimum seul, ou (minimum, maximum) avec None pour "sans borne"
+Constraint = Union[int, Tuple[Optional[int], Optional[int]]]
+
+
+class StatDistribution:
+    """Distribution exacte d'une caractéristique sous forme de poids cumulés
+    
+    Les valeurs sont triées avec le cumul de leurs poids entiers : un tirage est un
+    entier uniforme sous le poids total, retrouvé par dichotomie. La distribution
+    conditionnelle à un intervalle [min, max] est la tranche contiguë des valeurs
+    correspondantes (aucun tirage n'est rejeté). La taille ne dépend que du nombre
+    de valeurs distinctes, pas des poids ("8d10" : 73 valeurs).
+    """
+    
+    def __init__(self, counts: Mapping[int, int]):
+        """
+        Args:
+            counts: Poids entier de chaque valeur
+        """
+        counts = {value: n for value, n in counts.items() if n > 0}
+        if not counts:
+            raise ValueError("Distribution vide")
+        self.values: List[int] = sorted(counts)
+        self.cumulative: List[int] = []
+        running = 0
+        for value in self.values:
+            running += counts[value]
+            self.cumulative.append(running)
+        self._bounded: Dict[Tuple[Optional[int], Optional[int]], Tuple[int, int]] = {}
+    
+    @classmethod
+    def from_dice(cls, expression: str) -> 'StatDistribution':
+        """Distribution d'une expression de dés ("4d6kh3", "3d6+2"...)
+        
+        Raises:
+            ValueError: Si l'expression est invalide ou sa distribution exacte trop coûteuse
+        """
+        return _dice_distribution(expression)
+    
+    @classmethod
+    def from_spec(cls, spec) -> 'StatDistribution':
+        """Distribution d'une entrée de stat_table : {'min', 'max'}, liste de valeurs,
+        expression de dés ou valeur fixe"""
+        if isinstance(spec, dict):
+            return cls({value: 1 for value in range(spec.get('min', 8), spec.get('max', 18) + 1)})
+        if isinstance(spec, (list, tuple)):
+            counts: Dict[int, int] = {}
+            for value in spec:
+                counts[int(value)] = counts.get(int(value), 0) + 1
+            return cls(counts)
+        if isinstance(spec, int):
+            return cls({spec: 1})
+        return cls.from_dice(str(spec))
+    
+    @property
+    def minimum(self) -> int:
+        return self.values[0]
+    
+    @property
+    def maximum(self) -> int:
+        return self.values[-1]
+    
+    @property
+    def total(self) -> int:
+        """Poids total"""
+        return self.cumulative[-1]
+    
+    def weight(self, value: int) -> int:
+        """Poids d'une valeur (0 si elle est impossible)"""
+        index = bisect_left(self.values, value)
+        if index == len(self.values) or self.values[index] != value:
+            return 0
+        return self.cumulative[index] - (self.cumulative[index - 1] if index else 0)
+    
+    def bounded(self, minimum: Optional[int] = None, maximum: Optional[int] = None) -> Tuple[int, int]:
+        """Poids cumulés [bas, haut) de la distribution conditionnelle à minimum <= valeur <= maximum
+        
+        Raises:
+            ValueError: Si aucune valeur ne respecte la contrainte
+        """
+        key = (minimum, maximum)
+        if key not in self._bounded:
+            start = 0 if minimum is None else bisect_left(self.values, minimum)
+            end = len(self.values) if maximum is None else bisect_right(self.values, maximum)
+            if start >= end:
+                raise ValueError(
+                    f"Contrainte impossible : [{minimum}, {maximum}] hors de [{self.minimum}, {self.maximum}]"
+                )
+            self._bounded[key] = (self.cumulative[start - 1] if start else 0, self.cumulative[end - 1])
+        return self._bounded[key]
+    
+    def probability(self, minimum: Optional[int] = None, maximum: Optional[int] = None) -> float:
+        """Probabilité que la valeur soit dans [minimum, maximum]"""
+        try:
+            low, high = self.bounded(minimum, maximum)
+        except ValueError:
+            return 0.0
+        return (high - low) / self.total
+    
+    def sample(
+        self,
+        count: int,
+        rng: Optional[random.Random] = None,
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None
+    ) -> List[int]:
+        """Tire `count` valeurs (un entier uniforme et une dichotomie par valeur)"""
+        rng = rng or random
+        low, high = self.bounded(minimum, maximum)
+        values, cumulative = self.values, self.cumulative
+        return [values[bisect_right(cumulative, rng.randrange(low, high))] for _ in range(count)]
+    
+    def sample_each(
+        self,
+        rngs: Sequence[random.Random],
+        minimum: Optional[int] = None,
+        maximum: Optional[int] = None
+    ) -> List[int]:
+        """Tire une valeur dans chacun des flux `rngs` (ex: un flux par PNJ d'un lot)"""
+        low, high = self.bounded(minimum, maximum)
+        values, cumulative = self.values, self.cumulative
+        return [values[bisect_right(cumulative, rng.randrange(low, high))] for rng in rngs]
+
+
+@lru_cache(maxsize=64)
+def _dice_distribution(expression: str) -> StatDistribution:
+    """Table de tirage d'une expression de dés (calculée une seule fois)"""
+    # Poids entiers exacts : nombre de combinaisons menant à chaque total
+    return StatDistribution(compile_dice(expression).counts())
+
+
+def _parse_constraint(constraint: Constraint) -> Tuple[Optional[int], Optional[int]]:
+    """Normalise une contrainte en (minimum, maximum)"""
+    if isinstance(constraint, int):
+        return constraint, None
+    minimum, maximum = constraint
+    return minimum, maximum
 
 
 class StatsGenerator:
@@ -16,63 +167,162 @@ class StatsGenerator:
     # Méthode héroïque : 5d6, garder les 3 meilleurs
     # Méthode point buy : points à répartir
     
+    # Tous les tirages acceptent un générateur `rng` (random.Random) pour être
+    # reproductibles ; à défaut, le module random global est utilisé.
+    
     @staticmethod
-    def roll_dice(num_dice: int, dice_size: int = 6) -> int:
+    def roll_dice(num_dice: int, dice_size: int = 6, rng: Optional[random.Random] = None) -> int:
         """Lance des dés"""
-        return sum(random.randint(1, dice_size) for _ in range(num_dice))
+        rng = rng or random
+        return sum(rng.randint(1, dice_size) for _ in range(num_dice))
+    
+    @staticmethod
+    def stat_distribution(method: str = "standard") -> StatDistribution:
+        """Distribution exacte d'une caractéristique pour une méthode ("standard" ou "heroic")"""
+        return StatDistribution.from_dice(STAT_DICE.get(method, STAT_DICE["standard"]))
     
     @staticmethod
-    def roll_4d6_drop_lowest() -> int:
+    def roll_4d6_drop_lowest(rng: Optional[random.Random] = None) -> int:
         """Lance 4d6 et garde les 3 meilleurs (méthode standard)"""
-        rolls = [random.randint(1, 6) for _ in range(4)]
-        rolls.sort(reverse=True)
-        return sum(rolls[:3])
+        return StatsGenerator.stat_distribution("standard").sample(1, rng)[0]
     
     @staticmethod
-    def roll_5d6_drop_lowest() -> int:
+    def roll_5d6_drop_lowest(rng: Optional[random.Random] = None) -> int:
         """Lance 5d6 et garde les 3 meilleurs (méthode héroïque)"""
-        rolls = [random.randint(1, 6) for _ in range(5)]
-        rolls.sort(reverse=True)
-        return sum(rolls[:3])
+        return StatsGenerator.stat_distribution("heroic").sample(1, rng)[0]
     
     @staticmethod
-    def generate_standard_stats() -> Characteristics:
+    def generate_standard_stats(rng: Optional[random.Random] = None) -> Characteristics:
         """Génère des stats avec la méthode standard (4d6, garder 3 meilleurs)"""
-        stats = Characteristics(
-            strength=CharacteristicValue(value=StatsGenerator.roll_4d6_drop_lowest()),
-            dexterity=CharacteristicValue(value=StatsGenerator.roll_4d6_drop_lowest()),
-            constitution=CharacteristicValue(value=StatsGenerator.roll_4d6_drop_lowest()),
-            intelligence=CharacteristicValue(value=StatsGenerator.roll_4d6_drop_lowest()),
-            wisdom=CharacteristicValue(value=StatsGenerator.roll_4d6_drop_lowest()),
-            charisma=CharacteristicValue(value=StatsGenerator.roll_4d6_drop_lowest())
+        return StatsGenerator.characteristics_from_values(
+            StatsGenerator.roll_characteristics_batch(1, "standard", rng)[0]
         )
-        return stats
     
     @staticmethod
-    def generate_heroic_stats() -> Characteristics:
+    def generate_heroic_stats(rng: Optional[random.Random] = None) -> Characteristics:
         """Génère des stats avec la méthode héroïque (5d6, garder 3 meilleurs)"""
-        stats = Characteristics(
-            strength=CharacteristicValue(value=StatsGenerator.roll_5d6_drop_lowest()),
-            dexterity=CharacteristicValue(value=StatsGenerator.roll_5d6_drop_lowest()),
-            constitution=CharacteristicValue(value=StatsGenerator.roll_5d6_drop_lowest()),
-            intelligence=CharacteristicValue(value=StatsGenerator.roll_5d6_drop_lowest()),
-            wisdom=CharacteristicValue(value=StatsGenerator.roll_5d6_drop_lowest()),
-            charisma=CharacteristicValue(value=StatsGenerator.roll_5d6_drop_lowest())
+        return StatsGenerator.characteristics_from_values(
+            StatsGenerator.roll_characteristics_batch(1, "heroic", rng)[0]
         )
-        return stats
     
     @staticmethod
-    def generate_stats_by_level(level: int, method: str = "standard") -> Characteristics:
+    def roll_characteristics_batch(
+        count: int,
+        method: str = "standard",
+        rng: Optional[random.Random] = None,
+        constraints: Optional[Mapping[str, Constraint]] = None,
+        stat_table: Optional[Dict] = None
+    ) -> List[List[int]]:
+        """Tire les caractéristiques de plusieurs personnages en une seule passe
+        
+        Args:
+            count: Nombre de personnages
+            method: Méthode de génération ("standard" ou "heroic")
+            rng: Générateur aléatoire
+            constraints: Contraintes par caractéristique (nom ou abréviation), ex:
+                {'INT': 16} pour INT >= 16 ou {'strength': (None, 10)} pour FOR <= 10.
+                Les valeurs sont tirées directement dans la distribution conditionnelle.
+            stat_table: Plages personnalisées par caractéristique (voir generate_stats_from_table)
+        
+        Returns:
+            Une liste de 6 valeurs par personnage, dans l'ordre de CHARACTERISTIC_NAMES
+        
+        Raises:
+            ValueError: Si une contrainte est impossible à satisfaire
+        """
+        if count <= 0:
+            return []
+        values = StatsGenerator.roll_stat_values(count, method, rng, constraints, stat_table)
+        num_stats = len(CHARACTERISTIC_NAMES)
+        return [values[i * num_stats:(i + 1) * num_stats].tolist() for i in range(count)]
+    
+    @staticmethod
+    def roll_stat_values(
+        count: int,
+        method: str = "standard",
+        rng: Optional[random.Random] = None,
+        constraints: Optional[Mapping[str, Constraint]] = None,
+        stat_table: Optional[Dict] = None
+    ) -> array:
+        """Tire les caractéristiques de `count` personnages dans un tableau compact
+        
+        Les valeurs sont rangées personnage par personnage (6 valeurs chacun, ordre de
+        CHARACTERISTIC_NAMES). Plusieurs tableaux (un par flux aléatoire) peuvent être
+        concaténés. Voir roll_characteristics_batch pour les arguments.
+        """
+        rng = rng or random
+        num_stats = len(CHARACTERISTIC_NAMES)
+        # Une colonne par caractéristique, puis entrelacement personnage par personnage
+        values = array('h', bytes(2 * count * num_stats))
+        for column, (distribution, bounds) in enumerate(StatsGenerator._columns(method, constraints, stat_table)):
+            values[column::num_stats] = array('h', distribution.sample(count, rng, *bounds))
+        return values
+    
+    @staticmethod
+    def roll_stat_values_each(
+        rngs: Sequence[random.Random],
+        method: str = "standard",
+        constraints: Optional[Mapping[str, Constraint]] = None,
+        stat_table: Optional[Dict] = None
+    ) -> array:
+        """Tire en une passe les caractéristiques de plusieurs personnages, un flux chacun
+        
+        Même disposition que roll_stat_values ; les 6 valeurs d'un personnage ne
+        dépendent que de son flux (elles sont identiques à roll_stat_values(1, rng)),
+        mais distributions et contraintes ne sont préparées qu'une fois pour le lot.
+        """
+        num_stats = len(CHARACTERISTIC_NAMES)
+        values = array('h', bytes(2 * len(rngs) * num_stats))
+        # Colonne par colonne : chaque flux tire bien ses valeurs dans l'ordre des colonnes
+        for column, (distribution, bounds) in enumerate(StatsGenerator._columns(method, constraints, stat_table)):
+            values[column::num_stats] = array('h', distribution.sample_each(rngs, *bounds))
+        return values
+    
+    @staticmethod
+    def _columns(
+        method: str,
+        constraints: Optional[Mapping[str, Constraint]],
+        stat_table: Optional[Dict]
+    ) -> List[Tuple[StatDistribution, Tuple[Optional[int], Optional[int]]]]:
+        """Distribution et bornes de chaque caractéristique, dans l'ordre de CHARACTERISTIC_NAMES"""
+        bounds = {
+            CHARACTERISTIC_ABBREVIATIONS.get(name.upper(), name): _parse_constraint(constraint)
+            for name, constraint in (constraints or {}).items()
+        }
+        unknown = set(bounds) - set(CHARACTERISTIC_NAMES)
+        if unknown:
+            raise ValueError(f"Caractéristique inconnue: {', '.join(sorted(unknown))}")
+        columns = []
+        for name in CHARACTERISTIC_NAMES:
+            if stat_table and name in stat_table:
+                distribution = StatDistribution.from_spec(stat_table[name])
+            else:
+                distribution = StatsGenerator.stat_distribution(method)
+            columns.append((distribution, bounds.get(name, (None, None))))
+        return columns
+    
+    @staticmethod
+    def characteristics_from_values(values: Sequence[int]) -> Characteristics:
+        """Construit des caractéristiques depuis 6 valeurs (ordre de CHARACTERISTIC_NAMES)"""
+        return Characteristics.from_values(values)
+    
+    @staticmethod
+    def generate_stats_by_level(
+        level: int,
+        method: str = "standard",
+        rng: Optional[random.Random] = None
+    ) -> Characteristics:
         """Génère des stats adaptées au niveau
         
         Args:
             level: Niveau du personnage (1-20)
             method: Méthode de génération ("standard" ou "heroic")
+            rng: Générateur aléatoire
         """
         if method == "heroic":
-            base_stats = StatsGenerator.generate_heroic_stats()
+            base_stats = StatsGenerator.generate_heroic_stats(rng)
         else:
-            base_stats = StatsGenerator.generate_standard_stats()
+            base_stats = StatsGenerator.generate_standard_stats(rng)
         
         # Ajuster selon le niveau (les stats peuvent être améliorées au niveau)
         # Pour l'instant, on génère simplement des stats de base
@@ -81,35 +331,19 @@ class StatsGenerator:
         return base_stats
     
     @staticmethod
-    def generate_stats_from_table(stat_table: Optional[Dict] = None) -> Characteristics:
+    def generate_stats_from_table(
+        stat_table: Optional[Dict] = None,
+        rng: Optional[random.Random] = None
+    ) -> Characteristics:
         """Génère des stats depuis une table de stats personnalisée
         
         Args:
             stat_table: Dictionnaire avec des plages de valeurs par caractéristique
+            rng: Générateur aléatoire
         """
         if not stat_table:
-            return StatsGenerator.generate_standard_stats()
-        
-        def get_stat_value(stat_name: str) -> int:
-            """Récupère une valeur depuis la table ou génère aléatoirement"""
-            if stat_name in stat_table:
-                stat_range = stat_table[stat_name]
-                if isinstance(stat_range, dict):
-                    min_val = stat_range.get('min', 8)
-                    max_val = stat_range.get('max', 18)
-                    return random.randint(min_val, max_val)
-                elif isinstance(stat_range, list):
-                    return random.choice(stat_range)
-            # Par défaut, utiliser 4d6
-            return StatsGenerator.roll_4d6_drop_lowest()
-        
-        stats = Characteristics(
-            strength=CharacteristicValue(value=get_stat_value('strength')),
-            dexterity=CharacteristicValue(value=get_stat_value('dexterity')),
-            constitution=CharacteristicValue(value=get_stat_value('constitution')),
-            intelligence=CharacteristicValue(value=get_stat_value('intelligence')),
-            wisdom=CharacteristicValue(value=get_stat_value('wisdom')),
-            charisma=CharacteristicValue(value=get_stat_value('charisma'))
+            return StatsGenerator.generate_standard_stats(rng)
+        # Les caractéristiques absentes de la table sont tirées en 4d6 (3 meilleurs)
+        return StatsGenerator.characteristics_from_values(
+            StatsGenerator.roll_characteristics_batch(1, "standard", rng, stat_table=stat_table)[0]
         )
-        return stats
-
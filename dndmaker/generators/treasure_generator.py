@@ -0,0 +1,219 @@
+"""
+Générateur de trésors
+Butin individuel et trésors (magots) selon le niveau et le type de lieu, tirés de
+réserves pondérées construites une fois à partir des banques d'équipement.
+"""
+
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ..models.bank import BankType
+from ..models.character import Character
+from ..core.dice import compile_dice
+from ..core.rng import SEED_BITS, make_rng, new_seed
+from ..core.sampling import AliasSampler
+from ..core.utils import normalize_key
+
+MAX_LEVEL = 20
+
+# Valeur des pièces en pièces de cuivre
+COIN_VALUES = {"pp": 1000, "po": 100, "pa": 10, "pc": 1}
+
+# Banques d'objets : les babioles vont dans les objets de valeur, le reste dans l'équipement
+CATEGORIES = (BankType.WEAPONS, BankType.ARMORS, BankType.TOOLS, BankType.TRINKETS)
+
+# Poids relatifs des catégories selon le type de lieu (types inconnus : poids égaux)
+LOCATION_PROFILES: Dict[str, Dict[BankType, float]] = {
+    "taverne": {BankType.WEAPONS: 1, BankType.ARMORS: 0.5, BankType.TOOLS: 2, BankType.TRINKETS: 4},
+    "marché": {BankType.WEAPONS: 2, BankType.ARMORS: 1, BankType.TOOLS: 3, BankType.TRINKETS: 3},
+    "port": {BankType.WEAPONS: 1, BankType.ARMORS: 0.5, BankType.TOOLS: 3, BankType.TRINKETS: 2},
+    "forêt": {BankType.WEAPONS: 3, BankType.ARMORS: 1, BankType.TOOLS: 1, BankType.TRINKETS: 1},
+    "donjon": {BankType.WEAPONS: 3, BankType.ARMORS: 2, BankType.TOOLS: 1, BankType.TRINKETS: 2},
+    "caverne": {BankType.WEAPONS: 3, BankType.ARMORS: 2, BankType.TOOLS: 1, BankType.TRINKETS: 1},
+    "gouffre": {BankType.WEAPONS: 2, BankType.ARMORS: 2, BankType.TOOLS: 1, BankType.TRINKETS: 2},
+    "château": {BankType.WEAPONS: 3, BankType.ARMORS: 3, BankType.TOOLS: 1, BankType.TRINKETS: 2},
+    "temple": {BankType.WEAPONS: 0.5, BankType.ARMORS: 0.5, BankType.TOOLS: 1, BankType.TRINKETS: 4},
+    "bibliothèque": {BankType.WEAPONS: 0.25, BankType.ARMORS: 0.25, BankType.TOOLS: 2, BankType.TRINKETS: 4},
+    "cimetière": {BankType.WEAPONS: 1, BankType.ARMORS: 1, BankType.TOOLS: 0.5, BankType.TRINKETS: 4},
+    "tour": {BankType.WEAPONS: 1, BankType.ARMORS: 0.5, BankType.TOOLS: 2, BankType.TRINKETS: 3},
+}
+
+_COIN_PATTERN = re.compile(r"(\d+)\s*(pp|po|pa|pc)\b", re.IGNORECASE)
+
+
+def parse_coins(text: str) -> int:
+    """Valeur d'un texte de pièces ("2 po", "1 po 5 pa") en pièces de cuivre (0 si illisible)"""
+    return sum(int(amount) * COIN_VALUES[unit.lower()] for amount, unit in _COIN_PATTERN.findall(text or ""))
+
+
+def format_coins(copper: int) -> str:
+    """Formate une somme en pièces de cuivre ("12 po 3 pa 4 pc")"""
+    parts = []
+    for unit in ("po", "pa", "pc"):
+        amount, copper = divmod(copper, COIN_VALUES[unit])
+        if amount:
+            parts.append(f"{amount} {unit}")
+    return " ".join(parts) or "0 pc"
+
+
+def price_cap(level: int) -> int:
+    """Prix maximal (en pièces de cuivre) d'un objet trouvé au niveau donné"""
+    return 1000 * (level + 1) ** 2
+
+
+@dataclass
+class Loot:
+    """Butin tiré : objets d'équipement, objets de valeur et pièces"""
+    equipment: List[str] = field(default_factory=list)
+    valuables: List[str] = field(default_factory=list)
+    coins: int = 0  # En pièces de cuivre
+
+    def describe(self) -> str:
+        """Description courte, ex: "Dague, Petit miroir en argent, 12 po" """
+        return ", ".join(self.equipment + self.valuables + [format_coins(self.coins)])
+
+
+class TreasureGenerator:
+    """Générateur de butin et de trésors
+
+    Pour chaque banque d'objets, une réserve pondérée par niveau (0 à MAX_LEVEL) est
+    construite à la première demande : les objets trop chers pour le niveau en sont
+    exclus et les plus précieux y sont favorisés. Les réserves d'une banque sont
+    reconstruites dès que son échantillonneur change (mutation de la banque).
+    """
+
+    def __init__(self, bank_service, seed: Optional[int] = None):
+        """
+        Args:
+            bank_service: Service de banques (source des objets)
+            seed: Graine racine (None pour une graine aléatoire)
+        """
+        self.bank_service = bank_service
+        self.seed = seed if seed is not None else new_seed()
+        self.rng = make_rng(self.seed)
+        # Banque -> (échantillonneur source, réserves par niveau)
+        self._pools: Dict[BankType, Tuple[object, List[Optional[AliasSampler]]]] = {}
+        self._profiles: Dict[str, AliasSampler] = {}
+
+    def pool(self, category: BankType, level: int) -> Optional[AliasSampler]:
+        """Réserve pondérée d'une banque au niveau donné (None si vide)"""
+        source = self.bank_service.get_sampler(category)
+        cached = self._pools.get(category)
+        if cached is None or cached[0] is not source:
+            cached = (source, self._build_pools(source))
+            self._pools[category] = cached
+        return cached[1][max(0, min(MAX_LEVEL, level))]
+
+    def _build_pools(self, source: Optional[AliasSampler]) -> List[Optional[AliasSampler]]:
+        """Construit les réserves de tous les niveaux pour une banque"""
+        if not source:
+            return [None] * (MAX_LEVEL + 1)
+        priced = [(entry, parse_coins(str(entry.metadata.get('price', '')))) for entry in source.items]
+        pools = []
+        for level in range(MAX_LEVEL + 1):
+            cap = price_cap(level)
+            affordable = [(entry, price) for entry, price in priced if price <= cap]
+            sampler = AliasSampler(
+                [entry.value for entry, _ in affordable],
+                [entry.weight * (1 + price / cap) for entry, price in affordable]
+            )
+            pools.append(sampler if sampler else None)
+        return pools
+
+    def _category_sampler(self, location_type: Optional[str]) -> AliasSampler:
+        """Choix de la banque d'un objet selon le type de lieu"""
+        key = normalize_key(location_type or "")
+        sampler = self._profiles.get(key)
+        if sampler is None:
+            profile = {normalize_key(k): v for k, v in LOCATION_PROFILES.items()}.get(key, {})
+            sampler = AliasSampler(CATEGORIES, [profile.get(category, 1) for category in CATEGORIES])
+            self._profiles[key] = sampler
+        return sampler
+
+    def generate(
+        self,
+        level: int,
+        location_type: Optional[str] = None,
+        hoard: bool = False,
+        rng: Optional[random.Random] = None
+    ) -> Loot:
+        """Tire un butin individuel (0 à 2 objets, quelques pièces) ou un trésor
+
+        Args:
+            level: Niveau du butin (prix maximal des objets, nombre de pièces)
+            location_type: Type de lieu (oriente le choix des objets)
+            hoard: Trésor (plus d'objets et de pièces) plutôt que butin individuel
+            rng: Générateur aléatoire à utiliser
+        """
+        rng = rng or self.rng
+        level = max(0, min(MAX_LEVEL, level))
+        if hoard:
+            item_count = 3 + level // 2 + rng.randint(0, 3)
+            coins = compile_dice(f"{2 * (level + 1)}d6").roll(rng) * COIN_VALUES["po"]
+        else:
+            item_count = rng.choice((0, 1, 1, 2))
+            coins = compile_dice(f"{level + 1}d6").roll(rng) * COIN_VALUES["pa"]
+
+        loot = Loot(coins=coins)
+        categories = self._category_sampler(location_type)
+        for _ in range(item_count):
+            category = categories.draw(rng)
+            pool = self.pool(category, level)
+            if not pool:
+                continue
+            target = loot.valuables if category == BankType.TRINKETS else loot.equipment
+            target.append(pool.draw(rng))
+        return loot
+
+    def generate_many(
+        self,
+        count: int,
+        level: int,
+        location_type: Optional[str] = None,
+        hoard: bool = False,
+        seed: Optional[int] = None
+    ) -> List[Loot]:
+        """Tire `count` butins (même graine : mêmes butins)"""
+        rng = make_rng(seed) if seed is not None else self.rng
+        return [
+            self.generate(level, location_type, hoard, random.Random(rng.getrandbits(SEED_BITS)))
+            for _ in range(count)
+        ]
+
+    @staticmethod
+    def apply(character: Character, loot: Loot) -> None:
+        """Ajoute un butin à l'équipement, aux objets de valeur et à la bourse d'un personnage"""
+        character.materialize('equipment', 'valuables')
+        character.equipment.extend(loot.equipment)
+        character.valuables.items.extend(loot.valuables)
+        if not loot.coins:
+            return
+        purse = character.valuables.purse.strip()
+        if _COIN_PATTERN.sub("", purse).strip():
+            # Bourse décrite librement : on ajoute les pièces sans réécrire le texte
+            character.valuables.purse = f"{purse}, {format_coins(loot.coins)}"
+        else:
+            character.valuables.purse = format_coins(parse_coins(purse) + loot.coins)
+
+    def equip(
+        self,
+        characters: List[Character],
+        location_type: Optional[str] = None,
+        hoard: bool = False,
+        seed: Optional[int] = None
+    ) -> List[Loot]:
+        """Tire et attribue un butin à chaque personnage, selon son niveau
+
+        Les personnages sont modifiés en mémoire ; l'appelant les enregistre.
+        """
+        rng = make_rng(seed) if seed is not None else self.rng
+        loots = []
+        for character in characters:
+            loot = self.generate(
+                character.profile.level, location_type, hoard, random.Random(rng.getrandbits(SEED_BITS))
+            )
+            self.apply(character, loot)
+            loots.append(loot)
+        return loots
@@ -30,6 +30,7 @@ class BankEntry:
     id: str
     value: str
     metadata: Dict = field(default_factory=dict)
+    weight: float = 1.0  # Poids relatif pour les tirages aléatoires (rareté)
 
 
 @dataclass
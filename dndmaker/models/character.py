@@ -1,12 +1,38 @@
 """
 Modèles de données pour les personnages (PJ/PNJ/Créatures)
 Basés sur la fiche officielle Chroniques Oubliées
+
+Les modèles sont des dataclasses à __slots__ (pas de __dict__ par instance) et les
+six caractéristiques sont rangées dans un seul tableau compact : une campagne de
+centaines de milliers de créatures reste légère en mémoire.
 """
 
-from dataclasses import dataclass, field
-from typing import Optional, List
+import copy
+from array import array
+from dataclasses import dataclass, field, fields
+from typing import Optional, List, Dict, Iterable, Tuple
 from enum import Enum
 
+from .derived_stats import DerivedStats, ability_modifier
+
+
+def slotted(cls=None, *, extra: Tuple[str, ...] = ()):
+    """Dataclass à __slots__ (équivalent de @dataclass(slots=True), Python 3.10+)
+
+    `extra` ajoute des emplacements privés hors champs (non initialisés, non sérialisés).
+    """
+    if cls is None:
+        return lambda klass: slotted(klass, extra=extra)
+    cls = dataclass(cls)
+    names = tuple(f.name for f in fields(cls))
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in names}
+    namespace.pop('__dict__', None)
+    namespace.pop('__weakref__', None)
+    namespace['__slots__'] = names + tuple(extra)
+    slotted_cls = type(cls)(cls.__name__, cls.__bases__, namespace)
+    slotted_cls.__qualname__ = cls.__qualname__
+    return slotted_cls
+
 
 class CharacterType(Enum):
     """Type de personnage"""
@@ -15,34 +41,130 @@ class CharacterType(Enum):
     CREATURE = "CREATURE"
 
 
-@dataclass
+# Ordre des caractéristiques dans le tableau compact
+CHARACTERISTIC_NAMES = ('strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma')
+
+# Champs qu'une instance partage avec son prototype tant qu'ils ne sont pas modifiés
+PROTOTYPE_FIELDS = (
+    'profile', 'characteristics', 'combat', 'defense', 'weapons', 'capabilities', 'equipment', 'valuables'
+)
+
+
 class CharacteristicValue:
-    """Valeur d'une caractéristique avec son modificateur"""
-    value: int = 10
-    modifier: int = 0
+    """Valeur d'une caractéristique avec son modificateur
+
+    Une valeur isolée a son propre stockage ; celle obtenue depuis Characteristics
+    est une vue sur le tableau compact du personnage (la modifier modifie le personnage).
+    Le modificateur est toujours déduit de la valeur.
+    """
+
+    __slots__ = ('_values', '_index')
+
+    def __init__(self, value: int = 10, modifier: int = 0):
+        # Le modificateur fourni est ignoré : il est recalculé depuis la valeur
+        self._values = array('h', (value,))
+        self._index = 0
+
+    @classmethod
+    def _view(cls, values: array, index: int) -> 'CharacteristicValue':
+        view = cls.__new__(cls)
+        view._values = values
+        view._index = index
+        return view
+
+    @property
+    def value(self) -> int:
+        return self._values[self._index]
+
+    @value.setter
+    def value(self, value: int) -> None:
+        self._values[self._index] = value
+
+    @property
+    def modifier(self) -> int:
+        return self.calculate_modifier()
 
     def calculate_modifier(self) -> int:
         """Calcule le modificateur selon les règles Chroniques Oubliées"""
-        # Modificateur = (valeur - 10) / 2, arrondi vers le bas
-        return (self.value - 10) // 2
+        return ability_modifier(self.value)
+
+    def _asdict(self) -> Dict[str, int]:
+        return {'value': self.value, 'modifier': self.modifier}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CharacteristicValue):
+            return NotImplemented
+        return self.value == other.value
+
+    def __repr__(self) -> str:
+        return f"CharacteristicValue(value={self.value}, modifier={self.modifier})"
+
+
+def _characteristic(index: int) -> property:
+    """Accès à une caractéristique du tableau compact"""
+
+    def get(self) -> CharacteristicValue:
+        return CharacteristicValue._view(self._values, index)
+
+    def set(self, value: CharacteristicValue) -> None:
+        self._values[index] = value.value
 
-    def __post_init__(self):
-        """Recalcule le modificateur après initialisation"""
-        self.modifier = self.calculate_modifier()
+    return property(get, set)
 
 
-@dataclass
 class Characteristics:
-    """Caractéristiques du personnage"""
-    strength: CharacteristicValue = field(default_factory=lambda: CharacteristicValue())
-    dexterity: CharacteristicValue = field(default_factory=lambda: CharacteristicValue())
-    constitution: CharacteristicValue = field(default_factory=lambda: CharacteristicValue())
-    intelligence: CharacteristicValue = field(default_factory=lambda: CharacteristicValue())
-    wisdom: CharacteristicValue = field(default_factory=lambda: CharacteristicValue())
-    charisma: CharacteristicValue = field(default_factory=lambda: CharacteristicValue())
+    """Caractéristiques du personnage (six valeurs dans un tableau compact)"""
 
+    __slots__ = ('_values',)
 
-@dataclass
+    def __init__(
+        self,
+        strength: Optional[CharacteristicValue] = None,
+        dexterity: Optional[CharacteristicValue] = None,
+        constitution: Optional[CharacteristicValue] = None,
+        intelligence: Optional[CharacteristicValue] = None,
+        wisdom: Optional[CharacteristicValue] = None,
+        charisma: Optional[CharacteristicValue] = None
+    ):
+        self._values = array('h', (
+            10 if value is None else value.value
+            for value in (strength, dexterity, constitution, intelligence, wisdom, charisma)
+        ))
+
+    @classmethod
+    def from_values(cls, values: Iterable[int]) -> 'Characteristics':
+        """Construit des caractéristiques depuis 6 valeurs (ordre de CHARACTERISTIC_NAMES)"""
+        characteristics = cls.__new__(cls)
+        characteristics._values = array('h', values)
+        if len(characteristics._values) != len(CHARACTERISTIC_NAMES):
+            raise ValueError(f"{len(CHARACTERISTIC_NAMES)} valeurs attendues")
+        return characteristics
+
+    strength = _characteristic(0)
+    dexterity = _characteristic(1)
+    constitution = _characteristic(2)
+    intelligence = _characteristic(3)
+    wisdom = _characteristic(4)
+    charisma = _characteristic(5)
+
+    def values(self) -> List[int]:
+        """Les six valeurs, dans l'ordre de CHARACTERISTIC_NAMES"""
+        return self._values.tolist()
+
+    def _asdict(self) -> Dict[str, CharacteristicValue]:
+        return {name: getattr(self, name) for name in CHARACTERISTIC_NAMES}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Characteristics):
+            return NotImplemented
+        return self._values == other._values
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value}" for name, value in zip(CHARACTERISTIC_NAMES, self._values))
+        return f"Characteristics({values})"
+
+
+@slotted
 class CharacterProfile:
     """Profil du personnage"""
     level: int = 1
@@ -57,7 +179,7 @@ class CharacterProfile:
     profession: Optional[str] = None  # Métier du PNJ
 
 
-@dataclass
+@slotted
 class CombatStats:
     """Statistiques de combat"""
     melee_attack: str = ""  # FOR + NIV
@@ -70,21 +192,24 @@ class CombatStats:
     temporary_damage: int = 0  # DM temporaire
 
 
-@dataclass
+@slotted
 class DefenseStats:
     """Statistiques de défense"""
     base: int = 10
     armor: int = 0
     shield: int = 0
-    dexterity: int = 0  # Modificateur DEX
+    dexterity: int = 0  # Modificateur DEX à l'enregistrement (informatif, les totaux utilisent la DEX courante)
     misc: int = 0  # Divers
 
-    def calculate_total(self) -> int:
-        """Calcule la défense totale"""
-        return self.base + self.armor + self.shield + self.dexterity + self.misc
+    def calculate_total(self, dexterity_modifier: int) -> int:
+        """Calcule la défense totale avec le modificateur DEX courant du personnage
+
+        Le champ `dexterity` n'est pas utilisé : il peut être périmé si la DEX a changé.
+        """
+        return self.base + self.armor + self.shield + dexterity_modifier + self.misc
 
 
-@dataclass
+@slotted
 class Weapon:
     """Arme"""
     name: str = ""
@@ -93,7 +218,7 @@ class Weapon:
     special: Optional[str] = None
 
 
-@dataclass
+@slotted
 class PathCapability:
     """Capacité d'une voie"""
     name: str = ""
@@ -103,7 +228,7 @@ class PathCapability:
     level3: Optional[str] = None
 
 
-@dataclass
+@slotted
 class CharacterCapabilities:
     """Capacités du personnage (voies)"""
     path1: PathCapability = field(default_factory=PathCapability)
@@ -111,14 +236,14 @@ class CharacterCapabilities:
     path3: PathCapability = field(default_factory=PathCapability)
 
 
-@dataclass
+@slotted
 class Valuables:
     """Objets de valeur"""
     purse: str = ""  # Bourse
     items: List[str] = field(default_factory=list)
 
 
-@dataclass
+@slotted(extra=('_prototype',))
 class Character:
     """Personnage complet (PJ/PNJ/Créature)"""
     id: str
@@ -135,4 +260,90 @@ class Character:
     faction: Optional[str] = None  # ID de la faction (optionnel)
     image_id: Optional[str] = None  # ID de l'image associée
     notes: str = ""
+    seed: Optional[int] = None  # Graine de génération (permet de régénérer le personnage)
+    prototype: Optional[str] = None  # ID du prototype dont ce personnage est une instance
+
+    @property
+    def derived(self) -> DerivedStats:
+        """Statistiques dérivées (modificateurs, défense, attaques), calculées à la lecture"""
+        return DerivedStats(self)
+
+    # --- Prototypes (copie à l'écriture) ---
+
+    @property
+    def prototype_character(self) -> Optional['Character']:
+        """Prototype lié à cette instance (None si ce n'est pas une instance)"""
+        try:
+            return self._prototype
+        except AttributeError:
+            return None
+
+    def link_prototype(self, prototype: Optional['Character']) -> None:
+        """Lie une instance à son prototype (ou la détache avec None)"""
+        self._prototype = prototype
+        self.prototype = prototype.id if prototype is not None else None
+
+    def instantiate(self, id: str, name: str) -> 'Character':
+        """Crée une instance de ce personnage (ex: un gobelin parmi quarante)
+
+        L'instance partage les objets de PROTOTYPE_FIELDS avec le prototype : seuls son
+        ID, son nom et les champs modifiés par la suite lui sont propres.
+
+        Raises:
+            ValueError: Si ce personnage est lui-même une instance
+        """
+        if self.prototype is not None:
+            raise ValueError(f"{self.name} est déjà une instance : créez les instances depuis son prototype")
+        instance = Character(
+            id=id,
+            name=name,
+            type=self.type,
+            faction=self.faction,
+            image_id=self.image_id,
+            notes=self.notes,
+            seed=self.seed,
+            **{field_name: getattr(self, field_name) for field_name in PROTOTYPE_FIELDS}
+        )
+        instance.link_prototype(self)
+        return instance
+
+    def shared_fields(self) -> Tuple[str, ...]:
+        """Champs encore partagés avec le prototype"""
+        prototype = self.prototype_character
+        if prototype is None:
+            return ()
+        return tuple(name for name in PROTOTYPE_FIELDS if getattr(self, name) is getattr(prototype, name))
+
+    def materialize(self, *names: str) -> None:
+        """Copie les champs partagés avant de les modifier sur place (tous par défaut)
+
+        À appeler avant toute écriture dans un sous-objet (`combat.current_life_points`,
+        `valuables.items`...) : sans cela, la modification toucherait le prototype et
+        toutes ses instances. Remplacer un champ entier ne demande aucune copie.
+        """
+        shared = self.shared_fields()
+        for name in names or PROTOTYPE_FIELDS:
+            if name in shared:
+                setattr(self, name, copy.deepcopy(getattr(self, name)))
+
+    def share_unchanged(self) -> int:
+        """Partage à nouveau les champs redevenus identiques à ceux du prototype
+
+        Returns:
+            Nombre de champs de nouveau partagés
+        """
+        prototype = self.prototype_character
+        if prototype is None:
+            return 0
+        shared = 0
+        for name in PROTOTYPE_FIELDS:
+            value = getattr(prototype, name)
+            if getattr(self, name) is not value and getattr(self, name) == value:
+                setattr(self, name, value)
+                shared += 1
+        return shared
 
+    def detach(self) -> None:
+        """Rend une instance indépendante de son prototype (copie des champs partagés)"""
+        self.materialize()
+        self.link_prototype(None)
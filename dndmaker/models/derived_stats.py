@@ -0,0 +1,84 @@
+"""
+Statistiques dérivées des personnages
+Modificateurs, défense totale et bonus d'attaque calculés à la lecture depuis les
+champs courants du personnage (rien n'est conservé, donc rien n'est jamais périmé).
+"""
+
+from typing import Optional, Tuple
+
+# Index des caractéristiques dans le tableau compact (ordre de CHARACTERISTIC_NAMES)
+_STRENGTH, _DEXTERITY = 0, 1
+
+
+def ability_modifier(value: int) -> int:
+    """Modificateur d'une caractéristique selon les règles Chroniques Oubliées"""
+    # Modificateur = (valeur - 10) / 2, arrondi vers le bas
+    return (value - 10) // 2
+
+
+def parse_bonus(text: str, fallback: int) -> int:
+    """Lit un bonus saisi librement ("3 + 2", "+5") ; `fallback` si vide ou illisible"""
+    from ..core.dice import compile_dice
+    try:
+        expression = compile_dice(str(text).replace("+-", "-").replace("+ -", "-"))
+    except ValueError:
+        return fallback
+    # Un bonus ne contient pas de dés : seule la partie fixe compte
+    return expression.modifier if not expression.terms else fallback
+
+
+class DerivedStats:
+    """Statistiques dérivées d'un personnage (`character.derived`)
+
+    Vue sans état : chaque lecture recalcule la valeur depuis les champs du personnage,
+    pour quelques additions seulement. La défense utilise le modificateur DEX courant
+    plutôt que celui enregistré dans DefenseStats, qui peut être périmé. Les PV maximum
+    ne sont pas dérivés : seule la valeur saisie (`combat.life_points`) fait foi.
+    """
+
+    __slots__ = ('_character',)
+
+    def __init__(self, character):
+        self._character = character
+
+    @property
+    def modifiers(self) -> Tuple[int, ...]:
+        """Les six modificateurs, dans l'ordre de CHARACTERISTIC_NAMES"""
+        return tuple(ability_modifier(value) for value in self._character.characteristics._values)
+
+    def modifier(self, name: str) -> int:
+        """Modificateur d'une caractéristique ('strength', 'dexterity', ...)"""
+        from .character import CHARACTERISTIC_NAMES
+        return ability_modifier(self._character.characteristics._values[CHARACTERISTIC_NAMES.index(name)])
+
+    @property
+    def defense_total(self) -> int:
+        """Défense totale : base + armure + bouclier + mod. DEX + divers"""
+        character = self._character
+        return character.defense.calculate_total(ability_modifier(character.characteristics._values[_DEXTERITY]))
+
+    def _attack(self, name: str, ability: Optional[int]) -> int:
+        character = self._character
+        modifier = ability_modifier(character.characteristics._values[ability]) if ability is not None else 0
+        return parse_bonus(getattr(character.combat, name), modifier + character.profile.level)
+
+    @property
+    def melee_attack(self) -> int:
+        """Bonus d'attaque au contact (saisi, sinon FOR + NIV)"""
+        return self._attack('melee_attack', _STRENGTH)
+
+    @property
+    def ranged_attack(self) -> int:
+        """Bonus d'attaque à distance (saisi, sinon DEX + NIV)"""
+        return self._attack('ranged_attack', _DEXTERITY)
+
+    @property
+    def magic_attack(self) -> int:
+        """Bonus d'attaque magique (saisi, sinon NIV)"""
+        return self._attack('magic_attack', None)
+
+    @property
+    def initiative(self) -> int:
+        """Initiative (saisie, sinon valeur de DEX)"""
+        character = self._character
+        return parse_bonus(character.combat.initiative, character.characteristics._values[_DEXTERITY])
@@ -31,7 +31,7 @@ class Scene:
     images: List[str] = field(default_factory=list)  # IDs d'images
     image_id: Optional[str] = None  # ID de l'image principale associée
     referenced_scenes: List[str] = field(default_factory=list)  # IDs de scènes référencées
-    sessions: List[str] = field(default_factory=list)  # IDs de sessions
+    sessions: List[str] = field(default_factory=list)  # IDs de sessions (tenu à jour par SessionService)
     notes: str = ""
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
@@ -0,0 +1,204 @@
+"""
+Import / export en masse des banques de données (CSV et JSONL)
+Lecture et écriture en flux, ligne par ligne
+"""
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+import math
+
+from ..models.bank import DataBank
+
+# Préfixe des colonnes CSV contenant des métadonnées
+METADATA_PREFIX = "meta."
+
+SUPPORTED_FORMATS = ("csv", "jsonl")
+
+
+@dataclass
+class ImportReport:
+    """Rapport d'import d'entrées dans une banque"""
+    added: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    dry_run: bool = False
+    errors: List[Tuple[int, str]] = field(default_factory=list)  # (ligne, message)
+
+    @property
+    def total(self) -> int:
+        """Nombre de lignes traitées"""
+        return self.added + self.duplicates + self.invalid
+
+    def summary(self) -> str:
+        """Résumé lisible du rapport"""
+        prefix = "[Simulation] " if self.dry_run else ""
+        return (
+            f"{prefix}{self.added} ajoutée(s), {self.duplicates} doublon(s), "
+            f"{self.invalid} invalide(s) sur {self.total} ligne(s)"
+        )
+
+
+def detect_format(path: Path, explicit: Optional[str] = None) -> str:
+    """Détermine le format d'un fichier (explicite ou d'après l'extension)"""
+    fmt = (explicit or Path(path).suffix.lstrip('.')).lower()
+    if fmt == "json":
+        fmt = "jsonl"
+    if fmt not in SUPPORTED_FORMATS:
+        raise ValueError(f"Format non supporté: {fmt} (attendu: {', '.join(SUPPORTED_FORMATS)})")
+    return fmt
+
+
+def validate_row(row: Dict) -> Optional[str]:
+    """Valide une ligne d'import, retourne un message d'erreur ou None"""
+    value = row.get('value')
+    if not isinstance(value, str) or not value.strip():
+        return "valeur manquante"
+    if not isinstance(row.get('metadata', {}), dict):
+        return "métadonnées invalides"
+    weight = row.get('weight', 1.0)
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)) \
+            or not math.isfinite(weight) or weight < 0:
+        return f"poids invalide: {weight!r}"
+    return None
+
+
+class BankImporter:
+    """Lecture en flux de fichiers d'entrées de banque"""
+
+    @staticmethod
+    def iter_rows(path: Path, fmt: Optional[str] = None) -> Iterator[Tuple[int, Dict]]:
+        """Itère sur les lignes d'un fichier (numéro de ligne, données brutes)"""
+        fmt = detect_format(path, fmt)
+        if fmt == "csv":
+            return BankImporter.iter_csv(path)
+        return BankImporter.iter_jsonl(path)
+
+    @staticmethod
+    def iter_csv(path: Path) -> Iterator[Tuple[int, Dict]]:
+        """Lit un CSV: colonne `value`, colonne `weight` optionnelle, colonnes `meta.<clé>`"""
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            reader = csv.DictReader(f)
+            for line_number, record in enumerate(reader, start=2):
+                row: Dict = {'value': (record.get('value') or '').strip(), 'metadata': {}}
+                weight = (record.get('weight') or '').strip()
+                if weight:
+                    try:
+                        row['weight'] = float(weight)
+                    except ValueError:
+                        row['weight'] = weight  # Sera rejeté par la validation
+                for column, cell in record.items():
+                    if column and column.startswith(METADATA_PREFIX) and cell not in (None, ''):
+                        row['metadata'][column[len(METADATA_PREFIX):]] = _decode_cell(cell)
+                yield line_number, row
+
+    @staticmethod
+    def iter_jsonl(path: Path) -> Iterator[Tuple[int, Dict]]:
+        """Lit un JSONL: un objet {"value", "metadata", "weight"} par ligne"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, {'error': f"JSON invalide: {e.msg}"}
+                    continue
+                if isinstance(data, str):
+                    data = {'value': data}
+                if not isinstance(data, dict):
+                    yield line_number, {'error': "objet JSON attendu"}
+                    continue
+                row = {'value': data.get('value'), 'metadata': data.get('metadata', {})}
+                if 'weight' in data:
+                    row['weight'] = data['weight']
+                yield line_number, row
+
+
+class BankExporter:
+    """Écriture en flux des entrées d'une banque"""
+
+    @staticmethod
+    def export(bank: DataBank, path: Path, fmt: Optional[str] = None) -> int:
+        """Exporte une banque, retourne le nombre d'entrées écrites"""
+        fmt = detect_format(path, fmt)
+        if fmt == "csv":
+            return BankExporter.export_csv(bank, path)
+        return BankExporter.export_jsonl(bank, path)
+
+    @staticmethod
+    def export_csv(bank: DataBank, path: Path) -> int:
+        """Exporte une banque en CSV avec une colonne par clé de métadonnée"""
+        metadata_keys: Dict[str, None] = {}
+        for entry in bank.entries:
+            for key in entry.metadata:
+                metadata_keys.setdefault(key, None)
+        columns = ['value', 'weight'] + [METADATA_PREFIX + key for key in metadata_keys]
+
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for entry in bank.entries:
+                writer.writerow(
+                    [entry.value, entry.weight]
+                    + [_encode_cell(entry.metadata.get(key)) for key in metadata_keys]
+                )
+        return len(bank.entries)
+
+    @staticmethod
+    def export_jsonl(bank: DataBank, path: Path) -> int:
+        """Exporte une banque en JSONL (une entrée par ligne)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for entry in bank.entries:
+                record = {'value': entry.value, 'weight': entry.weight, 'metadata': entry.metadata}
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write('\n')
+        return len(bank.entries)
+
+
+def _encode_cell(value) -> str:
+    """Encode une métadonnée pour une cellule CSV (JSON pour les types non textuels)"""
+    if value is None:
+        return ''
+    if isinstance(value, str) and _decode_cell(value) == value:
+        return value
+    # Les types non textuels (et les textes ambigus comme "0") sont encodés en JSON
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _decode_cell(cell: str):
+    """Décode une cellule CSV (JSON si possible, texte sinon)"""
+    if cell[:1] in '[{"' or cell in ('true', 'false', 'null') or _looks_numeric(cell):
+        try:
+            return json.loads(cell)
+        except json.JSONDecodeError:
+            pass
+    return cell
+
+
+def _looks_numeric(cell: str) -> bool:
+    """Indique si une cellule ressemble à un nombre JSON"""
+    if not cell or cell[0] not in '-0123456789':
+        return False
+    digits = cell.lstrip('-')
+    if len(digits) > 1 and digits[0] == '0' and digits[1] != '.':
+        return False  # Préserver les zéros initiaux ("007")
+    try:
+        float(cell)
+    except ValueError:
+        return False
+    return True
+
+
+def iter_valid_rows(rows: Iterable[Tuple[int, Dict]], report: ImportReport) -> Iterator[Tuple[int, Dict]]:
+    """Filtre les lignes invalides en les consignant dans le rapport"""
+    for line_number, row in rows:
+        error = row.get('error') or validate_row(row)
+        if error:
+            report.invalid += 1
+            report.errors.append((line_number, error))
+            continue
+        yield line_number, row
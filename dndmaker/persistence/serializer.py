@@ -2,7 +2,8 @@
 Sérialisation/désérialisation des modèles
 """
 
-from typing import Any, Dict, Set
+from functools import lru_cache
+from typing import Any, Dict, Set, Tuple
 from datetime import datetime
 from enum import Enum
 import json
@@ -16,11 +17,33 @@ class JSONEncoder(json.JSONEncoder):
             return obj.isoformat()
         if isinstance(obj, Enum):
             return obj.value
-        if hasattr(obj, '__dict__'):
-            return obj.__dict__
+        if hasattr(obj, '_asdict'):
+            return obj._asdict()
+        attributes = _attributes(obj)
+        if attributes is not None:
+            return dict(attributes)
         return super().default(obj)
 
 
+def _attributes(model: Any):
+    """Attributs d'un objet (depuis __dict__ ou __slots__), None pour un objet sans attributs"""
+    if hasattr(model, '__dict__'):
+        return list(model.__dict__.items())
+    names = _slot_names(type(model))
+    if not names:
+        return None
+    return [(name, getattr(model, name)) for name in names if hasattr(model, name)]
+
+
+@lru_cache(maxsize=None)
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Noms des __slots__ publics d'une classe et de ses parents"""
+    return tuple(
+        name for klass in cls.__mro__ for name in getattr(klass, '__slots__', ())
+        if not name.startswith('_')
+    )
+
+
 def serialize_model(model: Any, visited: Set[int] = None) -> Any:
     """Sérialise un modèle en dictionnaire ou valeur primitive
     
@@ -60,10 +83,15 @@ def serialize_model(model: Any, visited: Set[int] = None) -> Any:
         if isinstance(model, dict):
             return {k: serialize_model(v, visited) for k, v in model.items()}
         
-        # Gérer les objets avec __dict__ (dataclasses, etc.)
-        if hasattr(model, '__dict__'):
+        # Objets compacts qui fournissent leur propre vue (ex: Characteristics)
+        if hasattr(model, '_asdict'):
+            return serialize_model(model._asdict(), visited)
+        
+        # Gérer les objets avec __dict__ ou __slots__ (dataclasses, etc.)
+        attributes = _attributes(model)
+        if attributes is not None:
             result = {}
-            for key, value in model.__dict__.items():
+            for key, value in attributes:
                 # Ignorer les attributs privés (sauf __dict__ lui-même)
                 if key.startswith('_') and key != '__dict__':
                     continue
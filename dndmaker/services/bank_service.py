@@ -2,9 +2,16 @@
 Service de gestion des banques de données
 """
 
-from typing import List, Optional
+import random
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from ..models.bank import DataBank, BankEntry, BankType
-from ..core.utils import generate_id
+from ..core.utils import generate_id, normalize_key
+from ..core.sampling import AliasSampler
+from ..persistence.bank_io import BankImporter, BankExporter, ImportReport, iter_valid_rows
+
+# Comportements possibles à l'insertion d'une valeur déjà présente (à la normalisation près)
+DUPLICATE_POLICIES = ("allow", "reject", "merge")
 
 
 class BankService:
@@ -14,10 +21,16 @@ class BankService:
         """Initialise le service avec une référence au ProjectService"""
         self.project_service = project_service
         self._banks: dict[str, DataBank] = {}
+        # Échantillonneurs par (banque, filtre), reconstruits à la demande après mutation
+        self._samplers: dict[tuple, tuple[int, AliasSampler]] = {}
+        # Index des clés canoniques par banque : bank_id -> (nb d'entrées, {clé: entrée})
+        self._key_indexes: dict[str, tuple[int, dict[str, BankEntry]]] = {}
     
     def load_banks(self, banks_data: List[dict]) -> None:
         """Charge les banques depuis les données du projet"""
         self._banks = {}
+        self._samplers = {}
+        self._key_indexes = {}
         for bank_data in banks_data:
             bank = self._deserialize_bank(bank_data)
             self._banks[bank.id] = bank
@@ -58,28 +71,128 @@ class BankService:
         if bank.id not in self._banks:
             raise ValueError(f"Banque {bank.id} introuvable")
         self._banks[bank.id] = bank
+        self._invalidate_caches(bank.id)
     
     def delete_bank(self, bank_id: str) -> bool:
         """Supprime une banque"""
         if bank_id not in self._banks:
             return False
         del self._banks[bank_id]
+        self._invalidate_caches(bank_id)
         return True
     
-    def add_entry_to_bank(self, bank_id: str, value: str, metadata: Optional[dict] = None) -> BankEntry:
-        """Ajoute une entrée à une banque"""
+    def add_entry_to_bank(
+        self,
+        bank_id: str,
+        value: str,
+        metadata: Optional[dict] = None,
+        weight: float = 1.0,
+        on_duplicate: str = "allow"
+    ) -> BankEntry:
+        """Ajoute une entrée à une banque
+        
+        Args:
+            bank_id: ID de la banque
+            value: Valeur de l'entrée
+            metadata: Métadonnées de l'entrée
+            weight: Poids relatif pour les tirages aléatoires
+            on_duplicate: Si une entrée équivalente existe déjà (casse, accents et espaces ignorés) :
+                "allow" ajoute quand même, "reject" lève une ValueError,
+                "merge" complète l'entrée existante et la retourne
+        """
+        if on_duplicate not in DUPLICATE_POLICIES:
+            raise ValueError(f"Comportement inconnu pour les doublons: {on_duplicate}")
+        
         bank = self.get_bank(bank_id)
         if not bank:
             raise ValueError(f"Banque {bank_id} introuvable")
         
+        if on_duplicate != "allow":
+            existing = self.find_duplicate(bank_id, value)
+            if existing:
+                if on_duplicate == "reject":
+                    raise ValueError(f"L'entrée '{value}' existe déjà dans cette banque ('{existing.value}')")
+                self._merge_entry(existing, metadata or {}, weight)
+                self._invalidate_caches(bank_id)
+                return existing
+        
         entry = BankEntry(
             id=generate_id(),
             value=value,
-            metadata=metadata or {}
+            metadata=metadata or {},
+            weight=weight
         )
         bank.entries.append(entry)
+        self._invalidate_samplers(bank_id)
+        
+        # Mise à jour incrémentale de l'index des clés (sans reconstruction)
+        cached = self._key_indexes.get(bank_id)
+        if cached and cached[0] == len(bank.entries) - 1:
+            cached[1].setdefault(normalize_key(value), entry)
+            self._key_indexes[bank_id] = (len(bank.entries), cached[1])
+        return entry
+    
+    def find_duplicate(self, bank_id: str, value: str, exclude_id: Optional[str] = None) -> Optional[BankEntry]:
+        """Recherche en O(1) une entrée équivalente à une valeur (casse, accents et espaces ignorés)
+        
+        Args:
+            bank_id: ID de la banque
+            value: Valeur à rechercher
+            exclude_id: ID d'une entrée à ignorer (l'entrée en cours d'édition)
+        """
+        bank = self.get_bank(bank_id)
+        if not bank:
+            return None
+        entry = self._get_key_index(bank).get(normalize_key(value))
+        if entry is None or entry.id == exclude_id:
+            return None
         return entry
     
+    def find_duplicate_groups(self, bank_id: str) -> List[Tuple[BankEntry, List[BankEntry]]]:
+        """Regroupe les entrées équivalentes d'une banque
+        
+        Returns:
+            Liste de (entrée conservée, doublons), la première entrée rencontrée étant conservée
+        """
+        bank = self.get_bank(bank_id)
+        if not bank:
+            return []
+        
+        groups: Dict[str, Tuple[BankEntry, List[BankEntry]]] = {}
+        for entry in bank.entries:
+            key = normalize_key(entry.value)
+            if key in groups:
+                groups[key][1].append(entry)
+            else:
+                groups[key] = (entry, [])
+        return [group for group in groups.values() if group[1]]
+    
+    def dedupe_bank(self, bank_id: str) -> Dict[str, str]:
+        """Fusionne les entrées équivalentes d'une banque
+        
+        Les métadonnées manquantes de l'entrée conservée sont complétées par celles des doublons.
+        
+        Returns:
+            Correspondance {valeur supprimée: valeur conservée} pour réécrire les références
+        """
+        bank = self.get_bank(bank_id)
+        if not bank:
+            return {}
+        
+        renames: Dict[str, str] = {}
+        removed_ids = set()
+        for kept, duplicates in self.find_duplicate_groups(bank_id):
+            for duplicate in duplicates:
+                self._merge_entry(kept, duplicate.metadata, duplicate.weight)
+                removed_ids.add(duplicate.id)
+                if duplicate.value != kept.value:
+                    renames[duplicate.value] = kept.value
+        
+        if removed_ids:
+            bank.entries = [e for e in bank.entries if e.id not in removed_ids]
+            self._invalidate_caches(bank_id)
+        return renames
+    
     def remove_entry_from_bank(self, bank_id: str, entry_id: str) -> bool:
         """Supprime une entrée d'une banque"""
         bank = self.get_bank(bank_id)
@@ -87,9 +200,17 @@ class BankService:
             return False
         
         bank.entries = [e for e in bank.entries if e.id != entry_id]
+        self._invalidate_caches(bank_id)
         return True
     
-    def update_entry(self, bank_id: str, entry_id: str, value: str, metadata: Optional[dict] = None) -> bool:
+    def update_entry(
+        self,
+        bank_id: str,
+        entry_id: str,
+        value: str,
+        metadata: Optional[dict] = None,
+        weight: Optional[float] = None
+    ) -> bool:
         """Met à jour une entrée d'une banque"""
         bank = self.get_bank(bank_id)
         if not bank:
@@ -102,16 +223,214 @@ class BankService:
         entry.value = value
         if metadata is not None:
             entry.metadata = metadata
+        if weight is not None:
+            entry.weight = weight
         
+        self._invalidate_caches(bank_id)
         return True
     
-    def get_random_entry(self, bank_type: BankType) -> Optional[str]:
-        """Récupère une entrée aléatoire d'une banque"""
-        import random
+    def import_entries(
+        self,
+        bank_type: BankType,
+        rows: Iterable[Tuple[int, Dict]],
+        dry_run: bool = False,
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> ImportReport:
+        """Importe des entrées en masse dans une banque
+        
+        Args:
+            bank_type: Type de banque cible (créée si nécessaire)
+            rows: Lignes (numéro de ligne, {value, metadata, weight}) lues en flux
+            dry_run: Si True, valide et compte sans rien insérer
+            batch_size: Nombre d'entrées retenues entre deux appels à progress
+            progress: Appelé après chaque lot avec le nombre de lignes traitées
+        
+        Les lignes invalides et les doublons (avec la banque ou dans le fichier) sont
+        ignorés et consignés dans le rapport.
+        """
+        report, entries = self.prepare_entries(bank_type, rows, dry_run, batch_size, progress)
+        if not dry_run:
+            self.apply_entries(bank_type, entries, report)
+        return report
+    
+    def prepare_entries(
+        self,
+        bank_type: BankType,
+        rows: Iterable[Tuple[int, Dict]],
+        dry_run: bool = False,
+        batch_size: int = 1000,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Tuple[ImportReport, List[BankEntry]]:
+        """Valide et construit les entrées d'un import sans modifier la banque
+        
+        Ne fait que lire la banque (ni insertion, ni cache) : peut s'exécuter dans un
+        thread de travail, les entrées étant ensuite insérées par apply_entries depuis
+        le thread principal. En simulation, aucune entrée n'est construite.
+        """
+        report = ImportReport(dry_run=dry_run)
+        bank = self.get_bank_by_type(bank_type)
+        seen_keys = {normalize_key(entry.value) for entry in list(bank.entries)} if bank else set()
+        
+        entries: List[BankEntry] = []
+        for line_number, row in iter_valid_rows(rows, report):
+            value = row['value'].strip()
+            key = normalize_key(value)
+            if key in seen_keys:
+                report.duplicates += 1
+                continue
+            seen_keys.add(key)
+            report.added += 1
+            if not dry_run:
+                entries.append(BankEntry(
+                    id=generate_id(),
+                    value=value,
+                    metadata=row.get('metadata') or {},
+                    weight=float(row.get('weight', 1.0))
+                ))
+            if progress and report.added % batch_size == 0:
+                progress(report.total)
+        
+        if progress:
+            progress(report.total)
+        return report, entries
+    
+    def apply_entries(self, bank_type: BankType, entries: List[BankEntry], report: ImportReport) -> ImportReport:
+        """Insère les entrées préparées par prepare_entries (thread principal)
+        
+        Les valeurs ajoutées à la banque depuis la préparation sont recomptées comme doublons.
+        """
+        bank = self.get_bank_by_type(bank_type) or self.create_bank(bank_type)
+        key_index = self._get_key_index(bank)
+        added = [entry for entry in entries if normalize_key(entry.value) not in key_index]
+        report.duplicates += len(entries) - len(added)
+        report.added -= len(entries) - len(added)
+        bank.entries.extend(added)
+        self._invalidate_caches(bank.id)
+        return report
+    
+    def import_file(
+        self,
+        bank_type: BankType,
+        path: Path,
+        fmt: Optional[str] = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> ImportReport:
+        """Importe un fichier CSV ou JSONL dans une banque"""
+        return self.import_entries(
+            bank_type, BankImporter.iter_rows(Path(path), fmt), dry_run=dry_run, progress=progress
+        )
+    
+    def prepare_file(
+        self,
+        bank_type: BankType,
+        path: Path,
+        fmt: Optional[str] = None,
+        dry_run: bool = False,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Tuple[ImportReport, List[BankEntry]]:
+        """Lit et valide un fichier CSV ou JSONL sans modifier la banque (voir prepare_entries)"""
+        return self.prepare_entries(
+            bank_type, BankImporter.iter_rows(Path(path), fmt), dry_run=dry_run, progress=progress
+        )
+    
+    def export_file(self, bank_type: BankType, path: Path, fmt: Optional[str] = None) -> int:
+        """Exporte une banque en CSV ou JSONL, retourne le nombre d'entrées écrites"""
+        bank = self.get_bank_by_type(bank_type)
+        if not bank:
+            raise ValueError(f"Banque {bank_type.value} introuvable")
+        return BankExporter.export(bank, Path(path), fmt)
+    
+    def get_sampler(self, bank_type: BankType, where: Optional[dict] = None) -> Optional[AliasSampler]:
+        """Récupère l'échantillonneur pondéré d'une banque (ou d'un sous-ensemble filtré)
+        
+        Args:
+            bank_type: Type de banque
+            where: Filtre sur les métadonnées ({clé: valeur}, comparaison insensible à la casse)
+        
+        L'échantillonneur est mis en cache et reconstruit uniquement après une mutation de la banque.
+        """
         bank = self.get_bank_by_type(bank_type)
-        if not bank or not bank.entries:
+        if not bank:
             return None
-        return random.choice(bank.entries).value
+        
+        key = (bank.id, tuple(sorted((k, str(v).upper()) for k, v in (where or {}).items())))
+        cached = self._samplers.get(key)
+        # Le nombre d'entrées protège contre les ajouts directs dans bank.entries
+        if cached and cached[0] == len(bank.entries):
+            return cached[1]
+        
+        entries = [e for e in bank.entries if self._entry_matches(e, where)] if where else bank.entries
+        sampler = AliasSampler(entries, [e.weight for e in entries])
+        self._samplers[key] = (len(bank.entries), sampler)
+        return sampler
+    
+    def sample_entries(
+        self,
+        bank_type: BankType,
+        count: int = 1,
+        replace: bool = True,
+        where: Optional[dict] = None,
+        rng: Optional[random.Random] = None
+    ) -> List[BankEntry]:
+        """Tire plusieurs entrées pondérées d'une banque
+        
+        Args:
+            bank_type: Type de banque
+            count: Nombre d'entrées à tirer
+            replace: Tirage avec remise (True) ou sans remise (False)
+            where: Filtre sur les métadonnées
+            rng: Générateur aléatoire à utiliser
+        """
+        sampler = self.get_sampler(bank_type, where)
+        if not sampler:
+            return []
+        return sampler.draw_many(count, replace=replace, rng=rng)
+    
+    def get_random_entry(self, bank_type: BankType, where: Optional[dict] = None) -> Optional[str]:
+        """Récupère une entrée aléatoire (pondérée) d'une banque"""
+        entries = self.sample_entries(bank_type, 1, where=where)
+        return entries[0].value if entries else None
+    
+    def _invalidate_caches(self, bank_id: str) -> None:
+        """Invalide les échantillonneurs et l'index des clés d'une banque après mutation"""
+        self._invalidate_samplers(bank_id)
+        self._key_indexes.pop(bank_id, None)
+    
+    def _invalidate_samplers(self, bank_id: str) -> None:
+        """Invalide les échantillonneurs d'une banque"""
+        for key in [k for k in self._samplers if k[0] == bank_id]:
+            del self._samplers[key]
+    
+    def _get_key_index(self, bank: DataBank) -> Dict[str, BankEntry]:
+        """Récupère (ou reconstruit) l'index des clés canoniques d'une banque"""
+        cached = self._key_indexes.get(bank.id)
+        # Le nombre d'entrées protège contre les ajouts directs dans bank.entries
+        if cached and cached[0] == len(bank.entries):
+            return cached[1]
+        
+        index: Dict[str, BankEntry] = {}
+        for entry in bank.entries:
+            index.setdefault(normalize_key(entry.value), entry)
+        self._key_indexes[bank.id] = (len(bank.entries), index)
+        return index
+    
+    @staticmethod
+    def _merge_entry(target: BankEntry, metadata: dict, weight: float) -> None:
+        """Complète une entrée avec les métadonnées et le poids d'un doublon"""
+        for key, value in metadata.items():
+            if target.metadata.get(key) in (None, '', [], {}):
+                target.metadata[key] = value
+        target.weight = max(target.weight, weight)
+    
+    @staticmethod
+    def _entry_matches(entry: BankEntry, where: dict) -> bool:
+        """Vérifie qu'une entrée correspond au filtre de métadonnées"""
+        for key, expected in where.items():
+            if str(entry.metadata.get(key, '')).upper() != str(expected).upper():
+                return False
+        return True
     
     def _deserialize_bank(self, data: dict) -> DataBank:
         """Désérialise une banque depuis un dictionnaire"""
@@ -120,7 +439,8 @@ class BankService:
             entries.append(BankEntry(
                 id=entry_data['id'],
                 value=entry_data['value'],
-                metadata=entry_data.get('metadata', {})
+                metadata=entry_data.get('metadata', {}),
+                weight=entry_data.get('weight', 1.0)
             ))
         
         bank = DataBank(
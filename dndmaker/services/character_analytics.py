@@ -0,0 +1,246 @@
+"""
+Statistiques de campagne sur les personnages
+Les champs numériques des personnages sont rangés en colonnes compactes (une ligne par
+personnage) : moyennes par groupe, classements et histogrammes sont calculés par
+vecteurs avec NumPy, ou par une boucle sur les colonnes sans NumPy.
+"""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.character import CHARACTERISTIC_NAMES, Character, CharacterType
+from ..models.derived_stats import ability_modifier
+from ..core.numeric import np
+
+_DEXTERITY = CHARACTERISTIC_NAMES.index('dexterity')
+
+# Colonnes numériques, dans l'ordre, avec la façon de les lire sur un personnage
+COLUMNS = (
+    ('level', lambda c: c.profile.level),
+) + tuple(
+    (name, lambda c, index=index: c.characteristics._values[index])
+    for index, name in enumerate(CHARACTERISTIC_NAMES)
+) + (
+    ('life_points', lambda c: c.combat.life_points),
+    ('defense_base', lambda c: c.defense.base),
+    ('defense_armor', lambda c: c.defense.armor),
+    ('defense_shield', lambda c: c.defense.shield),
+    # Modificateur DEX courant (DefenseStats.dexterity peut être périmé)
+    ('defense_dexterity', lambda c: ability_modifier(c.characteristics._values[_DEXTERITY])),
+    ('defense_misc', lambda c: c.defense.misc),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+# Colonnes catégorielles : chaque valeur distincte reçoit un code entier
+CATEGORIES = ('type', 'faction')
+
+_TYPE_CODES = {character_type: code for code, character_type in enumerate(CharacterType)}
+
+
+class CharacterAnalytics:
+    """Colonnes des champs numériques des personnages, alignées par ID
+
+    Chaque colonne est un `array` d'entiers ; avec NumPy, les requêtes travaillent sur
+    une vue sans copie de ces tableaux. Les lignes sont mises à jour une à une
+    (update / discard) : CharacterService tient la vue à jour à chaque ajout,
+    modification ou suppression de personnage. Une ligne n'est relue qu'à l'appel de
+    update : les instances d'un prototype modifié, qui partagent ses caractéristiques,
+    y sont repassées avec lui.
+
+    Les filtres `where` sont des égalités {colonne: valeur} ; pour `type`, la valeur est
+    un CharacterType, pour `faction` un ID de faction (None : sans faction).
+    """
+
+    def __init__(self, characters: Iterable[Character] = (), use_numpy: bool = True):
+        """
+        Args:
+            characters: Personnages initiaux
+            use_numpy: Utiliser NumPy s'il est installé (False : boucles Python)
+        """
+        self.use_numpy = use_numpy and np is not None
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[str, array] = {name: array('i') for name in COLUMN_NAMES + CATEGORIES}
+        # Codes des factions (0 : sans faction)
+        self._faction_codes: Dict[Optional[str], int] = {None: 0}
+        self._factions: List[Optional[str]] = [None]
+        for character in characters:
+            self.update(character)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, character_id: str) -> bool:
+        return character_id in self._rows
+
+    # --- Mise à jour ---
+
+    def update(self, character: Character) -> None:
+        """Ajoute un personnage ou relit ses valeurs"""
+        values = [read(character) for _, read in COLUMNS]
+        values.append(_TYPE_CODES.get(character.type, 0))
+        values.append(self._faction_code(character.faction))
+        row = self._rows.get(character.id)
+        columns = self._columns
+        if row is None:
+            self._rows[character.id] = len(self._ids)
+            self._ids.append(character.id)
+            for name, value in zip(COLUMN_NAMES + CATEGORIES, values):
+                columns[name].append(value)
+        else:
+            for name, value in zip(COLUMN_NAMES + CATEGORIES, values):
+                columns[name][row] = value
+
+    def discard(self, character_id: str) -> bool:
+        """Retire un personnage (sa ligne est remplacée par la dernière)"""
+        row = self._rows.pop(character_id, None)
+        if row is None:
+            return False
+        last_id = self._ids.pop()
+        for column in self._columns.values():
+            last = column.pop()
+            if row < len(column):
+                column[row] = last
+        if last_id != character_id:
+            self._ids[row] = last_id
+            self._rows[last_id] = row
+        return True
+
+    def _faction_code(self, faction: Optional[str]) -> int:
+        code = self._faction_codes.get(faction)
+        if code is None:
+            code = self._faction_codes[faction] = len(self._factions)
+            self._factions.append(faction)
+        return code
+
+    # --- Requêtes ---
+
+    def count(self, where: Optional[dict] = None) -> int:
+        """Nombre de personnages correspondant au filtre"""
+        if self.use_numpy:
+            return int(self._mask(where).sum())
+        return len(self._matching_rows(where))
+
+    def mean(self, column: str, where: Optional[dict] = None) -> Optional[float]:
+        """Moyenne d'une colonne (None si aucun personnage ne correspond)"""
+        means = self.mean_by(column, None, where)
+        return means.get(None)
+
+    def mean_by(self, column: str, by: Optional[str], where: Optional[dict] = None) -> Dict[object, float]:
+        """Moyenne d'une colonne par groupe, ex: niveau moyen des PNJ par faction
+
+        Args:
+            column: Colonne numérique moyennée
+            by: Colonne catégorielle de regroupement ('type', 'faction') ou None
+            where: Filtre d'égalité
+        """
+        self._check(column, COLUMN_NAMES)
+        if by is not None:
+            self._check(by, CATEGORIES)
+        if self.use_numpy:
+            mask = self._mask(where)
+            values = self._array(column)[mask]
+            codes = self._array(by)[mask] if by is not None else np.zeros(len(values), dtype=np.intp)
+            sums = np.bincount(codes, weights=values)
+            counts = np.bincount(codes)
+            return {
+                self._label(by, code): float(sums[code] / counts[code])
+                for code in np.flatnonzero(counts)
+            }
+        sums: Dict[int, int] = {}
+        counts: Dict[int, int] = {}
+        values = self._columns[column]
+        codes = self._columns[by] if by is not None else None
+        for row in self._matching_rows(where):
+            code = codes[row] if codes is not None else 0
+            sums[code] = sums.get(code, 0) + values[row]
+            counts[code] = counts.get(code, 0) + 1
+        return {self._label(by, code): sums[code] / counts[code] for code in sorted(counts)}
+
+    def top(self, column: str, count: int = 10, where: Optional[dict] = None) -> List[Tuple[str, int]]:
+        """Personnages ayant les plus fortes valeurs d'une colonne, ex: créatures les plus fortes
+
+        Returns:
+            Liste de (ID, valeur), par valeur décroissante (ordre d'insertion en cas d'égalité)
+        """
+        self._check(column, COLUMN_NAMES)
+        if self.use_numpy:
+            rows = np.flatnonzero(self._mask(where))
+            values = self._array(column)[rows]
+            order = np.argsort(-values, kind='stable')[:count]
+            return [(self._ids[rows[i]], int(values[i])) for i in order]
+        values = self._columns[column]
+        rows = sorted(self._matching_rows(where), key=lambda row: -values[row])[:count]
+        return [(self._ids[row], values[row]) for row in rows]
+
+    def histogram(self, column: str, where: Optional[dict] = None) -> Dict[int, int]:
+        """Nombre de personnages par valeur d'une colonne, ex: histogramme des niveaux"""
+        self._check(column, COLUMN_NAMES)
+        if self.use_numpy:
+            values, counts = np.unique(self._array(column)[self._mask(where)], return_counts=True)
+            return {int(value): int(n) for value, n in zip(values, counts)}
+        histogram: Dict[int, int] = {}
+        values = self._columns[column]
+        for row in self._matching_rows(where):
+            histogram[values[row]] = histogram.get(values[row], 0) + 1
+        return dict(sorted(histogram.items()))
+
+    def column(self, name: str, where: Optional[dict] = None) -> List[int]:
+        """Valeurs d'une colonne, dans l'ordre des lignes"""
+        self._check(name, COLUMN_NAMES + CATEGORIES)
+        if self.use_numpy:
+            return self._array(name)[self._mask(where)].tolist()
+        values = self._columns[name]
+        return [values[row] for row in self._matching_rows(where)]
+
+    def ids(self, where: Optional[dict] = None) -> List[str]:
+        """IDs des personnages correspondant au filtre, dans l'ordre des lignes"""
+        if self.use_numpy:
+            return [self._ids[row] for row in np.flatnonzero(self._mask(where))]
+        return [self._ids[row] for row in self._matching_rows(where)]
+
+    # --- Outils internes ---
+
+    @staticmethod
+    def _check(name: str, allowed: Tuple[str, ...]) -> None:
+        if name not in allowed:
+            raise ValueError(f"Colonne inconnue: {name} (attendu : {', '.join(allowed)})")
+
+    def _code(self, column: str, value) -> Optional[int]:
+        """Code d'une valeur filtrée (None : aucune ligne ne peut correspondre)"""
+        if column == 'type':
+            return _TYPE_CODES.get(CharacterType(value) if isinstance(value, str) else value)
+        if column == 'faction':
+            return self._faction_codes.get(value)
+        self._check(column, COLUMN_NAMES)
+        return int(value)
+
+    def _label(self, by: Optional[str], code: int):
+        if by == 'type':
+            return list(CharacterType)[code]
+        if by == 'faction':
+            return self._factions[code]
+        return None
+
+    def _array(self, name: str):
+        """Vue NumPy (sans copie) d'une colonne"""
+        return np.frombuffer(self._columns[name], dtype=np.intc)
+
+    def _mask(self, where: Optional[dict]):
+        mask = np.ones(len(self._ids), dtype=bool)
+        for column, value in (where or {}).items():
+            code = self._code(column, value)
+            if code is None:
+                return np.zeros(len(self._ids), dtype=bool)
+            mask &= self._array(column) == code
+        return mask
+
+    def _matching_rows(self, where: Optional[dict]) -> List[int]:
+        rows = range(len(self._ids))
+        for column, value in (where or {}).items():
+            code = self._code(column, value)
+            if code is None:
+                return []
+            values = self._columns[column]
+            rows = [row for row in rows if values[row] == code]
+        return list(rows)
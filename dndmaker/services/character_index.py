@@ -0,0 +1,304 @@
+"""
+Index des personnages
+Index entretenus sur le type, le niveau, la race, la classe, la faction et le début du
+nom : filtres combinés, tri stable et pagination sans parcourir tous les personnages.
+"""
+
+import heapq
+from bisect import bisect_left, insort
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+from ..models.character import Character, CharacterType
+from ..core.utils import normalize_key
+
+# Valeur par défaut d'un filtre : aucun filtre (None filtre les personnages sans valeur)
+ANY = object()
+
+# Champs de tri ("-level" : niveau décroissant) ; le nom puis l'ID départagent toujours
+SORT_FIELDS = ('name', 'level', 'type', 'race', 'class', 'faction')
+DEFAULT_SORT = ('name',)
+
+_TYPE_ORDER = {character_type: order for order, character_type in enumerate(CharacterType)}
+
+
+@dataclass
+class CharacterPage:
+    """Page de résultats d'une requête"""
+    characters: List[Character] = field(default_factory=list)
+    total: int = 0  # Nombre total de personnages correspondant aux filtres
+    offset: int = 0
+    limit: Optional[int] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.offset + len(self.characters) < self.total
+
+
+class _Entry:
+    """Valeurs indexées d'un personnage (pour le retirer des index à la mise à jour)"""
+
+    __slots__ = ('type', 'level', 'race', 'character_class', 'faction', 'name')
+
+    def __init__(self, character: Character):
+        profile = character.profile
+        self.type = character.type
+        self.level = profile.level
+        self.race = normalize_key(profile.race or "")
+        self.character_class = normalize_key(profile.character_class or "")
+        self.faction = character.faction
+        self.name = normalize_key(character.name or "")
+
+    def key(self) -> tuple:
+        return (self.type, self.level, self.race, self.character_class, self.faction, self.name)
+
+
+class CharacterIndex:
+    """Index des personnages d'un projet, tenus à jour par CharacterService
+
+    Chaque index associe une valeur aux IDs des personnages qui la portent (dict
+    ordonné : l'ordre d'insertion est conservé). Les noms normalisés sont gardés triés
+    pour les recherches par préfixe et le tri par nom.
+    
+    Les valeurs indexées ne sont relues qu'à l'appel de update : tout personnage dont
+    une valeur change doit y être repassé, y compris les instances d'un prototype
+    modifié, qui partagent son profil (CharacterService._track s'en charge).
+    """
+
+    def __init__(self, characters: Iterable[Character] = ()):
+        self._characters: Dict[str, Character] = {}
+        self._entries: Dict[str, _Entry] = {}
+        self._by_type: Dict[CharacterType, Dict[str, None]] = {}
+        self._by_level: Dict[int, Dict[str, None]] = {}
+        self._by_race: Dict[str, Dict[str, None]] = {}
+        self._by_class: Dict[str, Dict[str, None]] = {}
+        self._by_faction: Dict[Optional[str], Dict[str, None]] = {}
+        self._names: List[Tuple[str, str]] = []  # (nom normalisé, ID), trié
+        characters = list(characters)
+        for character in characters:
+            self._insert(character, _Entry(character), sort_names=False)
+        self._names.sort()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # --- Mise à jour ---
+
+    def update(self, character: Character) -> None:
+        """Ajoute un personnage ou réindexe ses valeurs"""
+        entry = _Entry(character)
+        previous = self._entries.get(character.id)
+        if previous is not None:
+            self._characters[character.id] = character
+            if previous.key() == entry.key():
+                return
+            self._remove(character.id, previous)
+        self._insert(character, entry)
+
+    def discard(self, character_id: str) -> bool:
+        """Retire un personnage des index"""
+        entry = self._entries.get(character_id)
+        if entry is None:
+            return False
+        self._remove(character_id, entry)
+        return True
+
+    def _indexes(self, entry: _Entry):
+        return (
+            (self._by_type, entry.type),
+            (self._by_level, entry.level),
+            (self._by_race, entry.race),
+            (self._by_class, entry.character_class),
+            (self._by_faction, entry.faction),
+        )
+
+    def _insert(self, character: Character, entry: _Entry, sort_names: bool = True) -> None:
+        self._characters[character.id] = character
+        self._entries[character.id] = entry
+        for index, value in self._indexes(entry):
+            index.setdefault(value, {})[character.id] = None
+        if sort_names:
+            insort(self._names, (entry.name, character.id))
+        else:
+            self._names.append((entry.name, character.id))
+
+    def _remove(self, character_id: str, entry: _Entry) -> None:
+        del self._characters[character_id]
+        del self._entries[character_id]
+        for index, value in self._indexes(entry):
+            ids = index[value]
+            del ids[character_id]
+            if not ids:
+                del index[value]
+        position = bisect_left(self._names, (entry.name, character_id))
+        del self._names[position]
+
+    # --- Requêtes ---
+
+    def of_type(self, character_type: CharacterType) -> List[Character]:
+        """Personnages d'un type, dans l'ordre d'insertion"""
+        return [self._characters[i] for i in self._by_type.get(character_type, ())]
+
+    def query(
+        self,
+        type=ANY,
+        level=ANY,
+        race=ANY,
+        character_class=ANY,
+        faction=ANY,
+        name_prefix: Optional[str] = None,
+        sort: Union[str, Sequence[str]] = DEFAULT_SORT,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> CharacterPage:
+        """Filtre, trie et pagine les personnages
+
+        Args:
+            type: CharacterType (ou plusieurs)
+            level: Niveau exact ou bornes incluses (min, max), l'une pouvant être None
+            race, character_class: Valeur (ou plusieurs), casse et accents ignorés
+            faction: ID de faction (ou plusieurs) ; None pour les personnages sans faction
+            name_prefix: Début du nom (casse et accents ignorés)
+            sort: Champ (ou champs) de tri parmi SORT_FIELDS, "-" en tête pour un ordre décroissant
+            offset, limit: Pagination
+
+        Raises:
+            ValueError: Si un champ de tri est inconnu
+        """
+        sort = (sort,) if isinstance(sort, str) else tuple(sort) or DEFAULT_SORT
+        for key in sort:
+            if key.lstrip('-') not in SORT_FIELDS:
+                raise ValueError(f"Champ de tri inconnu: {key} (attendu : {', '.join(SORT_FIELDS)})")
+
+        candidates = self._candidates(type, level, race, character_class, faction, name_prefix)
+        total = len(self._entries) if candidates is None else len(candidates)
+        offset = max(0, offset)
+        end = None if limit is None else offset + max(0, limit)
+
+        if sort[0] == 'name':
+            # Parcours de la liste triée des noms : on s'arrête à la fin de la page
+            ids = self._by_name(candidates, name_prefix, end, sort[1:])
+        else:
+            ids = self._sorted(self._entries if candidates is None else candidates, sort, end)
+
+        page = ids[offset:end]
+        return CharacterPage(
+            characters=[self._characters[i] for i in page],
+            total=total,
+            offset=offset,
+            limit=limit
+        )
+
+    def _candidates(self, type, level, race, character_class, faction, name_prefix) -> Optional[Set[str]]:
+        """IDs correspondant aux filtres (None : tous les personnages)"""
+        groups: List[Iterable[str]] = []
+        if type is not ANY:
+            groups.append(self._union(self._by_type, _values(type, CharacterType)))
+        if level is not ANY:
+            if isinstance(level, (tuple, list)):
+                low, high = level
+                levels = [
+                    value for value in self._by_level
+                    if (low is None or value >= low) and (high is None or value <= high)
+                ]
+            else:
+                levels = [level]
+            groups.append(self._union(self._by_level, levels))
+        if race is not ANY:
+            groups.append(self._union(self._by_race, [normalize_key(v or "") for v in _values(race)]))
+        if character_class is not ANY:
+            groups.append(self._union(self._by_class, [normalize_key(v or "") for v in _values(character_class)]))
+        if faction is not ANY:
+            groups.append(self._union(self._by_faction, _values(faction)))
+        if name_prefix:
+            groups.append(set(i for _, i in self._name_range(name_prefix)))
+        if not groups:
+            return None
+        groups.sort(key=len)
+        result = set(groups[0])
+        for group in groups[1:]:
+            result.intersection_update(group)
+        return result
+
+    @staticmethod
+    def _union(index: dict, values: Iterable) -> Set[str]:
+        result: Set[str] = set()
+        for value in values:
+            result.update(index.get(value, ()))
+        return result
+
+    def _name_range(self, prefix: str) -> List[Tuple[str, str]]:
+        """Noms triés commençant par `prefix`"""
+        prefix = normalize_key(prefix)
+        start = bisect_left(self._names, (prefix, ""))
+        end = bisect_left(self._names, (prefix + "\uffff", ""))
+        return self._names[start:end]
+
+    def _by_name(
+        self,
+        candidates: Optional[Set[str]],
+        name_prefix: Optional[str],
+        end: Optional[int],
+        tie_breakers: Sequence[str]
+    ) -> List[str]:
+        names = self._name_range(name_prefix) if name_prefix else self._names
+        if tie_breakers:
+            # Départage secondaire : on trie chaque groupe de même nom
+            ids = [i for _, i in names if candidates is None or i in candidates]
+            return self._sorted(ids, ('name',) + tuple(tie_breakers), end)
+        ids = []
+        for _, character_id in names:
+            if candidates is None or character_id in candidates:
+                ids.append(character_id)
+                if end is not None and len(ids) >= end:
+                    break
+        return ids
+
+    def _sorted(self, ids: Iterable[str], sort: Sequence[str], end: Optional[int]) -> List[str]:
+        """Trie des IDs selon les champs demandés (nom puis ID en dernier recours)"""
+        entries = self._entries
+        descending_text = any(key.startswith('-') and key[1:] not in ('level', 'type') for key in sort)
+        if descending_text:
+            # Tri en plusieurs passes stables, de la clé la moins prioritaire à la plus prioritaire
+            result = sorted(ids, key=lambda i: (entries[i].name, i))
+            for key in reversed(sort):
+                name = key.lstrip('-')
+                result.sort(key=lambda i: _sort_value(entries[i], name), reverse=key.startswith('-'))
+            return result if end is None else result[:end]
+
+        def composite(character_id: str) -> tuple:
+            entry = entries[character_id]
+            values = []
+            for key in sort:
+                value = _sort_value(entry, key.lstrip('-'))
+                values.append(-value if key.startswith('-') else value)
+            return tuple(values) + (entry.name, character_id)
+
+        if end is None:
+            return sorted(ids, key=composite)
+        return heapq.nsmallest(end, ids, key=composite)
+
+
+def _values(value, kind: type = None) -> list:
+    """Un filtre peut porter sur une valeur ou sur plusieurs"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        values = list(value)
+    else:
+        values = [value]
+    if kind is CharacterType:
+        values = [CharacterType(v) if isinstance(v, str) else v for v in values]
+    return values
+
+
+def _sort_value(entry: _Entry, name: str):
+    if name == 'name':
+        return entry.name
+    if name == 'level':
+        return entry.level
+    if name == 'type':
+        return _TYPE_ORDER.get(entry.type, 0)
+    if name == 'race':
+        return entry.race
+    if name == 'class':
+        return entry.character_class
+    return entry.faction or ""
@@ -2,12 +2,56 @@
 Service de gestion des personnages (PJ/PNJ/Créatures)
 """
 
-from typing import List, Optional
+import copy
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 from datetime import datetime
 
+from ..models.bank import BankType
 from ..models.character import Character, CharacterType
 from ..core.utils import generate_id
 
+# Champs des personnages alimentés par chaque banque (générateurs de PNJ et de trésors)
+BANK_REFERENCE_FIELDS: Dict[BankType, Tuple[str, ...]] = {
+    BankType.WEAPONS: ('weapons', 'equipment'),
+    BankType.ARMORS: ('equipment',),
+    BankType.TOOLS: ('equipment',),
+    BankType.TRINKETS: ('valuables',),
+    BankType.RACES: ('race',),
+    BankType.CLASSES: ('character_class',),
+    BankType.PROFESSIONS: ('profession',),
+}
+
+
+@dataclass
+class BulkChange:
+    """Résultat d'une opération en masse, annulable tant qu'elle n'est pas sauvegardée"""
+    created: List[Character] = field(default_factory=list)
+    updated: List[Character] = field(default_factory=list)
+    deleted: List[Character] = field(default_factory=list)
+    # Anciennes valeurs des champs modifiés : (objet, attribut, valeur)
+    previous: List[Tuple[Any, str, Any]] = field(default_factory=list, repr=False)
+    
+    def __len__(self) -> int:
+        return len(self.created) + len(self.updated) + len(self.deleted)
+
+
+def _resolve_field(character: Character, path: str) -> Tuple[Any, str]:
+    """Objet et attribut désignés par un chemin ("faction", "profile.level")
+    
+    Raises:
+        ValueError: Si le chemin ne désigne pas un champ du personnage
+    """
+    target = character
+    *parents, name = path.split('.')
+    for parent in parents:
+        if parent.startswith('_') or not hasattr(target, parent):
+            raise ValueError(f"Champ inconnu: {path}")
+        target = getattr(target, parent)
+    if path == 'id' or name.startswith('_') or not hasattr(target, name) or callable(getattr(target, name)):
+        raise ValueError(f"Champ inconnu: {path}")
+    return target, name
+
 
 class CharacterService:
     """Service de gestion des personnages"""
@@ -16,13 +60,76 @@ class CharacterService:
         """Initialise le service avec une référence au ProjectService"""
         self.project_service = project_service
         self._characters: dict[str, Character] = {}
+        self._analytics = None  # Vue en colonnes, construite à la première demande
+        self._index = None  # Index des requêtes, construit à la première demande
+    
+    def analytics(self):
+        """Vue en colonnes des champs numériques, tenue à jour par le service
+        
+        Un personnage modifié sur place doit être signalé par update_character ; pour
+        un prototype, les lignes de ses instances sont relues avec la sienne.
+        """
+        if self._analytics is None:
+            from .character_analytics import CharacterAnalytics
+            self._analytics = CharacterAnalytics(self._characters.values())
+        return self._analytics
+    
+    def index(self):
+        """Index des personnages (type, niveau, race, classe, faction, nom), tenu à jour"""
+        if self._index is None:
+            from .character_index import CharacterIndex
+            self._index = CharacterIndex(self._characters.values())
+        return self._index
+    
+    def query(self, **criteria):
+        """Filtre, trie et pagine les personnages via les index
+        
+        Voir CharacterIndex.query pour les critères (type, level, race, character_class,
+        faction, name_prefix, sort, offset, limit).
+        
+        Returns:
+            CharacterPage: personnages de la page et nombre total de résultats
+        """
+        return self.index().query(**criteria)
+    
+    def _track(self, characters: Iterable[Character]) -> None:
+        """Reporte des personnages ajoutés ou modifiés dans la vue en colonnes et les index
+        
+        Les instances partagent les champs de leur prototype : modifier un prototype
+        modifie aussi leurs valeurs, elles sont donc reportées avec lui.
+        """
+        characters = list(characters)
+        views = [view for view in (self._analytics, self._index) if view is not None]
+        if views:
+            tracked = {character.id: character for character in characters}
+            for character in characters:
+                if character.prototype is None:
+                    for instance in self.instances_of(character.id):
+                        tracked.setdefault(instance.id, instance)
+            for view in views:
+                for character in tracked.values():
+                    view.update(character)
+        for character in characters:
+            self.project_service.track_references('character', character)
     
     def load_characters(self, characters_data: List[dict]) -> None:
         """Charge les personnages depuis les données du projet"""
         self._characters = {}
+        instances = []
         for char_data in characters_data:
+            if char_data.get('prototype'):
+                # Les instances sont résolues une fois tous les prototypes chargés (l'ordre est conservé)
+                instances.append(char_data)
+                self._characters[char_data['id']] = None
+                continue
             character = self._deserialize_character(char_data)
             self._characters[character.id] = character
+        prototypes_data: Dict[str, dict] = {}
+        for char_data in instances:
+            character = self._deserialize_instance(char_data, prototypes_data)
+            self._characters[character.id] = character
+        self._analytics = None
+        self._index = None
     
     def create_character(
         self,
@@ -43,8 +150,28 @@ class CharacterService:
         )
         
         self._characters[character.id] = character
+        self._track((character,))
         return character
     
+    def add_character(self, character: Character) -> None:
+        """Ajoute un personnage déjà construit (ex: généré)"""
+        self._characters[character.id] = character
+        self._track((character,))
+    
+    def add_characters(self, characters: Iterable[Character]) -> int:
+        """Ajoute des personnages en masse, retourne le nombre ajouté"""
+        characters = list(characters)
+        before = len(self._characters)
+        self._characters.update((character.id, character) for character in characters)
+        self._track(characters)
+        return len(self._characters) - before
+    
+    def import_characters(self, characters_data: Iterable[dict]) -> List[Character]:
+        """Désérialise et ajoute des personnages en masse (ex: résultats de workers)"""
+        characters = [self._deserialize_character(data) for data in characters_data]
+        self.add_characters(characters)
+        return characters
+    
     def get_character(self, character_id: str) -> Optional[Character]:
         """Récupère un personnage par son ID"""
         return self._characters.get(character_id)
@@ -54,32 +181,239 @@ class CharacterService:
         return list(self._characters.values())
     
     def get_characters_by_type(self, character_type: CharacterType) -> List[Character]:
-        """Récupère les personnages d'un type spécifique"""
-        result = []
-        target_value = character_type.value if isinstance(character_type, CharacterType) else str(character_type)
-        
-        for c in self._characters.values():
-            char_type_value = c.type.value if isinstance(c.type, CharacterType) else str(c.type)
-            
-            # Comparaison robuste : comparer les valeurs de l'Enum
-            if char_type_value == target_value:
-                result.append(c)
-        
-        return result
+        """Récupère les personnages d'un type spécifique (via l'index des types)"""
+        if not isinstance(character_type, CharacterType):
+            try:
+                character_type = CharacterType(str(character_type))
+            except ValueError:
+                return []
+        return self.index().of_type(character_type)
     
     def update_character(self, character: Character) -> None:
-        """Met à jour un personnage"""
+        """Met à jour un personnage (une instance repartage les champs identiques au prototype)"""
         if character.id not in self._characters:
             raise ValueError(f"Personnage {character.id} introuvable")
+        character.share_unchanged()
         self._characters[character.id] = character
+        self._track((character,))
     
     def delete_character(self, character_id: str) -> bool:
-        """Supprime un personnage"""
+        """Supprime un personnage (ses instances deviennent des personnages indépendants)"""
         if character_id not in self._characters:
             return False
+        for instance in self.instances_of(character_id):
+            instance.detach()
         del self._characters[character_id]
+        for view in (self._analytics, self._index):
+            if view is not None:
+                view.discard(character_id)
+        self.project_service.remove_references('character', character_id)
         return True
     
+    def spawn_instances(self, prototype_id: str, count: int, name: Optional[str] = None) -> List[Character]:
+        """Crée des instances d'un personnage servant de prototype (ex: 40 gobelins d'un modèle)
+        
+        Chaque instance ne possède que son ID et son nom numéroté ; le reste est partagé
+        avec le prototype jusqu'à la première modification (voir Character.materialize).
+        
+        Raises:
+            ValueError: Si le prototype est introuvable ou est lui-même une instance
+        """
+        prototype = self.get_character(prototype_id)
+        if not prototype:
+            raise ValueError(f"Personnage {prototype_id} introuvable")
+        base_name = name or prototype.name
+        instances = [
+            prototype.instantiate(generate_id(), f"{base_name} {number}")
+            for number in range(1, count + 1)
+        ]
+        self.add_characters(instances)
+        return instances
+    
+    def instances_of(self, prototype_id: str) -> List[Character]:
+        """Instances d'un prototype (lues dans l'index inverse des références)"""
+        instances = []
+        for reference in self.project_service.get_references(prototype_id):
+            if reference.kind == 'character' and reference.field == 'prototype':
+                instance = self._characters.get(reference.id)
+                if instance is not None:
+                    instances.append(instance)
+        return instances
+    
+    def select(self, ids: Optional[Iterable[str]] = None, **criteria) -> List[Character]:
+        """Personnages désignés par une liste d'IDs et/ou des critères de requête
+        
+        Sans IDs ni critère, aucun personnage n'est sélectionné (jamais tous par accident).
+        """
+        if ids is not None:
+            selected = [self._characters[i] for i in dict.fromkeys(ids) if i in self._characters]
+            if not criteria:
+                return selected
+            matching = {c.id for c in self.query(**criteria).characters}
+            return [c for c in selected if c.id in matching]
+        if not criteria:
+            return []
+        return self.query(**criteria).characters
+    
+    def create_characters(self, entries: Iterable[Mapping[str, Any]]) -> BulkChange:
+        """Crée des personnages en masse ({'name', 'type', 'level', 'race', 'character_class', 'faction'})
+        
+        Toutes les entrées sont validées avant la moindre création.
+        
+        Raises:
+            ValueError: Si une entrée est invalide (rien n'est créé)
+        """
+        from ..models.character import CharacterProfile
+        
+        characters = []
+        for number, entry in enumerate(entries, 1):
+            name = str(entry.get('name') or '').strip()
+            if not name:
+                raise ValueError(f"Entrée {number} : nom manquant")
+            try:
+                character_type = CharacterType(entry.get('type', CharacterType.PNJ))
+                level = int(entry.get('level', 1))
+            except (TypeError, ValueError) as e:
+                raise ValueError(f"Entrée {number} : {e}")
+            characters.append(Character(
+                id=generate_id(),
+                name=name,
+                type=character_type,
+                profile=CharacterProfile(
+                    level=level,
+                    race=entry.get('race') or "",
+                    character_class=entry.get('character_class') or None
+                ),
+                faction=entry.get('faction') or None
+            ))
+        self.add_characters(characters)
+        return BulkChange(created=characters)
+    
+    def update_where(
+        self,
+        patch: Mapping[str, Any],
+        ids: Optional[Iterable[str]] = None,
+        **criteria
+    ) -> BulkChange:
+        """Applique un correctif aux personnages sélectionnés (voir select)
+        
+        Args:
+            patch: {chemin du champ: valeur}, ex: {'faction': 'f-2', 'profile.level': lambda n: n + 1} ;
+                une valeur appelable reçoit l'ancienne valeur et renvoie la nouvelle
+        
+        Toutes les nouvelles valeurs sont calculées avant la moindre écriture : si l'une
+        échoue, aucun personnage n'est modifié.
+        
+        Raises:
+            ValueError: Si un champ est inconnu ou si une valeur ne peut être calculée
+        """
+        characters = self.select(ids, **criteria)
+        writes = []
+        for character in characters:
+            for path, value in patch.items():
+                if '.' in path:
+                    # Écriture dans un sous-objet : une instance copie d'abord le champ partagé
+                    character.materialize(path.split('.', 1)[0])
+                target, name = _resolve_field(character, path)
+                old = getattr(target, name)
+                try:
+                    new = value(old) if callable(value) else value
+                    if path == 'type':
+                        new = CharacterType(new)
+                except Exception as e:
+                    raise ValueError(f"{character.name} : {path} : {e}")
+                writes.append((target, name, old, new))
+        
+        change = BulkChange(updated=characters)
+        for target, name, old, new in writes:
+            change.previous.append((target, name, old))
+            setattr(target, name, new)
+        self._track(characters)
+        return change
+    
+    def delete_where(self, ids: Optional[Iterable[str]] = None, **criteria) -> BulkChange:
+        """Supprime les personnages sélectionnés (voir select) et les retire des entités qui les citent"""
+        characters = self.select(ids, **criteria)
+        change = BulkChange(deleted=characters)
+        # Champs des scènes et lieux modifiés par la cascade, pour pouvoir annuler
+        for character in characters:
+            for reference in self.project_service.get_references(character.id):
+                entity = self.project_service.get_entity(reference.kind, reference.id)
+                if entity is not None:
+                    change.previous.append((entity, reference.field, copy.copy(getattr(entity, reference.field))))
+        for character in characters:
+            self.delete_character(character.id)
+        return change
+    
+    def revert(self, change: BulkChange) -> None:
+        """Annule une opération en masse (ex: si la sauvegarde a échoué)"""
+        for character in change.created:
+            self.delete_character(character.id)
+        for target, name, old in reversed(change.previous):
+            setattr(target, name, old)
+        self._track(change.updated)
+        self.add_characters(change.deleted)
+    
+    def replace_references(self, bank_type: BankType, renames: Dict[str, str], dry_run: bool = False) -> int:
+        """Remplace des valeurs d'une banque référencées par les personnages, en une seule passe
+        
+        Seuls les champs alimentés par cette banque sont concernés (BANK_REFERENCE_FIELDS) :
+        renommer une arme ne touche ni la race ni les objets de valeur.
+        
+        Args:
+            bank_type: Banque d'où proviennent les valeurs renommées
+            renames: Correspondance {ancienne valeur: nouvelle valeur}
+            dry_run: Si True, compte les personnages concernés sans les modifier
+        
+        Returns:
+            Nombre de personnages modifiés (ou à modifier)
+        """
+        fields = BANK_REFERENCE_FIELDS.get(bank_type, ())
+        if not renames or not fields:
+            return 0
+        
+        updated = 0
+        for character in self._characters.values():
+            if not any(value in renames for value in self._referenced_values(character, fields)):
+                continue
+            updated += 1
+            if dry_run:
+                continue
+            
+            profile_fields = [name for name in fields if name in ('race', 'character_class', 'profession')]
+            shared = [name for name in ('weapons', 'valuables') if name in fields]
+            if profile_fields:
+                shared.append('profile')
+            if shared:  # Sans argument, materialize copierait tous les champs
+                character.materialize(*shared)
+            if 'equipment' in fields:
+                character.equipment = [renames.get(item, item) for item in character.equipment]
+            if 'valuables' in fields:
+                character.valuables.items = [renames.get(item, item) for item in character.valuables.items]
+            if 'weapons' in fields:
+                for weapon in character.weapons:
+                    weapon.name = renames.get(weapon.name, weapon.name)
+            for name in profile_fields:
+                value = getattr(character.profile, name)
+                if value:
+                    setattr(character.profile, name, renames.get(value, value))
+            self._track((character,))
+        
+        return updated
+    
+    @staticmethod
+    def _referenced_values(character: Character, fields: Tuple[str, ...]) -> Iterable[str]:
+        """Valeurs de banque portées par les champs donnés d'un personnage"""
+        for name in fields:
+            if name == 'equipment':
+                yield from character.equipment
+            elif name == 'valuables':
+                yield from character.valuables.items
+            elif name == 'weapons':
+                yield from (weapon.name for weapon in character.weapons)
+            else:
+                yield getattr(character.profile, name)
+    
     def _deserialize_character(self, data: dict) -> Character:
         """Désérialise un personnage depuis un dictionnaire"""
         from ..models.character import (
@@ -109,10 +443,8 @@ class CharacterService:
             if attr in char_data:
                 from ..models.character import CharacteristicValue
                 val_data = char_data[attr]
-                setattr(characteristics, attr, CharacteristicValue(
-                    value=val_data.get('value', 10),
-                    modifier=val_data.get('modifier', 0)
-                ))
+                # Le modificateur enregistré n'est pas repris : il est déduit de la valeur
+                setattr(characteristics, attr, CharacteristicValue(value=val_data.get('value', 10)))
         
         # Désérialiser le combat
         combat_data = data.get('combat', {})
@@ -198,13 +530,81 @@ class CharacterService:
             valuables=valuables,
             faction=data.get('faction'),
             image_id=data.get('image_id'),
-            notes=data.get('notes', '')
+            notes=data.get('notes', ''),
+            seed=data.get('seed'),
+            prototype=data.get('prototype')
         )
         
         return character
     
+    def _deserialize_instance(self, data: dict, prototypes_data: Dict[str, dict]) -> Character:
+        """Désérialise une instance : ses champs enregistrés complètent ceux du prototype"""
+        from ..persistence.serializer import serialize_model
+        
+        prototype = self._characters.get(data['prototype'])
+        if prototype is None or prototype.prototype is not None:
+            # Prototype introuvable : l'instance garde ce qui a été enregistré
+            return self._deserialize_character(data)
+        
+        base = prototypes_data.get(prototype.id)
+        if base is None:
+            base = prototypes_data[prototype.id] = serialize_model(prototype)
+        merged = dict(base)
+        for key, value in data.items():
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                merged[key] = {**base[key], **value}
+            else:
+                merged[key] = value
+        character = self._deserialize_character(merged)
+        character.link_prototype(prototype)
+        character.share_unchanged()
+        return character
+    
     def serialize_characters(self) -> List[dict]:
-        """Sérialise tous les personnages"""
+        """Sérialise tous les personnages (une instance n'enregistre que ce qui diffère de son prototype)"""
+        from ..persistence.serializer import serialize_model
+        
+        result = []
+        prototypes_data: Dict[str, dict] = {}
+        for char in self._characters.values():
+            if char.prototype_character is not None:
+                result.append(self._serialize_instance(char, prototypes_data))
+                continue
+            data = serialize_model(char)
+            if data.get('prototype') is None:
+                data.pop('prototype', None)
+            result.append(data)
+        return result
+    
+    @staticmethod
+    def _serialize_instance(character: Character, prototypes_data: Dict[str, dict]) -> dict:
+        """ID, nom, prototype et champs modifiés d'une instance (sous-champs modifiés seulement)"""
+        from ..models.character import PROTOTYPE_FIELDS
         from ..persistence.serializer import serialize_model
-        return [serialize_model(char) for char in self._characters.values()]
+        
+        prototype = character.prototype_character
+        data = {
+            'id': character.id,
+            'name': character.name,
+            'type': character.type.value,
+            'prototype': prototype.id
+        }
+        for name in ('faction', 'image_id', 'notes', 'seed'):
+            value = getattr(character, name)
+            if value != getattr(prototype, name):
+                data[name] = value
+        for name in PROTOTYPE_FIELDS:
+            value = getattr(character, name)
+            base = getattr(prototype, name)
+            if value is base or value == base:
+                continue
+            serialized = serialize_model(value)
+            if isinstance(serialized, dict):
+                base_data = prototypes_data.get(prototype.id)
+                if base_data is None:
+                    base_data = prototypes_data[prototype.id] = serialize_model(prototype)
+                reference = base_data[name]
+                serialized = {key: item for key, item in serialized.items() if reference.get(key) != item}
+            data[name] = serialized
+        return data
 
@@ -0,0 +1,342 @@
+"""
+Simulateur de combat (Monte Carlo)
+Rejoue des milliers de combats entre deux camps de personnages pour estimer
+les chances de victoire, la durée des combats et les PV restants.
+"""
+
+import math
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..core.dice import compile_dice
+from ..core.numeric import np
+from ..core.rng import derive_seed, new_seed
+from ..core.utils import normalize_key
+from ..models.bank import BankType
+from ..models.character import Character
+
+# Dégâts d'un combattant sans arme connue
+DEFAULT_DAMAGE = "1d6"
+# Au-delà, le combat est déclaré nul
+MAX_ROUNDS = 30
+# En dessous de ce nombre de combats, le démarrage des workers coûte plus qu'il ne rapporte
+PARALLEL_THRESHOLD = 20000
+
+SIDE_A = 0
+SIDE_B = 1
+
+
+def weapon_damage_table(bank_service) -> Dict[str, str]:
+    """Dégâts des armes de la banque, indexés par nom normalisé"""
+    bank = bank_service.get_bank_by_type(BankType.WEAPONS) if bank_service else None
+    return {
+        normalize_key(entry.value): entry.metadata['damage']
+        for entry in (bank.entries if bank else [])
+        if entry.metadata.get('damage')
+    }
+
+
+@dataclass
+class Combatant:
+    """Profil de combat figé d'un personnage (sérialisable vers les workers)"""
+    name: str
+    hp: int
+    attack: int
+    defense: int
+    damage: str  # Expression de dés, modificateur compris
+    initiative: int
+
+    @classmethod
+    def from_character(cls, character: Character, weapon_damage: Optional[Dict[str, str]] = None) -> 'Combatant':
+        """Construit le profil depuis les statistiques dérivées et les armes du personnage"""
+        derived = character.derived
+        strength, dexterity, constitution = derived.modifiers[:3]
+        # PV saisis, sinon estimation propre à la simulation : NIV × (5 + mod. CON)
+        hp = character.combat.life_points or max(1, character.profile.level) * max(1, 5 + constitution)
+        return cls(
+            name=character.name or "Sans nom",
+            hp=max(1, hp),
+            attack=max(derived.melee_attack, derived.ranged_attack),
+            defense=derived.defense_total,
+            damage=f"{_best_damage(character, weapon_damage or {})}{max(strength, dexterity):+d}",
+            initiative=derived.initiative
+        )
+
+
+def _best_damage(character: Character, weapon_damage: Dict[str, str]) -> str:
+    """Dégâts de la meilleure arme du personnage (fiche, sinon équipement de la banque)"""
+    candidates = [w.damage for w in character.weapons if w.damage]
+    candidates += [weapon_damage[normalize_key(item)] for item in character.equipment if normalize_key(item) in weapon_damage]
+    best, best_mean = DEFAULT_DAMAGE, -math.inf
+    for damage in candidates:
+        try:
+            mean = compile_dice(damage).mean()
+        except ValueError:
+            continue
+        if mean > best_mean:
+            best, best_mean = damage, mean
+    return best
+
+
+@dataclass
+class CombatReport:
+    """Résultats agrégés des combats simulés (camp A contre camp B)"""
+    simulations: int = 0
+    wins_a: int = 0
+    wins_b: int = 0
+    draws: int = 0
+    rounds: Dict[int, int] = field(default_factory=dict)  # Durée -> nombre de combats
+    hp_remaining_a: Dict[int, int] = field(default_factory=dict)  # PV restants du camp A -> nombre de combats
+    hp_remaining_b: Dict[int, int] = field(default_factory=dict)
+    deaths: List[int] = field(default_factory=list)  # Nombre de morts par combattant (A puis B)
+    names: List[str] = field(default_factory=list)
+    side_a_size: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """Proportion de victoires du camp A"""
+        return self.wins_a / self.simulations if self.simulations else 0.0
+
+    def death_rates(self) -> List[Tuple[str, float]]:
+        """Probabilité de mourir de chaque combattant (camp A puis camp B)"""
+        if not self.simulations:
+            return []
+        return [
+            (f"{name} ({'A' if i < self.side_a_size else 'B'})", deaths / self.simulations)
+            for i, (name, deaths) in enumerate(zip(self.names, self.deaths))
+        ]
+
+    def merge(self, other: 'CombatReport') -> None:
+        """Ajoute les résultats d'un autre lot de combats"""
+        self.simulations += other.simulations
+        self.wins_a += other.wins_a
+        self.wins_b += other.wins_b
+        self.draws += other.draws
+        for target, source in ((self.rounds, other.rounds),
+                               (self.hp_remaining_a, other.hp_remaining_a),
+                               (self.hp_remaining_b, other.hp_remaining_b)):
+            for value, count in source.items():
+                target[value] = target.get(value, 0) + count
+        self.deaths = [a + b for a, b in zip(self.deaths, other.deaths)] if self.deaths else list(other.deaths)
+        self.names = self.names or other.names
+        self.side_a_size = self.side_a_size or other.side_a_size
+
+    @staticmethod
+    def percentile(distribution: Dict[int, int], p: float) -> int:
+        """Plus petite valeur dont la fréquence cumulée atteint p % (0-100)"""
+        total = sum(distribution.values())
+        target = max(1, math.ceil(total * p / 100))
+        running = 0
+        for value in sorted(distribution):
+            running += distribution[value]
+            if running >= target:
+                return value
+        return 0
+
+    def summary(self) -> str:
+        """Résumé lisible du rapport"""
+        if not self.simulations:
+            return "Aucun combat simulé"
+        lines = [
+            f"{self.simulations} combats simulés",
+            f"Victoire du camp A : {self.win_rate:.1%} "
+            f"(défaite {self.wins_b / self.simulations:.1%}, nul {self.draws / self.simulations:.1%})",
+            f"Durée : médiane {self.percentile(self.rounds, 50)} round(s) "
+            f"(10 % : {self.percentile(self.rounds, 10)}, 90 % : {self.percentile(self.rounds, 90)})",
+            f"PV restants du camp A : médiane {self.percentile(self.hp_remaining_a, 50)} "
+            f"(10 % : {self.percentile(self.hp_remaining_a, 10)}, 90 % : {self.percentile(self.hp_remaining_a, 90)})",
+            "Risque de mort :",
+        ]
+        lines += [f"  {name} : {rate:.1%}" for name, rate in self.death_rates()]
+        return "\n".join(lines)
+
+
+def _count(values: Iterable[int]) -> Dict[int, int]:
+    """Histogramme {valeur: occurrences}"""
+    result: Dict[int, int] = {}
+    for value in values:
+        result[value] = result.get(value, 0) + 1
+    return result
+
+
+def _simulate_chunk(
+    side_a: List[Combatant],
+    side_b: List[Combatant],
+    count: int,
+    seed: int,
+    max_rounds: int
+) -> CombatReport:
+    """Simule `count` combats (vectorisé avec NumPy si disponible)"""
+    if np is not None:
+        return _simulate_numpy(side_a, side_b, count, seed, max_rounds)
+    return _simulate_python(side_a, side_b, count, seed, max_rounds)
+
+
+def _initiative_order(combatants: Sequence[Combatant]) -> List[int]:
+    """Ordre d'action : initiative décroissante, camp A d'abord à égalité"""
+    return sorted(range(len(combatants)), key=lambda i: (-combatants[i].initiative, i))
+
+
+def _simulate_python(side_a, side_b, count, seed, max_rounds) -> CombatReport:
+    """Simulation combat par combat (sans NumPy)"""
+    rng = random.Random(seed)
+    combatants = side_a + side_b
+    sides = [SIDE_A] * len(side_a) + [SIDE_B] * len(side_b)
+    order = _initiative_order(combatants)
+    damages = [compile_dice(c.damage) for c in combatants]
+    enemies = [[j for j in range(len(combatants)) if sides[j] != sides[i]] for i in range(len(combatants))]
+
+    report = CombatReport(simulations=count, deaths=[0] * len(combatants),
+                          names=[c.name for c in combatants], side_a_size=len(side_a))
+    rounds_list, hp_a, hp_b = [], [], []
+    for _ in range(count):
+        hp = [c.hp for c in combatants]
+        alive = [len(side_a), len(side_b)]
+        rounds = 0
+        while alive[SIDE_A] and alive[SIDE_B] and rounds < max_rounds:
+            rounds += 1
+            for i in order:
+                if hp[i] <= 0:
+                    continue
+                targets = [j for j in enemies[i] if hp[j] > 0]
+                if not targets:
+                    break
+                target = rng.choice(targets)
+                d20 = rng.randint(1, 20)
+                if d20 == 1 or (d20 != 20 and d20 + combatants[i].attack < combatants[target].defense):
+                    continue
+                damage = max(1, damages[i].roll(rng)) * (2 if d20 == 20 else 1)
+                hp[target] -= damage
+                if hp[target] <= 0:
+                    alive[sides[target]] -= 1
+                    report.deaths[target] += 1
+        if alive[SIDE_A] and alive[SIDE_B]:
+            report.draws += 1
+        elif alive[SIDE_A]:
+            report.wins_a += 1
+        else:
+            report.wins_b += 1
+        rounds_list.append(rounds)
+        hp_a.append(sum(max(0, h) for h, s in zip(hp, sides) if s == SIDE_A))
+        hp_b.append(sum(max(0, h) for h, s in zip(hp, sides) if s == SIDE_B))
+
+    report.rounds, report.hp_remaining_a, report.hp_remaining_b = _count(rounds_list), _count(hp_a), _count(hp_b)
+    return report
+
+
+def _simulate_numpy(side_a, side_b, count, seed, max_rounds) -> CombatReport:
+    """Simulation vectorisée : chaque action est jouée dans tous les combats à la fois"""
+    rng = random.Random(seed)
+    generator = np.random.default_rng(rng.getrandbits(63))
+    combatants = side_a + side_b
+    sides = np.array([SIDE_A] * len(side_a) + [SIDE_B] * len(side_b))
+    attack = np.array([c.attack for c in combatants])
+    defense = np.array([c.defense for c in combatants])
+    damages = [compile_dice(c.damage) for c in combatants]
+    fights = np.arange(count)
+
+    hp = np.tile(np.array([c.hp for c in combatants]), (count, 1))
+    active = np.ones(count, dtype=bool)
+    rounds = np.full(count, max_rounds)
+    for round_number in range(1, max_rounds + 1):
+        for i in _initiative_order(combatants):
+            enemies = np.flatnonzero(sides != sides[i])
+            # Cible tirée au hasard parmi les ennemis encore debout
+            keys = generator.random((count, len(enemies)))
+            keys[hp[:, enemies] <= 0] = -1.0
+            choice = keys.argmax(axis=1)
+            target = enemies[choice]
+            acting = active & (hp[:, i] > 0) & (keys[fights, choice] >= 0)
+
+            d20 = generator.integers(1, 21, size=count)
+            hit = (d20 == 20) | ((d20 != 1) & (d20 + attack[i] >= defense[target]))
+            damage = np.maximum(1, np.asarray(damages[i].roll_many(count, rng))) * np.where(d20 == 20, 2, 1)
+            applied = acting & hit
+            hp[fights[applied], target[applied]] -= damage[applied]
+
+        standing_a = (hp[:, sides == SIDE_A] > 0).any(axis=1)
+        standing_b = (hp[:, sides == SIDE_B] > 0).any(axis=1)
+        finished = active & ~(standing_a & standing_b)
+        rounds[finished] = round_number
+        active &= standing_a & standing_b
+        if not active.any():
+            break
+
+    standing_a = (hp[:, sides == SIDE_A] > 0).any(axis=1)
+    standing_b = (hp[:, sides == SIDE_B] > 0).any(axis=1)
+    remaining = np.maximum(hp, 0)
+    return CombatReport(
+        simulations=count,
+        wins_a=int((standing_a & ~standing_b).sum()),
+        wins_b=int((standing_b & ~standing_a).sum()),
+        draws=int((standing_a & standing_b).sum()),
+        rounds=_count(rounds.tolist()),
+        hp_remaining_a=_count(remaining[:, sides == SIDE_A].sum(axis=1).tolist()),
+        hp_remaining_b=_count(remaining[:, sides == SIDE_B].sum(axis=1).tolist()),
+        deaths=(hp <= 0).sum(axis=0).tolist(),
+        names=[c.name for c in combatants],
+        side_a_size=len(side_a)
+    )
+
+
+class CombatSimulator:
+    """Estime l'issue d'un combat entre deux camps par simulation Monte Carlo
+
+    Règles : chacun agit par ordre d'initiative et attaque un ennemi debout au
+    hasard ; d20 + attaque doit atteindre la défense (1 rate toujours, 20 touche
+    et double les dégâts). Le combat s'arrête quand un camp est à terre.
+    """
+
+    def __init__(self, bank_service=None, seed: Optional[int] = None, workers: int = 1):
+        """
+        Args:
+            bank_service: Service de banques (dégâts des armes de l'équipement)
+            seed: Graine racine (None pour une graine aléatoire)
+            workers: Nombre de processus pour les grands volumes (1 pour tout faire sur place)
+        """
+        self.bank_service = bank_service
+        self.seed = seed if seed is not None else new_seed()
+        self.workers = max(1, workers or multiprocessing.cpu_count())
+
+    def combatants(self, characters: Iterable[Character]) -> List[Combatant]:
+        """Profils de combat des personnages"""
+        weapon_damage = weapon_damage_table(self.bank_service)
+        return [Combatant.from_character(c, weapon_damage) for c in characters]
+
+    def simulate(
+        self,
+        side_a: Iterable[Character],
+        side_b: Iterable[Character],
+        simulations: int = 5000,
+        max_rounds: int = MAX_ROUNDS
+    ) -> CombatReport:
+        """Simule `simulations` combats du camp A (ex: PJ) contre le camp B (ex: PNJ de la scène)
+
+        Raises:
+            ValueError: Si l'un des camps est vide
+        """
+        combatants_a = self.combatants(side_a)
+        combatants_b = self.combatants(side_b)
+        if not combatants_a or not combatants_b:
+            raise ValueError("Chaque camp doit compter au moins un combattant")
+
+        if self.workers <= 1 or simulations < PARALLEL_THRESHOLD:
+            return _simulate_chunk(combatants_a, combatants_b, simulations, self.seed, max_rounds)
+
+        # Un lot par worker, chacun avec sa graine dérivée
+        chunk = math.ceil(simulations / self.workers)
+        counts = [min(chunk, simulations - start) for start in range(0, simulations, chunk)]
+        report = CombatReport()
+        with ProcessPoolExecutor(max_workers=self.workers,
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = [
+                executor.submit(_simulate_chunk, combatants_a, combatants_b, n,
+                                derive_seed(self.seed, "combat", i), max_rounds)
+                for i, n in enumerate(counts)
+            ]
+            for future in futures:
+                report.merge(future.result())
+        return report
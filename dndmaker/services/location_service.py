@@ -44,6 +44,7 @@ class LocationService:
             updated_at=datetime.now()
         )
         self._locations[location.id] = location
+        self.project_service.track_references('location', location)
         return location
     
     def get_location(self, location_id: str) -> Optional[Location]:
@@ -60,12 +61,14 @@ class LocationService:
             raise ValueError(f"Lieu {location.id} introuvable")
         location.updated_at = datetime.now()
         self._locations[location.id] = location
+        self.project_service.track_references('location', location)
     
     def delete_location(self, location_id: str) -> bool:
-        """Supprime un lieu"""
+        """Supprime un lieu et le retire des scènes et lieux qui le citent"""
         if location_id not in self._locations:
             return False
         del self._locations[location_id]
+        self.project_service.remove_references('location', location_id)
         return True
     
     def _deserialize_location(self, data: dict) -> Location:
@@ -74,6 +74,8 @@ class MediaService:
                 media.associated_entities[entity_type].append(entity_id)
             
             self._media[media.id] = media
+            if self.project_service:
+                self.project_service.track_references('media', media)
             return media.id
             
         except Exception as e:
@@ -92,8 +94,12 @@ class MediaService:
         """Récupère un média par son ID"""
         return self._media.get(media_id)
     
+    def get_all_media(self) -> List[Media]:
+        """Récupère tous les médias"""
+        return list(self._media.values())
+    
     def delete_media(self, media_id: str) -> bool:
-        """Supprime un média et son fichier"""
+        """Supprime un média et son fichier, et le retire des entités qui l'affichent"""
         media = self._media.get(media_id)
         if not media:
             return False
@@ -109,6 +115,8 @@ class MediaService:
         
         # Supprimer l'entrée
         del self._media[media_id]
+        if self.project_service:
+            self.project_service.remove_references('media', media_id)
         return True
     
     def load_media(self, media_data: List[dict]) -> None:
@@ -3,20 +3,21 @@ Service de gestion de campagne
 """
 
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 
 from ..models.project import Project
 from ..core.utils import generate_id
 from ..persistence.project_loader import ProjectLoader
 from ..persistence.version_manager import VersionManager
-from .character_service import CharacterService
+from .character_service import BulkChange, CharacterService
 from .scene_service import SceneService
 from .session_service import SessionService
 from .bank_service import BankService
 from .location_service import LocationService
 from .table_service import TableService
 from .media_service import MediaService
+from .reference_index import Reference, ReferenceIndex, strip_reference
 
 
 class ProjectService:
@@ -35,6 +36,9 @@ class ProjectService:
         self.location_service = LocationService(self)
         self.table_service = TableService(self)
         self.media_service = MediaService(self)
+        
+        # Index inverse des références, construit à la première utilisation
+        self._references: Optional[ReferenceIndex] = None
     
     def create_project(self, name: str, project_dir: Path) -> Project:
         """Crée une nouvelle campagne"""
@@ -209,6 +213,124 @@ class ProjectService:
             print(traceback.format_exc())
             return None
     
+    def dedupe_bank(self, bank_type, dry_run: bool = False) -> Tuple[int, int]:
+        """Fusionne les doublons d'une banque et réécrit les références des personnages
+        
+        Args:
+            bank_type: Type de banque à dédoublonner
+            dry_run: Si True, calcule le résultat sans rien modifier
+        
+        Returns:
+            (nombre d'entrées fusionnées, nombre de personnages mis à jour)
+        """
+        bank = self.bank_service.get_bank_by_type(bank_type)
+        if not bank:
+            return 0, 0
+        
+        if dry_run:
+            renames = {}
+            removed = 0
+            for kept, duplicates in self.bank_service.find_duplicate_groups(bank.id):
+                removed += len(duplicates)
+                renames.update({d.value: kept.value for d in duplicates if d.value != kept.value})
+            return removed, self.character_service.replace_references(bank_type, renames, dry_run=True)
+        
+        count_before = len(bank.entries)
+        renames = self.bank_service.dedupe_bank(bank.id)
+        removed = count_before - len(bank.entries)
+        return removed, self.character_service.replace_references(bank_type, renames)
+    
+    def bulk_create_characters(self, entries) -> BulkChange:
+        """Crée des personnages en masse : une seule sauvegarde, une seule version"""
+        change = self.character_service.create_characters(entries)
+        return self._commit_bulk(change, f"Création de {len(change.created)} personnage(s)")
+    
+    def bulk_update_characters(self, patch, ids=None, **criteria) -> BulkChange:
+        """Modifie les personnages sélectionnés (voir CharacterService.update_where) et sauvegarde une fois"""
+        change = self.character_service.update_where(patch, ids, **criteria)
+        return self._commit_bulk(change, f"Modification de {len(change.updated)} personnage(s)")
+    
+    def bulk_delete_characters(self, ids=None, **criteria) -> BulkChange:
+        """Supprime les personnages sélectionnés (voir CharacterService.delete_where) et sauvegarde une fois"""
+        change = self.character_service.delete_where(ids, **criteria)
+        return self._commit_bulk(change, f"Suppression de {len(change.deleted)} personnage(s)")
+    
+    def _commit_bulk(self, change: BulkChange, description: str) -> BulkChange:
+        """Sauvegarde une opération en masse ; l'annule en mémoire si la sauvegarde échoue"""
+        if not len(change):
+            return change
+        try:
+            self.save_project(description)
+        except Exception:
+            self.character_service.revert(change)
+            # Les références restaurées par l'annulation seront réindexées
+            self._references = None
+            raise
+        return change
+    
+    def references(self) -> ReferenceIndex:
+        """Index inverse des références entre entités (construit à la première utilisation)"""
+        if self._references is None:
+            self._references = ReferenceIndex(self._all_entities())
+        return self._references
+    
+    def _all_entities(self) -> Iterator[Tuple[str, object]]:
+        for character in self.character_service.get_all_characters():
+            yield 'character', character
+        for scene in self.scene_service.get_all_scenes():
+            yield 'scene', scene
+        for session in self.session_service.get_all_sessions():
+            yield 'session', session
+        for location in self.location_service.get_all_locations():
+            yield 'location', location
+        for media in self.media_service.get_all_media():
+            yield 'media', media
+    
+    def get_entity(self, kind: str, entity_id: str):
+        """Récupère une entité par son type ('character', 'scene', ...) et son ID"""
+        getters = {
+            'character': self.character_service.get_character,
+            'scene': self.scene_service.get_scene,
+            'session': self.session_service.get_session,
+            'location': self.location_service.get_location,
+            'media': self.media_service.get_media,
+        }
+        getter = getters.get(kind)
+        return getter(entity_id) if getter else None
+    
+    def get_references(self, entity_id: str) -> List[Reference]:
+        """Entités qui référencent un ID (panneau « Utilisé dans… »)"""
+        return self.references().referrers(entity_id)
+    
+    def track_references(self, kind: str, entity) -> None:
+        """Réindexe les références d'une entité créée ou modifiée (appelé par les services)"""
+        if self._references is not None:
+            self._references.update(kind, entity)
+    
+    def remove_references(self, kind: str, entity_id: str) -> List[Reference]:
+        """Suppression en cascade : retire l'ID d'une entité supprimée de tout ce qui la cite
+        
+        Appelé par les services après la suppression ; ne parcourt que les entités qui
+        référencent l'ID, pas tout le projet.
+        
+        Returns:
+            Références retirées
+        """
+        index = self.references()
+        index.discard(kind, entity_id)
+        removed = []
+        for reference in index.referrers(entity_id):
+            entity = self.get_entity(reference.kind, reference.id)
+            if entity is None:
+                index.discard(reference.kind, reference.id)
+                continue
+            if strip_reference(entity, reference.field, entity_id):
+                removed.append(reference)
+                if hasattr(entity, 'updated_at'):
+                    entity.updated_at = datetime.now()
+            index.update(reference.kind, entity)
+        return removed
+    
     def get_current_project(self) -> Optional[Project]:
         """Récupère la campagne actuelle"""
         return self.current_project
@@ -249,10 +371,11 @@ class ProjectService:
         """Réinitialise les services associés (appelé lors du chargement/création d'un projet)"""
         # Les services sont déjà initialisés dans __init__
         # Cette méthode peut être utilisée pour réinitialiser si nécessaire
-        pass
+        self._references = None
     
     def _load_project_data(self, data: dict) -> None:
         """Charge les données du projet dans les services"""
+        self._references = None
         if self.character_service:
             self.character_service.load_characters(data.get('characters', []))
         if self.scene_service:
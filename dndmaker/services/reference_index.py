@@ -0,0 +1,137 @@
+"""
+Index inverse des références entre entités
+Pour chaque ID, les entités qui le citent (scènes, sessions, lieux, médias, personnages) :
+suppressions en cascade et panneau « Utilisé dans… » sans parcourir tout le projet.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Tuple
+
+# Champs portant des IDs d'autres entités, par type d'entité référente
+REFERENCE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'character': ('image_id', 'prototype'),
+    'scene': (
+        'player_characters', 'npcs', 'locations', 'referenced_scenes', 'sessions',
+        'images', 'cards', 'image_id'
+    ),
+    'session': ('scenes', 'image_id'),
+    'location': ('parent_location', 'bestiary'),
+    'media': ('associated_entities',),
+}
+
+
+class Reference(NamedTuple):
+    """Une entité citant un ID dans l'un de ses champs"""
+    kind: str  # Type de l'entité référente ('scene', 'session', ...)
+    id: str  # ID de l'entité référente
+    field: str  # Champ contenant la référence
+
+
+def reference_targets(entity, field: str) -> Tuple[str, ...]:
+    """IDs contenus dans un champ (ID seul, liste d'IDs ou dict type -> liste d'IDs)"""
+    value = getattr(entity, field, None)
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    if isinstance(value, dict):
+        return tuple(target for targets in value.values() for target in targets)
+    return tuple(value)
+
+
+def strip_reference(entity, field: str, target_id: str) -> bool:
+    """Retire un ID d'un champ d'une entité, retourne True si le champ a changé"""
+    value = getattr(entity, field, None)
+    if not value:
+        return False
+    if isinstance(value, str):
+        if value != target_id:
+            return False
+        setattr(entity, field, None)
+        return True
+    if isinstance(value, dict):
+        changed = False
+        for key, targets in value.items():
+            if target_id in targets:
+                value[key] = [target for target in targets if target != target_id]
+                changed = True
+        return changed
+    if target_id not in value:
+        return False
+    setattr(entity, field, [target for target in value if target != target_id])
+    return True
+
+
+class ReferenceIndex:
+    """Index ID cible -> entités qui le référencent, tenu à jour par ProjectService
+
+    Chaque entité indexée garde ses cibles par champ : la réindexer (update) ne touche
+    que les références ajoutées ou retirées depuis, en O(références de l'entité).
+    """
+
+    def __init__(self, entities: Iterable[Tuple[str, object]] = ()):
+        """
+        Args:
+            entities: Couples (type d'entité, entité) initiaux
+        """
+        self._forward: Dict[Tuple[str, str], Dict[str, Tuple[str, ...]]] = {}
+        self._reverse: Dict[str, Dict[Reference, None]] = {}
+        for kind, entity in entities:
+            self.update(kind, entity)
+
+    def __len__(self) -> int:
+        """Nombre d'IDs référencés"""
+        return len(self._reverse)
+
+    # --- Mise à jour ---
+
+    def update(self, kind: str, entity) -> None:
+        """Ajoute une entité ou réindexe ses références"""
+        key = (kind, entity.id)
+        previous = self._forward.get(key, {})
+        current = {}
+        for field in REFERENCE_FIELDS.get(kind, ()):
+            targets = reference_targets(entity, field)
+            if targets:
+                current[field] = targets
+            old = previous.get(field, ())
+            if old == targets:
+                continue
+            reference = Reference(kind, entity.id, field)
+            kept = set(targets)
+            for target in set(old) - kept:
+                self._unlink(target, reference)
+            for target in kept.difference(old):
+                self._reverse.setdefault(target, {})[reference] = None
+        if current:
+            self._forward[key] = current
+        else:
+            self._forward.pop(key, None)
+
+    def discard(self, kind: str, entity_id: str) -> bool:
+        """Retire les références portées par une entité supprimée"""
+        fields = self._forward.pop((kind, entity_id), None)
+        if fields is None:
+            return False
+        for field, targets in fields.items():
+            reference = Reference(kind, entity_id, field)
+            for target in set(targets):
+                self._unlink(target, reference)
+        return True
+
+    def _unlink(self, target: str, reference: Reference) -> None:
+        referrers = self._reverse.get(target)
+        if referrers is None:
+            return
+        referrers.pop(reference, None)
+        if not referrers:
+            del self._reverse[target]
+
+    # --- Requêtes ---
+
+    def referrers(self, target_id: str) -> List[Reference]:
+        """Entités qui référencent un ID, dans l'ordre où les références ont été ajoutées"""
+        return list(self._reverse.get(target_id, ()))
+
+    def is_referenced(self, target_id: str) -> bool:
+        """Vérifie si un ID est cité par au moins une entité"""
+        return target_id in self._reverse
@@ -0,0 +1,235 @@
+"""
+Graphe des scènes
+Liens `referenced_scenes` d'une scène vers les scènes qui la suivent dans l'histoire :
+adjacence et adjacence inverse, détection des cycles, ordre topologique, et ensembles
+des descendants/ancêtres en cache, mis à jour scène par scène.
+"""
+
+import heapq
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..models.scene import Scene
+
+
+class SceneGraph:
+    """Graphe orienté scène -> scènes référencées, tenu à jour par SceneService
+
+    Les nœuds gardent l'ordre d'insertion des scènes : il sert à départager l'ordre
+    topologique et l'ordre des racines. Les références vers une scène inconnue sont
+    ignorées (le graphe est construit avec toutes les scènes avant les liens).
+
+    Les descendants et ancêtres d'une scène sont calculés à la demande puis gardés en
+    cache ; modifier les liens d'une scène n'invalide que les entrées concernées (ses
+    ancêtres pour les descendants, ses descendants pour les ancêtres).
+    """
+
+    def __init__(self, scenes: Iterable[Scene] = ()):
+        self._nodes: Dict[str, None] = {}
+        self._children: Dict[str, Tuple[str, ...]] = {}
+        self._parents: Dict[str, Dict[str, None]] = {}
+        self._descendants: Dict[str, FrozenSet[str]] = {}
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+        self._components: Optional[List[List[str]]] = None  # Composantes fortement connexes, ordre topologique
+        scenes = list(scenes)
+        for scene in scenes:
+            self._nodes[scene.id] = None
+            self._parents.setdefault(scene.id, {})
+        for scene in scenes:
+            self._set_children(scene.id, scene.referenced_scenes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, scene_id: str) -> bool:
+        return scene_id in self._nodes
+
+    # --- Mise à jour ---
+
+    def update(self, scene: Scene) -> None:
+        """Ajoute une scène ou relit ses scènes référencées"""
+        if scene.id not in self._nodes:
+            self._nodes[scene.id] = None
+            self._parents.setdefault(scene.id, {})
+            self._components = None
+        children = self._known(scene.id, scene.referenced_scenes)
+        if children == self._children.get(scene.id, ()):
+            return
+        self._invalidate(scene.id)
+        self._set_children(scene.id, children)
+        self._invalidate(scene.id)
+
+    def discard(self, scene_id: str) -> bool:
+        """Retire une scène et les liens qui y mènent"""
+        if scene_id not in self._nodes:
+            return False
+        self._invalidate(scene_id)
+        for parent in list(self._parents.get(scene_id, ())):
+            self._children[parent] = tuple(c for c in self._children[parent] if c != scene_id)
+        self._set_children(scene_id, ())
+        del self._nodes[scene_id]
+        self._parents.pop(scene_id, None)
+        self._children.pop(scene_id, None)
+        return True
+
+    def _known(self, scene_id: str, referenced: Iterable[str]) -> Tuple[str, ...]:
+        """Scènes référencées existantes, sans doublon, dans l'ordre"""
+        return tuple(ref for ref in dict.fromkeys(referenced) if ref in self._nodes)
+
+    def _set_children(self, scene_id: str, referenced: Iterable[str]) -> None:
+        children = self._known(scene_id, referenced)
+        for child in self._children.get(scene_id, ()):
+            self._parents[child].pop(scene_id, None)
+        for child in children:
+            self._parents[child][scene_id] = None
+        self._children[scene_id] = children
+        self._components = None
+
+    def _invalidate(self, scene_id: str) -> None:
+        """Oublie les ensembles en cache qui dépendent des liens sortants d'une scène
+
+        Les descendants de la scène et de ses ancêtres changent ; les ancêtres de ses
+        descendants aussi. Appelé avant et après la modification des liens.
+        """
+        for node in self.ancestors(scene_id) | {scene_id}:
+            self._descendants.pop(node, None)
+        for node in self._reach(scene_id, self._children) | {scene_id}:
+            self._ancestors.pop(node, None)
+
+    # --- Requêtes ---
+
+    def children(self, scene_id: str) -> List[str]:
+        """Scènes référencées par une scène"""
+        return list(self._children.get(scene_id, ()))
+
+    def parents(self, scene_id: str) -> List[str]:
+        """Scènes qui référencent une scène"""
+        return list(self._parents.get(scene_id, ()))
+
+    def descendants(self, scene_id: str) -> FrozenSet[str]:
+        """Scènes atteignables depuis une scène (elle-même seulement si elle est dans un cycle)"""
+        cached = self._descendants.get(scene_id)
+        if cached is None:
+            cached = self._descendants[scene_id] = self._reach(scene_id, self._children)
+        return cached
+
+    def ancestors(self, scene_id: str) -> FrozenSet[str]:
+        """Scènes depuis lesquelles une scène est atteignable"""
+        cached = self._ancestors.get(scene_id)
+        if cached is None:
+            cached = self._ancestors[scene_id] = self._reach(scene_id, self._parents)
+        return cached
+
+    @staticmethod
+    def _reach(scene_id: str, edges: Dict[str, Iterable[str]]) -> FrozenSet[str]:
+        seen: Set[str] = set()
+        stack = list(edges.get(scene_id, ()))
+        while stack:
+            node = stack.pop()
+            if node not in seen:
+                seen.add(node)
+                stack.extend(edges.get(node, ()))
+        return frozenset(seen)
+
+    def would_create_cycle(self, scene_id: str, referenced_id: str) -> bool:
+        """Vérifie si référencer `referenced_id` depuis `scene_id` fermerait un cycle"""
+        return scene_id == referenced_id or scene_id in self.descendants(referenced_id)
+
+    def cycles(self) -> List[List[str]]:
+        """Groupes de scènes qui se référencent en boucle"""
+        return [
+            component for component in self._strong_components()
+            if len(component) > 1 or component[0] in self._children.get(component[0], ())
+        ]
+
+    def has_cycle(self) -> bool:
+        return bool(self.cycles())
+
+    def topological_order(self) -> List[str]:
+        """Scènes ordonnées de façon à ce que chacune précède celles qu'elle référence
+
+        Les scènes d'un même cycle sont regroupées, dans l'ordre d'insertion.
+        """
+        return [node for component in self._strong_components() for node in component]
+
+    def roots(self) -> List[str]:
+        """Points d'entrée : scènes qu'aucune autre ne référence
+
+        Pour un cycle que rien ne référence de l'extérieur, sa première scène sert de
+        racine : toute scène est atteignable depuis une racine.
+        """
+        roots = []
+        for component in self._strong_components():
+            members = set(component)
+            if not any(parent not in members for node in component for parent in self._parents[node]):
+                roots.append(component[0])
+        return roots
+
+    def _strong_components(self) -> List[List[str]]:
+        """Composantes fortement connexes (Tarjan, itératif), dans l'ordre topologique"""
+        if self._components is not None:
+            return self._components
+        position = {node: i for i, node in enumerate(self._nodes)}
+        index: Dict[str, int] = {}
+        low: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        for start in self._nodes:
+            if start in index:
+                continue
+            work = [(start, iter(self._children.get(start, ())))]
+            index[start] = low[start] = len(index)
+            stack.append(start)
+            on_stack.add(start)
+            while work:
+                node, children = work[-1]
+                for child in children:
+                    if child not in index:
+                        index[child] = low[child] = len(index)
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(self._children.get(child, ()))))
+                        break
+                    if child in on_stack:
+                        low[node] = min(low[node], index[child])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(sorted(component, key=position.__getitem__))
+        # Tarjan produit les composantes puits d'abord ; on les départage par ordre
+        # d'insertion avec un tri topologique (Kahn) du graphe des composantes
+        return self._order_components(components, position)
+
+    def _order_components(self, components: List[List[str]], position: Dict[str, int]) -> List[List[str]]:
+        owner = {node: i for i, component in enumerate(components) for node in component}
+        successors: List[Set[int]] = [set() for _ in components]
+        indegree = [0] * len(components)
+        for i, component in enumerate(components):
+            for node in component:
+                for child in self._children.get(node, ()):
+                    target = owner[child]
+                    if target != i and target not in successors[i]:
+                        successors[i].add(target)
+                        indegree[target] += 1
+        ready = [(position[component[0]], i) for i, component in enumerate(components) if not indegree[i]]
+        heapq.heapify(ready)
+        ordered = []
+        while ready:
+            _, i = heapq.heappop(ready)
+            ordered.append(components[i])
+            for target in successors[i]:
+                indegree[target] -= 1
+                if not indegree[target]:
+                    heapq.heappush(ready, (position[components[target][0]], target))
+        self._components = ordered
+        return ordered
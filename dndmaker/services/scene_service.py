@@ -7,6 +7,7 @@ from datetime import datetime
 
 from ..models.scene import Scene, Event
 from ..core.utils import generate_id
+from .scene_graph import SceneGraph
 
 
 class SceneService:
@@ -16,6 +17,14 @@ class SceneService:
         """Initialise le service avec une référence au ProjectService"""
         self.project_service = project_service
         self._scenes: dict[str, Scene] = {}
+        # Graphe des scènes référencées, construit à la première utilisation
+        self._graph: Optional[SceneGraph] = None
+    
+    def graph(self) -> SceneGraph:
+        """Graphe des liens referenced_scenes (racines, ordre, cycles, descendants)"""
+        if self._graph is None:
+            self._graph = SceneGraph(self._scenes.values())
+        return self._graph
     
     def load_scenes(self, scenes_data: List[dict]) -> None:
         """Charge les scènes depuis les données du projet"""
@@ -23,6 +32,7 @@ class SceneService:
         for scene_data in scenes_data:
             scene = self._deserialize_scene(scene_data)
             self._scenes[scene.id] = scene
+        self._graph = None
     
     def create_scene(self, title: str, description: str = "") -> Scene:
         """Crée une nouvelle scène"""
@@ -34,6 +44,9 @@ class SceneService:
             updated_at=datetime.now()
         )
         self._scenes[scene.id] = scene
+        if self._graph is not None:
+            self._graph.update(scene)
+        self.project_service.track_references('scene', scene)
         return scene
     
     def get_scene(self, scene_id: str) -> Optional[Scene]:
@@ -50,12 +63,20 @@ class SceneService:
             raise ValueError(f"Scène {scene.id} introuvable")
         scene.updated_at = datetime.now()
         self._scenes[scene.id] = scene
+        if self._graph is not None:
+            self._graph.update(scene)
+        self.project_service.track_references('scene', scene)
     
     def delete_scene(self, scene_id: str) -> bool:
-        """Supprime une scène"""
+        """Supprime une scène et la retire des sessions et scènes qui la citent"""
         if scene_id not in self._scenes:
             return False
         del self._scenes[scene_id]
+        if self._graph is not None:
+            self._graph.discard(scene_id)
+        if self.project_service.session_service:
+            self.project_service.session_service.discard_scene(scene_id)
+        self.project_service.remove_references('scene', scene_id)
         return True
     
     def add_event_to_scene(self, scene_id: str, title: str, description: str = "") -> Event:
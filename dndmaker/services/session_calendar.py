@@ -0,0 +1,120 @@
+"""
+Calendrier des sessions
+Sessions rangées par date, séparées en préparations et sessions réelles : listes triées,
+requêtes par intervalle de dates et prochaine préparation par dichotomie (bisect).
+"""
+
+import heapq
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..models.session import Session
+
+# Clé de tri : date, puis création et ID pour départager les sessions du même jour
+_Key = Tuple[datetime, datetime, str]
+
+
+def _key(session: Session) -> _Key:
+    return (session.date, session.created_at, session.id)
+
+
+class SessionCalendar:
+    """Sessions triées par date, tenues à jour par SessionService
+
+    Deux listes triées de clés, une par partition (préparation / réelle) ; une session
+    dont la date ou le statut change est déplacée en O(log n) pour la recherche, plus
+    le décalage de la liste.
+    """
+
+    def __init__(self, sessions: Iterable[Session] = ()):
+        self._sessions: Dict[str, Session] = {}
+        self._keys: Dict[str, Tuple[_Key, bool]] = {}  # ID -> (clé, préparation) indexés
+        self._preparation: List[_Key] = []
+        self._actual: List[_Key] = []
+        for session in sessions:
+            key = _key(session)
+            self._sessions[session.id] = session
+            self._keys[session.id] = (key, session.is_preparation)
+            self._partition(session.is_preparation).append(key)
+        self._preparation.sort()
+        self._actual.sort()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _partition(self, is_preparation: bool) -> List[_Key]:
+        return self._preparation if is_preparation else self._actual
+
+    def _partitions(self, is_preparation: Optional[bool]) -> List[List[_Key]]:
+        if is_preparation is None:
+            return [self._actual, self._preparation]
+        return [self._partition(is_preparation)]
+
+    # --- Mise à jour ---
+
+    def update(self, session: Session) -> None:
+        """Ajoute une session ou la replace selon sa date et son statut"""
+        key = _key(session)
+        self._sessions[session.id] = session
+        previous = self._keys.get(session.id)
+        if previous == (key, session.is_preparation):
+            return
+        if previous is not None:
+            self._remove(*previous)
+        self._keys[session.id] = (key, session.is_preparation)
+        insort(self._partition(session.is_preparation), key)
+
+    def discard(self, session_id: str) -> bool:
+        """Retire une session"""
+        previous = self._keys.pop(session_id, None)
+        if previous is None:
+            return False
+        del self._sessions[session_id]
+        self._remove(*previous)
+        return True
+
+    def _remove(self, key: _Key, is_preparation: bool) -> None:
+        keys = self._partition(is_preparation)
+        del keys[bisect_left(keys, key)]
+
+    # --- Requêtes ---
+
+    def sessions(self, is_preparation: Optional[bool] = None) -> List[Session]:
+        """Sessions par date croissante (toutes, préparations ou sessions réelles)"""
+        return self.between(is_preparation=is_preparation)
+
+    def between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        is_preparation: Optional[bool] = None
+    ) -> List[Session]:
+        """Sessions dont la date est dans [start, end], par date croissante
+
+        Args:
+            start, end: Bornes incluses (None : pas de borne)
+            is_preparation: True pour les préparations, False pour les sessions réelles,
+                None pour toutes
+        """
+        partitions = self._partitions(is_preparation)
+        slices = [self._range(keys, start, end) for keys in partitions]
+        keys = slices[0] if len(slices) == 1 else heapq.merge(*slices)
+        return [self._sessions[key[2]] for key in keys]
+
+    @staticmethod
+    def _range(keys: List[_Key], start: Optional[datetime], end: Optional[datetime]) -> List[_Key]:
+        low = 0 if start is None else bisect_left(keys, (start,))
+        high = len(keys) if end is None else bisect_right(keys, (end, datetime.max, "\uffff"))
+        return keys[low:high]
+
+    def next_session(self, after: Optional[datetime] = None, is_preparation: Optional[bool] = True) -> Optional[Session]:
+        """Première session à partir d'une date (par défaut : prochaine préparation à venir)"""
+        after = after or datetime.now()
+        partitions = self._partitions(is_preparation)
+        candidates = []
+        for keys in partitions:
+            position = bisect_left(keys, (after,))
+            if position < len(keys):
+                candidates.append(keys[position])
+        return self._sessions[min(candidates)[2]] if candidates else None
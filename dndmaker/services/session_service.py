@@ -2,10 +2,11 @@
 Service de gestion des sessions
 """
 
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
 from ..models.session import Session
+from .session_calendar import SessionCalendar
 from ..core.utils import generate_id
 
 
@@ -16,13 +17,28 @@ class SessionService:
         """Initialise le service avec une référence au ProjectService"""
         self.project_service = project_service
         self._sessions: dict[str, Session] = {}
+        # Index scène <-> session : Session.scenes fait foi, Scene.sessions en est le reflet
+        self._placements: Dict[str, Dict[str, int]] = {}  # ID scène -> {ID session: position}
+        self._indexed: Dict[str, Tuple[str, ...]] = {}  # ID session -> scènes indexées
+        self._calendar: Optional[SessionCalendar] = None  # Construit à la première requête
     
     def load_sessions(self, sessions_data: List[dict]) -> None:
-        """Charge les sessions depuis les données du projet"""
+        """Charge les sessions depuis les données du projet
+        
+        Les scènes sont chargées avant : leur champ `sessions` est recalculé depuis
+        les sessions, ce qui corrige un éventuel écart dans les données enregistrées.
+        """
         self._sessions = {}
+        self._placements = {}
+        self._indexed = {}
+        self._calendar = None
         for session_data in sessions_data:
             session = self._deserialize_session(session_data)
             self._sessions[session.id] = session
+            self._index_session(session, sync=False)
+        scene_service = self.project_service.scene_service
+        if scene_service:
+            self._sync_scenes(scene.id for scene in scene_service.get_all_scenes())
     
     def create_session(
         self,
@@ -43,6 +59,10 @@ class SessionService:
             updated_at=datetime.now()
         )
         self._sessions[session.id] = session
+        self._index_session(session)
+        if self._calendar is not None:
+            self._calendar.update(session)
+        self.project_service.track_references('session', session)
         return session
     
     def get_session(self, session_id: str) -> Optional[Session]:
@@ -50,8 +70,35 @@ class SessionService:
         return self._sessions.get(session_id)
     
     def get_all_sessions(self) -> List[Session]:
-        """Récupère toutes les sessions"""
-        return list(self._sessions.values())
+        """Récupère toutes les sessions, par date croissante"""
+        return self.calendar().sessions()
+    
+    def calendar(self) -> SessionCalendar:
+        """Sessions triées par date, tenues à jour à chaque modification"""
+        if self._calendar is None:
+            self._calendar = SessionCalendar(self._sessions.values())
+        return self._calendar
+    
+    def get_sessions_between(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        is_preparation: Optional[bool] = None
+    ) -> List[Session]:
+        """Sessions dont la date est comprise entre deux dates (incluses), par date croissante"""
+        return self.calendar().between(start, end, is_preparation)
+    
+    def get_preparation_sessions(self) -> List[Session]:
+        """Sessions de préparation, par date croissante"""
+        return self.calendar().sessions(is_preparation=True)
+    
+    def get_actual_sessions(self) -> List[Session]:
+        """Sessions réelles, par date croissante"""
+        return self.calendar().sessions(is_preparation=False)
+    
+    def get_next_preparation_session(self, after: Optional[datetime] = None) -> Optional[Session]:
+        """Prochaine session de préparation à partir d'une date (par défaut : maintenant)"""
+        return self.calendar().next_session(after, is_preparation=True)
     
     def update_session(self, session: Session) -> None:
         """Met à jour une session"""
@@ -59,12 +106,20 @@ class SessionService:
             raise ValueError(f"Session {session.id} introuvable")
         session.updated_at = datetime.now()
         self._sessions[session.id] = session
+        self._index_session(session)
+        if self._calendar is not None:
+            self._calendar.update(session)
+        self.project_service.track_references('session', session)
     
     def delete_session(self, session_id: str) -> bool:
-        """Supprime une session"""
+        """Supprime une session et la retire des scènes qui la citent"""
         if session_id not in self._sessions:
             return False
         del self._sessions[session_id]
+        self._unindex_session(session_id)
+        if self._calendar is not None:
+            self._calendar.discard(session_id)
+        self.project_service.remove_references('session', session_id)
         return True
     
     def add_scene_to_session(self, session_id: str, scene_id: str, position: Optional[int] = None) -> None:
@@ -82,6 +137,8 @@ class SessionService:
             session.scenes.insert(position, scene_id)
         
         session.updated_at = datetime.now()
+        self._index_session(session)
+        self.project_service.track_references('session', session)
     
     def remove_scene_from_session(self, session_id: str, scene_id: str) -> bool:
         """Retire une scène d'une session"""
@@ -94,6 +151,8 @@ class SessionService:
         
         session.scenes.remove(scene_id)
         session.updated_at = datetime.now()
+        self._index_session(session)
+        self.project_service.track_references('session', session)
         return True
     
     def reorder_scenes_in_session(self, session_id: str, scene_ids: List[str]) -> None:
@@ -104,6 +163,8 @@ class SessionService:
         
         session.scenes = scene_ids
         session.updated_at = datetime.now()
+        self._index_session(session)
+        self.project_service.track_references('session', session)
     
     def duplicate_session(self, session_id: str, new_title: Optional[str] = None) -> Session:
         """Duplique une session (préparation → réel)"""
@@ -124,8 +185,85 @@ class SessionService:
         )
         
         self._sessions[new_session.id] = new_session
+        self._index_session(new_session)
+        if self._calendar is not None:
+            self._calendar.update(new_session)
+        self.project_service.track_references('session', new_session)
         return new_session
     
+    def discard_scene(self, scene_id: str) -> List[Session]:
+        """Retire une scène supprimée des sessions qui la contiennent
+        
+        Returns:
+            Sessions modifiées
+        """
+        sessions = [self._sessions[session_id] for session_id in self._placements.get(scene_id, ())]
+        for session in sessions:
+            session.scenes = [s for s in session.scenes if s != scene_id]
+            session.updated_at = datetime.now()
+            self._index_session(session)
+            self.project_service.track_references('session', session)
+        return sessions
+    
+    # --- Index scène <-> session ---
+    
+    def get_scene_sessions(self, scene_id: str) -> List[Session]:
+        """Sessions contenant une scène"""
+        return [self._sessions[session_id] for session_id in self._placements.get(scene_id, ())]
+    
+    def get_scene_position(self, session_id: str, scene_id: str) -> Optional[int]:
+        """Position d'une scène dans une session (None si elle n'y est pas)"""
+        return self._placements.get(scene_id, {}).get(session_id)
+    
+    def is_scene_assigned(self, scene_id: str) -> bool:
+        """Vérifie si une scène fait partie d'au moins une session"""
+        return scene_id in self._placements
+    
+    def _index_session(self, session: Session, sync: bool = True) -> None:
+        """Réindexe les scènes d'une session, en O(scènes de la session)"""
+        previous = self._indexed.get(session.id, ())
+        current = tuple(dict.fromkeys(session.scenes))
+        if previous == current:
+            return
+        kept = set(current)
+        for scene_id in previous:
+            if scene_id not in kept:
+                placements = self._placements[scene_id]
+                del placements[session.id]
+                if not placements:
+                    del self._placements[scene_id]
+        for position, scene_id in enumerate(current):
+            self._placements.setdefault(scene_id, {})[session.id] = position
+        if current:
+            self._indexed[session.id] = current
+        else:
+            self._indexed.pop(session.id, None)
+        if sync:
+            self._sync_scenes(set(previous).symmetric_difference(current))
+    
+    def _unindex_session(self, session_id: str) -> None:
+        previous = self._indexed.pop(session_id, ())
+        for scene_id in previous:
+            placements = self._placements[scene_id]
+            del placements[session_id]
+            if not placements:
+                del self._placements[scene_id]
+        self._sync_scenes(previous)
+    
+    def _sync_scenes(self, scene_ids: Iterable[str]) -> None:
+        """Recopie l'index dans le champ `sessions` des scènes"""
+        scene_service = self.project_service.scene_service
+        if not scene_service:
+            return
+        for scene_id in scene_ids:
+            scene = scene_service.get_scene(scene_id)
+            if scene is None:
+                continue
+            sessions = list(self._placements.get(scene_id, ()))
+            if scene.sessions != sessions:
+                scene.sessions = sessions
+                self.project_service.track_references('scene', scene)
+    
     def _deserialize_session(self, data: dict) -> Session:
         """Désérialise une session depuis un dictionnaire"""
         session = Session(
@@ -32,6 +32,7 @@ Exemples:
   dndmaker-cli character list --type PJ
   dndmaker-cli scene create --title "La Taverne"
   dndmaker-cli export character --name "Aragorn" --format PDF
+  dndmaker-cli roll "4d6kh3" --count 6
             """
         )
         
@@ -52,9 +53,15 @@ Exemples:
         # Commande bank
         self._add_bank_commands(subparsers)
         
+        # Commande generate
+        self._add_generate_commands(subparsers)
+        
         # Commande export
         self._add_export_commands(subparsers)
         
+        # Commande roll
+        self._add_roll_command(subparsers)
+        
         args = parser.parse_args()
         
         if not args.command:
@@ -120,7 +127,11 @@ Exemples:
         
         # list
         list_parser = char_subparsers.add_parser('list', help='Lister les personnages')
-        list_parser.add_argument('--type', choices=['PJ', 'PNJ', 'CREATURE'], help='Filtrer par type')
+        self._add_character_filters(list_parser)
+        list_parser.add_argument('--sort', default='name',
+                                 help='Champs de tri séparés par des virgules, "-" pour décroissant (ex: -level,name)')
+        list_parser.add_argument('--offset', type=int, default=0, help='Nombre de personnages à sauter')
+        list_parser.add_argument('--limit', type=int, default=100, help='Taille de la page (0 : tout)')
         list_parser.set_defaults(func=self._cmd_character_list)
         
         # show
@@ -141,6 +152,61 @@ Exemples:
         delete_parser = char_subparsers.add_parser('delete', help='Supprimer un personnage')
         delete_parser.add_argument('--name', required=True, help='Nom du personnage')
         delete_parser.set_defaults(func=self._cmd_character_delete)
+        
+        # spawn
+        spawn_parser = char_subparsers.add_parser('spawn', help='Créer des instances d\'un personnage modèle (copie à l\'écriture)')
+        spawn_parser.add_argument('--name', required=True, help='Nom du personnage servant de prototype')
+        spawn_parser.add_argument('--count', type=int, required=True, help='Nombre d\'instances')
+        spawn_parser.add_argument('--scene', help='Titre de la scène à laquelle ajouter les instances')
+        spawn_parser.set_defaults(func=self._cmd_character_spawn)
+        
+        # create-many
+        create_many_parser = char_subparsers.add_parser('create-many', help='Créer des personnages en masse')
+        create_many_parser.add_argument('--type', choices=['PJ', 'PNJ', 'CREATURE'], default='PNJ', help='Type')
+        create_many_parser.add_argument('--name', action='append', default=[], help='Nom (répétable)')
+        create_many_parser.add_argument('--count', type=int, default=0, help='Nombre de personnages numérotés à créer')
+        create_many_parser.add_argument('--prefix', default='PNJ', help='Préfixe des noms numérotés (avec --count)')
+        create_many_parser.add_argument('--level', type=int, default=1, help='Niveau')
+        create_many_parser.add_argument('--race', help='Race')
+        create_many_parser.add_argument('--class', dest='character_class', help='Classe')
+        create_many_parser.add_argument('--faction', help='Faction (nom ou ID)')
+        create_many_parser.set_defaults(func=self._cmd_character_create_many)
+        
+        # update (en masse)
+        update_parser = char_subparsers.add_parser('update', help='Modifier en masse les personnages filtrés')
+        self._add_character_filters(update_parser)
+        update_parser.add_argument('--set', action='append', default=[], metavar='CHAMP=VALEUR',
+                                   help='Champ à modifier, ex: faction=Guilde, profile.race=Nain (répétable)')
+        update_parser.add_argument('--level-up', type=int, default=0, help='Niveaux à ajouter (négatif pour retirer)')
+        update_parser.add_argument('--dry-run', action='store_true', help='Afficher les personnages concernés sans rien modifier')
+        update_parser.set_defaults(func=self._cmd_character_update)
+        
+        # bulk-delete
+        bulk_delete_parser = char_subparsers.add_parser('bulk-delete', help='Supprimer en masse les personnages filtrés')
+        self._add_character_filters(bulk_delete_parser)
+        bulk_delete_parser.add_argument('--dry-run', action='store_true', help='Afficher les personnages concernés sans rien supprimer')
+        bulk_delete_parser.set_defaults(func=self._cmd_character_bulk_delete)
+        
+        # stats
+        from ..services.character_analytics import COLUMN_NAMES
+        stats_parser = char_subparsers.add_parser('stats', help='Statistiques de campagne (moyennes, histogramme, classement)')
+        stats_parser.add_argument('--column', choices=COLUMN_NAMES, default='level', help='Colonne étudiée')
+        stats_parser.add_argument('--type', choices=['PJ', 'PNJ', 'CREATURE'], help='Filtrer par type')
+        stats_parser.add_argument('--by', choices=['type', 'faction'], help='Moyenne par groupe')
+        stats_parser.add_argument('--top', type=int, default=5, help='Taille du classement')
+        stats_parser.set_defaults(func=self._cmd_character_stats)
+    
+    @staticmethod
+    def _add_character_filters(parser):
+        """Ajoute les filtres de sélection de personnages (list, update, bulk-delete)"""
+        parser.add_argument('--type', choices=['PJ', 'PNJ', 'CREATURE'], help='Filtrer par type')
+        parser.add_argument('--level', type=int, help='Filtrer par niveau exact')
+        parser.add_argument('--min-level', type=int, help='Niveau minimal')
+        parser.add_argument('--max-level', type=int, help='Niveau maximal')
+        parser.add_argument('--race', help='Filtrer par race')
+        parser.add_argument('--class', dest='character_class', help='Filtrer par classe')
+        parser.add_argument('--faction', help='Filtrer par faction (nom ou ID, "-" : sans faction)')
+        parser.add_argument('--name', help='Début du nom')
     
     def _add_scene_commands(self, subparsers):
         """Ajoute les commandes de gestion de scènes"""
@@ -166,6 +232,27 @@ Exemples:
         delete_parser = scene_subparsers.add_parser('delete', help='Supprimer une scène')
         delete_parser.add_argument('--title', required=True, help='Titre de la scène')
         delete_parser.set_defaults(func=self._cmd_scene_delete)
+        
+        # encounter
+        encounter_parser = scene_subparsers.add_parser('encounter', help='Composer une rencontre équilibrée pour une scène')
+        encounter_parser.add_argument('--title', required=True, help='Titre de la scène')
+        encounter_parser.add_argument('--difficulty', choices=['facile', 'moyenne', 'difficile', 'mortelle'],
+                                      default='moyenne', help='Difficulté de la rencontre')
+        encounter_parser.add_argument('--max-creatures', type=int, default=8, help='Nombre maximum de créatures')
+        encounter_parser.add_argument('--archetype', action='append', dest='archetypes',
+                                      help='Archétype autorisé (répétable, tous par défaut)')
+        encounter_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        encounter_parser.add_argument('--shared', action='store_true',
+                                      help='Une créature générée par template, les autres en sont des instances')
+        encounter_parser.set_defaults(func=self._cmd_scene_encounter)
+        
+        # simulate
+        simulate_parser = scene_subparsers.add_parser('simulate', help='Simuler le combat des PJ contre les PNJ d\'une scène')
+        simulate_parser.add_argument('--title', required=True, help='Titre de la scène')
+        simulate_parser.add_argument('--count', type=int, default=5000, help='Nombre de combats simulés')
+        simulate_parser.add_argument('--workers', type=int, default=1, help='Nombre de processus (utile au-delà de 20000 combats)')
+        simulate_parser.add_argument('--seed', type=int, help='Graine pour une simulation reproductible')
+        simulate_parser.set_defaults(func=self._cmd_scene_simulate)
     
     def _add_session_commands(self, subparsers):
         """Ajoute les commandes de gestion de sessions"""
@@ -174,6 +261,8 @@ Exemples:
         
         # list
         list_parser = session_subparsers.add_parser('list', help='Lister les sessions')
+        list_parser.add_argument('--from', dest='date_from', help='Depuis cette date incluse (format: YYYY-MM-DD)')
+        list_parser.add_argument('--to', dest='date_to', help='Jusqu\'à cette date incluse (format: YYYY-MM-DD)')
         list_parser.set_defaults(func=self._cmd_session_list)
         
         # show
@@ -204,6 +293,113 @@ Exemples:
                                        'CREATURES', 'PROFESSIONS', 'ARMORS', 'TOOLS', 'TRINKETS', 'WEAPONS'],
                                help='Type de banque')
         list_parser.set_defaults(func=self._cmd_bank_list)
+        
+        from ..models.bank import BankType
+        bank_types = [t.value for t in BankType]
+        
+        # import
+        import_parser = bank_subparsers.add_parser('import', help='Importer des entrées en masse (CSV/JSONL)')
+        import_parser.add_argument('--type', required=True, choices=bank_types, help='Type de banque')
+        import_parser.add_argument('--file', type=Path, required=True, help='Fichier à importer')
+        import_parser.add_argument('--format', choices=['csv', 'jsonl'], help='Format (déduit de l\'extension par défaut)')
+        import_parser.add_argument('--dry-run', action='store_true', help='Valider sans importer')
+        import_parser.set_defaults(func=self._cmd_bank_import)
+        
+        # export
+        export_parser = bank_subparsers.add_parser('export', help='Exporter une banque (CSV/JSONL)')
+        export_parser.add_argument('--type', required=True, choices=bank_types, help='Type de banque')
+        export_parser.add_argument('--file', type=Path, required=True, help='Fichier de sortie')
+        export_parser.add_argument('--format', choices=['csv', 'jsonl'], help='Format (déduit de l\'extension par défaut)')
+        export_parser.set_defaults(func=self._cmd_bank_export)
+        
+        # dedupe
+        dedupe_parser = bank_subparsers.add_parser('dedupe', help='Fusionner les entrées en double')
+        dedupe_parser.add_argument('--type', choices=bank_types, help='Type de banque (toutes par défaut)')
+        dedupe_parser.add_argument('--dry-run', action='store_true', help='Afficher le résultat sans rien modifier')
+        dedupe_parser.set_defaults(func=self._cmd_bank_dedupe)
+    
+    def _add_generate_commands(self, subparsers):
+        """Ajoute les commandes de génération"""
+        generate_parser = subparsers.add_parser('generate', help='Génération aléatoire')
+        generate_subparsers = generate_parser.add_subparsers(dest='generate_command', help='Commandes génération')
+        
+        # npc
+        npc_parser = generate_subparsers.add_parser('npc', help='Générer des PNJ en masse')
+        npc_parser.add_argument('--count', type=int, default=1, help='Nombre de PNJ à générer')
+        npc_parser.add_argument('--level', type=int, default=1, help='Niveau des PNJ')
+        npc_parser.add_argument('--race', help='Race imposée (aléatoire par défaut)')
+        npc_parser.add_argument('--class', dest='character_class', help='Classe imposée (aléatoire par défaut)')
+        npc_parser.add_argument('--gender', choices=['M', 'F'], help='Genre imposé (aléatoire par défaut)')
+        npc_parser.add_argument('--method', choices=['standard', 'heroic'], default='standard',
+                               help='Méthode de génération des caractéristiques')
+        npc_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        npc_parser.add_argument('--invent-names', action='store_true',
+                               help='Inventer des noms inédits à partir de la banque de noms (selon la race et le genre)')
+        npc_parser.add_argument('--min', action='append', dest='stat_min', metavar='CARAC=VALEUR',
+                               help='Valeur minimale d\'une caractéristique, ex: INT=16 (répétable)')
+        npc_parser.add_argument('--max', action='append', dest='stat_max', metavar='CARAC=VALEUR',
+                               help='Valeur maximale d\'une caractéristique, ex: FOR=10 (répétable)')
+        npc_parser.set_defaults(func=self._cmd_generate_npc)
+        
+        # encounters
+        encounters_parser = generate_subparsers.add_parser('encounters', help='Générer des rencontres en masse (une scène par rencontre)')
+        encounters_parser.add_argument('--count', type=int, required=True, help='Nombre de rencontres')
+        encounters_parser.add_argument('--min-level', type=int, default=1, help='Niveau minimum')
+        encounters_parser.add_argument('--max-level', type=int, default=1, help='Niveau maximum')
+        encounters_parser.add_argument('--min-size', type=int, default=1, help='Nombre minimum de créatures par rencontre')
+        encounters_parser.add_argument('--max-size', type=int, default=6, help='Nombre maximum de créatures par rencontre')
+        encounters_parser.add_argument('--workers', type=int, help='Nombre de processus (par défaut: nombre de cœurs)')
+        encounters_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        encounters_parser.set_defaults(func=self._cmd_generate_encounters)
+        
+        # bestiary
+        bestiary_parser = generate_subparsers.add_parser('bestiary', help='Créer une variante de chaque créature du bestiaire à un niveau donné')
+        bestiary_parser.add_argument('--level', type=int, required=True, help='Niveau des créatures')
+        bestiary_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        bestiary_parser.set_defaults(func=self._cmd_generate_bestiary)
+        
+        # loot
+        loot_parser = generate_subparsers.add_parser('loot', help='Distribuer du butin aux personnages (équipement, objets de valeur, bourse)')
+        loot_parser.add_argument('--character', action='append', dest='characters', metavar='NOM',
+                                help='Personnage à équiper (répétable, par défaut tous les personnages du type choisi)')
+        loot_parser.add_argument('--type', choices=['PJ', 'PNJ', 'CREATURE'], default='PNJ',
+                                help='Type des personnages équipés sans --character')
+        loot_parser.add_argument('--location-type', help='Type de lieu (Taverne, Donjon, Temple...)')
+        loot_parser.add_argument('--hoard', action='store_true', help='Trésor complet plutôt que butin individuel')
+        loot_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        loot_parser.set_defaults(func=self._cmd_generate_loot)
+        
+        # settlement
+        settlement_parser = generate_subparsers.add_parser('settlement', help='Peupler un lieu existant (foyers, métiers, factions)')
+        settlement_parser.add_argument('--location', required=True, help='Nom du lieu')
+        settlement_parser.add_argument('--population', type=int, required=True, help='Nombre d\'habitants')
+        settlement_parser.add_argument('--level', type=int, default=1, help='Niveau des habitants')
+        settlement_parser.add_argument('--race', help='Race dominante (aléatoire par défaut)')
+        settlement_parser.add_argument('--factions', type=int, default=2, help='Nombre maximal de factions présentes')
+        settlement_parser.add_argument('--bank-names', action='store_true',
+                                      help='Reprendre les noms de la banque au lieu d\'en inventer')
+        settlement_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        settlement_parser.set_defaults(func=self._cmd_generate_settlement)
+        
+        # region
+        region_parser = generate_subparsers.add_parser('region', help='Générer une région de villages peuplés')
+        region_parser.add_argument('--name', required=True, help='Nom de la région')
+        region_parser.add_argument('--villages', type=int, required=True, help='Nombre de villages')
+        region_parser.add_argument('--min-population', type=int, default=20, help='Population minimum par village')
+        region_parser.add_argument('--max-population', type=int, default=60, help='Population maximum par village')
+        region_parser.add_argument('--level', type=int, default=1, help='Niveau des habitants')
+        region_parser.add_argument('--workers', type=int, help='Nombre de processus (par défaut: nombre de cœurs)')
+        region_parser.add_argument('--seed', type=int, help='Graine pour une génération reproductible')
+        region_parser.set_defaults(func=self._cmd_generate_region)
+    
+    def _add_roll_command(self, subparsers):
+        """Ajoute la commande de lancer de dés"""
+        roll_parser = subparsers.add_parser('roll', help='Lancer des dés (ex: 2d6+3, 4d6kh3, 1d20kl1)')
+        roll_parser.add_argument('expression', help='Expression de dés')
+        roll_parser.add_argument('--count', type=int, default=1, help='Nombre de lancers')
+        roll_parser.add_argument('--stats', action='store_true', help='Afficher la distribution exacte des résultats')
+        roll_parser.add_argument('--seed', type=int, help='Graine pour des lancers reproductibles')
+        roll_parser.set_defaults(func=self._cmd_roll)
     
     def _add_export_commands(self, subparsers):
         """Ajoute les commandes d'export"""
@@ -223,6 +419,43 @@ Exemples:
         scene_parser.add_argument('--format', choices=['JSON', 'TXT', 'Markdown'], required=True, help='Format')
         scene_parser.add_argument('--output', type=Path, help='Fichier de sortie')
         scene_parser.set_defaults(func=self._cmd_export_scene)
+        
+        # story-arc
+        arc_parser = export_subparsers.add_parser('story-arc', help='Exporter l\'arc narratif (scènes et leurs références)')
+        arc_parser.add_argument('--format', choices=['TXT', 'Markdown'], required=True, help='Format')
+        arc_parser.add_argument('--output', type=Path, help='Fichier de sortie (par défaut: arc_narratif.format)')
+        arc_parser.set_defaults(func=self._cmd_export_story_arc)
+    
+    # Commande roll
+    def _cmd_roll(self, args):
+        """Lance des dés (aucun projet requis)"""
+        from ..core.dice import compile_dice
+        from ..core.rng import make_rng
+        
+        try:
+            expression = compile_dice(args.expression)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        rolls = expression.roll_many(max(1, args.count), make_rng(args.seed))
+        if len(rolls) == 1:
+            print(f"🎲 {expression} → {rolls[0]}")
+        else:
+            print(f"🎲 {expression} × {len(rolls)} → {', '.join(map(str, rolls))}")
+            print(f"  Total: {sum(rolls)}, moyenne obtenue: {sum(rolls) / len(rolls):.2f}")
+        
+        if args.stats:
+            print(f"\n📊 {expression.summary()}")
+            print("  Percentiles 10/25/75/90: " + " / ".join(
+                str(expression.percentile(p)) for p in (10, 25, 75, 90)
+            ))
+            distribution = expression.distribution() if expression.is_exact else {}
+            if 0 < len(distribution) <= 40:
+                peak = max(distribution.values())
+                for value, probability in distribution.items():
+                    bar = "█" * max(1, round(probability / peak * 30))
+                    print(f"  {value:>5} {probability * 100:6.2f} % {bar}")
     
     # Commandes project
     def _cmd_project_create(self, args):
@@ -300,25 +533,33 @@ Exemples:
         if not self._check_project_loaded():
             return
         
-        from ..models.character import CharacterType
-        
-        all_chars = self.project_service.character_service.get_all_characters()
-        
-        if args.type:
-            char_type = CharacterType(args.type)
-            chars = [c for c in all_chars if c.type == char_type]
-        else:
-            chars = all_chars
+        try:
+            page = self.project_service.character_service.query(
+                sort=[key.strip() for key in args.sort.split(',') if key.strip()],
+                offset=args.offset,
+                limit=args.limit or None,
+                **self._character_criteria(args)
+            )
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        chars = page.characters
         
         if chars:
-            print(f"\n👥 Personnages ({len(chars)}):")
-            print("-" * 80)
-            print(f"{'Nom':<30} {'Type':<10} {'Niveau':<8} {'Race':<15} {'Classe':<15}")
-            print("-" * 80)
-            for char in sorted(chars, key=lambda x: x.name):
+            print(f"\n👥 Personnages ({page.offset + 1}-{page.offset + len(chars)} sur {page.total}):")
+            print("-" * 94)
+            print(f"{'Nom':<30} {'Type':<10} {'Niveau':<8} {'Race':<15} {'Classe':<15} {'PV':<6} {'Déf':<5}")
+            print("-" * 94)
+            for char in chars:
                 race = char.profile.race or "-"
                 char_class = char.profile.character_class or "-"
-                print(f"{char.name:<30} {char.type.value:<10} {char.profile.level:<8} {race:<15} {char_class:<15}")
+                derived = char.derived
+                print(
+                    f"{char.name:<30} {char.type.value:<10} {char.profile.level:<8} {race:<15} {char_class:<15} "
+                    f"{char.combat.life_points:<6} {derived.defense_total:<5}"
+                )
+            if page.has_next:
+                print(f"\nℹ️  Suite : --offset {page.offset + len(chars)}")
         else:
             print("ℹ️  Aucun personnage trouvé")
     
@@ -352,9 +593,11 @@ Exemples:
         print(f"  CHA: {char.characteristics.charisma.value} ({char.characteristics.charisma.modifier:+d})")
         
         print(f"\n⚔️  Combat:")
+        derived = char.derived
         print(f"  PV:        {char.combat.life_points}")
-        print(f"  Défense:   {char.defense.calculate_total()}")
-        print(f"  Initiative: {char.combat.initiative or 'DEX'}")
+        print(f"  Défense:   {derived.defense_total}")
+        print(f"  Attaque:   contact {derived.melee_attack:+d}, distance {derived.ranged_attack:+d}, magie {derived.magic_attack:+d}")
+        print(f"  Initiative: {derived.initiative}")
     
     def _cmd_character_create(self, args):
         """Crée un personnage"""
@@ -397,6 +640,193 @@ Exemples:
         else:
             print(f"❌ Erreur lors de la suppression")
     
+    def _cmd_character_spawn(self, args):
+        """Crée des instances d'un personnage servant de prototype"""
+        if not self._check_project_loaded():
+            return
+        
+        if args.count < 1:
+            print("❌ --count doit être au moins 1")
+            return
+        
+        chars = self.project_service.character_service.get_all_characters()
+        prototype = next((c for c in chars if c.name.lower() == args.name.lower()), None)
+        if not prototype:
+            print(f"❌ Personnage '{args.name}' introuvable")
+            return
+        
+        scene = None
+        if args.scene:
+            scenes = self.project_service.scene_service.get_all_scenes()
+            scene = next((s for s in scenes if s.title.lower() == args.scene.lower()), None)
+            if not scene:
+                print(f"❌ Scène '{args.scene}' introuvable")
+                return
+        
+        try:
+            instances = self.project_service.character_service.spawn_instances(prototype.id, args.count)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        if scene:
+            scene.npcs.extend(c.id for c in instances)
+            self.project_service.scene_service.update_scene(scene)
+        self.project_service.save_project(f"{len(instances)} instance(s) de {prototype.name}")
+        print(f"✅ {len(instances)} instance(s) de '{prototype.name}' créée(s)"
+              + (f" et ajoutée(s) à '{scene.title}'" if scene else ""))
+    
+    def _character_criteria(self, args) -> dict:
+        """Critères de requête construits depuis les filtres de la ligne de commande"""
+        from ..models.character import CharacterType
+        
+        criteria = {}
+        if args.type:
+            criteria['type'] = CharacterType(args.type)
+        if args.level is not None:
+            criteria['level'] = args.level
+        elif args.min_level is not None or args.max_level is not None:
+            criteria['level'] = (args.min_level, args.max_level)
+        if args.race:
+            criteria['race'] = args.race
+        if args.character_class:
+            criteria['character_class'] = args.character_class
+        if args.faction:
+            criteria['faction'] = None if args.faction == '-' else self._faction_id(args.faction)
+        if args.name:
+            criteria['name_prefix'] = args.name
+        return criteria
+    
+    def _faction_id(self, faction: str) -> str:
+        """ID d'une faction de la banque désignée par son nom (ou son ID)"""
+        from ..models.bank import BankType
+        from ..core.utils import normalize_key
+        
+        bank = self.project_service.bank_service.get_bank_by_type(BankType.FACTIONS)
+        for entry in bank.entries if bank else []:
+            if entry.id == faction or normalize_key(entry.value) == normalize_key(faction):
+                return entry.id
+        return faction
+    
+    def _cmd_character_create_many(self, args):
+        """Crée des personnages en masse (une seule sauvegarde)"""
+        if not self._check_project_loaded():
+            return
+        
+        names = list(args.name) + [f"{args.prefix} {i}" for i in range(1, args.count + 1)]
+        if not names:
+            print("❌ Indiquez des noms (--name) ou un nombre (--count)")
+            return
+        
+        faction = self._faction_id(args.faction) if args.faction else None
+        entries = [
+            {'name': name, 'type': args.type, 'level': args.level, 'race': args.race,
+             'character_class': args.character_class, 'faction': faction}
+            for name in names
+        ]
+        try:
+            change = self.project_service.bulk_create_characters(entries)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ {len(change.created)} personnage(s) créé(s)")
+    
+    def _cmd_character_update(self, args):
+        """Modifie en masse les personnages filtrés (une seule sauvegarde)"""
+        if not self._check_project_loaded():
+            return
+        
+        criteria = self._character_criteria(args)
+        if not criteria:
+            print("❌ Indiquez au moins un filtre (--type, --race, --faction, ...)")
+            return
+        
+        patch = {}
+        for assignment in args.set:
+            path, separator, value = assignment.partition('=')
+            if not separator:
+                print(f"❌ Modification invalide: {assignment} (attendu CHAMP=VALEUR)")
+                return
+            path = path.strip()
+            value = _parse_value(value)
+            if path == 'faction' and value is not None:
+                value = self._faction_id(str(value))
+            patch[path] = value
+        if args.level_up:
+            patch['profile.level'] = lambda level, delta=args.level_up: max(1, level + delta)
+        if not patch:
+            print("❌ Rien à modifier (--set ou --level-up)")
+            return
+        
+        character_service = self.project_service.character_service
+        if args.dry_run:
+            selected = character_service.select(**criteria)
+            print(f"ℹ️  {len(selected)} personnage(s) seraient modifiés")
+            return
+        try:
+            change = self.project_service.bulk_update_characters(patch, **criteria)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        print(f"✅ {len(change.updated)} personnage(s) modifié(s)")
+    
+    def _cmd_character_bulk_delete(self, args):
+        """Supprime en masse les personnages filtrés (une seule sauvegarde)"""
+        if not self._check_project_loaded():
+            return
+        
+        criteria = self._character_criteria(args)
+        if not criteria:
+            print("❌ Indiquez au moins un filtre (--type, --race, --faction, ...)")
+            return
+        
+        if args.dry_run:
+            selected = self.project_service.character_service.select(**criteria)
+            print(f"ℹ️  {len(selected)} personnage(s) seraient supprimés")
+            return
+        change = self.project_service.bulk_delete_characters(**criteria)
+        print(f"✅ {len(change.deleted)} personnage(s) supprimé(s)")
+    
+    def _cmd_character_stats(self, args):
+        """Statistiques sur les personnages (vue en colonnes)"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..models.bank import BankType
+        from ..models.character import CharacterType
+        
+        character_service = self.project_service.character_service
+        analytics = character_service.analytics()
+        where = {'type': CharacterType(args.type)} if args.type else {}
+        count = analytics.count(where)
+        if not count:
+            print("ℹ️  Aucun personnage trouvé")
+            return
+        
+        print(f"\n📊 {args.column} ({count} personnage(s)) : moyenne {analytics.mean(args.column, where):.2f}")
+        
+        if args.by:
+            factions = self.project_service.bank_service.get_bank_by_type(BankType.FACTIONS)
+            faction_names = {entry.id: entry.value for entry in factions.entries} if factions else {}
+            print(f"\nMoyenne par {args.by}:")
+            for group, mean in analytics.mean_by(args.column, args.by, where).items():
+                if args.by == 'type':
+                    label = group.value
+                else:
+                    label = faction_names.get(group, group) if group else "(aucune)"
+                print(f"  {label:<30} {mean:.2f}")
+        
+        histogram = analytics.histogram(args.column, where)
+        widest = max(histogram.values())
+        print("\nHistogramme:")
+        for value, n in histogram.items():
+            print(f"  {value:>5} {n:>7} {'█' * max(1, round(40 * n / widest))}")
+        
+        if args.top > 0:
+            print(f"\nTop {args.top}:")
+            for character_id, value in analytics.top(args.column, args.top, where):
+                print(f"  {character_service.get_character(character_id).name:<30} {value}")
+    
     # Commandes scene
     def _cmd_scene_list(self, args):
         """Liste les scènes"""
@@ -434,6 +864,12 @@ Exemples:
         print(f"Description: {scene.description or '-'}")
         if scene.notes:
             print(f"\nNotes: {scene.notes}")
+        session_service = self.project_service.session_service
+        placements = [
+            f"{session.title} (scène {session_service.get_scene_position(session.id, scene.id) + 1})"
+            for session in session_service.get_scene_sessions(scene.id)
+        ]
+        print(f"Sessions: {', '.join(placements) or '-'}")
         print(f"\nCréée le:  {scene.created_at.strftime('%d/%m/%Y %H:%M')}")
         print(f"Modifiée le: {scene.updated_at.strftime('%d/%m/%Y %H:%M')}")
     
@@ -467,24 +903,97 @@ Exemples:
         else:
             print(f"❌ Erreur lors de la suppression")
     
+    def _cmd_scene_encounter(self, args):
+        """Compose une rencontre pour une scène et ajoute les créatures à ses PNJ"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..generators.encounter_builder import EncounterBuilder
+        
+        scenes = self.project_service.scene_service.get_all_scenes()
+        scene = next((s for s in scenes if s.title.lower() == args.title.lower()), None)
+        
+        if not scene:
+            print(f"❌ Scène '{args.title}' introuvable")
+            return
+        
+        builder = EncounterBuilder(self.project_service, seed=args.seed)
+        # Groupe : les PJ de la scène, sinon tous les PJ du projet
+        party = builder.party_levels(scene.player_characters) or builder.party_levels() or [1]
+        encounters = builder.suggest(
+            args.difficulty, party, count=1,
+            max_creatures=args.max_creatures, archetypes=args.archetypes
+        )
+        if not encounters:
+            print("❌ Aucune créature du bestiaire ne correspond à ces critères")
+            return
+        
+        encounter = encounters[0]
+        creatures = builder.add_to_scene(scene, encounter, shared=args.shared)
+        self.project_service.save_project(f"Rencontre ajoutée à la scène {scene.title}")
+        print(f"✅ {len(creatures)} créature(s) ajoutée(s) à '{scene.title}' : {encounter.describe()}")
+    
+    def _cmd_scene_simulate(self, args):
+        """Simule le combat des PJ de la scène (ou de tous les PJ) contre ses PNJ"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..models.character import CharacterType
+        from ..services.combat_simulator import CombatSimulator
+        
+        scenes = self.project_service.scene_service.get_all_scenes()
+        scene = next((s for s in scenes if s.title.lower() == args.title.lower()), None)
+        
+        if not scene:
+            print(f"❌ Scène '{args.title}' introuvable")
+            return
+        
+        character_service = self.project_service.character_service
+        party = [c for c in map(character_service.get_character, scene.player_characters) if c]
+        party = party or character_service.get_characters_by_type(CharacterType.PJ)
+        opponents = [c for c in map(character_service.get_character, scene.npcs) if c]
+        if not party or not opponents:
+            print("❌ Il faut au moins un PJ et un PNJ ou une créature dans la scène")
+            return
+        
+        simulator = CombatSimulator(self.project_service.bank_service, seed=args.seed, workers=args.workers)
+        report = simulator.simulate(party, opponents, simulations=max(1, args.count))
+        print(f"\n⚔️  {scene.title} — camp A : {len(party)} PJ, camp B : {len(opponents)} adversaire(s)")
+        print("=" * 60)
+        print(report.summary())
+        print(f"\nGraine: {simulator.seed}")
+    
     # Commandes session
     def _cmd_session_list(self, args):
         """Liste les sessions"""
         if not self._check_project_loaded():
             return
         
-        sessions = self.project_service.session_service.get_all_sessions()
+        from datetime import datetime, time
+        
+        # Bornes incluses : --to couvre toute la journée
+        try:
+            start = datetime.strptime(args.date_from, '%Y-%m-%d') if getattr(args, 'date_from', None) else None
+            end = datetime.strptime(args.date_to, '%Y-%m-%d') if getattr(args, 'date_to', None) else None
+        except ValueError:
+            print(f"❌ Format de date invalide. Utilisez YYYY-MM-DD")
+            return
+        if end is not None:
+            end = datetime.combine(end.date(), time.max)
+        
+        # Sessions déjà triées par date : les plus récentes en premier
+        sessions = self.project_service.session_service.get_sessions_between(start, end)
         
         if sessions:
             print(f"\n📅 Sessions ({len(sessions)}):")
             print("-" * 80)
             print(f"{'Titre':<40} {'Date':<15} {'Scènes':<10}")
             print("-" * 80)
-        for session in sorted(sessions, key=lambda x: x.date if x.date else x.created_at, reverse=True):
+        for session in reversed(sessions):
             date_str = session.date.strftime('%d/%m/%Y') if session.date else '-'
             scenes_count = len(session.scenes)
             print(f"{session.title:<40} {date_str:<15} {scenes_count:<10}")
-        else:
+        if not sessions:
             print("ℹ️  Aucune session trouvée")
     
     def _cmd_session_show(self, args):
@@ -571,6 +1080,277 @@ Exemples:
         for entry in sorted(bank.entries, key=lambda x: x.value):
             print(f"  • {entry.value}")
     
+    def _cmd_bank_import(self, args):
+        """Importe des entrées en masse dans une banque"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..models.bank import BankType
+        
+        if not args.file.exists():
+            print(f"❌ Le fichier '{args.file}' n'existe pas")
+            return
+        
+        bank_type = BankType(args.type)
+        report = self.project_service.bank_service.import_file(
+            bank_type, args.file, fmt=args.format, dry_run=args.dry_run
+        )
+        
+        for line_number, message in report.errors[:20]:
+            print(f"  ⚠️  Ligne {line_number}: {message}")
+        if len(report.errors) > 20:
+            print(f"  ... {len(report.errors) - 20} autre(s) erreur(s)")
+        
+        if not args.dry_run and report.added:
+            self.project_service.save_project(f"Import de {report.added} entrée(s) dans {bank_type.value}")
+        print(f"✅ {report.summary()}")
+    
+    def _cmd_bank_export(self, args):
+        """Exporte une banque"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..models.bank import BankType
+        
+        bank_type = BankType(args.type)
+        count = self.project_service.bank_service.export_file(bank_type, args.file, fmt=args.format)
+        print(f"✅ {count} entrée(s) de {bank_type.value} exportée(s) vers: {args.file}")
+    
+    def _cmd_bank_dedupe(self, args):
+        """Fusionne les doublons d'une ou de toutes les banques"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..models.bank import BankType
+        
+        bank_types = [BankType(args.type)] if args.type else list(BankType)
+        prefix = "[Simulation] " if args.dry_run else ""
+        total_removed = 0
+        for bank_type in bank_types:
+            removed, characters = self.project_service.dedupe_bank(bank_type, dry_run=args.dry_run)
+            if removed:
+                total_removed += removed
+                print(f"  {prefix}{bank_type.value}: {removed} doublon(s) fusionné(s), "
+                      f"{characters} personnage(s) mis à jour")
+        
+        if not total_removed:
+            print("ℹ️  Aucun doublon trouvé")
+            return
+        
+        if not args.dry_run:
+            self.project_service.save_project("Dédoublonnage des banques")
+        print(f"✅ {prefix}{total_removed} doublon(s) fusionné(s) au total")
+    
+    # Commandes generate
+    def _cmd_generate_npc(self, args):
+        """Génère des PNJ en masse"""
+        if not self._check_project_loaded():
+            return
+        
+        if args.count <= 0:
+            print("❌ Le nombre de PNJ doit être positif")
+            return
+        
+        from ..generators.npc_generator import NPCGenerator
+        from ..core.rng import new_seed
+        
+        # Contraintes sur les caractéristiques : {carac: (min, max)}
+        constraints = {}
+        for option, position in (('stat_min', 0), ('stat_max', 1)):
+            for item in getattr(args, option) or []:
+                name, _, value = item.partition('=')
+                if not value.strip().lstrip('-').isdigit():
+                    print(f"❌ Contrainte invalide: {item} (attendu: CARAC=VALEUR, ex: INT=16)")
+                    return
+                bounds = list(constraints.get(name.strip(), (None, None)))
+                bounds[position] = int(value)
+                constraints[name.strip()] = tuple(bounds)
+        
+        # La graine est affichée pour pouvoir régénérer le même lot
+        seed = args.seed if args.seed is not None else new_seed()
+        generator = NPCGenerator(self.project_service.bank_service, seed=seed, invent_names=args.invent_names)
+        if args.invent_names:
+            # Ne pas réutiliser les noms des personnages du projet
+            generator.name_generator.reserve(
+                c.name for c in self.project_service.character_service.get_all_characters()
+            )
+        npcs = generator.generate_npcs(
+            args.count,
+            level=args.level,
+            race=args.race,
+            class_name=args.character_class,
+            gender=args.gender,
+            stats_method=args.method,
+            seed=seed,
+            constraints=constraints or None
+        )
+        self.project_service.character_service.add_characters(npcs)
+        self.project_service.save_project(f"Génération de {len(npcs)} PNJ")
+        
+        for npc in npcs[:10]:
+            print(f"  • {npc.name} ({npc.profile.race}, niveau {npc.profile.level})")
+        if len(npcs) > 10:
+            print(f"  ... et {len(npcs) - 10} autre(s)")
+        print(f"✅ {len(npcs)} PNJ généré(s) (graine: {seed})")
+    
+    def _cmd_generate_encounters(self, args):
+        """Génère des rencontres en masse"""
+        if not self._check_project_loaded():
+            return
+        
+        if args.count <= 0 or args.min_level > args.max_level or args.min_size > args.max_size:
+            print("❌ Paramètres invalides (nombre positif et bornes min <= max attendus)")
+            return
+        
+        from ..generators.bulk_generator import BulkGenerator
+        from ..core.rng import new_seed
+        
+        seed = args.seed if args.seed is not None else new_seed()
+        generator = BulkGenerator(self.project_service, workers=args.workers)
+        tasks = generator.plan_encounters(
+            args.count, args.min_level, args.max_level, args.min_size, args.max_size, seed=seed
+        )
+        self._run_bulk_generation(generator, tasks, f"Génération de {args.count} rencontres", seed)
+    
+    def _cmd_generate_bestiary(self, args):
+        """Crée une variante de chaque créature du bestiaire au niveau demandé"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..generators.creature_generator import CreatureGenerator
+        from ..generators.creature_scaling import MAX_LEVEL
+        from ..core.rng import new_seed
+        
+        if not 0 <= args.level <= MAX_LEVEL:
+            print(f"❌ Le niveau doit être compris entre 0 et {MAX_LEVEL}")
+            return
+        
+        seed = args.seed if args.seed is not None else new_seed()
+        creatures = CreatureGenerator(self.project_service.bank_service).generate_bestiary(args.level, seed=seed)
+        if not creatures:
+            print("ℹ️  Bestiaire vide")
+            return
+        self.project_service.character_service.add_characters(creatures)
+        self.project_service.save_project(f"Bestiaire au niveau {args.level}")
+        print(f"✅ {len(creatures)} créature(s) de niveau {args.level} créée(s) (graine: {seed})")
+    
+    def _cmd_generate_loot(self, args):
+        """Distribue du butin aux personnages, selon leur niveau"""
+        if not self._check_project_loaded():
+            return
+        
+        from ..generators.treasure_generator import TreasureGenerator
+        from ..models.character import CharacterType
+        from ..core.rng import new_seed
+        
+        character_service = self.project_service.character_service
+        if args.characters:
+            by_name = {c.name.lower(): c for c in character_service.get_all_characters()}
+            missing = [name for name in args.characters if name.lower() not in by_name]
+            if missing:
+                print(f"❌ Personnage(s) introuvable(s): {', '.join(missing)}")
+                return
+            characters = [by_name[name.lower()] for name in args.characters]
+        else:
+            characters = character_service.get_characters_by_type(CharacterType(args.type))
+        if not characters:
+            print("ℹ️  Aucun personnage à équiper")
+            return
+        
+        seed = args.seed if args.seed is not None else new_seed()
+        loots = TreasureGenerator(self.project_service.bank_service).equip(
+            characters, location_type=args.location_type, hoard=args.hoard, seed=seed
+        )
+        for character in characters:
+            character_service.update_character(character)
+        self.project_service.save_project(f"Butin de {len(characters)} personnage(s)")
+        
+        for character, loot in list(zip(characters, loots))[:10]:
+            print(f"  • {character.name} : {loot.describe()}")
+        if len(characters) > 10:
+            print(f"  ... et {len(characters) - 10} autre(s)")
+        print(f"✅ Butin distribué à {len(characters)} personnage(s) (graine: {seed})")
+    
+    def _cmd_generate_settlement(self, args):
+        """Peuple un lieu existant"""
+        if not self._check_project_loaded():
+            return
+        
+        if args.population <= 0:
+            print("❌ La population doit être positive")
+            return
+        
+        locations = self.project_service.location_service.get_all_locations()
+        location = next((l for l in locations if l.name.lower() == args.location.lower()), None)
+        if not location:
+            print(f"❌ Lieu '{args.location}' introuvable")
+            return
+        
+        from ..generators.settlement_generator import SettlementGenerator
+        from ..core.rng import new_seed
+        
+        seed = args.seed if args.seed is not None else new_seed()
+        generator = SettlementGenerator(self.project_service, invent_names=not args.bank_names)
+        report = generator.populate(
+            location, args.population, level=args.level, race=args.race,
+            faction_count=args.factions, seed=seed
+        )
+        self.project_service.save_project(f"Peuplement de {location.name}")
+        
+        for npc in report.characters[:10]:
+            print(f"  • {npc.name} ({npc.profile.race}, {npc.profile.profession or 'sans métier'})")
+        if len(report.characters) > 10:
+            print(f"  ... et {len(report.characters) - 10} autre(s)")
+        print(f"✅ {location.name} : {report.summary()} (graine: {seed})")
+    
+    def _cmd_generate_region(self, args):
+        """Génère une région de villages"""
+        if not self._check_project_loaded():
+            return
+        
+        if args.villages <= 0 or args.min_population > args.max_population:
+            print("❌ Paramètres invalides (nombre positif et bornes min <= max attendus)")
+            return
+        
+        from ..generators.bulk_generator import BulkGenerator
+        from ..core.rng import new_seed
+        
+        seed = args.seed if args.seed is not None else new_seed()
+        generator = BulkGenerator(self.project_service, workers=args.workers)
+        tasks = generator.plan_settlements(
+            args.villages, args.min_population, args.max_population, args.level, seed=seed
+        )
+        self._run_bulk_generation(
+            generator, tasks, f"Génération de la région {args.name}", seed, region_name=args.name
+        )
+    
+    def _run_bulk_generation(self, generator, tasks, description: str, seed: int, region_name=None):
+        """Exécute une génération en masse avec progression (Ctrl+C pour annuler)"""
+        import signal
+        
+        cancelled = []
+        
+        def on_interrupt(signum, frame):
+            cancelled.append(True)
+            print("\n⚠️  Annulation demandée, les packs déjà générés sont conservés...")
+        
+        def progress(done: int, total: int):
+            print(f"\r  {done}/{total} pack(s)", end="", flush=True)
+        
+        previous_handler = signal.signal(signal.SIGINT, on_interrupt)
+        try:
+            report = generator.run(
+                tasks, progress=progress, is_cancelled=lambda: bool(cancelled), region_name=region_name
+            )
+        finally:
+            signal.signal(signal.SIGINT, previous_handler)
+        print()
+        
+        if report.packs:
+            self.project_service.save_project(description)
+        status = "⚠️ " if report.cancelled else "✅"
+        print(f"{status} {report.summary()} (graine: {seed})")
+    
     # Commandes export
     def _cmd_export_character(self, args):
         """Exporte un personnage"""
@@ -651,6 +1431,43 @@ Exemples:
         else:
             print(f"❌ Erreur lors de l'export")
             sys.exit(1)
+    
+    def _cmd_export_story_arc(self, args):
+        """Exporte les scènes dans l'ordre de leurs références"""
+        if not self._check_project_loaded():
+            return
+        
+        scene_service = self.project_service.scene_service
+        scenes = scene_service.get_all_scenes()
+        if not scenes:
+            print("ℹ️  Aucune scène à exporter")
+            return
+        
+        output_path = args.output or Path(f"arc_narratif.{'md' if args.format == 'Markdown' else 'txt'}")
+        
+        from ..exporters.txt_exporter import TXTExporter
+        from ..exporters.markdown_exporter import MarkdownExporter
+        
+        exporter = MarkdownExporter if args.format == "Markdown" else TXTExporter
+        graph = scene_service.graph()
+        if exporter.export_story_arc(scenes, graph, output_path):
+            print(f"✅ Arc narratif ({len(scenes)} scène(s)) exporté vers: {output_path}")
+            if graph.has_cycle():
+                print(f"⚠️  {len(graph.cycles())} boucle(s) de références entre scènes")
+        else:
+            print(f"❌ Erreur lors de l'export")
+            sys.exit(1)
+
+
+def _parse_value(text: str):
+    """Valeur saisie après CHAMP= : entier si possible, None si vide, texte sinon"""
+    text = text.strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return text
 
 
 def main():
@@ -2,12 +2,14 @@
 Vue des banques de données
 """
 
+from pathlib import Path
+
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QTableWidget, QTableWidgetItem, QMessageBox,
-    QTabWidget, QDialog, QHeaderView
+    QTabWidget, QDialog, QHeaderView, QFileDialog
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
 from ...services.project_service import ProjectService
 from ...models.bank import BankType, BankEntry
@@ -19,6 +21,35 @@ from ..widgets.table_editor import TableEditor
 logger = UserActionLogger()
 
 
+class BankImportWorker(QThread):
+    """Lecture d'un fichier de banque en arrière-plan (évite de figer l'interface)
+    
+    Le thread se contente de valider et de construire les entrées ; leur insertion
+    dans la banque se fait dans le thread principal, à la réception du rapport.
+    """
+    
+    progress = pyqtSignal(int)  # Nombre de lignes traitées
+    finished_with_report = pyqtSignal(object, object)  # ImportReport, entrées à insérer
+    failed = pyqtSignal(str)
+    
+    def __init__(self, bank_service, bank_type: BankType, path: Path, dry_run: bool, parent=None):
+        super().__init__(parent)
+        self.bank_service = bank_service
+        self.bank_type = bank_type
+        self.path = path
+        self.dry_run = dry_run
+    
+    def run(self):
+        """Prépare l'import dans le thread de travail"""
+        try:
+            report, entries = self.bank_service.prepare_file(
+                self.bank_type, self.path, dry_run=self.dry_run, progress=self.progress.emit
+            )
+            self.finished_with_report.emit(report, entries)
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
 class BanksView(QWidget):
     """Vue des banques de données"""
     
@@ -87,10 +118,20 @@ class BanksView(QWidget):
         layout = QVBoxLayout(widget)
         layout.setSpacing(10)
         
-        # Bouton Ajouter (ouvre un formulaire)
+        # Bouton Ajouter (ouvre un formulaire) et import/export en masse
+        top_layout = QHBoxLayout()
         add_btn = QPushButton("Ajouter")
         add_btn.clicked.connect(lambda: self._add_entry(bank_type))
-        layout.addWidget(add_btn)
+        top_layout.addWidget(add_btn, 1)
+        
+        import_btn = QPushButton("Importer...")
+        import_btn.clicked.connect(lambda: self._import_entries(bank_type))
+        top_layout.addWidget(import_btn)
+        
+        export_btn = QPushButton("Exporter...")
+        export_btn.clicked.connect(lambda: self._export_entries(bank_type))
+        top_layout.addWidget(export_btn)
+        layout.addLayout(top_layout)
         
         # Tableau des entrées
         columns = self._get_table_columns(bank_type)
@@ -127,6 +168,7 @@ class BanksView(QWidget):
         setattr(widget, 'bank_type', bank_type)
         setattr(widget, 'edit_btn', edit_btn)
         setattr(widget, 'delete_btn', delete_btn)
+        setattr(widget, 'import_btn', import_btn)
         
         def on_selection_changed():
             has_selection = len(table.selectedItems()) > 0
@@ -152,14 +194,15 @@ class BanksView(QWidget):
             bank_type = getattr(widget, 'bank_type', None)
             
             if table and bank_type:
+                table.setUpdatesEnabled(False)
                 table.setRowCount(0)
                 bank = self.project_service.bank_service.get_bank_by_type(bank_type)
                 if bank:
                     columns = self._get_table_columns(bank_type)
-                    for entry in bank.entries:
-                        row = table.rowCount()
-                        table.insertRow(row)
+                    table.setRowCount(len(bank.entries))
+                    for row, entry in enumerate(bank.entries):
                         self._populate_table_row(table, row, entry, bank_type, columns)
+                table.setUpdatesEnabled(True)
         
         # Rafraîchir les tables personnalisées (créer/mettre à jour les onglets)
         if self.project_service.table_service:
@@ -286,11 +329,11 @@ class BanksView(QWidget):
             if editor.exec() == QDialog.DialogCode.Accepted:
                 value, metadata = editor.get_entry_data()
                 
-                # Vérifier qu'il n'existe pas déjà
+                # Vérifier qu'il n'existe pas déjà (casse, accents et espaces ignorés)
                 bank = self.project_service.bank_service.get_or_create_bank(bank_type)
-                existing_values = [e.value for e in bank.entries]
-                if value in existing_values:
-                    QMessageBox.warning(self, "Attention", f"L'entrée '{value}' existe déjà dans cette banque.")
+                duplicate = self.project_service.bank_service.find_duplicate(bank.id, value)
+                if duplicate:
+                    QMessageBox.warning(self, "Attention", f"L'entrée '{duplicate.value}' existe déjà dans cette banque.")
                     return
                 
                 # Ajouter l'entrée
@@ -341,9 +384,9 @@ class BanksView(QWidget):
                 new_value, new_metadata = editor.get_entry_data()
                 
                 # Vérifier qu'il n'existe pas déjà (sauf si c'est la même entrée)
-                existing_values = [e.value for e in bank.entries if e.id != entry_id]
-                if new_value in existing_values:
-                    QMessageBox.warning(self, "Attention", f"L'entrée '{new_value}' existe déjà dans cette banque.")
+                duplicate = self.project_service.bank_service.find_duplicate(bank.id, new_value, exclude_id=entry_id)
+                if duplicate:
+                    QMessageBox.warning(self, "Attention", f"L'entrée '{duplicate.value}' existe déjà dans cette banque.")
                     return
                 
                 # Mettre à jour l'entrée
@@ -394,6 +437,102 @@ class BanksView(QWidget):
             logger.exception(f"Erreur lors de la suppression d'entrée: {e}")
             QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
     
+    def _import_entries(self, bank_type: BankType):
+        """Importe des entrées en masse depuis un fichier CSV ou JSONL"""
+        if not self.project_service.get_current_project():
+            QMessageBox.warning(self, "Attention", "Veuillez ouvrir ou créer un projet avant d'importer des entrées.")
+            return
+        
+        filename, _ = QFileDialog.getOpenFileName(
+            self, f"Importer dans {bank_type.value}", "", "CSV / JSONL (*.csv *.jsonl *.json)"
+        )
+        if not filename:
+            return
+        
+        # Première passe en simulation pour présenter le rapport avant l'import
+        self._start_import(bank_type, Path(filename), dry_run=True)
+    
+    def _start_import(self, bank_type: BankType, path: Path, dry_run: bool):
+        """Lance un import dans un thread de travail"""
+        widget = self.tabs.currentWidget()
+        import_btn = getattr(widget, 'import_btn', None)
+        if import_btn:
+            import_btn.setEnabled(False)
+            import_btn.setText("Analyse..." if dry_run else "Import...")
+        
+        worker = BankImportWorker(self.project_service.bank_service, bank_type, path, dry_run, self)
+        if import_btn:
+            worker.progress.connect(lambda count: import_btn.setText(f"{count} ligne(s)..."))
+        worker.finished_with_report.connect(
+            lambda report, entries: self._on_import_finished(bank_type, path, report, entries, import_btn)
+        )
+        worker.failed.connect(lambda message: self._on_import_failed(message, import_btn))
+        worker.finished.connect(worker.deleteLater)
+        self._import_worker = worker  # Garder une référence pendant l'exécution
+        worker.start()
+    
+    def _on_import_finished(self, bank_type: BankType, path: Path, report, entries, import_btn):
+        """Traite la fin d'un import (simulation ou réel)"""
+        if import_btn:
+            import_btn.setEnabled(True)
+            import_btn.setText("Importer...")
+        if not report.dry_run:
+            self.project_service.bank_service.apply_entries(bank_type, entries, report)
+        
+        message = report.summary()
+        if report.errors:
+            message += "\n\n" + "\n".join(f"Ligne {line}: {error}" for line, error in report.errors[:10])
+            if len(report.errors) > 10:
+                message += f"\n... {len(report.errors) - 10} autre(s) erreur(s)"
+        
+        if report.dry_run:
+            if not report.added:
+                QMessageBox.information(self, "Import", message)
+                return
+            reply = QMessageBox.question(
+                self, "Confirmer l'import",
+                f"{message}\n\nImporter ces entrées ?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply == QMessageBox.StandardButton.Yes:
+                self._start_import(bank_type, path, dry_run=False)
+            return
+        
+        if report.added:
+            self.project_service.save_project(f"Import de {report.added} entrée(s) dans {bank_type.value}")
+            logger.log_bank_action("Import", bank_type=bank_type.value, entry_value=str(report.added))
+        self.refresh()
+        QMessageBox.information(self, "Import terminé", report.summary())
+    
+    def _on_import_failed(self, message: str, import_btn):
+        """Affiche une erreur d'import"""
+        if import_btn:
+            import_btn.setEnabled(True)
+            import_btn.setText("Importer...")
+        logger.error(f"Erreur lors de l'import: {message}")
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de l'import: {message}")
+    
+    def _export_entries(self, bank_type: BankType):
+        """Exporte les entrées d'une banque en CSV ou JSONL"""
+        bank = self.project_service.bank_service.get_bank_by_type(bank_type)
+        if not bank or not bank.entries:
+            QMessageBox.information(self, "Information", "Cette banque est vide.")
+            return
+        
+        filename, _ = QFileDialog.getSaveFileName(
+            self, f"Exporter {bank_type.value}", f"{bank_type.value.lower()}.csv",
+            "CSV (*.csv);;JSONL (*.jsonl)"
+        )
+        if not filename:
+            return
+        
+        try:
+            count = self.project_service.bank_service.export_file(bank_type, Path(filename))
+            QMessageBox.information(self, "Export terminé", f"{count} entrée(s) exportée(s) vers {filename}")
+        except Exception as e:
+            logger.exception(f"Erreur lors de l'export de banque: {e}")
+            QMessageBox.critical(self, "Erreur", f"Erreur: {str(e)}")
+    
     def _add_custom_table(self):
         """Ajoute une nouvelle table personnalisée"""
         editor = TableEditor(project_service=self.project_service, parent=self)
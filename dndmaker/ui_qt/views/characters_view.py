@@ -5,9 +5,9 @@ Vue des personnages (PJ/PNJ/Créatures)
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QPushButton, QListWidget, QListWidgetItem, QMessageBox,
-    QTabWidget
+    QTabWidget, QLineEdit, QAbstractItemView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QThread, pyqtSignal
 
 from ...services.project_service import ProjectService
 from ...core.logger import get_logger
@@ -17,15 +17,93 @@ logger = get_logger()
 from ...models.character import CharacterType
 from ...models.bank import BankType
 
+# Nombre de personnages affichés par page dans chaque onglet
+PAGE_SIZE = 200
+
+
+class BulkGenerationWorker(QThread):
+    """Génération en masse en arrière-plan, annulable
+    
+    Le thread de travail ne fait que générer : les packs sont envoyés par signal et
+    fusionnés dans les services depuis le thread de l'interface.
+    """
+    
+    progress = pyqtSignal(int, int)  # (packs terminés, total)
+    packs_ready = pyqtSignal(object)  # Liste de GeneratedPack
+    generated = pyqtSignal()  # Tous les lots ont été envoyés
+    finished_with_report = pyqtSignal(object)  # BulkGenerationReport
+    failed = pyqtSignal(str)
+    
+    def __init__(self, generator, tasks, region_name=None, parent=None):
+        super().__init__(parent)
+        self.generator = generator
+        self.tasks = tasks
+        self._cancelled = False
+        # Créé et utilisé dans le thread de l'interface : les signaux émis par run()
+        # y sont mis en file, dans l'ordre d'émission
+        self.merger = generator.merger(region_name)
+        self.packs_ready.connect(self.merger.add)
+        self.generated.connect(self._finish)
+    
+    def cancel(self):
+        """Demande l'annulation (les packs déjà générés sont conservés)"""
+        self._cancelled = True
+    
+    def run(self):
+        """Exécute la génération dans le thread de travail"""
+        try:
+            for packs in self.generator.generate(
+                self.tasks,
+                progress=self.progress.emit,
+                is_cancelled=lambda: self._cancelled
+            ):
+                self.packs_ready.emit(packs)
+            self.generated.emit()
+        except Exception as e:
+            self.failed.emit(str(e))
+    
+    def _finish(self):
+        """Fusionne les derniers packs (thread de l'interface) et publie le rapport"""
+        try:
+            self.finished_with_report.emit(self.merger.finish(len(self.tasks)))
+        except Exception as e:
+            self.failed.emit(str(e))
+
 
 class CharactersView(QWidget):
     """Vue des personnages"""
     
+    # Réserves de pré-génération partagées par les vues d'un même projet
+    _generation_pools = {}
+    
     def __init__(self, project_service: ProjectService, parent=None):
         super().__init__(parent)
         self.project_service = project_service
+        self._creature_generator = None
         self._init_ui()
     
+    def _get_generation_pool(self):
+        """Réserve de PNJ et créatures pré-générés (paramètres lus dans la configuration)"""
+        pool = self._generation_pools.get(id(self.project_service))
+        if pool is None:
+            from ...core.config import Config
+            from ...generators.generation_pool import DEFAULT_POOL_SIZE, GenerationPool
+            settings = Config().get_generation_pool()
+            pool = GenerationPool(
+                self.project_service.bank_service,
+                size=settings.get('size', DEFAULT_POOL_SIZE),
+                presets=settings.get('presets')
+            )
+            self._generation_pools[id(self.project_service)] = pool
+        return pool
+    
+    def _get_creature_generator(self):
+        """Générateur de créatures de la vue (bestiaire chargé une seule fois)"""
+        if self._creature_generator is None or self._creature_generator.bank_service is not self.project_service.bank_service:
+            from ...generators.creature_generator import CreatureGenerator
+            self._creature_generator = CreatureGenerator(self.project_service.bank_service)
+        return self._creature_generator
+    
     def _init_ui(self):
         """Initialise l'interface"""
         layout = QVBoxLayout(self)
@@ -67,6 +145,15 @@ class CharactersView(QWidget):
             generate_btn = QPushButton(tr("character.generate"))
             generate_btn.clicked.connect(lambda: self._generate_character(char_type))
             button_layout.addWidget(generate_btn)
+            
+            bulk_btn = QPushButton("Génération en masse...")
+            bulk_btn.clicked.connect(lambda: self._bulk_generate(char_type))
+            button_layout.addWidget(bulk_btn)
+        
+        if char_type == CharacterType.PNJ:
+            populate_btn = QPushButton("Peupler un lieu...")
+            populate_btn.clicked.connect(self._populate_location)
+            button_layout.addWidget(populate_btn)
         
         edit_btn = QPushButton(tr("character.edit"))
         edit_btn.clicked.connect(lambda: self._edit_character(char_type))
@@ -78,13 +165,35 @@ class CharactersView(QWidget):
         delete_btn.setEnabled(False)
         button_layout.addWidget(delete_btn)
         
+        bulk_edit_btn = QPushButton("Modifier la sélection...")
+        bulk_edit_btn.clicked.connect(self._bulk_edit_characters)
+        bulk_edit_btn.setEnabled(False)
+        button_layout.addWidget(bulk_edit_btn)
+        
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
+        # Recherche par début de nom et pagination
+        page_layout = QHBoxLayout()
+        search_edit = QLineEdit()
+        search_edit.setPlaceholderText("Rechercher par nom...")
+        search_edit.textChanged.connect(lambda: self._show_page(widget, 0))
+        page_layout.addWidget(search_edit)
+        prev_btn = QPushButton("◀")
+        prev_btn.clicked.connect(lambda: self._show_page(widget, widget.page_offset - PAGE_SIZE))
+        page_layout.addWidget(prev_btn)
+        page_label = QLabel("")
+        page_layout.addWidget(page_label)
+        next_btn = QPushButton("▶")
+        next_btn.clicked.connect(lambda: self._show_page(widget, widget.page_offset + PAGE_SIZE))
+        page_layout.addWidget(next_btn)
+        layout.addLayout(page_layout)
+        
         # Liste des personnages
         char_list = QListWidget()
+        char_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
         char_list.itemSelectionChanged.connect(
-            lambda: self._on_selection_changed(char_type, edit_btn, delete_btn)
+            lambda: self._on_selection_changed(char_type, edit_btn, delete_btn, bulk_edit_btn)
         )
         char_list.itemDoubleClicked.connect(lambda: self._edit_character(char_type))
         layout.addWidget(char_list)
@@ -100,6 +209,11 @@ class CharactersView(QWidget):
         setattr(widget, 'char_type', char_type)
         setattr(widget, 'edit_btn', edit_btn)
         setattr(widget, 'delete_btn', delete_btn)
+        widget.search_edit = search_edit
+        widget.page_label = page_label
+        widget.prev_btn = prev_btn
+        widget.next_btn = next_btn
+        widget.page_offset = 0
         
         return widget
     
@@ -114,35 +228,62 @@ class CharactersView(QWidget):
         if not self.project_service.character_service:
             return
         
-        # Debug: afficher tous les personnages
-        all_chars = self.project_service.character_service.get_all_characters()
-        print(f"DEBUG: Total personnages: {len(all_chars)}")
-        for char in all_chars:
-            print(f"  - {char.name} (type: {char.type}, value: {char.type.value if hasattr(char.type, 'value') else char.type})")
+        # Pré-générer en arrière-plan dès qu'un projet est ouvert
+        if self.project_service.get_current_project():
+            self._get_generation_pool().start()
         
         for i in range(self.tabs.count()):
             widget = self.tabs.widget(i)
-            # Essayer getattr d'abord, puis property
-            char_list = getattr(widget, 'char_list', None) or widget.property('char_list')
-            char_type = getattr(widget, 'char_type', None) or widget.property('char_type')
-            
-            # Vérification explicite (les objets Qt peuvent être évalués comme False même s'ils existent)
-            if char_list is not None and char_type is not None:
-                char_list.clear()
-                characters = self.project_service.character_service.get_characters_by_type(char_type)
-                for char in characters:
-                    item = QListWidgetItem(char.name)
-                    item.setData(Qt.ItemDataRole.UserRole, char.id)
-                    char_list.addItem(item)
+            self._show_page(widget, getattr(widget, 'page_offset', 0))
+    
+    def _show_page(self, widget, offset: int):
+        """Affiche une page de l'onglet (tri par nom, filtre sur le début du nom)"""
+        # Essayer getattr d'abord, puis property
+        char_list = getattr(widget, 'char_list', None) or widget.property('char_list')
+        char_type = getattr(widget, 'char_type', None) or widget.property('char_type')
+        
+        # Vérification explicite (les objets Qt peuvent être évalués comme False même s'ils existent)
+        if char_list is None or char_type is None or not self.project_service.character_service:
+            return
+        
+        page = self.project_service.character_service.query(
+            type=char_type,
+            name_prefix=widget.search_edit.text().strip() or None,
+            offset=max(0, offset),
+            limit=PAGE_SIZE
+        )
+        if page.offset and not page.characters and page.total:
+            # Page devenue vide (suppressions) : revenir à la dernière page
+            return self._show_page(widget, (page.total - 1) // PAGE_SIZE * PAGE_SIZE)
+        widget.page_offset = page.offset
+        
+        char_list.clear()
+        for char in page.characters:
+            item = QListWidgetItem(char.name)
+            item.setData(Qt.ItemDataRole.UserRole, char.id)
+            char_list.addItem(item)
+        
+        first = page.offset + 1 if page.characters else 0
+        widget.page_label.setText(f"{first}-{page.offset + len(page.characters)} / {page.total}")
+        widget.prev_btn.setEnabled(page.offset > 0)
+        widget.next_btn.setEnabled(page.has_next)
     
-    def _on_selection_changed(self, char_type: CharacterType, edit_btn, delete_btn):
+    def _on_selection_changed(self, char_type: CharacterType, edit_btn, delete_btn, bulk_edit_btn):
         """Gère le changement de sélection"""
         widget = self.tabs.currentWidget()
         char_list = getattr(widget, 'char_list', None)
         if char_list:
-            has_selection = len(char_list.selectedItems()) > 0
-            edit_btn.setEnabled(has_selection)
-            delete_btn.setEnabled(has_selection)
+            selected = len(char_list.selectedItems())
+            edit_btn.setEnabled(selected == 1)
+            delete_btn.setEnabled(selected > 0)
+            bulk_edit_btn.setEnabled(selected > 0)
+    
+    def _selected_ids(self) -> list:
+        """IDs des personnages sélectionnés dans l'onglet courant"""
+        char_list = getattr(self.tabs.currentWidget(), 'char_list', None)
+        if not char_list:
+            return []
+        return [item.data(Qt.ItemDataRole.UserRole) for item in char_list.selectedItems()]
     
     def _new_character(self, char_type: CharacterType):
         """Crée un nouveau personnage"""
@@ -176,31 +317,82 @@ class CharactersView(QWidget):
                 self.refresh()
     
     def _delete_character(self, char_type: CharacterType):
-        """Supprime un personnage"""
-        widget = self.tabs.currentWidget()
-        char_list = getattr(widget, 'char_list', None)
-        if not char_list:
+        """Supprime les personnages sélectionnés (une seule sauvegarde)"""
+        ids = self._selected_ids()
+        if not ids:
             return
         
-        current_item = char_list.currentItem()
-        if not current_item:
-            return
-        
-        char_id = current_item.data(Qt.ItemDataRole.UserRole)
-        
+        question = (
+            "Êtes-vous sûr de vouloir supprimer ce personnage ?" if len(ids) == 1
+            else f"Êtes-vous sûr de vouloir supprimer ces {len(ids)} personnages ?"
+        )
         reply = QMessageBox.question(
             self,
             "Confirmation",
-            "Êtes-vous sûr de vouloir supprimer ce personnage ?",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            if self.project_service.character_service.delete_character(char_id):
-                self.project_service.save_project("Suppression de personnage")
-                self.refresh()
-            else:
-                QMessageBox.warning(self, "Erreur", "Impossible de supprimer le personnage")
+            try:
+                change = self.project_service.bulk_delete_characters(ids)
+            except Exception as e:
+                logger.error(f"Suppression en masse impossible: {e}")
+                QMessageBox.warning(self, "Erreur", f"Impossible de supprimer les personnages : {e}")
+                return
+            logger.log_ui_action("Personnages supprimés", count=len(change.deleted))
+            self.refresh()
+    
+    def _bulk_edit_characters(self):
+        """Modifie en une fois les personnages sélectionnés (niveau, faction)"""
+        from PyQt6.QtWidgets import QDialog, QFormLayout, QSpinBox, QComboBox, QDialogButtonBox
+        
+        ids = self._selected_ids()
+        if not ids:
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle(f"Modifier {len(ids)} personnage(s)")
+        form = QFormLayout(dialog)
+        
+        level_spin = QSpinBox()
+        level_spin.setRange(-20, 20)
+        level_spin.setPrefix("+")
+        level_spin.valueChanged.connect(lambda value: level_spin.setPrefix("+" if value >= 0 else ""))
+        form.addRow("Niveaux à ajouter:", level_spin)
+        
+        faction_combo = QComboBox()
+        faction_combo.addItem("(inchangée)", False)
+        faction_combo.addItem("(aucune)", None)
+        factions = self.project_service.bank_service.get_bank_by_type(BankType.FACTIONS)
+        for entry in factions.entries if factions else []:
+            faction_combo.addItem(entry.value, entry.id)
+        form.addRow("Faction:", faction_combo)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+        
+        if not dialog.exec():
+            return
+        
+        patch = {}
+        if level_spin.value():
+            patch['profile.level'] = lambda level, delta=level_spin.value(): max(1, level + delta)
+        if faction_combo.currentData() is not False:
+            patch['faction'] = faction_combo.currentData()
+        if not patch:
+            return
+        
+        try:
+            change = self.project_service.bulk_update_characters(patch, ids)
+        except Exception as e:
+            logger.error(f"Modification en masse impossible: {e}")
+            QMessageBox.warning(self, "Erreur", f"Impossible de modifier les personnages : {e}")
+            return
+        logger.log_ui_action("Personnages modifiés en masse", count=len(change.updated))
+        self.refresh()
     
     def _generate_character(self, char_type: CharacterType):
         """Génère un personnage (PNJ ou Créature)"""
@@ -405,19 +597,21 @@ class CharactersView(QWidget):
         
         try:
             if char_type == CharacterType.PNJ:
-                from ...generators.npc_generator import NPCGenerator
-                generator = NPCGenerator(self.project_service.bank_service)
-                character = generator.generate_npc(
-                    level=level,
-                    stats_method=stats_method
-                )
+                # Personnage pré-généré si disponible, sinon génération immédiate
+                character = self._get_generation_pool().take(char_type, level, stats_method)
+                if character is None:
+                    from ...generators.npc_generator import NPCGenerator
+                    generator = NPCGenerator(self.project_service.bank_service)
+                    character = generator.generate_npc(
+                        level=level,
+                        stats_method=stats_method
+                    )
                 # Ajouter le métier si sélectionné
                 profession = profession_combo.currentText().strip() if profession_combo else None
                 if profession:
                     character.profile.profession = profession
             elif char_type == CharacterType.CREATURE:
-                from ...generators.creature_generator import CreatureGenerator
-                generator = CreatureGenerator(self.project_service.bank_service)
+                generator = self._get_creature_generator()
                 
                 # Si une créature a été sélectionnée, utiliser son template
                 if selected_creature:
@@ -434,12 +628,14 @@ class CharactersView(QWidget):
                             use_template=False
                         )
                 else:
-                    # Générer une créature aléatoire
-                    character = generator.generate_creature(
-                        level=level,
-                        stats_method=stats_method,
-                        use_template=True
-                    )
+                    # Créature aléatoire : pré-générée si disponible
+                    character = self._get_generation_pool().take(char_type, level, stats_method)
+                    if character is None:
+                        character = generator.generate_creature(
+                            level=level,
+                            stats_method=stats_method,
+                            use_template=True
+                        )
             else:
                 QMessageBox.warning(self, "Erreur", "La génération n'est disponible que pour PNJ et Créatures")
                 return
@@ -449,7 +645,7 @@ class CharactersView(QWidget):
                 return
             
             # Ajouter le personnage au service
-            self.project_service.character_service._characters[character.id] = character
+            self.project_service.character_service.add_character(character)
             
             # Sauvegarder si un projet est ouvert
             if self.project_service.get_current_project():
@@ -470,4 +666,189 @@ class CharactersView(QWidget):
         except Exception as e:
             logger.exception(f"Erreur lors de la génération: {e}")
             QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération: {str(e)}")
-
+    
+    def _bulk_generate(self, char_type: CharacterType):
+        """Génère des rencontres (créatures) ou une région de villages (PNJ) en masse"""
+        from PyQt6.QtWidgets import (
+            QDialog, QFormLayout, QSpinBox, QLineEdit, QDialogButtonBox, QProgressDialog
+        )
+        from ...generators.bulk_generator import BulkGenerator
+        from ...core.rng import new_seed
+        
+        if not self.project_service.get_current_project():
+            QMessageBox.warning(self, "Attention", "Veuillez ouvrir ou créer un projet avant de générer.")
+            return
+        
+        encounters = char_type == CharacterType.CREATURE
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Générer des rencontres" if encounters else "Générer une région")
+        form = QFormLayout(dialog)
+        
+        def spin(value: int, maximum: int) -> QSpinBox:
+            box = QSpinBox()
+            box.setRange(1, maximum)
+            box.setValue(value)
+            return box
+        
+        region_edit = QLineEdit("Nouvelle région")
+        count_spin = spin(100 if encounters else 10, 100000)
+        min_level_spin = spin(1, 20)
+        max_level_spin = spin(5 if encounters else 1, 20)
+        min_size_spin = spin(1 if encounters else 20, 10000)
+        max_size_spin = spin(6 if encounters else 60, 10000)
+        seed_edit = QLineEdit()
+        seed_edit.setPlaceholderText("Aléatoire")
+        
+        if encounters:
+            form.addRow("Nombre de rencontres:", count_spin)
+            form.addRow("Niveau minimum:", min_level_spin)
+            form.addRow("Niveau maximum:", max_level_spin)
+            form.addRow("Créatures min. par rencontre:", min_size_spin)
+            form.addRow("Créatures max. par rencontre:", max_size_spin)
+        else:
+            form.addRow("Nom de la région:", region_edit)
+            form.addRow("Nombre de villages:", count_spin)
+            form.addRow("Niveau des habitants:", min_level_spin)
+            form.addRow("Population minimum:", min_size_spin)
+            form.addRow("Population maximum:", max_size_spin)
+        form.addRow("Graine:", seed_edit)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+        
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        seed_text = seed_edit.text().strip()
+        if seed_text and not seed_text.lstrip('-').isdigit():
+            QMessageBox.warning(self, "Erreur de validation", "La graine doit être un nombre entier.")
+            return
+        seed = int(seed_text) if seed_text else new_seed()
+        min_size = min(min_size_spin.value(), max_size_spin.value())
+        max_size = max(min_size_spin.value(), max_size_spin.value())
+        
+        generator = BulkGenerator(self.project_service)
+        if encounters:
+            tasks = generator.plan_encounters(
+                count_spin.value(),
+                min(min_level_spin.value(), max_level_spin.value()),
+                max(min_level_spin.value(), max_level_spin.value()),
+                min_size, max_size, seed=seed
+            )
+            region_name = None
+        else:
+            tasks = generator.plan_settlements(
+                count_spin.value(), min_size, max_size, min_level_spin.value(), seed=seed
+            )
+            region_name = region_edit.text().strip() or "Nouvelle région"
+        
+        progress_dialog = QProgressDialog("Génération en cours...", "Annuler", 0, len(tasks), self)
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(0)
+        
+        worker = BulkGenerationWorker(generator, tasks, region_name, self)
+        worker.progress.connect(lambda done, total: progress_dialog.setValue(done))
+        progress_dialog.canceled.connect(worker.cancel)
+        worker.finished_with_report.connect(
+            lambda report: self._on_bulk_generation_finished(report, seed, progress_dialog)
+        )
+        worker.failed.connect(lambda message: self._on_bulk_generation_failed(message, progress_dialog))
+        worker.finished.connect(worker.deleteLater)
+        self._bulk_worker = worker  # Garder une référence pendant l'exécution
+        logger.log_ui_action("Génération en masse lancée", character_type=char_type.value, packs=len(tasks))
+        worker.start()
+    
+    def _populate_location(self):
+        """Génère toute la population d'un lieu en une seule opération"""
+        from PyQt6.QtWidgets import (
+            QApplication, QDialog, QFormLayout, QSpinBox, QLineEdit, QComboBox, QDialogButtonBox
+        )
+        from ...generators.settlement_generator import SettlementGenerator
+        from ...core.rng import new_seed
+        
+        if not self.project_service.get_current_project():
+            QMessageBox.warning(self, "Attention", "Veuillez ouvrir ou créer un projet avant de générer.")
+            return
+        locations = sorted(
+            self.project_service.location_service.get_all_locations(), key=lambda l: l.name.lower()
+        )
+        if not locations:
+            QMessageBox.information(self, "Peupler un lieu", "Aucun lieu dans le projet.")
+            return
+        
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Peupler un lieu")
+        form = QFormLayout(dialog)
+        location_combo = QComboBox()
+        for location in locations:
+            location_combo.addItem(location.name, location.id)
+        population_spin = QSpinBox()
+        population_spin.setRange(1, 100000)
+        population_spin.setValue(100)
+        level_spin = QSpinBox()
+        level_spin.setRange(1, 20)
+        factions_spin = QSpinBox()
+        factions_spin.setRange(0, 20)
+        factions_spin.setValue(2)
+        race_combo = QComboBox()
+        race_combo.addItem("Aléatoire", None)
+        races_bank = self.project_service.bank_service.get_bank_by_type(BankType.RACES)
+        for entry in races_bank.entries if races_bank else []:
+            race_combo.addItem(entry.value, entry.value)
+        seed_edit = QLineEdit()
+        seed_edit.setPlaceholderText("Aléatoire")
+        
+        form.addRow("Lieu:", location_combo)
+        form.addRow("Habitants:", population_spin)
+        form.addRow("Niveau des habitants:", level_spin)
+        form.addRow("Race dominante:", race_combo)
+        form.addRow("Factions (max.):", factions_spin)
+        form.addRow("Graine:", seed_edit)
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        form.addRow(buttons)
+        
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        
+        seed_text = seed_edit.text().strip()
+        if seed_text and not seed_text.lstrip('-').isdigit():
+            QMessageBox.warning(self, "Erreur de validation", "La graine doit être un nombre entier.")
+            return
+        seed = int(seed_text) if seed_text else new_seed()
+        location = self.project_service.location_service.get_location(location_combo.currentData())
+        
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            report = SettlementGenerator(self.project_service).populate(
+                location, population_spin.value(), level=level_spin.value(),
+                race=race_combo.currentData(), faction_count=factions_spin.value(), seed=seed
+            )
+            self.project_service.save_project(f"Peuplement de {location.name}")
+        except Exception as e:
+            logger.exception(f"Erreur lors du peuplement: {e}")
+            QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération: {str(e)}")
+            return
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        logger.log_ui_action("Lieu peuplé", location=location.name, population=len(report.characters))
+        self.refresh()
+        QMessageBox.information(self, "Peupler un lieu", f"{location.name} : {report.summary()}\nGraine: {seed}")
+    
+    def _on_bulk_generation_finished(self, report, seed: int, progress_dialog):
+        """Sauvegarde et affiche le résultat d'une génération en masse"""
+        progress_dialog.close()
+        if report.packs:
+            self.project_service.save_project(f"Génération en masse: {report.summary()}")
+        self.refresh()
+        QMessageBox.information(self, "Génération en masse", f"{report.summary()}\nGraine: {seed}")
+    
+    def _on_bulk_generation_failed(self, message: str, progress_dialog):
+        """Affiche l'échec d'une génération en masse"""
+        progress_dialog.close()
+        logger.error(f"Erreur lors de la génération en masse: {message}")
+        QMessageBox.critical(self, "Erreur", f"Erreur lors de la génération: {message}")
@@ -157,10 +157,14 @@ class ScenesView(QWidget):
         
         logger.log_ui_action("Suppression de scène demandée", scene_title=scene_title, scene_id=scene_id)
         
+        question = "Êtes-vous sûr de vouloir supprimer cette scène ?"
+        references = self.project_service.get_references(scene_id)
+        if references:
+            question += f"\n\nElle sera retirée des {len(references)} session(s) et scène(s) qui la citent."
         reply = QMessageBox.question(
             self,
             "Confirmation",
-            "Êtes-vous sûr de vouloir supprimer cette scène ?",
+            question,
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         
@@ -60,6 +60,10 @@ class SessionsView(QWidget):
         button_layout.addStretch()
         layout.addLayout(button_layout)
         
+        # Prochaine session de préparation
+        self.next_label = QLabel()
+        layout.addWidget(self.next_label)
+        
         # Liste des sessions
         self.session_list = QListWidget()
         self.session_list.itemSelectionChanged.connect(self._on_selection_changed)
@@ -69,12 +73,14 @@ class SessionsView(QWidget):
     def refresh(self):
         """Rafraîchit la vue"""
         self.session_list.clear()
+        self.next_label.clear()
         
-        if not self.project_service.session_service:
+        session_service = self.project_service.session_service
+        if not session_service:
             return
         
-        sessions = self.project_service.session_service.get_all_sessions()
-        for session in sessions:
+        # Sessions tenues triées par date par le service
+        for session in session_service.get_all_sessions():
             item_text = f"{session.title}"
             if session.is_preparation:
                 item_text += " [Préparation]"
@@ -82,6 +88,12 @@ class SessionsView(QWidget):
             item = QListWidgetItem(item_text)
             item.setData(Qt.ItemDataRole.UserRole, session.id)
             self.session_list.addItem(item)
+        
+        upcoming = session_service.get_next_preparation_session()
+        if upcoming:
+            self.next_label.setText(
+                f"Prochaine préparation : {upcoming.title} - {upcoming.date.strftime('%d/%m/%Y')}"
+            )
     
     def _on_selection_changed(self):
         """Gère le changement de sélection"""
@@ -167,17 +179,4 @@ class SessionsView(QWidget):
         self.duplicate_btn.setText(tr("session.duplicate"))
         self.delete_btn.setText(tr("character.delete"))
         self.refresh()
-    
-    def refresh(self):
-        """Rafraîchit la vue"""
-        self.session_list.clear()
-        
-        if not self.project_service.session_service:
-            return
-        
-        sessions = self.project_service.session_service.get_all_sessions()
-        for session in sessions:
-            item = QListWidgetItem(f"{session.title} - {session.date.strftime('%d/%m/%Y')}")
-            item.setData(Qt.ItemDataRole.UserRole, session.id)
-            self.session_list.addItem(item)
 
@@ -13,6 +13,7 @@ from PyQt6.QtCore import Qt
 from ...models.bank import BankType, BankEntry
 from ...core.logger import get_logger
 from .image_upload_widget import ImageUploadWidget
+from .dice_tooltip import attach_dice_tooltip
 
 logger = get_logger()
 
@@ -423,6 +424,8 @@ class BankEntryEditor(QDialog):
         
         self.damage_edit = QLineEdit()
         self.damage_edit.setPlaceholderText("1d6")
+        # Infobulle : étendue, moyenne et médiane des dégâts
+        attach_dice_tooltip(self.damage_edit)
         form.addRow("Dégâts:", self.damage_edit)
         
         self.damage_type_combo = QComboBox()
@@ -14,8 +14,11 @@ from ...models.character import (
     CharacteristicValue, CombatStats, DefenseStats, Weapon,
     CharacterCapabilities, PathCapability, Valuables
 )
+from ...models.derived_stats import ability_modifier
 from ...services.project_service import ProjectService
 from .image_upload_widget import ImageUploadWidget
+from .dice_tooltip import attach_dice_tooltip
+from .usage_list_widget import UsageListWidget
 
 
 class CharacterEditor(QDialog):
@@ -67,6 +70,12 @@ class CharacterEditor(QDialog):
         # Onglet Équipement
         tabs.addTab(self._create_equipment_tab(), "Équipement")
         
+        # Onglet Utilisé dans (scènes, lieux qui citent le personnage)
+        if not self.is_new:
+            self.usage_widget = UsageListWidget(self.project_service)
+            self.usage_widget.load(self.character.id)
+            tabs.addTab(self.usage_widget, "Utilisé dans")
+        
         layout.addWidget(tabs)
         
         # Boutons
@@ -390,6 +399,8 @@ class CharacterEditor(QDialog):
         layout.addRow("Initiative:", self.initiative_edit)
         
         self.life_dice_edit = QLineEdit()
+        # Infobulle : étendue, moyenne et médiane des dés saisis
+        attach_dice_tooltip(self.life_dice_edit)
         layout.addRow("Dés de vie (DV):", self.life_dice_edit)
         
         self.life_points_spin = QSpinBox()
@@ -547,8 +558,7 @@ class CharacterEditor(QDialog):
     
     def _update_modifier(self, char_name: str):
         """Met à jour le modificateur d'une caractéristique"""
-        value = self.char_edits[char_name].value()
-        modifier = (value - 10) // 2
+        modifier = ability_modifier(self.char_edits[char_name].value())
         mod_str = f"+{modifier}" if modifier >= 0 else str(modifier)
         self.mod_labels[char_name].setText(mod_str)
         
@@ -558,14 +568,15 @@ class CharacterEditor(QDialog):
             self._update_defense_total()
     
     def _update_defense_total(self):
-        """Met à jour la défense totale"""
-        base = 10
-        armor = self.armor_spin.value()
-        shield = self.shield_spin.value()
-        dex_mod = int(self.dex_defense_label.text().replace("+", ""))
-        misc = self.misc_defense_spin.value()
-        total = base + armor + shield + dex_mod + misc
-        self.total_defense_label.setText(str(total))
+        """Met à jour la défense totale (même calcul que DefenseStats, sur les valeurs saisies)"""
+        defense = DefenseStats(
+            base=self.character.defense.base if self.character else DefenseStats().base,
+            armor=self.armor_spin.value(),
+            shield=self.shield_spin.value(),
+            misc=self.misc_defense_spin.value()
+        )
+        dexterity = ability_modifier(self.char_edits["DEX"].value())
+        self.total_defense_label.setText(str(defense.calculate_total(dexterity)))
     
     def _add_weapon(self):
         """Ajoute une arme"""
@@ -849,6 +860,10 @@ class CharacterEditor(QDialog):
                 capabilities=CharacterCapabilities(),
                 valuables=Valuables()
             )
+        else:
+            # Instance d'un prototype : copie des champs partagés avant de les modifier
+            # (update_character repartage ceux qui n'ont pas changé)
+            self.character.materialize()
         
         # Profil
         self.character.name = name  # Utiliser le nom validé
@@ -934,7 +949,7 @@ class CharacterEditor(QDialog):
         
         # Sauvegarder dans le service
         if self.is_new:
-            self.project_service.character_service._characters[self.character.id] = self.character
+            self.project_service.character_service.add_character(self.character)
         else:
             self.project_service.character_service.update_character(self.character)
         
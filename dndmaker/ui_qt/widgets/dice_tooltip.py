@@ -0,0 +1,21 @@
+"""
+Infobulle des champs de dés : étendue, moyenne et médiane de l'expression saisie
+"""
+
+from PyQt6.QtWidgets import QLineEdit
+from PyQt6.QtCore import QTimer
+
+from ...core.dice import describe_dice
+
+# Pause de saisie avant de recalculer l'infobulle
+TOOLTIP_DELAY_MS = 300
+
+
+def attach_dice_tooltip(line_edit: QLineEdit, delay_ms: int = TOOLTIP_DELAY_MS) -> QTimer:
+    """Met à jour l'infobulle d'un champ après une pause de saisie, pas à chaque touche"""
+    timer = QTimer(line_edit)
+    timer.setSingleShot(True)
+    timer.setInterval(delay_ms)
+    timer.timeout.connect(lambda: line_edit.setToolTip(describe_dice(line_edit.text())))
+    line_edit.textChanged.connect(lambda _text: timer.start())
+    return timer
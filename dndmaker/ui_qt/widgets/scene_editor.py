@@ -15,6 +15,7 @@ from ...models.scene import Scene, Event
 from ...services.project_service import ProjectService
 from ...core.utils import generate_id
 from .image_upload_widget import ImageUploadWidget
+from .usage_list_widget import UsageListWidget
 
 
 class SceneEditor(QDialog):
@@ -116,6 +117,16 @@ class SceneEditor(QDialog):
         self.npc_selector.selection_changed.connect(self._on_npc_selection_changed)
         ref_layout.addWidget(self.npc_selector)
         
+        # Bouton pour composer une rencontre adaptée au groupe
+        self.generate_encounter_btn = QPushButton("Générer une rencontre...")
+        self.generate_encounter_btn.clicked.connect(self._generate_encounter)
+        ref_layout.addWidget(self.generate_encounter_btn)
+        
+        # Bouton pour estimer la dangerosité du combat (PJ contre PNJ sélectionnés)
+        self.simulate_combat_btn = QPushButton("Simuler le combat...")
+        self.simulate_combat_btn.clicked.connect(self._simulate_combat)
+        ref_layout.addWidget(self.simulate_combat_btn)
+        
         # Lieux
         location_items = []
         if self.project_service.bank_service:
@@ -187,6 +198,12 @@ class SceneEditor(QDialog):
         
         tabs.addTab(notes_tab, "Notes")
         
+        # Onglet Utilisé dans (sessions et scènes qui citent la scène)
+        if not self.is_new:
+            self.usage_widget = UsageListWidget(self.project_service)
+            self.usage_widget.load(self.scene.id)
+            tabs.addTab(self.usage_widget, "Utilisé dans")
+        
         layout.addWidget(tabs)
         
         # Boutons
@@ -341,6 +358,72 @@ class SceneEditor(QDialog):
             except ValueError as e:
                 QMessageBox.warning(self, "Erreur", str(e))
     
+    def _generate_encounter(self):
+        """Compose une rencontre pour les PJ sélectionnés et l'ajoute aux PNJ de la scène"""
+        from PyQt6.QtWidgets import QInputDialog
+        from ...generators.encounter_builder import EncounterBuilder, DIFFICULTY_MULTIPLIERS
+        
+        difficulties = list(DIFFICULTY_MULTIPLIERS)
+        difficulty, ok = QInputDialog.getItem(
+            self, "Générer une rencontre", "Difficulté:", difficulties, difficulties.index("moyenne"), False
+        )
+        if not ok:
+            return
+        
+        builder = EncounterBuilder(self.project_service)
+        # Groupe : les PJ sélectionnés, sinon tous les PJ du projet
+        pj_ids = self.pj_selector.get_selected_ids() if hasattr(self, 'pj_selector') else []
+        party = builder.party_levels(pj_ids) or builder.party_levels() or [1]
+        encounters = builder.suggest(difficulty, party, count=5)
+        if not encounters:
+            QMessageBox.information(self, "Information", "Aucune créature du bestiaire ne convient à ce groupe.")
+            return
+        
+        descriptions = [encounter.describe() for encounter in encounters]
+        choice, ok = QInputDialog.getItem(
+            self, "Générer une rencontre",
+            f"Groupe de {len(party)} PJ (niveaux {', '.join(map(str, party))}) :",
+            descriptions, 0, False
+        )
+        if not ok:
+            return
+        
+        encounter = encounters[descriptions.index(choice)]
+        creatures = builder.create_creatures(encounter)
+        self.project_service.save_project(f"Génération d'une rencontre ({len(creatures)} créature(s))")
+        
+        # Recharger les PNJ et ajouter les nouvelles créatures à la sélection
+        selected_ids = self.npc_selector.get_selected_ids()
+        self._load_references()
+        self.npc_selector.set_selected_ids(selected_ids + [c.id for c in creatures])
+    
+    def _simulate_combat(self):
+        """Simule le combat des PJ sélectionnés (ou de tous les PJ) contre les PNJ sélectionnés"""
+        from PyQt6.QtWidgets import QApplication
+        from ...models.character import CharacterType
+        from ...services.combat_simulator import CombatSimulator
+        
+        character_service = self.project_service.character_service
+        party = [c for c in map(character_service.get_character, self.pj_selector.get_selected_ids()) if c]
+        party = party or character_service.get_characters_by_type(CharacterType.PJ)
+        opponents = [c for c in map(character_service.get_character, self.npc_selector.get_selected_ids()) if c]
+        if not party or not opponents:
+            QMessageBox.information(
+                self, "Information", "Sélectionnez au moins un PNJ ou une créature (et créez au moins un PJ)."
+            )
+            return
+        
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            report = CombatSimulator(self.project_service.bank_service).simulate(party, opponents)
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        QMessageBox.information(
+            self, "Simulation de combat",
+            f"Camp A : {len(party)} PJ, camp B : {len(opponents)} adversaire(s)\n\n{report.summary()}"
+        )
+    
     def _add_event(self):
         """Ajoute un événement"""
         from PyQt6.QtWidgets import QInputDialog
@@ -434,7 +517,7 @@ class SceneEditor(QDialog):
             self.scene.referenced_scenes = scene_ref_ids
             self.scene.events = events
             self.scene.image_id = self.image_widget.get_image_id()
-            self.scene.updated_at = datetime.now()
+            self.project_service.scene_service.update_scene(self.scene)
         else:
             # Mettre à jour la scène existante
             self.scene.title = title
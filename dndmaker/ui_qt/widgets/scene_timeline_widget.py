@@ -102,7 +102,9 @@ class SceneTimelineWidget(QWidget):
     def _draw_timeline(self, scenes: List[Scene]):
         """Dessine la vue timeline"""
         # Organiser les scènes par sessions
-        sessions = self.project_service.session_service.get_all_sessions() if self.project_service.session_service else []
+        session_service = self.project_service.session_service
+        sessions = session_service.get_all_sessions() if session_service else []
+        scene_dict = {s.id: s for s in scenes}
         
         y_pos = 50
         x_start = 50
@@ -122,7 +124,7 @@ class SceneTimelineWidget(QWidget):
             # Dessiner les scènes de la session
             x_pos = x_start
             for i, scene_id in enumerate(session.scenes):
-                scene = next((s for s in scenes if s.id == scene_id), None)
+                scene = scene_dict.get(scene_id)
                 if scene:
                     self._draw_scene_box(
                         scene, x_pos, y_pos, scene_width, scene_height,
@@ -141,12 +143,11 @@ class SceneTimelineWidget(QWidget):
             
             y_pos += scene_height + 60
         
-        # Dessiner les scènes non assignées
-        assigned_scene_ids = set()
-        for session in sessions:
-            assigned_scene_ids.update(session.scenes)
-        
-        unassigned_scenes = [s for s in scenes if s.id not in assigned_scene_ids]
+        # Dessiner les scènes non assignées (index scène -> sessions du service)
+        if session_service:
+            unassigned_scenes = [s for s in scenes if not session_service.is_scene_assigned(s.id)]
+        else:
+            unassigned_scenes = list(scenes)
         if unassigned_scenes:
             unassigned_text = self.graphics_scene.addText(
                 "Scènes non assignées",
@@ -165,15 +166,13 @@ class SceneTimelineWidget(QWidget):
     
     def _draw_tree(self, scenes: List[Scene]):
         """Dessine la vue arbre des relations"""
-        # Créer un graphe des relations
+        # Le graphe des scènes est tenu à jour par le service : racines et liens sans recalcul
+        graph = self.project_service.scene_service.graph()
         scene_dict = {s.id: s for s in scenes}
         
-        # Trouver les scènes racines (celles qui ne sont référencées par aucune autre)
-        referenced_ids = set()
-        for scene in scenes:
-            referenced_ids.update(scene.referenced_scenes)
-        
-        root_scenes = [s for s in scenes if s.id not in referenced_ids]
+        # Scènes racines (aucune autre ne les référence ; une par cycle isolé)
+        root_scenes = [scene_dict[scene_id] for scene_id in graph.roots()]
+        positions: Dict[str, tuple] = {}
         
         y_pos = 50
         x_start = 50
@@ -182,48 +181,50 @@ class SceneTimelineWidget(QWidget):
         level_spacing = 200
         
         def draw_scene_recursive(scene: Scene, x: float, y: float, level: int = 0):
-            """Dessine récursivement une scène et ses références"""
+            """Dessine récursivement une scène et ses références (chaque scène une seule fois)"""
             # Dessiner la scène
+            positions[scene.id] = (x, y)
             self._draw_scene_box(
                 scene, x, y, scene_width, scene_height,
                 is_current=(scene.id == self.current_scene_id)
             )
             
             # Dessiner les scènes référencées
-            if scene.referenced_scenes:
+            children = graph.children(scene.id)
+            if children:
                 child_y = y + scene_height + 50
-                child_x_start = x - (len(scene.referenced_scenes) - 1) * (scene_width + 30) / 2
+                child_x_start = x - (len(children) - 1) * (scene_width + 30) / 2
                 
-                for i, ref_id in enumerate(scene.referenced_scenes):
-                    ref_scene = scene_dict.get(ref_id)
-                    if ref_scene:
-                        child_x = child_x_start + i * (scene_width + 30)
-                        
-                        # Ligne de connexion
-                        line = self.graphics_scene.addLine(
+                for i, ref_id in enumerate(children):
+                    if ref_id in positions:
+                        # Déjà dessinée (plusieurs parents ou cycle) : simple lien en pointillés
+                        ref_x, ref_y = positions[ref_id]
+                        pen = QPen(QColor(100, 100, 100), 1)
+                        pen.setStyle(Qt.PenStyle.DashLine)
+                        self.graphics_scene.addLine(
                             x + scene_width // 2, y + scene_height,
-                            child_x + scene_width // 2, child_y,
-                            QPen(QColor(100, 100, 100), 2)
+                            ref_x + scene_width // 2, ref_y,
+                            pen
                         )
-                        
-                        # Dessiner récursivement
-                        draw_scene_recursive(ref_scene, child_x, child_y, level + 1)
+                        continue
+                    
+                    child_x = child_x_start + i * (scene_width + 30)
+                    
+                    # Ligne de connexion
+                    line = self.graphics_scene.addLine(
+                        x + scene_width // 2, y + scene_height,
+                        child_x + scene_width // 2, child_y,
+                        QPen(QColor(100, 100, 100), 2)
+                    )
+                    
+                    # Dessiner récursivement
+                    draw_scene_recursive(scene_dict[ref_id], child_x, child_y, level + 1)
         
-        # Dessiner à partir des racines
+        # Dessiner à partir des racines (toute scène est atteignable depuis l'une d'elles)
         x_pos = x_start
         for i, root_scene in enumerate(root_scenes):
             draw_scene_recursive(root_scene, x_pos, y_pos)
             x_pos += scene_width + 100
-        
-        # Si pas de racines, dessiner toutes les scènes
-        if not root_scenes:
-            x_pos = x_start
-            for i, scene in enumerate(scenes[:5]):  # Limiter à 5 pour éviter le surchargement
-                self._draw_scene_box(
-                    scene, x_pos, y_pos, scene_width, scene_height,
-                    is_current=(scene.id == self.current_scene_id)
-                )
-                x_pos += scene_width + 30
     
     def _draw_scene_box(self, scene: Scene, x: float, y: float, width: float, height: float, is_current: bool = False):
         """Dessine une boîte représentant une scène"""
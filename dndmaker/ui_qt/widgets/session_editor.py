@@ -152,7 +152,7 @@ class SessionEditor(QDialog):
             return
         
         all_scenes = self.project_service.scene_service.get_all_scenes()
-        session_scene_ids = self.session.scenes if self.session else []
+        session_scene_ids = set(self.session.scenes) if self.session else set()
         
         for scene in all_scenes:
             # Ne pas afficher les scènes déjà dans la session
@@ -269,7 +269,7 @@ class SessionEditor(QDialog):
             self.session.scenes = scene_ids
             self.session.post_session_notes = notes
             self.session.image_id = self.image_widget.get_image_id()
-            self.session.updated_at = datetime.now()
+            self.project_service.session_service.update_session(self.session)
         else:
             # Mettre à jour la session existante
             self.session.title = title
@@ -0,0 +1,69 @@
+"""
+Panneau « Utilisé dans… » : entités qui référencent l'entité éditée
+"""
+
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QListWidget, QListWidgetItem
+from PyQt6.QtCore import Qt
+
+from ...services.project_service import ProjectService
+
+KIND_LABELS = {
+    'character': "Personnage",
+    'scene': "Scène",
+    'session': "Session",
+    'location': "Lieu",
+    'media': "Média",
+}
+
+FIELD_LABELS = {
+    'player_characters': "PJ",
+    'npcs': "PNJ",
+    'locations': "lieux",
+    'referenced_scenes': "scènes référencées",
+    'sessions': "sessions",
+    'scenes': "scènes",
+    'images': "images",
+    'cards': "cartes",
+    'image_id': "image",
+    'parent_location': "lieu parent",
+    'bestiary': "bestiaire",
+    'associated_entities': "associations",
+    'prototype': "prototype",
+}
+
+
+class UsageListWidget(QWidget):
+    """Liste des entités qui référencent un ID (lue dans l'index inverse du projet)"""
+
+    def __init__(self, project_service: ProjectService, parent=None):
+        super().__init__(parent)
+        self.project_service = project_service
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+
+        self.title_label = QLabel("Utilisé dans…")
+        layout.addWidget(self.title_label)
+
+        self.usage_list = QListWidget()
+        layout.addWidget(self.usage_list)
+
+    def load(self, entity_id: str) -> None:
+        """Affiche les entités qui référencent `entity_id`"""
+        self.usage_list.clear()
+        references = self.project_service.get_references(entity_id)
+        for reference in references:
+            entity = self.project_service.get_entity(reference.kind, reference.id)
+            if entity is None:
+                continue
+            name = getattr(entity, 'title', None) or getattr(entity, 'name', None) or getattr(entity, 'filename', reference.id)
+            label = f"{KIND_LABELS.get(reference.kind, reference.kind)} : {name} ({FIELD_LABELS.get(reference.field, reference.field)})"
+            item = QListWidgetItem(label)
+            item.setData(Qt.ItemDataRole.UserRole, reference)
+            self.usage_list.addItem(item)
+
+        count = self.usage_list.count()
+        if not count:
+            self.title_label.setText("Utilisé dans… (aucune référence)")
+        else:
+            self.title_label.setText(f"Utilisé dans… ({count})")
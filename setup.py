@@ -16,6 +16,9 @@ setup(
         "Pillow>=10.0.0",
         "jsonschema>=4.20.0",
     ],
+    extras_require={
+        "fast": ["numpy>=1.24"],  # Calculs en masse vectorisés (optionnel)
+    },
     python_requires=">=3.8",
     entry_points={
         "console_scripts": [
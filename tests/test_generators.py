@@ -0,0 +1,502 @@
+"""
+Tests pour les générateurs
+"""
+
+import pytest
+
+from dndmaker.core.data_loader import DataLoader
+from dndmaker.generators.bulk_generator import BulkGenerator
+from dndmaker.generators.creature_generator import CreatureGenerator
+from dndmaker.generators.creature_scaling import scale_template
+from dndmaker.generators.encounter_builder import (
+    BestiaryIndex, EncounterBuilder, parse_challenge, solve_budget
+)
+from dndmaker.generators.generation_pool import GenerationPool
+from dndmaker.generators.name_generator import NameGenerator, NameModel
+from dndmaker.generators.npc_generator import NPCGenerator
+from dndmaker.generators.settlement_generator import SettlementGenerator, SettlementReport
+from dndmaker.generators.stats_generator import CHARACTERISTIC_NAMES, StatDistribution, StatsGenerator
+from dndmaker.generators.treasure_generator import TreasureGenerator, format_coins, parse_coins, price_cap
+from dndmaker.models.bank import BankType
+from dndmaker.models.character import CharacterType
+
+
+class TestStatsGenerator:
+    """Tests pour StatsGenerator"""
+    
+    @pytest.mark.parametrize("method", ["standard", "heroic"])
+    def test_roll_characteristics_batch(self, method):
+        """Vérifie le tirage en masse des caractéristiques"""
+        rows = StatsGenerator.roll_characteristics_batch(500, method)
+        assert len(rows) == 500
+        assert all(len(row) == 6 for row in rows)
+        assert all(3 <= value <= 18 for row in rows for value in row)
+    
+    def test_characteristics_from_values(self):
+        """Vérifie la construction des caractéristiques avec leurs modificateurs"""
+        stats = StatsGenerator.characteristics_from_values([15, 12, 14, 10, 13, 8])
+        assert stats.strength.value == 15
+        assert stats.strength.modifier == 2
+        assert stats.charisma.modifier == -1
+    
+    def test_stat_distribution_is_exact(self):
+        """Vérifie que les poids reproduisent la distribution exacte de 4d6 (3 meilleurs)"""
+        distribution = StatsGenerator.stat_distribution("standard")
+        assert distribution.total == 1296
+        assert distribution.weight(18) == 21 and distribution.weight(3) == 1
+        assert StatsGenerator.stat_distribution("heroic").probability(18) == pytest.approx(276 / 7776)
+        # Poids non développés en table : une entrée par valeur distincte
+        assert len(StatDistribution.from_dice("8d10").values) == 73
+    
+    def test_constrained_batch(self):
+        """Vérifie le tirage conditionnel (sans rejet) et le refus des contraintes impossibles"""
+        import random
+        rows = StatsGenerator.roll_characteristics_batch(
+            2000, rng=random.Random(2), constraints={'INT': 16, 'strength': (None, 9)}
+        )
+        intelligence = [row[CHARACTERISTIC_NAMES.index('intelligence')] for row in rows]
+        assert all(16 <= value <= 18 for value in intelligence)
+        assert all(row[0] <= 9 for row in rows)
+        # Distribution conditionnelle : P(18 | >= 16) = 21 / (73 + 54 + 21)
+        assert intelligence.count(18) / 2000 == pytest.approx(21 / 148, abs=0.03)
+        with pytest.raises(ValueError):
+            StatsGenerator.roll_characteristics_batch(1, constraints={'INT': 19})
+        with pytest.raises(ValueError):
+            StatsGenerator.roll_characteristics_batch(1, constraints={'luck': 10})
+    
+    def test_batch_with_one_stream_per_character(self):
+        """Vérifie qu'un tirage en lot donne à chaque flux les mêmes valeurs qu'un tirage seul"""
+        import random
+        constraints = {'INT': 14}
+        batch = StatsGenerator.roll_stat_values_each([random.Random(seed) for seed in range(5)], constraints=constraints)
+        alone = [StatsGenerator.roll_stat_values(1, rng=random.Random(seed), constraints=constraints) for seed in range(5)]
+        assert batch.tolist() == [value for values in alone for value in values]
+    
+    def test_stats_from_table(self):
+        """Vérifie les plages personnalisées (intervalle, liste, dés)"""
+        stat_table = {'strength': {'min': 14, 'max': 16}, 'dexterity': [8, 9], 'wisdom': "1d4+10"}
+        for _ in range(50):
+            stats = StatsGenerator.generate_stats_from_table(stat_table)
+            assert 14 <= stats.strength.value <= 16
+            assert stats.dexterity.value in (8, 9)
+            assert 11 <= stats.wisdom.value <= 14
+        assert StatDistribution.from_spec([8, 8, 9]).probability(8, 8) == pytest.approx(2 / 3)
+
+
+class TestNPCGenerator:
+    """Tests pour NPCGenerator"""
+    
+    def test_generate_npcs_batch(self, project_service):
+        """Vérifie la génération en masse et l'insertion groupée"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = NPCGenerator(project_service.bank_service)
+        
+        npcs = generator.generate_npcs(200, level=3, race="Nain")
+        assert len(npcs) == 200
+        assert len({npc.id for npc in npcs}) == 200
+        assert all(npc.type == CharacterType.PNJ for npc in npcs)
+        assert all(npc.profile.race == "Nain" and npc.profile.level == 3 for npc in npcs)
+        assert all(npc.name and npc.equipment for npc in npcs)
+        assert all(npc.profile.character_class for npc in npcs)
+        
+        assert project_service.character_service.add_characters(npcs) == 200
+        assert len(project_service.character_service.get_characters_by_type(CharacterType.PNJ)) == 200
+    
+    def test_generate_npcs_without_banks(self, project_service):
+        """Vérifie les valeurs par défaut quand les banques sont vides"""
+        generator = NPCGenerator(project_service.bank_service)
+        npcs = generator.generate_npcs(5)
+        assert all(npc.profile.race == "Humain" for npc in npcs)
+        assert all(npc.name.startswith("PNJ_") for npc in npcs)
+        assert all(npc.profile.character_class == "Guerrier" for npc in npcs)
+
+
+class TestNameGenerator:
+    """Tests pour le générateur de noms (modèle de Markov)"""
+    
+    NAMES = ["Aelar", "Aerin", "Alaric", "Arannis", "Belanor", "Caelynn", "Elandor", "Erevan",
+             "Galinndan", "Ilyana", "Laucian", "Mialee", "Naivara", "Quelenna", "Sariel", "Thamior"]
+    
+    def _fill_bank(self, project_service):
+        """Remplit la banque de noms elfiques"""
+        from dndmaker.models.bank import BankType
+        bank = project_service.bank_service.get_or_create_bank(BankType.NAMES)
+        for name in self.NAMES:
+            project_service.bank_service.add_entry_to_bank(bank.id, name, {'racial_origin': 'Elfe'})
+        return bank
+    
+    def test_generates_new_unique_names(self, project_service, tmp_path):
+        """Vérifie que les noms inventés sont inédits et distincts"""
+        import random
+        self._fill_bank(project_service)
+        generator = NameGenerator(project_service.bank_service, tmp_path)
+        generator.reserve(["Aelin"])
+        names = generator.generate_many(40, "Elfe", rng=random.Random(1))
+        assert len(names) == 40
+        assert len(set(names)) == 40
+        assert not set(names) & set(self.NAMES) and "Aelin" not in names
+    
+    def test_disk_cache_and_invalidation(self, project_service, tmp_path):
+        """Vérifie le cache disque et la recompilation quand la banque change"""
+        import random
+        bank = self._fill_bank(project_service)
+        NameGenerator(project_service.bank_service, tmp_path).generate("Elfe")
+        cached = list(tmp_path.iterdir())
+        assert len(cached) == 1
+        
+        model = NameModel.train(self.NAMES, 2)
+        restored = NameModel.from_dict(model.to_dict())
+        assert restored.generate(random.Random(5)) == model.generate(random.Random(5))
+        
+        project_service.bank_service.add_entry_to_bank(bank.id, "Varis", {'racial_origin': 'Elfe'})
+        NameGenerator(project_service.bank_service, tmp_path).generate("Elfe")
+        assert len(list(tmp_path.iterdir())) == 2
+    
+    def test_npc_generator_invents_names(self, project_service, monkeypatch, tmp_path):
+        """Vérifie l'utilisation des noms inventés dans la génération de PNJ"""
+        from dndmaker.generators import npc_generator
+        monkeypatch.setattr(npc_generator, "default_cache_dir", lambda: tmp_path)
+        self._fill_bank(project_service)
+        npcs = NPCGenerator(project_service.bank_service, seed=3, invent_names=True).generate_npcs(20, race="Elfe")
+        names = [npc.name for npc in npcs]
+        assert len(set(names)) == 20
+        assert not set(names) & set(self.NAMES)
+
+
+class TestSeededGeneration:
+    """Tests pour la reproductibilité des générateurs"""
+    
+    @staticmethod
+    def _signature(character):
+        """Résumé comparable d'un personnage généré (sans l'ID)"""
+        stats = character.characteristics
+        return (
+            character.name, character.profile.race, character.profile.gender,
+            [getattr(stats, name).value for name in CHARACTERISTIC_NAMES],
+            character.equipment, character.seed
+        )
+    
+    def test_same_seed_same_npcs_whatever_the_split(self, project_service):
+        """Vérifie qu'un lot découpé en plusieurs tâches donne les mêmes PNJ"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        whole = NPCGenerator(project_service.bank_service).generate_npcs(40, seed=1234)
+        parts = []
+        for start in range(0, 40, 15):
+            generator = NPCGenerator(project_service.bank_service)
+            parts.extend(generator.generate_npcs(min(15, 40 - start), seed=1234, start=start))
+        
+        assert [self._signature(c) for c in whole] == [self._signature(c) for c in parts]
+        assert len({c.seed for c in whole}) == 40
+    
+    def test_npc_regenerated_from_recorded_seed(self, project_service):
+        """Vérifie qu'un PNJ se régénère depuis la graine enregistrée"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = NPCGenerator(project_service.bank_service)
+        npc = generator.generate_npcs(3, level=2)[1]
+        again = NPCGenerator(project_service.bank_service).generate_npc(level=2, seed=npc.seed)
+        assert self._signature(again) == self._signature(npc)
+    
+    def test_creature_seed(self, project_service):
+        """Vérifie la reproductibilité des créatures"""
+        generator = CreatureGenerator(project_service.bank_service, seed=7)
+        first = generator.generate_creature(level=3)
+        second = CreatureGenerator(project_service.bank_service).generate_creature(level=3, seed=first.seed)
+        assert first.seed is not None
+        assert self._signature(first) == self._signature(second)
+
+
+class TestBulkGenerator:
+    """Tests pour la génération en masse"""
+    
+    @staticmethod
+    def _run(project_service, workers):
+        """Génère des rencontres et une région, retourne les personnages obtenus"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = BulkGenerator(project_service, workers=workers, batch_size=4)
+        encounters = generator.run(generator.plan_encounters(12, 1, 4, seed=5))
+        region = generator.run(generator.plan_settlements(3, 5, 8, seed=6), region_name="Val")
+        return encounters, region
+    
+    def test_merges_packs_into_scenes_and_locations(self, project_service):
+        """Vérifie la fusion des packs en scènes et en lieux"""
+        encounters, region = self._run(project_service, workers=1)
+        assert encounters.packs == 12 and not encounters.cancelled
+        scenes = project_service.scene_service.get_all_scenes()
+        assert len(scenes) == 12
+        assert sum(len(s.npcs) for s in scenes) == encounters.characters
+        
+        assert region.packs == 3
+        locations = {l.id: l for l in project_service.location_service.get_all_locations()}
+        region_location = locations[region.location_ids[0]]
+        villages = [l for l in locations.values() if l.parent_location == region_location.id]
+        assert len(villages) == 3
+        assert sum(len(v.bestiary) for v in villages) == region.characters
+    
+    def test_same_result_with_several_processes(self, monkeypatch):
+        """Vérifie que le résultat ne dépend pas du nombre de processus"""
+        from dndmaker.generators import bulk_generator
+        from dndmaker.services.project_service import ProjectService
+        monkeypatch.setattr(bulk_generator, "PARALLEL_THRESHOLD", 0)
+        
+        signatures = []
+        for workers in (1, 2):
+            service = ProjectService()
+            self._run(service, workers)
+            signatures.append(sorted(
+                (c.name, c.seed, c.characteristics.strength.value)
+                for c in service.character_service.get_all_characters()
+            ))
+        assert signatures[0] == signatures[1]
+    
+    def test_cancellation_keeps_finished_packs(self, project_service):
+        """Vérifie qu'une annulation conserve les packs déjà fusionnés"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = BulkGenerator(project_service, workers=1, batch_size=5)
+        done = []
+        report = generator.run(
+            generator.plan_encounters(20, seed=1),
+            progress=lambda finished, total: done.append(finished),
+            is_cancelled=lambda: bool(done)
+        )
+        assert report.cancelled
+        assert report.packs == 5
+        assert len(project_service.scene_service.get_all_scenes()) == 5
+    
+    def test_generate_then_merge_separately(self, project_service):
+        """Vérifie que generate ne touche pas aux services (fusion faite par l'appelant)"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = BulkGenerator(project_service, workers=1, batch_size=4)
+        tasks = generator.plan_encounters(6, seed=3)
+        batches = list(generator.generate(tasks))
+        assert project_service.scene_service.get_all_scenes() == []
+        # Les caches des banques du projet ne sont pas remplis par la génération
+        list(generator.generate(generator.plan_settlements(2, seed=3)))
+        assert not project_service.bank_service._samplers
+        merger = generator.merger()
+        for packs in batches:
+            merger.add(packs)
+        report = merger.finish(len(tasks))
+        assert report.packs == 6 and not report.cancelled
+        assert len(project_service.scene_service.get_all_scenes()) == 6
+
+
+class TestCreatureGenerator:
+    """Tests pour CreatureGenerator"""
+    
+    def test_template_hit_dice_are_rolled(self, project_service):
+        """Vérifie que des PV exprimés en dés ("2d6") sont lancés"""
+        generator = CreatureGenerator(project_service.bank_service, seed=8)
+        template = {'name': 'Gobelours', 'level': 2, 'hp': '2d6+1'}
+        creatures = [generator.generate_creature_from_data(template) for _ in range(50)]
+        assert all(3 <= c.combat.life_points <= 13 for c in creatures)
+        assert all(c.combat.life_dice == "2d6+1" for c in creatures)
+        assert len({c.combat.life_points for c in creatures}) > 1
+    
+    def test_scaled_template(self):
+        """Vérifie l'adaptation d'un template à un niveau supérieur puis inférieur"""
+        template = {'name': 'Ogre', 'level': 2, 'challenge': '2', 'archetype': 'puissant', 'size': 'grand',
+                    'hp': 40, 'ac': 12, 'stats': {'strength': 16, 'constitution': 14, 'dexterity': 8}}
+        scaled = scale_template(template, 6)
+        assert scaled['level'] == 6 and scaled['base_level'] == 2
+        assert scaled['hp'] > 40 and scaled['ac'] >= 12
+        assert scaled['stats']['strength'] > 16 and scaled['stats']['dexterity'] == 8
+        assert parse_challenge(scaled['challenge']) > 2
+        assert template['hp'] == 40  # Le template d'origine est intact
+        weaker = scale_template(template, 0)
+        assert 1 <= weaker['hp'] < 40
+        assert scale_template({'name': 'Rat', 'level': 0, 'hp': '1d4'}, 3)['hp'].startswith('1d4+')
+    
+    def test_generate_bestiary(self, project_service):
+        """Vérifie la génération du bestiaire complet à un niveau"""
+        generator = CreatureGenerator(project_service.bank_service, seed=5)
+        creatures = generator.generate_bestiary(5, seed=11)
+        assert len(creatures) == len(DataLoader.load_creatures())
+        assert all(c.profile.level == 5 for c in creatures)
+        again = CreatureGenerator(project_service.bank_service).generate_bestiary(5, seed=11)
+        assert [c.combat.life_points for c in again] == [c.combat.life_points for c in creatures]
+
+
+class TestEncounterBuilder:
+    """Tests pour l'index du bestiaire et le constructeur de rencontres"""
+    
+    def test_parse_challenge(self):
+        """Vérifie la lecture des NC fractionnaires"""
+        assert parse_challenge("1/4") == 0.25
+        assert parse_challenge("3") == 3.0
+        assert parse_challenge("?") == 0.0
+    
+    def test_index_range_queries(self):
+        """Vérifie les recherches par intervalle de niveau et de NC"""
+        index = BestiaryIndex.from_templates(DataLoader.load_creatures())
+        templates = DataLoader.load_creatures()
+        expected = sorted(t['name'] for t in templates if 2 <= t.get('level', 1) <= 3)
+        assert sorted(c.name for c in index.by_level(2, 3)) == expected
+        assert all(c.challenge <= 0.5 for c in index.by_challenge(max_challenge=0.5))
+        assert all(c.archetype == "puissant" for c in index.by_archetype("Puissant"))
+    
+    def test_solve_budget(self):
+        """Vérifie que le solveur atteint le budget sans le dépasser"""
+        counts = solve_budget((3, 5), 13, 8)
+        assert counts[0] * 3 + counts[1] * 5 == 13
+        # Budget inatteignable exactement : on s'en approche par en dessous
+        counts = solve_budget((4,), 10, 8)
+        assert counts == (2,)
+        # Limite du nombre de créatures
+        assert sum(solve_budget((1,), 20, 3)) == 3
+    
+    def test_add_to_scene(self, project_service):
+        """Vérifie la composition d'une rencontre et son ajout à une scène"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        builder = EncounterBuilder(project_service, seed=3)
+        encounters = builder.suggest("difficile", party_levels=[2, 2, 3], count=3, max_creatures=6)
+        assert encounters
+        budget = builder.budget_for([2, 2, 3], "difficile")
+        for encounter in encounters:
+            assert 0 < encounter.total_cost <= budget
+            assert len(encounter.creatures) <= 6
+            assert all(c.level <= 4 for c in encounter.creatures)
+        
+        scene = project_service.scene_service.create_scene("Embuscade")
+        creatures = builder.add_to_scene(scene, encounters[0])
+        assert scene.npcs == [c.id for c in creatures]
+        assert all(c.type == CharacterType.CREATURE for c in creatures)
+        assert len(project_service.character_service.get_all_characters()) == len(creatures)
+    
+    def test_index_follows_bank_edits(self, project_service):
+        """Vérifie que l'index est reconstruit après un renommage ou une modification de métadonnées"""
+        bank_service = project_service.bank_service
+        bank = bank_service.create_bank(BankType.CREATURES)
+        entry = bank_service.add_entry_to_bank(bank.id, "Vouivre pâle", {'level': 3, 'challenge': '2'})
+        builder = EncounterBuilder(project_service)
+        assert any(c.name == "Vouivre pâle" for c in builder.index.creatures)
+        
+        bank_service.update_entry(bank.id, entry.id, "Vouivre d'argent", {'level': 7, 'challenge': '6'})
+        names = {c.name: c for c in builder.index.creatures}
+        assert "Vouivre pâle" not in names
+        assert (names["Vouivre d'argent"].level, names["Vouivre d'argent"].challenge) == (7, 6.0)
+
+
+class TestTreasureGenerator:
+    """Tests pour TreasureGenerator"""
+    
+    def test_coins(self):
+        """Vérifie la lecture et l'écriture des sommes"""
+        assert parse_coins("1 po 5 pa") == 150
+        assert parse_coins("Bourse vide") == 0
+        assert format_coins(1234) == "12 po 3 pa 4 pc"
+    
+    def test_pools_respect_level(self, project_service):
+        """Vérifie que les objets trop chers pour le niveau sont exclus"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = TreasureGenerator(project_service.bank_service, seed=1)
+        prices = {entry.value: parse_coins(entry.metadata.get('price', ''))
+                  for entry in project_service.bank_service.get_sampler(BankType.ARMORS).items}
+        pool = generator.pool(BankType.ARMORS, 0)
+        assert pool and all(prices[item] <= price_cap(0) for item in pool.items)
+        assert len(generator.pool(BankType.ARMORS, 20)) > len(pool)
+        # Réserve reconstruite après une mutation de la banque
+        bank = project_service.bank_service.get_bank_by_type(BankType.ARMORS)
+        project_service.bank_service.add_entry_to_bank(bank.id, "Cotte de lin", {'price': '1 pa'})
+        assert "Cotte de lin" in generator.pool(BankType.ARMORS, 0).items
+    
+    def test_equip(self, project_service):
+        """Vérifie l'attribution reproductible d'un trésor aux personnages"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        npcs = NPCGenerator(project_service.bank_service, seed=2).generate_npcs(5, level=3)
+        for npc in npcs:
+            npc.valuables.purse = "2 po"
+        before = [len(npc.equipment) for npc in npcs]
+        generator = TreasureGenerator(project_service.bank_service)
+        loots = generator.equip(npcs, location_type="Donjon", hoard=True, seed=9)
+        for npc, loot, count in zip(npcs, loots, before):
+            assert len(npc.equipment) == count + len(loot.equipment)
+            assert npc.valuables.items == loot.valuables
+            assert parse_coins(npc.valuables.purse) == 200 + loot.coins
+        again = generator.generate_many(5, 3, "Donjon", hoard=True, seed=9)
+        assert [l.describe() for l in again] == [l.describe() for l in loots]
+
+
+class TestSettlementGenerator:
+    """Tests pour SettlementGenerator"""
+    
+    def test_populate_location(self, project_service):
+        """Vérifie le peuplement d'un lieu en un seul lot (foyers, métiers, factions)"""
+        bank_service = project_service.bank_service
+        DataLoader.initialize_banks(bank_service)
+        factions = bank_service.get_or_create_bank(BankType.FACTIONS)
+        for name in ("Guilde des marchands", "Garde du roi"):
+            bank_service.add_entry_to_bank(factions.id, name)
+        location = project_service.location_service.create_location("Fort-Cendre", location_type="Ville")
+        
+        generator = SettlementGenerator(project_service, seed=4, invent_names=False)
+        report = generator.populate(location, 120, level=2, race="Nain", seed=7)
+        
+        assert len(report.characters) == 120
+        assert location.bestiary == [c.id for c in report.characters]
+        assert len(project_service.character_service.get_all_characters()) == 120
+        assert 0 < report.households <= 120
+        assert all(c.profile.profession for c in report.characters)
+        faction_ids = {e.id for e in factions.entries}
+        assert all(c.faction in faction_ids for c in report.characters if c.faction)
+        # La race dominante est majoritaire
+        assert sum(c.profile.race == "Nain" for c in report.characters) > 60
+        
+        again = SettlementGenerator(project_service, invent_names=False).generate(120, 2, "Nain", seed=7)
+        assert [c.name for c in again] == [c.name for c in report.characters]
+    
+    def test_same_seed_with_invented_names(self, project_service):
+        """Vérifie qu'avec des noms inventés, seule la graine décide des foyers et des habitants"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        generator = SettlementGenerator(project_service, seed=3)
+        
+        def layout(characters):
+            return [
+                (c.profile.race, c.profile.profession, c.profile.character_class, c.characteristics.values())
+                for c in characters
+            ]
+        
+        first = SettlementReport(location_id="", seed=1)
+        second = SettlementReport(location_id="", seed=1)
+        residents = generator.generate(10, 1, "Humain", seed=1, report=first)
+        # Les noms du premier tirage sont désormais pris : le second en invente d'autres
+        again = generator.generate(10, 1, "Humain", seed=1, report=second)
+        assert first.households == second.households
+        assert layout(again) == layout(residents)
+
+
+class TestGenerationPool:
+    """Tests pour GenerationPool"""
+    
+    def test_take_and_refill(self, project_service):
+        """Vérifie que la réserve se remplit en arrière-plan et se recharge après un retrait"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        pool = GenerationPool(
+            project_service.bank_service, size=2,
+            presets=[{'type': 'PNJ', 'level': 3}, {'type': 'CREATURE', 'level': 2}]
+        )
+        pool.start()
+        try:
+            assert pool.wait_until_full()
+            npc = pool.take(CharacterType.PNJ, 3)
+            assert npc.type == CharacterType.PNJ and npc.profile.level == 3
+            assert pool.take(CharacterType.CREATURE, 2).type == CharacterType.CREATURE
+            # Jeu de paramètres inconnu : rien d'avance, mais il est entretenu ensuite
+            assert pool.take(CharacterType.PNJ, 7) is None
+            assert pool.wait_until_full()
+            assert pool.available(CharacterType.PNJ, 7) == 2
+        finally:
+            pool.stop(timeout=5)
+    
+    def test_bank_change_discards_pool(self, project_service):
+        """Vérifie qu'une mutation des banques vide la réserve (personnages périmés)"""
+        DataLoader.initialize_banks(project_service.bank_service)
+        pool = GenerationPool(project_service.bank_service, size=2, presets=[{'type': 'PNJ', 'level': 1}])
+        pool.start()
+        try:
+            assert pool.wait_until_full()
+            pool.stop(timeout=5)
+            races = project_service.bank_service.get_bank_by_type(BankType.RACES)
+            project_service.bank_service.add_entry_to_bank(races.id, "Gnome des roches")
+            assert pool.take(CharacterType.PNJ, 1) is None
+        finally:
+            pool.stop(timeout=5)
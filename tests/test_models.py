@@ -46,6 +46,63 @@ class TestCharacteristicValue:
         assert char_value.modifier == -1  # (8-10)/2 = -1
 
 
+class TestCharacteristics:
+    """Tests pour Characteristics (tableau compact)"""
+    
+    def test_attribute_access_writes_through(self):
+        """Vérifie que les caractéristiques restent accessibles et modifiables par attribut"""
+        stats = Characteristics(strength=CharacteristicValue(value=16))
+        assert stats.strength.value == 16 and stats.strength.modifier == 3
+        assert stats.wisdom.value == 10
+        stats.dexterity.value = 14
+        assert stats.dexterity.modifier == 2
+        stats.charisma = CharacteristicValue(value=6)
+        assert stats.values() == [16, 14, 10, 10, 10, 6]
+        assert stats == Characteristics.from_values([16, 14, 10, 10, 10, 6])
+    
+    def test_serialization_unchanged(self):
+        """Vérifie que le format sérialisé reste celui des dataclasses"""
+        from dndmaker.persistence.serializer import serialize_model
+        character = Character(
+            id="c-1", name="Gobelin", type=CharacterType.CREATURE,
+            characteristics=Characteristics.from_values([8, 14, 10, 8, 8, 6])
+        )
+        data = serialize_model(character)
+        assert data['characteristics']['dexterity'] == {'value': 14, 'modifier': 2}
+        assert data['defense'] == {'base': 10, 'armor': 0, 'shield': 0, 'dexterity': 0, 'misc': 0}
+        assert data['valuables'] == {'purse': '', 'items': []}
+    
+    def test_no_instance_dict(self):
+        """Vérifie que les modèles n'ont pas de __dict__ par instance"""
+        character = Character(id="c-1", name="Gobelin", type=CharacterType.CREATURE)
+        for model in (character, character.profile, character.characteristics, character.combat,
+                      character.defense, character.capabilities, character.capabilities.path1,
+                      character.valuables):
+            assert not hasattr(model, '__dict__')
+    
+    @pytest.mark.slow
+    def test_memory_benchmark(self):
+        """Mesure la mémoire d'un bestiaire de 100 000 créatures"""
+        import tracemalloc
+        count = 100_000
+        tracemalloc.start()
+        try:
+            before = tracemalloc.get_traced_memory()[0]
+            bestiary = [
+                Character(
+                    id=f"creature-{i}", name="Gobelin", type=CharacterType.CREATURE,
+                    characteristics=Characteristics.from_values([8 + (i + k) % 8 for k in range(6)])
+                )
+                for i in range(count)
+            ]
+            per_creature = (tracemalloc.get_traced_memory()[0] - before) / count
+        finally:
+            tracemalloc.stop()
+        assert len(bestiary) == count
+        # Environ 2,1 Ko par créature avec les dataclasses à __dict__, 1,2 Ko avec __slots__
+        assert per_creature < 1500, f"{per_creature:.0f} octets par créature"
+
+
 class TestCharacter:
     """Tests pour le modèle Character"""
     
@@ -75,6 +132,48 @@ class TestCharacter:
         assert character.profile.race == "Elf"
 
 
+class TestDerivedStats:
+    """Tests des statistiques dérivées"""
+
+    def test_defaults(self):
+        """Sans saisie : attaques FOR/DEX + NIV, défense 10 + DEX"""
+        character = Character(id="d-1", name="Test", type=CharacterType.PNJ)
+        character.characteristics.strength.value = 14
+        character.characteristics.dexterity.value = 12
+        character.profile.level = 3
+        derived = character.derived
+        assert derived.modifiers == (2, 1, 0, 0, 0, 0)
+        assert derived.melee_attack == 5
+        assert derived.ranged_attack == 4
+        assert derived.magic_attack == 3
+        assert derived.defense_total == 11
+
+    def test_follows_field_changes(self):
+        """Chaque lecture reflète les champs courants, modifiés sur place ou remplacés"""
+        character = Character(id="d-2", name="Test", type=CharacterType.PNJ)
+        derived = character.derived
+        assert derived.defense_total == 10
+        character.characteristics.dexterity.value = 16
+        assert derived.defense_total == 13
+        character.defense.armor = 2
+        assert derived.defense_total == 15
+        character.defense = DefenseStats(shield=1)
+        assert derived.defense_total == 14
+        assert character.defense.calculate_total(derived.modifier('dexterity')) == 14
+        character.combat.melee_attack = "3 + 2"
+        assert derived.melee_attack == 5
+        character.profile.level = 2
+        assert derived.magic_attack == 2
+
+    def test_nothing_stored_on_character(self):
+        """Aucun état n'est ajouté au personnage ni sérialisé"""
+        from dndmaker.persistence.serializer import serialize_model
+        character = Character(id="d-4", name="Test", type=CharacterType.PNJ)
+        assert character.derived.defense_total == 10
+        assert not hasattr(character, '_derived')
+        assert 'derived' not in serialize_model(character)
+
+
 class TestScene:
     """Tests pour le modèle Scene"""
     
@@ -103,6 +103,180 @@ class TestCharacterService:
         assert result is False
 
 
+class TestCharacterAnalytics:
+    """Tests de la vue en colonnes des personnages"""
+    
+    @pytest.fixture
+    def service(self, project_service):
+        service = project_service.character_service
+        for name, character_type, level, strength, faction in [
+            ("Garde", CharacterType.PNJ, 2, 12, "f-garde"),
+            ("Capitaine", CharacterType.PNJ, 6, 15, "f-garde"),
+            ("Voleur", CharacterType.PNJ, 3, 9, None),
+            ("Ogre", CharacterType.CREATURE, 5, 19, None),
+            ("Loup", CharacterType.CREATURE, 1, 12, None),
+        ]:
+            character = service.create_character(name, character_type, level=level)
+            character.characteristics.strength.value = strength
+            character.faction = faction
+            service.update_character(character)
+        return service
+    
+    @pytest.mark.parametrize("use_numpy", [True, False])
+    def test_queries(self, service, use_numpy):
+        """Moyennes par groupe, classement et histogramme, avec ou sans NumPy"""
+        from dndmaker.services.character_analytics import CharacterAnalytics
+        analytics = CharacterAnalytics(service.get_all_characters(), use_numpy=use_numpy)
+        npcs = {'type': CharacterType.PNJ}
+        assert analytics.count(npcs) == 3
+        assert analytics.mean_by('level', 'faction', npcs) == {None: 3.0, "f-garde": 4.0}
+        strongest = analytics.top('strength', 1, {'type': CharacterType.CREATURE})
+        assert [(service.get_character(i).name, value) for i, value in strongest] == [("Ogre", 19)]
+        assert analytics.histogram('strength') == {9: 1, 12: 2, 15: 1, 19: 1}
+        assert analytics.count({'faction': "inconnue"}) == 0
+    
+    def test_incremental_updates(self, service):
+        """La vue du service suit les ajouts, modifications et suppressions"""
+        analytics = service.analytics()
+        assert analytics.mean('level') == 3.4
+        ogre = next(c for c in service.get_all_characters() if c.name == "Ogre")
+        ogre.profile.level = 10
+        service.update_character(ogre)
+        assert analytics.top('level', 1) == [(ogre.id, 10)]
+        service.delete_character(ogre.id)
+        service.create_character("Rat", CharacterType.CREATURE, level=1)
+        assert len(analytics) == 5
+        assert analytics.histogram('level', {'type': CharacterType.CREATURE}) == {1: 2}
+    
+    def test_prototype_changes_refresh_instance_rows(self, service):
+        """Les lignes des instances suivent les caractéristiques partagées du prototype"""
+        analytics = service.analytics()
+        wolf = next(c for c in service.get_all_characters() if c.name == "Loup")
+        pack = service.spawn_instances(wolf.id, 3)
+        wolf.characteristics.strength.value = 14
+        service.update_character(wolf)
+        assert analytics.histogram('strength', {'type': CharacterType.CREATURE}) == {14: 4, 19: 1}
+        assert analytics.top('strength', 1, {'type': CharacterType.CREATURE})[0][1] == 19
+        assert pack[0].id in analytics and analytics.count() == 8
+    
+    def test_defense_dexterity_is_live(self, service):
+        """La colonne du modificateur DEX de défense suit la DEX, pas la valeur enregistrée"""
+        analytics = service.analytics()
+        thief = next(c for c in service.get_all_characters() if c.name == "Voleur")
+        thief.defense.dexterity = 0
+        thief.characteristics.dexterity.value = 16
+        service.update_character(thief)
+        assert dict(analytics.top('defense_dexterity', 1)) == {thief.id: 3}
+
+
+class TestCharacterQuery:
+    """Tests des requêtes indexées sur les personnages"""
+    
+    @pytest.fixture
+    def service(self, project_service):
+        service = project_service.character_service
+        for name, character_type, level, race, faction in [
+            ("Éloi", CharacterType.PNJ, 3, "Humain", "f-garde"),
+            ("Bran", CharacterType.PNJ, 5, "Nain", "f-garde"),
+            ("Elda", CharacterType.PNJ, 5, "Elfe", None),
+            ("Alric", CharacterType.PNJ, 1, "Humain", None),
+            ("Ogre", CharacterType.CREATURE, 5, "Géant", None),
+        ]:
+            character = service.create_character(name, character_type, level=level, race=race)
+            character.faction = faction
+            service.update_character(character)
+        return service
+    
+    def test_filters_sort_and_pages(self, service):
+        """Filtres combinés, tri stable et pagination"""
+        names = lambda page: [c.name for c in page.characters]
+        page = service.query(type=CharacterType.PNJ, limit=2)
+        assert names(page) == ["Alric", "Bran"] and page.total == 4 and page.has_next
+        assert names(service.query(type=CharacterType.PNJ, offset=2, limit=2)) == ["Elda", "Éloi"]
+        assert names(service.query(level=(4, None), sort=['-level', 'name'])) == ["Bran", "Elda", "Ogre"]
+        assert names(service.query(type=CharacterType.PNJ, sort='name')) == ["Alric", "Bran", "Elda", "Éloi"]
+        assert names(service.query(type=CharacterType.PNJ, sort='-level'))[:2] == ["Bran", "Elda"]
+        assert names(service.query(type=CharacterType.PNJ, race="humain", faction=None)) == ["Alric"]
+        assert names(service.query(name_prefix="el")) == ["Elda", "Éloi"]
+        with pytest.raises(ValueError):
+            service.query(sort=['age'])
+    
+    def test_index_follows_changes(self, service):
+        """Les index suivent les modifications et suppressions"""
+        assert len(service.get_characters_by_type(CharacterType.CREATURE)) == 1
+        ogre = service.get_characters_by_type(CharacterType.CREATURE)[0]
+        ogre.name = "Troll"
+        ogre.type = CharacterType.PNJ
+        service.update_character(ogre)
+        assert service.get_characters_by_type(CharacterType.CREATURE) == []
+        assert [c.name for c in service.query(name_prefix="tr").characters] == ["Troll"]
+        service.delete_character(ogre.id)
+        assert service.query(name_prefix="tr").total == 0
+    
+    def test_index_follows_prototype_changes(self, service):
+        """Les instances sont réindexées quand leur prototype partagé change"""
+        ogre = service.get_characters_by_type(CharacterType.CREATURE)[0]
+        service.spawn_instances(ogre.id, 2)
+        assert service.query(race="géant").total == 3
+        ogre.profile.race = "Troll"
+        service.update_character(ogre)
+        assert service.query(race="géant").total == 0
+        assert [c.name for c in service.query(race="troll").characters] == ["Ogre", "Ogre 1", "Ogre 2"]
+
+
+class TestBulkCharacterOperations:
+    """Tests des opérations en masse sur les personnages"""
+    
+    @pytest.fixture
+    def service(self, project_service):
+        service = project_service.character_service
+        service.create_characters(
+            [{'name': f"Garde {i}", 'type': "PNJ", 'level': 1 + i % 3, 'faction': "f-garde"} for i in range(6)]
+            + [{'name': "Loup", 'type': "CREATURE", 'level': 2}]
+        )
+        return service
+    
+    def test_update_and_delete_where(self, service):
+        """Correctif et suppression sur une sélection par critères ou par IDs"""
+        change = service.update_where({'profile.level': lambda n: n + 1, 'faction': "f-milice"}, faction="f-garde")
+        assert len(change.updated) == 6
+        assert service.query(faction="f-milice").total == 6
+        assert service.query(type=CharacterType.PNJ, level=(2, 4)).total == 6
+        
+        wolf = service.get_characters_by_type(CharacterType.CREATURE)[0]
+        assert len(service.delete_where([wolf.id])) == 1
+        assert service.get_character(wolf.id) is None
+        assert service.delete_where().deleted == []  # Sans critère : rien n'est sélectionné
+    
+    def test_update_is_atomic(self, service):
+        """Une valeur impossible à calculer n'en laisse aucune appliquée"""
+        def level_up(level):
+            if level == 3:
+                raise ValueError("niveau maximal")
+            return level + 1
+        with pytest.raises(ValueError):
+            service.update_where({'profile.level': level_up}, type=CharacterType.PNJ)
+        with pytest.raises(ValueError):
+            service.update_where({'profile.inconnu': 1}, type=CharacterType.PNJ)
+        assert service.analytics().histogram('level', {'type': CharacterType.PNJ}) == {1: 2, 2: 2, 3: 2}
+    
+    def test_failed_save_reverts(self, project_service, service):
+        """Sans sauvegarde possible (aucun projet ouvert), l'opération est annulée"""
+        with pytest.raises(ValueError):
+            project_service.bulk_update_characters({'faction': None}, faction="f-garde")
+        assert service.query(faction="f-garde").total == 6
+        with pytest.raises(ValueError):
+            project_service.bulk_delete_characters(type=CharacterType.PNJ)
+        assert len(service.get_characters_by_type(CharacterType.PNJ)) == 6
+    
+    def test_single_save(self, project_service, service):
+        """Une opération en masse ne sauvegarde qu'une fois"""
+        with patch.object(project_service, 'save_project') as save:
+            change = project_service.bulk_update_characters({'profile.race': "Nain"}, type=CharacterType.PNJ)
+        assert len(change.updated) == 6
+        save.assert_called_once()
+
+
 class TestSceneService:
     """Tests pour SceneService"""
     
@@ -146,6 +320,52 @@ class TestSceneService:
         assert service.get_scene(scene_id) is None
 
 
+class TestSceneGraph:
+    """Tests du graphe des scènes référencées"""
+    
+    @staticmethod
+    def _link(service, scene, *targets):
+        scene.referenced_scenes = [t.id for t in targets]
+        service.update_scene(scene)
+    
+    def test_order_roots_and_reachability(self, project_service):
+        """Vérifie l'ordre topologique, les racines et les ensembles en cache"""
+        service = project_service.scene_service
+        end, middle, start, side = (service.create_scene(t) for t in ("Fin", "Milieu", "Début", "Annexe"))
+        self._link(service, start, middle, side)
+        self._link(service, middle, end)
+        graph = service.graph()
+        order = graph.topological_order()
+        assert order.index(start.id) < order.index(middle.id) < order.index(end.id)
+        assert graph.roots() == [start.id]
+        assert graph.descendants(start.id) == {middle.id, end.id, side.id}
+        assert graph.ancestors(end.id) == {start.id, middle.id}
+        assert not graph.has_cycle()
+        
+        # Mise à jour incrémentale : les ensembles en cache suivent les nouveaux liens
+        self._link(service, side, end)
+        assert graph.ancestors(end.id) == {start.id, middle.id, side.id}
+        service.delete_scene(middle.id)
+        assert graph.descendants(start.id) == {side.id, end.id}
+        assert start.referenced_scenes == [side.id]
+    
+    def test_cycles(self, project_service):
+        """Vérifie la détection des boucles et qu'elles restent ordonnées et atteignables"""
+        service = project_service.scene_service
+        a, b, c = (service.create_scene(t) for t in ("A", "B", "C"))
+        self._link(service, a, b)
+        self._link(service, b, c)
+        graph = service.graph()
+        assert graph.would_create_cycle(c.id, a.id)
+        self._link(service, c, a)
+        assert graph.cycles() == [[a.id, b.id, c.id]]
+        assert graph.roots() == [a.id]
+        assert graph.topological_order() == [a.id, b.id, c.id]
+        assert a.id in graph.descendants(a.id)
+        self._link(service, c)
+        assert not graph.has_cycle() and a.id not in graph.descendants(a.id)
+
+
 class TestSessionService:
     """Tests pour SessionService"""
     
@@ -183,6 +403,199 @@ class TestSessionService:
         session_service.add_scene(session.id, scene.id)
         updated_session = session_service.get_session(session.id)
         assert scene.id in updated_session.scenes
+    
+    def test_scene_session_index(self, project_service):
+        """Vérifie que Session.scenes et Scene.sessions restent cohérents"""
+        session_service = project_service.session_service
+        scene_service = project_service.scene_service
+        first, second = session_service.create_session("Session 1"), session_service.create_session("Session 2")
+        a, b, c = (scene_service.create_scene(t) for t in ("A", "B", "C"))
+        
+        session_service.add_scene_to_session(first.id, a.id)
+        session_service.add_scene_to_session(first.id, b.id)
+        session_service.add_scene_to_session(second.id, b.id)
+        assert a.sessions == [first.id] and b.sessions == [first.id, second.id]
+        assert session_service.get_scene_position(first.id, b.id) == 1
+        assert not session_service.is_scene_assigned(c.id)
+        
+        session_service.reorder_scenes_in_session(first.id, [b.id, a.id])
+        assert session_service.get_scene_position(first.id, b.id) == 0
+        copy = session_service.duplicate_session(first.id)
+        assert a.sessions == [first.id, copy.id]
+        session_service.remove_scene_from_session(first.id, a.id)
+        assert a.sessions == [copy.id]
+        
+        scene_service.delete_scene(b.id)
+        assert first.scenes == [] and second.scenes == [] and copy.scenes == [a.id]
+        session_service.delete_session(copy.id)
+        assert a.sessions == [] and session_service.get_scene_sessions(a.id) == []
+    
+    def test_sessions_by_date(self, project_service):
+        """Vérifie l'ordre par date, les intervalles et la prochaine préparation"""
+        from datetime import datetime
+        service = project_service.session_service
+        third = service.create_session("Session 3", datetime(2024, 3, 1))
+        first = service.create_session("Session 1", datetime(2024, 1, 1))
+        prep = service.create_session("Préparation", datetime(2024, 2, 15), is_preparation=True)
+        second = service.create_session("Session 2", datetime(2024, 2, 1))
+        
+        assert service.get_all_sessions() == [first, second, prep, third]
+        assert service.get_sessions_between(datetime(2024, 2, 1), datetime(2024, 3, 1)) == [second, prep, third]
+        assert service.get_actual_sessions() == [first, second, third]
+        assert service.get_next_preparation_session(datetime(2024, 2, 2)) is prep
+        assert service.get_next_preparation_session(datetime(2024, 2, 16)) is None
+        
+        # Date et statut modifiés : la session change de place et de partition
+        prep.date, prep.is_preparation = datetime(2023, 12, 1), False
+        service.update_session(prep)
+        assert service.get_all_sessions() == [prep, first, second, third]
+        assert service.get_preparation_sessions() == []
+        service.delete_session(first.id)
+        assert service.get_sessions_between(end=datetime(2024, 1, 31)) == [prep]
+    
+    def test_load_repairs_scene_sessions(self, project_service):
+        """Vérifie que le chargement recalcule Scene.sessions depuis les sessions"""
+        scene = project_service.scene_service.create_scene("A")
+        session = project_service.session_service.create_session("Session 1")
+        session.scenes = [scene.id]
+        sessions_data = project_service.session_service.serialize_sessions()
+        scene.sessions = ["session-supprimée"]
+        project_service.session_service.load_sessions(sessions_data)
+        assert scene.sessions == [session.id]
+
+
+class TestCharacterPrototypes:
+    """Tests des instances de prototype (copie à l'écriture)"""
+    
+    @staticmethod
+    def _goblins(service, count=3):
+        prototype = service.character_service.create_character("Gobelin", CharacterType.CREATURE, level=2)
+        prototype.combat.life_points = 7
+        prototype.combat.current_life_points = 7
+        return prototype, service.character_service.spawn_instances(prototype.id, count)
+    
+    def test_copy_on_write(self, project_service):
+        """Vérifie que les instances partagent le prototype jusqu'à la première écriture"""
+        prototype, goblins = self._goblins(project_service)
+        assert [g.name for g in goblins] == ["Gobelin 1", "Gobelin 2", "Gobelin 3"]
+        assert goblins[0].combat is prototype.combat and goblins[0].derived.defense_total == 10
+        
+        goblins[0].materialize('combat')
+        goblins[0].combat.current_life_points = 2
+        assert prototype.combat.current_life_points == 7
+        assert goblins[1].combat.current_life_points == 7
+        assert goblins[0].shared_fields() == tuple(f for f in goblins[1].shared_fields() if f != 'combat')
+        
+        project_service.character_service.update_where({'profile.level': 3}, [goblins[1].id])
+        assert goblins[1].profile.level == 3 and prototype.profile.level == 2
+        
+        goblins[0].combat.current_life_points = 7
+        project_service.character_service.update_character(goblins[0])
+        assert goblins[0].combat is prototype.combat
+    
+    def test_round_trip_stores_only_overrides(self, project_service, temp_project_dir):
+        """Vérifie que project.json ne contient que les champs modifiés des instances"""
+        project_service.create_project("Proto", temp_project_dir)
+        prototype, goblins = self._goblins(project_service)
+        goblins[0].materialize('combat')
+        goblins[0].combat.current_life_points = 1
+        data = project_service.character_service.serialize_characters()
+        stored = {d['id']: d for d in data}
+        assert stored[goblins[0].id] == {
+            'id': goblins[0].id, 'name': "Gobelin 1", 'type': 'CREATURE',
+            'prototype': prototype.id, 'combat': {'current_life_points': 1}
+        }
+        assert 'combat' not in stored[goblins[1].id]
+        assert 'prototype' not in stored[prototype.id]
+        
+        project_service.character_service.load_characters(data)
+        service = project_service.character_service
+        loaded = [service.get_character(g.id) for g in goblins]
+        assert [c.id for c in service.get_all_characters()] == [prototype.id] + [g.id for g in goblins]
+        assert loaded[0].combat.current_life_points == 1 and loaded[0].combat.life_points == 7
+        assert loaded[1].combat is service.get_character(prototype.id).combat
+    
+    def test_deleting_prototype_detaches_instances(self, project_service):
+        """Vérifie qu'une instance reste complète si son prototype est supprimé"""
+        prototype, goblins = self._goblins(project_service)
+        assert project_service.character_service.delete_character(prototype.id)
+        assert goblins[0].prototype is None and goblins[0].shared_fields() == ()
+        assert goblins[0].combat.life_points == 7
+        assert goblins[0].combat is not goblins[1].combat
+    
+    def test_editing_prototype_updates_instance_views(self, project_service):
+        """Vérifie que les index et la vue en colonnes suivent un prototype modifié"""
+        service = project_service.character_service
+        prototype, goblins = self._goblins(project_service)
+        service.query(level=2)
+        service.analytics()
+        
+        service.update_where({'profile.level': 5}, ids=[prototype.id])
+        assert all(g.profile.level == 5 for g in goblins)
+        assert service.query(level=5).total == 4
+        assert service.query(level=2).total == 0
+        assert service.analytics().mean('level') == 5.0
+
+
+class TestReferenceIndex:
+    """Tests de l'index inverse des références et des suppressions en cascade"""
+    
+    @staticmethod
+    def _campaign(service):
+        """Une scène citant un PNJ, un lieu et une autre scène, dans une session"""
+        npc = service.character_service.create_character("Garde", CharacterType.PNJ)
+        region = service.location_service.create_location("Région")
+        village = service.location_service.create_location("Village", parent_location=region.id, bestiary=[npc.id])
+        intro = service.scene_service.create_scene("Introduction")
+        scene = service.scene_service.create_scene("Embuscade")
+        scene.npcs = [npc.id]
+        scene.locations = [village.id]
+        scene.referenced_scenes = [intro.id]
+        service.scene_service.update_scene(scene)
+        session = service.session_service.create_session("Session 1")
+        service.session_service.add_scene_to_session(session.id, intro.id)
+        service.session_service.add_scene_to_session(session.id, scene.id)
+        return npc, region, village, intro, scene, session
+    
+    def test_referrers_follow_updates(self, project_service):
+        """Vérifie que l'index suit les modifications faites via les services"""
+        npc, region, village, intro, scene, session = self._campaign(project_service)
+        referrers = {(r.kind, r.id, r.field) for r in project_service.get_references(npc.id)}
+        assert referrers == {('scene', scene.id, 'npcs'), ('location', village.id, 'bestiary')}
+        assert {r.id for r in project_service.get_references(intro.id)} == {scene.id, session.id}
+        
+        scene.npcs = []
+        project_service.scene_service.update_scene(scene)
+        project_service.session_service.remove_scene_from_session(session.id, intro.id)
+        assert [r.id for r in project_service.get_references(npc.id)] == [village.id]
+        assert [r.id for r in project_service.get_references(intro.id)] == [scene.id]
+    
+    def test_cascading_deletes(self, project_service):
+        """Vérifie qu'une suppression ne laisse aucun ID orphelin"""
+        npc, region, village, intro, scene, session = self._campaign(project_service)
+        # Index construit avant les suppressions : la cascade ne lit que les référents
+        project_service.references()
+        
+        assert project_service.character_service.delete_character(npc.id)
+        assert scene.npcs == [] and village.bestiary == []
+        assert project_service.location_service.delete_location(region.id)
+        assert village.parent_location is None
+        assert project_service.scene_service.delete_scene(intro.id)
+        assert scene.referenced_scenes == [] and session.scenes == [scene.id]
+        assert project_service.location_service.delete_location(village.id)
+        assert scene.locations == []
+        assert project_service.session_service.delete_session(session.id)
+        assert len(project_service.references()) == 0
+    
+    def test_bulk_delete_revert_restores_references(self, project_service):
+        """Vérifie que l'annulation d'une suppression en masse restaure les références"""
+        npc, region, village, intro, scene, session = self._campaign(project_service)
+        change = project_service.character_service.delete_where([npc.id])
+        assert scene.npcs == [] and village.bestiary == []
+        project_service.character_service.revert(change)
+        project_service._references = None
+        assert scene.npcs == [npc.id] and village.bestiary == [npc.id]
+        assert len(project_service.get_references(npc.id)) == 2
 
 
 class TestBankService:
@@ -228,6 +641,201 @@ class TestBankService:
         assert random_entry.value in ["Name1", "Name2"]
 
 
+class TestBankSampling:
+    """Tests pour les tirages pondérés des banques"""
+    
+    def test_weighted_random_entry(self, project_service):
+        """Vérifie que le poids des entrées est respecté"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.TRINKETS)
+        service.add_entry_to_bank(bank.id, "Commun", weight=9.0)
+        service.add_entry_to_bank(bank.id, "Introuvable", weight=0.0)
+        
+        values = {service.get_random_entry(BankType.TRINKETS) for _ in range(50)}
+        assert values == {"Commun"}
+    
+    def test_sampler_rebuilt_after_mutation(self, project_service):
+        """Vérifie que l'échantillonneur est reconstruit après une mutation"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.NAMES)
+        service.add_entry_to_bank(bank.id, "Arwen", {"racial_origin": "Elfe"})
+        sampler = service.get_sampler(BankType.NAMES)
+        assert service.get_sampler(BankType.NAMES) is sampler
+        
+        service.add_entry_to_bank(bank.id, "Gimli", {"racial_origin": "Nain"})
+        assert len(service.get_sampler(BankType.NAMES)) == 2
+        assert len(service.get_sampler(BankType.NAMES, where={"racial_origin": "nain"})) == 1
+    
+    def test_sample_entries_without_replacement(self, project_service):
+        """Vérifie le tirage multiple sans remise"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.WEAPONS)
+        for i in range(20):
+            service.add_entry_to_bank(bank.id, f"Arme {i}")
+        
+        entries = service.sample_entries(BankType.WEAPONS, 8, replace=False)
+        assert len({e.id for e in entries}) == 8
+
+
+class TestBankImportExport:
+    """Tests pour l'import/export en masse des banques"""
+    
+    def test_csv_import_with_dedup_and_validation(self, project_service, temp_project_dir):
+        """Vérifie l'import CSV, la déduplication et la validation"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.NAMES)
+        service.add_entry_to_bank(bank.id, "Arwen")
+        
+        csv_file = temp_project_dir / "noms.csv"
+        csv_file.write_text(
+            "value,weight,meta.racial_origin\n"
+            "Arwen,1,Elfe\n"
+            "Thorin,2,Nain\n"
+            "Thorin,1,Nain\n"
+            ",1,Humain\n"
+            "Bilbo,-3,Halfelin\n",
+            encoding="utf-8"
+        )
+        
+        report = service.import_file(BankType.NAMES, csv_file)
+        assert report.added == 1
+        assert report.duplicates == 2
+        assert report.invalid == 2
+        thorin = next(e for e in bank.entries if e.value == "Thorin")
+        assert thorin.weight == 2.0
+        assert thorin.metadata == {"racial_origin": "Nain"}
+    
+    def test_dry_run_does_not_insert(self, project_service, temp_project_dir):
+        """Vérifie qu'une simulation n'insère rien"""
+        service = project_service.bank_service
+        jsonl_file = temp_project_dir / "armes.jsonl"
+        jsonl_file.write_text('{"value": "Dague"}\n"Gourdin"\nnot json\n', encoding="utf-8")
+        
+        report = service.import_file(BankType.WEAPONS, jsonl_file, dry_run=True)
+        assert report.added == 2
+        assert report.invalid == 1
+        bank = service.get_bank_by_type(BankType.WEAPONS)
+        assert bank is None or not bank.entries
+    
+    def test_non_finite_weights_are_invalid(self, project_service):
+        """Vérifie que les poids nan / inf sont rejetés"""
+        rows = [(1, {"value": "Dague", "weight": float("nan")}), (2, {"value": "Épée", "weight": float("inf")})]
+        report = project_service.bank_service.import_entries(BankType.WEAPONS, rows)
+        assert report.added == 0
+        assert report.invalid == 2
+    
+    def test_prepare_then_apply(self, project_service):
+        """Vérifie que la préparation ne modifie pas la banque et que l'insertion recompte les doublons"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.NAMES)
+        rows = [(1, {"value": "Arwen"}), (2, {"value": "Thorin"})]
+        
+        report, entries = service.prepare_entries(BankType.NAMES, rows)
+        assert report.added == 2
+        assert not bank.entries
+        
+        service.add_entry_to_bank(bank.id, "Thorin")
+        service.apply_entries(BankType.NAMES, entries, report)
+        assert [entry.value for entry in bank.entries] == ["Thorin", "Arwen"]
+        assert (report.added, report.duplicates) == (1, 1)
+    
+    def test_export_import_round_trip(self, project_service, temp_project_dir):
+        """Vérifie qu'un export puis un import restitue les entrées"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.CREATURES)
+        service.add_entry_to_bank(bank.id, "Gobelin", {"level": 1, "challenge": "0", "stats": {"strength": 9}}, weight=3.0)
+        
+        for extension in ("csv", "jsonl"):
+            path = temp_project_dir / f"bestiaire.{extension}"
+            assert service.export_file(BankType.CREATURES, path) == 1
+            
+            other = ProjectService().bank_service
+            report = other.import_file(BankType.CREATURES, path)
+            assert report.added == 1
+            entry = other.get_bank_by_type(BankType.CREATURES).entries[0]
+            assert entry.value == "Gobelin"
+            assert entry.weight == 3.0
+            assert entry.metadata == {"level": 1, "challenge": "0", "stats": {"strength": 9}}
+
+
+class TestBankDedupe:
+    """Tests pour la normalisation et le dédoublonnage des banques"""
+    
+    def test_initial_data_keeps_homonym_variants(self):
+        """Vérifie que l'initialisation garde les variantes homonymes des fichiers, une seule fois"""
+        from dndmaker.core.data_loader import DataLoader
+        service = ProjectService().bank_service
+        DataLoader.initialize_banks(service)
+        armors = DataLoader.load_armors()
+        assert len({armor['name'] for armor in armors}) < len(armors)
+        expected = {
+            BankType.ARMORS: len(armors),
+            BankType.WEAPONS: len(DataLoader.load_weapons()),
+            BankType.TOOLS: len(DataLoader.load_tools()),
+            BankType.CREATURES: len(DataLoader.load_creatures()),
+        }
+        for bank_type, count in expected.items():
+            assert len(service.get_bank_by_type(bank_type).entries) == count, bank_type
+        
+        DataLoader.initialize_banks(service)
+        assert len(service.get_bank_by_type(BankType.ARMORS).entries) == len(armors)
+    
+    def test_find_duplicate_and_insert_guard(self, project_service):
+        """Vérifie la détection des quasi-doublons à l'insertion"""
+        service = project_service.bank_service
+        bank = service.create_bank(BankType.WEAPONS)
+        epee = service.add_entry_to_bank(bank.id, "Épée longue", {"damage": "1d8"})
+        
+        assert service.find_duplicate(bank.id, " epee  LONGUE") is epee
+        assert service.find_duplicate(bank.id, "epee longue", exclude_id=epee.id) is None
+        with pytest.raises(ValueError):
+            service.add_entry_to_bank(bank.id, "EPEE LONGUE", on_duplicate="reject")
+        
+        merged = service.add_entry_to_bank(bank.id, "epee longue", {"damage": "1d10", "weight": 3}, on_duplicate="merge")
+        assert merged is epee
+        assert epee.metadata == {"damage": "1d8", "weight": 3}
+        assert len(bank.entries) == 1
+    
+    def test_dedupe_rewrites_character_references(self, project_service):
+        """Vérifie la fusion des doublons et la réécriture des références"""
+        from dndmaker.models.character import Weapon
+        
+        bank = project_service.bank_service.create_bank(BankType.WEAPONS)
+        for value in ("Épée longue", "epee longue", "Dague", "ÉPÉE  LONGUE"):
+            project_service.bank_service.add_entry_to_bank(bank.id, value)
+        character = project_service.character_service.create_character("Boromir", CharacterType.PJ)
+        character.equipment = ["epee longue", "Dague"]
+        character.weapons = [Weapon(name="ÉPÉE  LONGUE")]
+        
+        assert project_service.dedupe_bank(BankType.WEAPONS, dry_run=True) == (2, 1)
+        assert len(bank.entries) == 4
+        
+        assert project_service.dedupe_bank(BankType.WEAPONS) == (2, 1)
+        assert [e.value for e in bank.entries] == ["Épée longue", "Dague"]
+        assert character.equipment == ["Épée longue", "Dague"]
+        assert character.weapons[0].name == "Épée longue"
+    
+    def test_rename_only_touches_fields_of_the_bank(self, project_service):
+        """Vérifie qu'un renommage ne réécrit que les champs alimentés par la banque"""
+        from dndmaker.models.character import Weapon
+        
+        character = project_service.character_service.create_character("Lame", CharacterType.PNJ)
+        character.profile.race = "Lame"
+        character.valuables.items = ["Lame"]
+        character.weapons = [Weapon(name="Lame")]
+        character.equipment = ["Lame"]
+        
+        assert project_service.character_service.replace_references(BankType.RACES, {"Lame": "Elfe"}) == 1
+        assert character.profile.race == "Elfe"
+        assert character.weapons[0].name == "Lame"
+        
+        renames = {"Lame": "Épée"}
+        assert project_service.character_service.replace_references(BankType.WEAPONS, renames) == 1
+        assert (character.weapons[0].name, character.equipment) == ("Épée", ["Épée"])
+        assert character.valuables.items == ["Lame"]
+        assert project_service.character_service.replace_references(BankType.NAMES, renames) == 0
+
+
 class TestProjectService:
     """Tests pour ProjectService"""
     
@@ -255,3 +863,55 @@ class TestProjectService:
         assert service.table_service is not None
         assert service.media_service is not None
 
+
+
+class TestCombatSimulator:
+    """Tests pour le simulateur de combat"""
+    
+    @staticmethod
+    def _fighter(service, name, level, life_points, weapon_damage):
+        """Crée un combattant avec une arme"""
+        from dndmaker.models.character import Weapon
+        character = service.create_character(name, CharacterType.PJ, level=level)
+        character.combat.life_points = life_points
+        character.weapons = [Weapon(name="Arme", damage=weapon_damage)]
+        return character
+    
+    def test_combatant_profile(self, project_service):
+        """Vérifie la lecture des bonus, de la défense et des dégâts"""
+        from dndmaker.services.combat_simulator import Combatant
+        character = self._fighter(project_service.character_service, "Brute", 3, 20, "1d8")
+        character.characteristics.strength.value = 14
+        character.combat.melee_attack = "2 + 3"
+        character.defense.armor = 4
+        combatant = Combatant.from_character(character)
+        assert combatant.attack == 5
+        assert combatant.defense == 14
+        assert combatant.damage == "1d8+2"
+        assert combatant.hp == 20
+    
+    def test_stronger_side_wins(self, project_service):
+        """Vérifie les taux de victoire et la cohérence du rapport"""
+        from dndmaker.services.combat_simulator import CombatSimulator
+        service = project_service.character_service
+        heroes = [self._fighter(service, f"Héros {i}", 5, 40, "2d6") for i in range(3)]
+        rats = [self._fighter(service, f"Rat {i}", 1, 3, "1d2") for i in range(2)]
+        
+        report = CombatSimulator(seed=1).simulate(heroes, rats, simulations=500)
+        assert report.simulations == 500
+        assert report.wins_a + report.wins_b + report.draws == 500
+        assert report.win_rate > 0.99
+        assert sum(report.rounds.values()) == 500
+        assert sum(report.hp_remaining_a.values()) == 500
+        assert len(report.death_rates()) == 5
+        assert "Victoire du camp A" in report.summary()
+        
+        again = CombatSimulator(seed=1).simulate(heroes, rats, simulations=500)
+        assert again.rounds == report.rounds
+    
+    def test_empty_side_rejected(self, project_service):
+        """Vérifie qu'un camp vide est refusé"""
+        from dndmaker.services.combat_simulator import CombatSimulator
+        hero = self._fighter(project_service.character_service, "Héros", 1, 10, "1d6")
+        with pytest.raises(ValueError):
+            CombatSimulator().simulate([hero], [])
@@ -6,8 +6,11 @@ import pytest
 from dndmaker.core.utils import (
     generate_id,
     validate_characteristic_value,
-    calculate_modifier
+    calculate_modifier,
+    normalize_key
 )
+from dndmaker.core.sampling import AliasSampler
+from dndmaker.core.dice import compile_dice, describe_dice
 
 
 class TestGenerateID:
@@ -85,3 +88,104 @@ class TestCalculateModifier:
         # Valeur 13 = (13-10)/2 = 1.5 arrondi vers le bas = 1
         assert calculate_modifier(13) == 1
 
+
+class TestNormalizeKey:
+    """Tests pour normalize_key"""
+    
+    def test_ignores_case_accents_and_spaces(self):
+        """Vérifie que la casse, les accents et les espaces sont ignorés"""
+        assert normalize_key("  Épée   longue ") == "epee longue"
+        assert normalize_key("ÉPÉE LONGUE") == normalize_key("epee longue")
+    
+    def test_distinct_values_stay_distinct(self):
+        """Vérifie que des valeurs différentes gardent des clés différentes"""
+        assert normalize_key("Demi-elfe") != normalize_key("Demi elfe")
+
+
+class TestAliasSampler:
+    """Tests pour l'échantillonneur pondéré"""
+    
+    def test_zero_weight_never_drawn(self):
+        """Vérifie qu'un élément de poids nul n'est jamais tiré"""
+        import random
+        sampler = AliasSampler(["a", "b", "c"], [1.0, 0.0, 3.0])
+        rng = random.Random(42)
+        draws = sampler.draw_many(2000, rng=rng)
+        assert "b" not in draws
+        # "c" est trois fois plus probable que "a"
+        assert draws.count("c") > 2 * draws.count("a")
+    
+    def test_draw_without_replacement(self):
+        """Vérifie le tirage sans remise"""
+        import random
+        sampler = AliasSampler(list(range(50)))
+        rng = random.Random(1)
+        few = sampler.draw_many(10, replace=False, rng=rng)
+        assert len(few) == len(set(few)) == 10
+        all_items = sampler.draw_many(100, replace=False, rng=rng)
+        assert sorted(all_items) == list(range(50))
+    
+    def test_empty_sampler(self):
+        """Vérifie le comportement sans élément"""
+        sampler = AliasSampler([])
+        assert len(sampler) == 0
+        assert sampler.draw_many(5) == []
+        with pytest.raises(ValueError):
+            sampler.draw()
+
+
+class TestDiceExpression:
+    """Tests pour les expressions de dés"""
+    
+    def test_compile_and_bounds(self):
+        """Vérifie l'analyse des termes, modificateurs et bornes"""
+        expression = compile_dice("1d8 + 1d6 - 1")
+        assert str(expression) == "1d8+1d6-1"
+        assert (expression.minimum, expression.maximum) == (1, 13)
+        assert str(compile_dice("4d6d1")) == "4d6kh3"
+        assert compile_dice("2d6") is compile_dice("2d6")  # évaluateur mis en cache
+    
+    @pytest.mark.parametrize("text", ["", "2d", "1d6+FOR", "5d6kh6", "0d6"])
+    def test_invalid_expressions(self, text):
+        """Vérifie le rejet des expressions invalides"""
+        with pytest.raises(ValueError):
+            compile_dice(text)
+        assert describe_dice(text) == ""
+    
+    def test_exact_distribution(self):
+        """Vérifie la distribution exacte, y compris en conservant les meilleurs dés"""
+        distribution = compile_dice("2d6").distribution()
+        assert distribution[7] == pytest.approx(6 / 36)
+        assert sum(distribution.values()) == pytest.approx(1.0)
+        
+        keep = compile_dice("4d6kh3")
+        assert keep.distribution()[18] == pytest.approx(21 / 1296)
+        assert keep.mean() == pytest.approx(15869 / 1296)
+        assert keep.percentile(50) == 12
+        assert compile_dice("2d20kl1").distribution()[20] == pytest.approx(1 / 400)
+    
+    def test_roll_many(self):
+        """Vérifie les tirages en masse (bornes et reproductibilité)"""
+        import random
+        expression = compile_dice("3d6+2")
+        rolls = expression.roll_many(2000, random.Random(4))
+        assert all(5 <= r <= 20 for r in rolls)
+        assert sum(rolls) / len(rolls) == pytest.approx(expression.mean(), abs=0.3)
+        assert rolls == expression.roll_many(2000, random.Random(4))
+    
+    def test_large_expressions_are_approximated(self):
+        """Vérifie qu'une expression trop coûteuse n'a pas de table exacte"""
+        import random
+        expression = compile_dice("200d100")
+        assert not expression.is_exact
+        assert expression.mean() == 10100
+        assert 9400 < expression.percentile(5) < expression.percentile(50) == 10100 < expression.percentile(95) < 10800
+        assert "valeurs approchées" in describe_dice("100d6kh50")
+        with pytest.raises(ValueError):
+            expression.counts()
+        assert all(200 <= r <= 20000 for r in expression.roll_many(100, random.Random(1)))
+        
+        # Quelques tirages ne construisent pas la table, même exacte
+        small = compile_dice("4d8")
+        small.roll_many(3, random.Random(1))
+        assert small._values is None